@@ -0,0 +1,426 @@
+"""
+Batch scoring for the Policy Comparison Engine.
+Loads the numeric attributes of a candidate set into NumPy columns and computes
+criteria, value, review and organization scores for every policy in one pass.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from policies.models import BasePolicy, PolicyReviewStats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# BasePolicy attributes that are always populated and can be scored as columns
+NUMERIC_FIELDS = (
+    'base_premium',
+    'coverage_amount',
+    'waiting_period_days',
+    'minimum_age',
+    'maximum_age',
+)
+
+
+def _to_float(value: Any) -> float:
+    """Convert a value the same way the scalar path does (via Decimal)."""
+    return float(Decimal(str(value)))
+
+
+def _progressive_penalty(pct: np.ndarray) -> np.ndarray:
+    """Progressive penalty: 1 point per % up to 20%, 1.5 up to 50%, then 2."""
+    return np.where(
+        pct <= 20,
+        pct,
+        np.where(pct <= 50, 20 + (pct - 20) * 1.5, 65 + (pct - 50) * 2)
+    )
+
+
+def score_lower_better(values: np.ndarray, user_target: Any) -> np.ndarray:
+    """Vectorized counterpart of PolicyComparisonEngine._score_lower_better."""
+    if user_target is None:
+        return np.full(len(values), 50.0)
+
+    try:
+        target = _to_float(user_target)
+    except Exception:
+        return np.zeros(len(values))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if target != 0:
+            savings_pct = (target - values) / target * 100
+        else:
+            savings_pct = np.zeros(len(values))
+        within = np.minimum(100 + np.minimum(savings_pct / 10, 10), 100)
+        within = np.where((values == 0) & (target > 0), 100.0, within)
+
+        excess_pct = (values - target) / target * 100
+        over = np.maximum(100 - _progressive_penalty(excess_pct), 0)
+
+    scores = np.where(values <= target, within, over)
+    if target == 0:
+        # Division by a zero target raises in the scalar path; criterion is skipped
+        scores = np.where(values > target, np.nan, scores)
+    return scores
+
+
+def score_higher_better(values: np.ndarray, user_target: Any) -> np.ndarray:
+    """Vectorized counterpart of PolicyComparisonEngine._score_higher_better."""
+    if user_target is None:
+        return np.full(len(values), 50.0)
+
+    try:
+        target = _to_float(user_target)
+    except Exception:
+        return np.zeros(len(values))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if target != 0:
+            excess_pct = (values - target) / target * 100
+        else:
+            excess_pct = np.zeros(len(values))
+        meets = np.minimum(100 + np.minimum(excess_pct / 20, 10), 100)
+
+        shortfall_pct = (target - values) / target * 100
+        below = np.maximum(100 - _progressive_penalty(shortfall_pct), 0)
+
+    scores = np.where(values >= target, meets, below)
+    if target == 0:
+        scores = np.where(values < target, np.nan, scores)
+    return scores
+
+
+def score_range(values: np.ndarray, user_range: Any) -> np.ndarray:
+    """Vectorized counterpart of PolicyComparisonEngine._score_range."""
+    if not user_range or not isinstance(user_range, dict):
+        return np.full(len(values), 50.0)
+
+    min_val = user_range.get('min')
+    max_val = user_range.get('max')
+
+    if min_val is None and max_val is None:
+        return np.full(len(values), 50.0)
+
+    try:
+        lower = _to_float(min_val) if min_val is not None else None
+        upper = _to_float(max_val) if max_val is not None else None
+    except Exception:
+        # Bounds that cannot be parsed raise in the scalar path
+        return np.full(len(values), np.nan)
+
+    within_min = np.ones(len(values), dtype=bool) if lower is None else values >= lower
+    within_max = np.ones(len(values), dtype=bool) if upper is None else values <= upper
+
+    gap = np.where(
+        ~within_min,
+        (lower if lower is not None else 0) - values,
+        values - (upper if upper is not None else 0)
+    )
+    outside = np.maximum(100 - np.minimum(gap * 10, 100), 0)
+
+    return np.where(within_min & within_max, 100.0, outside)
+
+
+def score_exact_match(values: np.ndarray, user_value: Any) -> np.ndarray:
+    """Vectorized EXACT_MATCH evaluation for numeric columns."""
+    if not isinstance(user_value, (int, float, Decimal)):
+        return np.zeros(len(values))
+    return np.where(values == float(user_value), 100.0, 0.0)
+
+
+def score_boolean(values: np.ndarray, user_value: Any) -> np.ndarray:
+    """Vectorized BOOLEAN evaluation for numeric columns."""
+    if user_value is None:
+        return np.full(len(values), 50.0)
+    return np.where((values != 0) == bool(user_value), 100.0, 0.0)
+
+
+def score_proximity(values: np.ndarray, user_value: Any) -> np.ndarray:
+    """Vectorized counterpart of PolicyComparisonEngine._smart_evaluate for numbers."""
+    if user_value is None:
+        return np.full(len(values), 50.0)
+
+    try:
+        target = _to_float(user_value)
+    except Exception:
+        return np.full(len(values), np.nan)
+
+    if target != 0:
+        diff_pct = np.abs((values - target) / target * 100)
+    else:
+        diff_pct = np.full(len(values), 100.0)
+
+    return np.where(values == target, 100.0, np.maximum(100 - diff_pct, 0))
+
+
+COMPARISON_TYPE_SCORERS = {
+    'LOWER_BETTER': score_lower_better,
+    'HIGHER_BETTER': score_higher_better,
+    'RANGE': score_range,
+    'EXACT_MATCH': score_exact_match,
+    'BOOLEAN': score_boolean,
+}
+
+
+class PolicyColumns:
+    """
+    Column-oriented view of the scoring-relevant attributes of a candidate set.
+    Row i of every column belongs to policies[i].
+    """
+
+    def __init__(self, policies: List[BasePolicy]):
+        self.policies = list(policies)
+        self.ids = np.array([policy.id for policy in self.policies], dtype=np.int64)
+
+        self.numeric = {
+            field_name: np.array(
+                [float(getattr(policy, field_name)) for policy in self.policies],
+                dtype=np.float64
+            )
+            for field_name in NUMERIC_FIELDS
+        }
+
+        self.org_verified = self._flag(lambda p: p.organization.is_verified)
+        self.org_active = self._flag(lambda p: p.organization.is_active)
+        self.is_featured = self._flag(lambda p: p.is_featured)
+
+        self.review_score = self._load_review_scores()
+
+    def __len__(self):
+        return len(self.policies)
+
+    def take(self, rows: List[int]) -> 'PolicyColumns':
+        """Columns for a subset of rows, in the given order, without reloading anything."""
+        subset = PolicyColumns.__new__(PolicyColumns)
+        subset.policies = [self.policies[row] for row in rows]
+        subset.ids = self.ids[rows]
+        subset.numeric = {field_name: column[rows] for field_name, column in self.numeric.items()}
+        subset.org_verified = self.org_verified[rows]
+        subset.org_active = self.org_active[rows]
+        subset.is_featured = self.is_featured[rows]
+        subset.review_score = self.review_score[rows]
+        return subset
+
+    def _flag(self, getter) -> np.ndarray:
+        return np.array([bool(getter(policy)) for policy in self.policies], dtype=bool)
+
+    def _load_review_scores(self) -> np.ndarray:
+        """Read precomputed review scores for the whole set in one query."""
+        review_stats = PolicyReviewStats.get_for_policies(self.ids.tolist())
+        return np.array(
+            [float(review_stats[policy_id].review_score) for policy_id in self.ids.tolist()],
+            dtype=np.float64
+        )
+
+
+class BatchPolicyScorer:
+    """
+    Scores a whole candidate set for a PolicyComparisonEngine in one pass.
+
+    Numeric criteria on BasePolicy columns, value, review and organization
+    scores are computed with NumPy. Criteria that cannot be expressed as a
+    column (benefit levels, ranges, feature fields) fall back to the engine's
+    per-policy evaluator. Produces the same score_data structure as
+    PolicyComparisonEngine._score_policy.
+    """
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine: PolicyComparisonEngine with weights and criteria loaded
+        """
+        self.engine = engine
+
+    def score_policies(
+        self,
+        policies: List[BasePolicy],
+        user_criteria: Dict[str, Any],
+        columns: Optional[PolicyColumns] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score every policy in the candidate set.
+
+        Args:
+            policies: Policies to score
+            user_criteria: Dictionary of user preferences and criteria
+            columns: Pre-built columns for the policies (optional)
+
+        Returns:
+            List of score_data dictionaries, in the same order as policies
+        """
+        if not policies:
+            return []
+
+        columns = columns or PolicyColumns(policies)
+
+        criteria_scores = self._score_criteria(columns, user_criteria)
+        criteria_score = self._combine_criteria(criteria_scores, len(columns))
+        value_score = self._value_scores(columns)
+        review_score = columns.review_score
+        org_score = self._organization_scores(columns)
+
+        return self._build_score_data(
+            columns, criteria_scores, criteria_score, value_score, review_score, org_score
+        )
+
+    def _score_criteria(
+        self,
+        columns: PolicyColumns,
+        user_criteria: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score each weighted criterion for all policies.
+        NaN marks a criterion the scalar path would have skipped for that policy.
+        """
+        scores = {}
+
+        for field_name, weight in self.engine.weights.items():
+            if weight == 0:
+                continue
+
+            user_value = user_criteria.get(field_name)
+            if field_name in NUMERIC_FIELDS:
+                scores[field_name] = self._score_column(columns, field_name, user_value)
+            else:
+                scores[field_name] = self._score_per_policy(columns, field_name, user_value)
+
+        return scores
+
+    def _score_column(
+        self,
+        columns: PolicyColumns,
+        field_name: str,
+        user_value: Any
+    ) -> np.ndarray:
+        """Score a numeric BasePolicy column with the criterion's comparison type."""
+        values = columns.numeric[field_name]
+        criteria = self.engine.criteria.get(field_name)
+
+        if not criteria:
+            return score_proximity(values, user_value)
+
+        scorer = COMPARISON_TYPE_SCORERS.get(criteria.comparison_type)
+        if scorer is None:
+            return np.full(len(values), 50.0)
+
+        return scorer(values, user_value)
+
+    def _score_per_policy(
+        self,
+        columns: PolicyColumns,
+        field_name: str,
+        user_value: Any
+    ) -> np.ndarray:
+        """Fall back to the engine's scalar evaluator for one criterion."""
+        scores = np.full(len(columns), np.nan)
+
+        for i, policy in enumerate(columns.policies):
+            try:
+                scores[i] = float(self.engine._evaluate_criterion(policy, field_name, user_value))
+            except Exception as e:
+                logger.warning(f"Error evaluating {field_name} for policy {policy.id}: {str(e)}")
+
+        return scores
+
+    def _combine_criteria(self, criteria_scores: Dict[str, np.ndarray], size: int) -> np.ndarray:
+        """Weighted criteria score (0-100), neutral 50 when no criterion applied."""
+        total_weighted_score = np.zeros(size)
+        total_weight = np.zeros(size)
+
+        for field_name, scores in criteria_scores.items():
+            weight = float(self.engine.weights[field_name])
+            evaluated = ~np.isnan(scores)
+            total_weighted_score += np.where(evaluated, scores * weight / 100, 0)
+            total_weight += np.where(evaluated, weight, 0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_weight > 0, total_weighted_score / total_weight * 100, 50.0)
+
+    def _value_scores(self, columns: PolicyColumns) -> np.ndarray:
+        """Vectorized counterpart of PolicyComparisonEngine._calculate_value_score."""
+        premium = columns.numeric['base_premium']
+        coverage = columns.numeric['coverage_amount']
+        waiting = columns.numeric['waiting_period_days']
+        age_range = columns.numeric['maximum_age'] - columns.numeric['minimum_age']
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            base_score = np.minimum(coverage / premium / 150 * 100, 100)
+
+        base_score = base_score - np.where(waiting > 0, np.minimum(waiting / 10, 20), 0)
+        base_score = base_score - np.where(age_range < 30, (30 - age_range) / 3, 0)
+
+        return np.where(premium == 0, 100.0, np.maximum(base_score, 0))
+
+    def _organization_scores(self, columns: PolicyColumns) -> np.ndarray:
+        """Vectorized counterpart of PolicyComparisonEngine._calculate_organization_score."""
+        score = (
+            50.0
+            + np.where(columns.org_verified, 20, 0)
+            + np.where(columns.org_active, 10, 0)
+            + np.where(columns.is_featured, 5, 0)
+        )
+        return np.clip(score, 0, 100)
+
+    def _build_score_data(
+        self,
+        columns: PolicyColumns,
+        criteria_scores: Dict[str, np.ndarray],
+        criteria_score: np.ndarray,
+        value_score: np.ndarray,
+        review_score: np.ndarray,
+        org_score: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Assemble per-policy score_data dictionaries from the score columns."""
+        criteria_weight = float(self.engine.CRITERIA_WEIGHT)
+        value_weight = float(self.engine.VALUE_WEIGHT)
+        review_weight = float(self.engine.REVIEW_WEIGHT)
+        organization_weight = float(self.engine.ORGANIZATION_WEIGHT)
+
+        final_score = (
+            criteria_score * criteria_weight +
+            value_score * value_weight +
+            review_score * review_weight +
+            org_score * organization_weight
+        )
+
+        weights = {
+            field_name: float(self.engine.weights[field_name])
+            for field_name in criteria_scores
+        }
+
+        results = []
+        for i in range(len(columns)):
+            policy_criteria_scores = {}
+            for field_name, scores in criteria_scores.items():
+                score = scores[i]
+                if np.isnan(score):
+                    continue
+                policy_criteria_scores[field_name] = {
+                    'score': float(score),
+                    'weight': weights[field_name],
+                    'weighted_score': float(score * weights[field_name] / 100)
+                }
+
+            overall_score = Decimal(repr(float(final_score[i]))).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+            )
+
+            results.append({
+                'overall_score': float(overall_score),
+                'criteria_score': float(criteria_score[i]),
+                'value_score': float(value_score[i]),
+                'review_score': float(review_score[i]),
+                'organization_score': float(org_score[i]),
+                'criteria_scores': policy_criteria_scores,
+                'score_breakdown': {
+                    'criteria_contribution': float(criteria_score[i] * criteria_weight),
+                    'value_contribution': float(value_score[i] * value_weight),
+                    'review_contribution': float(review_score[i] * review_weight),
+                    'organization_contribution': float(org_score[i] * organization_weight)
+                }
+            })
+
+        return results
@@ -0,0 +1,184 @@
+"""
+In-memory policy catalog snapshots.
+Keeps every active, approved policy of a category loaded per process so that
+comparison engines can score without going back to the database.
+"""
+
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from policies.models import BasePolicy, PolicyReviewStats
+from surveys.caching import cache_is_shared
+from health_policies.models import HealthPolicy
+from funeral_policies.models import FuneralPolicy
+import logging
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'policy_catalog_generation'
+GENERATION_TIMEOUT = 3600 * 24 * 7  # 7 days
+
+
+def catalog_queryset(category_slug: str, typed: bool = True) -> QuerySet:
+    """
+    Active and approved policies with the relations scoring reads.
+
+    Args:
+        category_slug: Slug of the policy category
+        typed: Use the category-specific model (HealthPolicy, FuneralPolicy)
+            instead of BasePolicy
+    """
+    base_query = {
+        'is_active': True,
+        'approval_status': 'APPROVED'
+    }
+
+    # Get category-specific instances with prefetching
+    if typed and category_slug == 'health':
+        return HealthPolicy.objects.filter(**base_query).select_related(
+            'organization', 'category', 'policy_type', 'review_stats'
+        ).prefetch_related(
+            'health_benefits',
+            'hospital_networks',
+            'chronic_conditions',
+            'reviews'
+        )
+    elif typed and category_slug == 'funeral':
+        return FuneralPolicy.objects.filter(**base_query).select_related(
+            'organization', 'category', 'policy_type', 'review_stats'
+        ).prefetch_related(
+            'family_tiers',
+            'service_providers',
+            'additional_benefits',
+            'reviews'
+        )
+
+    # Fallback to base policies
+    return BasePolicy.objects.filter(**base_query).select_related(
+        'organization', 'category', 'policy_type', 'policy_features', 'review_stats'
+    ).prefetch_related('additional_features', 'reviews')
+
+
+def current_generation() -> str:
+    """Get the catalog generation, starting a new one if none is recorded."""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = format(time.time_ns(), 'x')
+        if not cache.add(GENERATION_KEY, generation, GENERATION_TIMEOUT):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def bump_generation() -> None:
+    """Mark every process's catalog snapshots as outdated."""
+    cache.set(GENERATION_KEY, format(time.time_ns(), 'x'), GENERATION_TIMEOUT)
+
+
+class CatalogSnapshot:
+    """
+    Immutable snapshot of a category's catalog.
+
+    Policies are fully loaded model instances shared between requests and must
+    be treated as read-only. Batch scoring columns and the eligibility index
+    for the whole catalog are built once; lookups for a candidate set slice them.
+    """
+
+    __slots__ = (
+        'category_slug', 'typed', 'generation', 'built_at', 'policies', 'columns', 'eligibility', '_rows'
+    )
+
+    def __init__(self, category_slug: str, typed: bool, generation: str):
+        from .batch_scoring import PolicyColumns
+        from .eligibility_index import EligibilityIndex
+
+        self.category_slug = category_slug
+        self.typed = typed
+        self.generation = generation
+        self.built_at = time.monotonic()
+
+        policies = list(catalog_queryset(category_slug, typed).filter(category__slug=category_slug))
+
+        # Attach review stats so scoring never has to create them on the fly
+        review_stats = PolicyReviewStats.get_for_policies([policy.id for policy in policies])
+        for policy in policies:
+            policy.review_stats = review_stats[policy.id]
+
+        self.policies = tuple(policies)
+        self._rows = {policy.id: row for row, policy in enumerate(policies)}
+        self.columns = PolicyColumns(policies)
+        self.eligibility = EligibilityIndex(policies)
+
+    def __len__(self):
+        return len(self.policies)
+
+    def __contains__(self, policy_id):
+        return policy_id in self._rows
+
+    def _rows_for(self, policy_ids: Iterable[int]) -> List[int]:
+        """Snapshot rows for the given IDs, in catalog order."""
+        return sorted(
+            self._rows[policy_id] for policy_id in set(policy_ids) if policy_id in self._rows
+        )
+
+    def get_policies(self, policy_ids: Iterable[int]) -> List[BasePolicy]:
+        """Policies with the given IDs that are in the snapshot, in catalog order."""
+        return [self.policies[row] for row in self._rows_for(policy_ids)]
+
+    def columns_for(self, policies: List[BasePolicy]):
+        """Batch scoring columns for snapshot policies, or None if any are not in it."""
+        rows = []
+        for policy in policies:
+            row = self._rows.get(policy.id)
+            if row is None or self.policies[row] is not policy:
+                return None
+            rows.append(row)
+        return self.columns.take(rows)
+
+
+_snapshots: Dict[Tuple[str, bool], CatalogSnapshot] = {}
+_snapshots_lock = Lock()
+
+
+def get_catalog_snapshot(category_slug: str, typed: bool = True) -> Optional[CatalogSnapshot]:
+    """
+    Get the catalog snapshot for a category, rebuilding it when the catalog
+    generation has moved on or it is older than POLICY_CATALOG_MAX_AGE seconds.
+    Returns None when snapshots are disabled or cannot be built, and when the
+    default cache is process-local, since generation bumps then never reach
+    other workers.
+    """
+    if not getattr(settings, 'POLICY_CATALOG_SNAPSHOT_ENABLED', True) or not cache_is_shared():
+        return None
+
+    max_age = getattr(settings, 'POLICY_CATALOG_MAX_AGE', 300)
+    key = (category_slug, typed)
+
+    try:
+        generation = current_generation()
+        snapshot = _snapshots.get(key)
+        if snapshot is not None and snapshot.generation == generation \
+                and time.monotonic() - snapshot.built_at < max_age:
+            return snapshot
+
+        with _snapshots_lock:
+            snapshot = _snapshots.get(key)
+            if snapshot is None or snapshot.generation != generation \
+                    or time.monotonic() - snapshot.built_at >= max_age:
+                snapshot = CatalogSnapshot(category_slug, typed, generation)
+                _snapshots[key] = snapshot
+                logger.info(f"Built {category_slug} catalog snapshot with {len(snapshot)} policies")
+
+        return snapshot
+
+    except Exception as e:
+        logger.error(f"Error building catalog snapshot for {category_slug}: {str(e)}")
+        return None
+
+
+def clear_catalog_snapshots() -> None:
+    """Drop all snapshots held by this process."""
+    with _snapshots_lock:
+        _snapshots.clear()
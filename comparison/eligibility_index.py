@@ -0,0 +1,223 @@
+"""
+Eligibility index for hard survey filters.
+Answers ORM-style filters (``field__lte`` etc.) against a category catalog from
+sorted columns and boolean masks instead of checking every policy in Python.
+"""
+
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from policies.models import BasePolicy
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Numeric fields most survey filters bound; other fields are indexed on first use
+INDEXED_NUMERIC_FIELDS = [
+    'base_premium',
+    'coverage_amount',
+    'minimum_age',
+    'maximum_age',
+    'waiting_period_days',
+]
+
+RANGE_OPERATORS = ('lte', 'gte', 'lt', 'gt', 'exact')
+
+
+def split_filter_key(filter_key: str) -> Tuple[str, Optional[str]]:
+    """Split an ORM-style filter key into field name and operator."""
+    if '__' in filter_key:
+        field_name, operator = filter_key.split('__', 1)
+        return field_name, operator
+    return filter_key, None
+
+
+def value_meets_filter(policy_value: Any, operator: Optional[str], filter_value: Any) -> bool:
+    """
+    Check a single policy value against a filter.
+
+    Args:
+        policy_value: The policy's value for the filtered field
+        operator: ORM-style operator, or None for a direct comparison
+        filter_value: Required value
+
+    Returns:
+        True if the value meets the filter
+    """
+    if policy_value is None:
+        return False
+
+    # Handle Django ORM-style filters
+    if operator is not None:
+        if operator == 'lte':
+            return policy_value <= filter_value
+        elif operator == 'gte':
+            return policy_value >= filter_value
+        elif operator == 'lt':
+            return policy_value < filter_value
+        elif operator == 'gt':
+            return policy_value > filter_value
+        elif operator == 'exact':
+            return policy_value == filter_value
+        elif operator == 'icontains':
+            return str(filter_value).lower() in str(policy_value).lower()
+        return True
+
+    # Boolean filters
+    if isinstance(filter_value, bool):
+        return bool(policy_value) == filter_value
+
+    # Exact match filters
+    return policy_value == filter_value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+class SortedColumn:
+    """Non-null values of one field in ascending order, with the rows they came from."""
+
+    __slots__ = ('values', 'rows')
+
+    def __init__(self, values: Sequence[Any]):
+        present = sorted(
+            (value, row) for row, value in enumerate(values) if value is not None
+        )
+        self.values = [value for value, _ in present]
+        self.rows = np.array([row for _, row in present], dtype=np.int64)
+
+    def bounds(self, operator: str, filter_value: Any) -> Tuple[int, int]:
+        """Slice of the sorted values that meets the operator."""
+        if operator == 'lte':
+            return 0, bisect_right(self.values, filter_value)
+        elif operator == 'lt':
+            return 0, bisect_left(self.values, filter_value)
+        elif operator == 'gte':
+            return bisect_left(self.values, filter_value), len(self.values)
+        elif operator == 'gt':
+            return bisect_right(self.values, filter_value), len(self.values)
+        # exact
+        return bisect_left(self.values, filter_value), bisect_right(self.values, filter_value)
+
+
+class EligibilityIndex:
+    """
+    Index over a fixed list of policies for answering hard filters.
+
+    Numeric fields are kept as sorted columns, so range filters are two
+    bisects. Boolean filters use precomputed masks. Each filter yields a
+    boolean row mask and filters combine with bitwise AND. Filters the index
+    cannot answer from a sorted column (text matching, mixed types) are
+    evaluated over the field's extracted values with the same semantics as
+    value_meets_filter.
+
+    Field values are read with getattr on the policy, as the comparison
+    engine's per-policy filter check does. Built once per catalog snapshot
+    and rebuilt with it.
+    """
+
+    def __init__(self, policies: Sequence[BasePolicy]):
+        self.policies = tuple(policies)
+        self.ids = np.array([policy.id for policy in self.policies], dtype=np.int64)
+        self._rows = {policy.id: row for row, policy in enumerate(self.policies)}
+        self._values: Dict[str, List[Any]] = {}
+        self._sorted: Dict[str, Optional[SortedColumn]] = {}
+        self._masks: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._lock = Lock()
+
+        for field_name in INDEXED_NUMERIC_FIELDS:
+            self._sorted_column(field_name)
+
+    def __len__(self):
+        return len(self.policies)
+
+    def row_of(self, policy: BasePolicy) -> Optional[int]:
+        """Row of a policy instance held by the index, or None."""
+        row = self._rows.get(policy.id)
+        if row is None or self.policies[row] is not policy:
+            return None
+        return row
+
+    def _column(self, field_name: str) -> List[Any]:
+        values = self._values.get(field_name)
+        if values is None:
+            values = [getattr(policy, field_name, None) for policy in self.policies]
+            self._values[field_name] = values
+        return values
+
+    def _sorted_column(self, field_name: str) -> Optional[SortedColumn]:
+        """Sorted column for a numeric field, or None if its values are not all numbers."""
+        if field_name not in self._sorted:
+            with self._lock:
+                if field_name not in self._sorted:
+                    values = self._column(field_name)
+                    column = None
+                    if all(value is None or _is_number(value) for value in values):
+                        column = SortedColumn(values)
+                    self._sorted[field_name] = column
+        return self._sorted[field_name]
+
+    def _truth_mask(self, field_name: str, truth: bool) -> np.ndarray:
+        """Rows whose value is present and has the given truthiness."""
+        key = (field_name, truth)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = np.array(
+                [value is not None and bool(value) == truth for value in self._column(field_name)],
+                dtype=bool
+            )
+            self._masks[key] = mask
+        return mask
+
+    def filter_mask(self, filter_key: str, filter_value: Any) -> np.ndarray:
+        """Boolean row mask of policies meeting a single filter."""
+        field_name, operator = split_filter_key(filter_key)
+
+        if operator is None and isinstance(filter_value, bool):
+            return self._truth_mask(field_name, filter_value)
+
+        if operator is None and _is_number(filter_value):
+            operator = 'exact'
+
+        if operator in RANGE_OPERATORS and _is_number(filter_value):
+            column = self._sorted_column(field_name)
+            if column is not None:
+                start, stop = column.bounds(operator, filter_value)
+                mask = np.zeros(len(self.policies), dtype=bool)
+                mask[column.rows[start:stop]] = True
+                return mask
+
+        return np.array(
+            [value_meets_filter(value, operator, filter_value) for value in self._column(field_name)],
+            dtype=bool
+        )
+
+    def match(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean row mask of policies meeting every filter."""
+        mask = np.ones(len(self.policies), dtype=bool)
+        for filter_key, filter_value in filters.items():
+            mask &= self.filter_mask(filter_key, filter_value)
+            if not mask.any():
+                break
+        return mask
+
+    def eligible_ids(self, filters: Dict[str, Any], order_by: Optional[str] = None) -> List[int]:
+        """
+        IDs of policies meeting every filter.
+
+        Args:
+            filters: ORM-style filters, e.g. {'base_premium__lte': 500}
+            order_by: Numeric field to sort by (ascending); catalog order if omitted
+        """
+        mask = self.match(filters)
+
+        if order_by is not None:
+            column = self._sorted_column(order_by)
+            if column is not None:
+                rows = column.rows[mask[column.rows]]
+                return self.ids[rows].tolist()
+
+        return self.ids[mask].tolist()
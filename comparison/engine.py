@@ -7,11 +7,20 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Dict, Any, Optional, Tuple
 from django.db.models import Q, Avg, Count
 from django.core.cache import cache
-from policies.models import BasePolicy
+from policies.models import BasePolicy, PolicyReviewStats
 from health_policies.models import HealthPolicy
 # from life_policies.models import LifePolicy  # Module doesn't exist yet
 from funeral_policies.models import FuneralPolicy
 from .models import ComparisonSession, ComparisonResult, ComparisonCriteria
+from .catalog import get_catalog_snapshot, catalog_queryset
+from .eligibility_index import split_filter_key, value_meets_filter
+from .lazy_results import LazyResult
+from .result_cache import ComparisonResultCache
+from .result_writer import ComparisonResultWriter
+from .scoring_plan import (
+    ScoringPlan, get_scoring_plan, bind_criteria,
+    lower_better_score, higher_better_score, range_score
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,17 +38,34 @@ class PolicyComparisonEngine:
     REVIEW_WEIGHT = Decimal('0.10')    # 10% - User reviews
     ORGANIZATION_WEIGHT = Decimal('0.05')  # 5% - Organization reputation
     
-    def __init__(self, category_slug: str):
+    def __init__(
+        self,
+        category_slug: str,
+        batch_scoring: bool = True,
+        narrative_top_n: Optional[int] = None
+    ):
         """
         Initialize the comparison engine for a specific category.
         
         Args:
             category_slug: Slug of the policy category (health, life, funeral)
+            batch_scoring: Score the candidate set in one vectorized pass
+            narrative_top_n: Only generate pros, cons and recommendation text
+                for the top N results (all results when None). Results past N
+                are also saved without it, so only set this when the saved
+                results are not rendered.
         """
         self.category_slug = category_slug
+        self.batch_scoring = batch_scoring
+        self.narrative_top_n = narrative_top_n
         self.weights = {}
         self.criteria = {}
         self.user_criteria = {}
+        self.survey_context = {}
+        self.result_cache = ComparisonResultCache()
+        self.scoring_plan = None
+        self._bound_criteria = None
+        self.catalog_snapshot = None
         
     def compare_policies(
         self,
@@ -69,6 +95,28 @@ class PolicyComparisonEngine:
             if len(policy_ids) > 10:
                 return {'error': 'Maximum 10 policies can be compared at once'}
             
+            # Store user criteria and survey context
+            self.user_criteria = user_criteria
+            self.survey_context = survey_context or {}
+            
+            # One freshness check of the criteria serves the cache key and scoring
+            scoring_plan = get_scoring_plan(self.category_slug)
+            
+            # Serve repeated identical requests from the result cache
+            cache_key = None
+            if self.result_cache.enabled:
+                cache_key = self.result_cache.make_key(
+                    self.category_slug, policy_ids, user_criteria, self.survey_context,
+                    criteria_version=scoring_plan.version
+                )
+                cached_comparison = self.result_cache.get(cache_key)
+                cached_response = cached_comparison and self._restore_cached_comparison(
+                    cached_comparison, scoring_plan, user_criteria, user, session_key
+                )
+                if cached_response:
+                    logger.info(f"Serving cached comparison for {len(policy_ids)} policies")
+                    return cached_response
+            
             # Get policies
             policies = self._get_policies(policy_ids)
             
@@ -82,32 +130,12 @@ class PolicyComparisonEngine:
             if len(policies) < 2:
                 return {'error': 'At least 2 valid policies required for comparison'}
             
-            # Store user criteria and survey context
-            self.user_criteria = user_criteria
-            self.survey_context = survey_context or {}
-            
-            # Create comparison session
-            session = self._create_session(policies, user_criteria, user, session_key)
-            
             # Load comparison criteria (enhanced with survey data if available)
-            self._load_criteria(user_criteria)
+            self._load_criteria(user_criteria, scoring_plan)
             
             # Score each policy (with survey context if available)
             logger.info(f"Scoring {len(policies)} policies for comparison")
-            results = []
-            for policy in policies:
-                try:
-                    if self.survey_context:
-                        score_data = self._score_policy_with_survey_context(policy, user_criteria, self.survey_context)
-                    else:
-                        score_data = self._score_policy(policy, user_criteria)
-                    results.append({
-                        'policy': policy,
-                        'score_data': score_data
-                    })
-                except Exception as e:
-                    logger.error(f"Error scoring policy {policy.id}: {str(e)}")
-                    continue
+            results = self._score_policies(policies, user_criteria)
             
             if not results:
                 return {'error': 'Failed to score policies'}
@@ -115,81 +143,177 @@ class PolicyComparisonEngine:
             # Rank policies
             ranked_results = self._rank_policies(results)
             
-            # Generate detailed analysis
-            analysis = self._generate_detailed_analysis(ranked_results, user_criteria)
-            
-            # Save results to session
-            self._save_results(session, ranked_results)
-            
-            # Generate recommendations
-            recommendations = self._generate_recommendations(ranked_results, user_criteria)
-            
-            # Calculate comparison insights
-            insights = self._generate_insights(ranked_results, user_criteria)
+            if cache_key:
+                # Only scores and ranks are cached; narrative text stays lazy
+                self.result_cache.set(cache_key, {
+                    'policy_ids': [policy.id for policy in policies],
+                    'ranked_results': [
+                        {
+                            'policy_id': result['policy'].id,
+                            'score_data': result['score_data'],
+                            'rank': result['rank'],
+                            'match_percentage': result['match_percentage'],
+                        }
+                        for result in ranked_results
+                    ],
+                })
             
-            return {
-                'success': True,
-                'session_id': session.id,
-                'session_key': session.session_key,
-                'category': session.category.name,
-                'total_policies': len(policies),
-                'best_match': ranked_results[0]['policy'],
-                'results': ranked_results,
-                'recommendations': recommendations,
-                'analysis': analysis,
-                'insights': insights,
-                'created_at': session.created_at
-            }
+            return self._build_comparison_response(
+                policies, ranked_results, user_criteria, user, session_key
+            )
             
         except Exception as e:
             logger.error(f"Comparison engine error: {str(e)}")
             return {'error': f'Comparison failed: {str(e)}'}
     
+    def _restore_cached_comparison(
+        self,
+        cached_comparison: Dict[str, Any],
+        scoring_plan: ScoringPlan,
+        user_criteria: Dict[str, Any],
+        user,
+        session_key: str
+    ) -> Optional[LazyResult]:
+        """
+        Rebuild a response from cached policy IDs and scores.
+        Policies are re-attached from the catalog snapshot; returns None if any
+        of them is no longer available, so the comparison is scored afresh.
+        """
+        policy_ids = cached_comparison.get('policy_ids')
+        if not policy_ids:
+            return None
+        
+        policies_by_id = {policy.id: policy for policy in self._get_policies(policy_ids)}
+        if any(policy_id not in policies_by_id for policy_id in policy_ids):
+            return None
+        
+        # Criteria are needed for narrative text generated on access
+        self._load_criteria(user_criteria, scoring_plan)
+        ranked_results = []
+        for position, cached_result in enumerate(cached_comparison['ranked_results']):
+            result = dict(cached_result)
+            result['policy'] = policies_by_id[result.pop('policy_id')]
+            ranked_results.append(self._attach_narrative(result, position))
+        
+        return self._build_comparison_response(
+            [policies_by_id[policy_id] for policy_id in policy_ids],
+            ranked_results, user_criteria, user, session_key
+        )
+    
+    def _build_comparison_response(
+        self,
+        policies: List[BasePolicy],
+        ranked_results: List[LazyResult],
+        user_criteria: Dict[str, Any],
+        user,
+        session_key: str
+    ) -> LazyResult:
+        """
+        Record a comparison session for ranked results and build the response.
+        Runs on every request, including ones served from the result cache.
+        Analysis, recommendations and insights are generated on first access.
+        """
+        # Create comparison session
+        session = self._create_session(policies, user_criteria, user, session_key)
+        
+        # Save results to session
+        self._save_results(session, ranked_results)
+        
+        response = LazyResult({
+            'success': True,
+            'session_id': session.id,
+            'session_key': session.session_key,
+            'category': session.category.name,
+            'total_policies': len(policies),
+            'best_match': ranked_results[0]['policy'],
+            'results': ranked_results,
+            'created_at': session.created_at
+        })
+        
+        # Generate recommendations
+        response.set_lazy('recommendations', self._narrative(
+            lambda: self._generate_recommendations(ranked_results, user_criteria), []
+        ))
+        
+        # Generate detailed analysis
+        response.set_lazy('analysis', self._narrative(
+            lambda: self._generate_detailed_analysis(ranked_results, user_criteria), {}
+        ))
+        
+        # Calculate comparison insights
+        response.set_lazy('insights', self._narrative(
+            lambda: self._generate_insights(ranked_results, user_criteria), {}
+        ))
+        
+        return response
+    
+    def _narrative(self, generate, default):
+        """
+        Wrap a narrative generator for lazy evaluation.
+        Failures are logged and fall back to the default instead of breaking the reader.
+        """
+        def factory():
+            try:
+                return generate()
+            except Exception as e:
+                logger.error(f"Error generating comparison narrative: {str(e)}")
+                return default
+        return factory
+    
+    def _attach_narrative(self, result: Dict[str, Any], position: int) -> LazyResult:
+        """
+        Wrap a ranked result so its pros, cons and recommendation reason are
+        generated on first access. Results past narrative_top_n get empty text.
+        """
+        entry = LazyResult(result)
+        
+        if self.narrative_top_n is not None and position >= self.narrative_top_n:
+            entry.update(pros=[], cons=[], recommendation_reason='')
+            return entry
+        
+        policy = entry['policy']
+        score_data = entry['score_data']
+        survey_context = self.survey_context
+        
+        # Generate pros and cons (enhanced with survey context if available)
+        if survey_context:
+            entry.set_lazy('pros', self._narrative(
+                lambda: self._generate_survey_aware_pros(policy, score_data, survey_context), []
+            ))
+            entry.set_lazy('cons', self._narrative(
+                lambda: self._generate_survey_aware_cons(policy, score_data, survey_context), []
+            ))
+        else:
+            entry.set_lazy('pros', self._narrative(
+                lambda: self._generate_pros(policy, score_data), []
+            ))
+            entry.set_lazy('cons', self._narrative(
+                lambda: self._generate_cons(policy, score_data), []
+            ))
+        
+        entry.set_lazy('recommendation_reason', self._narrative(
+            lambda: self._generate_recommendation_reason(entry), ''
+        ))
+        
+        return entry
+    
     def _get_policies(self, policy_ids: List[int]) -> List[BasePolicy]:
         """
         Get active and approved policies by IDs with category-specific models.
+        Served from the category's catalog snapshot; IDs outside it are loaded
+        from the database.
         """
-        base_query = {
-            'id__in': policy_ids,
-            'is_active': True,
-            'approval_status': 'APPROVED'
-        }
+        self.catalog_snapshot = get_catalog_snapshot(self.category_slug)
+        if self.catalog_snapshot is None:
+            return list(catalog_queryset(self.category_slug).filter(id__in=policy_ids))
         
-        # Get category-specific instances with prefetching
-        if self.category_slug == 'health':
-            policies = HealthPolicy.objects.filter(**base_query).select_related(
-                'organization', 'category', 'policy_type'
-            ).prefetch_related(
-                'health_benefits',
-                'hospital_networks',
-                'chronic_conditions',
-                'reviews'
-            )
-        # elif self.category_slug == 'life':
-        #     policies = LifePolicy.objects.filter(**base_query).select_related(
-        #         'organization', 'category', 'policy_type'
-        #     ).prefetch_related(
-        #         'coverage_tiers',
-        #         'critical_illnesses',
-        #         'riders',
-        #         'reviews'
-        #     )
-        elif self.category_slug == 'funeral':
-            policies = FuneralPolicy.objects.filter(**base_query).select_related(
-                'organization', 'category', 'policy_type'
-            ).prefetch_related(
-                'family_tiers',
-                'service_providers',
-                'additional_benefits',
-                'reviews'
-            )
-        else:
-            # Fallback to base policies
-            policies = BasePolicy.objects.filter(**base_query).select_related(
-                'organization', 'category', 'policy_type', 'policy_features'
-            ).prefetch_related('additional_features', 'reviews')
+        policies = self.catalog_snapshot.get_policies(policy_ids)
         
-        return list(policies)
+        missing_ids = [policy_id for policy_id in policy_ids if policy_id not in self.catalog_snapshot]
+        if missing_ids:
+            policies.extend(catalog_queryset(self.category_slug).filter(id__in=missing_ids))
+        
+        return policies
     
     def _create_session(
         self,
@@ -218,32 +342,105 @@ class PolicyComparisonEngine:
         
         return session
     
-    def _load_criteria(self, user_criteria: Dict[str, Any]):
+    def _load_criteria(self, user_criteria: Dict[str, Any], scoring_plan: Optional[ScoringPlan] = None):
         """
-        Load comparison criteria and weights from database and user input.
+        Load comparison criteria and weights from the category's scoring plan and user input.
         Merges default criteria with user-specified weights.
+        
+        Args:
+            user_criteria: User preferences and weights
+            scoring_plan: Plan already fetched for this comparison (fetched when None)
         """
-        # Get default criteria for category from database
-        default_criteria = ComparisonCriteria.objects.filter(
-            category__slug=self.category_slug,
-            is_active=True
-        )
+        # Get default criteria for category from the compiled plan
+        self.scoring_plan = scoring_plan or get_scoring_plan(self.category_slug)
+        self._bound_criteria = None
         
         # Apply user-specified weights or use defaults
-        for criteria in default_criteria:
-            weight = user_criteria.get('weights', {}).get(
-                criteria.field_name,
-                criteria.weight
-            )
-            self.weights[criteria.field_name] = Decimal(str(weight))
-            self.criteria[criteria.field_name] = criteria
+        user_weights = user_criteria.get('weights', {})
+        for field_name, default_weight, criteria in self.scoring_plan.criteria:
+            if field_name in user_weights:
+                self.weights[field_name] = Decimal(str(user_weights[field_name]))
+            else:
+                self.weights[field_name] = default_weight
+            self.criteria[field_name] = criteria
         
         # Add any custom criteria from user that aren't in database
-        custom_weights = user_criteria.get('weights', {})
-        for field_name, weight in custom_weights.items():
+        for field_name, weight in user_weights.items():
             if field_name not in self.weights:
                 self.weights[field_name] = Decimal(str(weight))
     
+    def _criterion_evaluators(self, user_criteria: Dict[str, Any]) -> List[Tuple[str, Decimal, Any]]:
+        """
+        Weighted criteria bound to the user's values.
+        Bound once per comparison and reused for every policy.
+        """
+        if self._bound_criteria is None or self._bound_criteria[0] is not user_criteria:
+            self._bound_criteria = (
+                user_criteria,
+                bind_criteria(self, self.weights, self.criteria, user_criteria)
+            )
+        return self._bound_criteria[1]
+    
+    def _score_policies(
+        self,
+        policies: List[BasePolicy],
+        user_criteria: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score all policies, using batch scoring when enabled.
+        Falls back to per-policy scoring if the batch pass fails.
+        
+        Returns:
+            List of dictionaries with 'policy' and 'score_data' keys
+        """
+        base_scores = None
+        if self.batch_scoring:
+            try:
+                base_scores = self._score_policies_batch(policies, user_criteria)
+            except Exception as e:
+                logger.warning(f"Batch scoring failed, scoring policies individually: {str(e)}")
+        
+        results = []
+        for i, policy in enumerate(policies):
+            try:
+                base_score_data = base_scores[i] if base_scores is not None else None
+                if self.survey_context:
+                    score_data = self._score_policy_with_survey_context(
+                        policy, user_criteria, self.survey_context,
+                        base_score_data=base_score_data
+                    )
+                else:
+                    score_data = base_score_data or self._score_policy(policy, user_criteria)
+                results.append({
+                    'policy': policy,
+                    'score_data': score_data
+                })
+            except Exception as e:
+                logger.error(f"Error scoring policy {policy.id}: {str(e)}")
+                continue
+        
+        return results
+    
+    def _score_policies_batch(
+        self,
+        policies: List[BasePolicy],
+        user_criteria: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score the whole candidate set in one vectorized pass.
+        
+        Returns:
+            List of score_data dictionaries in the same order as policies
+        """
+        from .batch_scoring import BatchPolicyScorer
+        
+        # Reuse the snapshot's prebuilt columns when every policy came from it
+        columns = None
+        if self.catalog_snapshot is not None:
+            columns = self.catalog_snapshot.columns_for(policies)
+        
+        return BatchPolicyScorer(self).score_policies(policies, user_criteria, columns=columns)
+    
     def _score_policy(
         self,
         policy: BasePolicy,
@@ -260,16 +457,9 @@ class PolicyComparisonEngine:
         total_weight = Decimal('0')
         
         # Score based on user criteria
-        for field_name, weight in self.weights.items():
-            if weight == 0:
-                continue
-            
+        for field_name, weight, evaluate in self._criterion_evaluators(user_criteria):
             try:
-                score = self._evaluate_criterion(
-                    policy,
-                    field_name,
-                    user_criteria.get(field_name)
-                )
+                score = evaluate(policy)
                 
                 criteria_scores[field_name] = {
                     'score': float(score),
@@ -329,7 +519,8 @@ class PolicyComparisonEngine:
         self,
         policy: BasePolicy,
         user_criteria: Dict[str, Any],
-        survey_context: Dict[str, Any]
+        survey_context: Dict[str, Any],
+        base_score_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Enhanced scoring that considers survey context with confidence weighting.
@@ -338,12 +529,14 @@ class PolicyComparisonEngine:
             policy: Policy to score
             user_criteria: User criteria from survey responses
             survey_context: Survey context including user profile and confidence levels
+            base_score_data: Precomputed base score (e.g. from batch scoring)
             
         Returns:
             Dictionary with enhanced score data including survey-specific adjustments
         """
         # Get base score using standard method
-        base_score_data = self._score_policy(policy, user_criteria)
+        if base_score_data is None:
+            base_score_data = self._score_policy(policy, user_criteria)
         
         # Apply survey-specific enhancements
         user_profile = survey_context.get('user_profile', {})
@@ -952,28 +1145,7 @@ class PolicyComparisonEngine:
         except:
             return Decimal('0')
         
-        if policy_value <= user_target:
-            # Better than target - award bonus
-            if policy_value == 0 and user_target > 0:
-                return Decimal('100')  # Free is best!
-            
-            savings_pct = ((user_target - policy_value) / user_target * 100) if user_target != 0 else Decimal('0')
-            # Cap bonus at 10 points
-            bonus = min(savings_pct / 10, Decimal('10'))
-            return min(Decimal('100') + bonus, Decimal('100'))
-        
-        # Worse than target - apply penalty
-        excess_pct = ((policy_value - user_target) / user_target * 100)
-        
-        # Progressive penalty: first 20% over = -1 point per %, then steeper
-        if excess_pct <= 20:
-            penalty = excess_pct
-        elif excess_pct <= 50:
-            penalty = 20 + (excess_pct - 20) * Decimal('1.5')
-        else:
-            penalty = 65 + (excess_pct - 50) * Decimal('2')
-        
-        return max(Decimal('100') - penalty, Decimal('0'))
+        return lower_better_score(policy_value, user_target)
     
     def _score_higher_better(
         self,
@@ -992,25 +1164,7 @@ class PolicyComparisonEngine:
         except:
             return Decimal('0')
         
-        if policy_value >= user_target:
-            # Meets or exceeds target
-            excess_pct = ((policy_value - user_target) / user_target * 100) if user_target != 0 else Decimal('0')
-            # Award bonus for exceeding (capped at 10 points)
-            bonus = min(excess_pct / 20, Decimal('10'))
-            return min(Decimal('100') + bonus, Decimal('100'))
-        
-        # Below target - apply penalty
-        shortfall_pct = ((user_target - policy_value) / user_target * 100)
-        
-        # Progressive penalty
-        if shortfall_pct <= 20:
-            penalty = shortfall_pct
-        elif shortfall_pct <= 50:
-            penalty = 20 + (shortfall_pct - 20) * Decimal('1.5')
-        else:
-            penalty = 65 + (shortfall_pct - 50) * Decimal('2')
-        
-        return max(Decimal('100') - penalty, Decimal('0'))
+        return higher_better_score(policy_value, user_target)
     
     def _score_range(
         self,
@@ -1035,22 +1189,11 @@ class PolicyComparisonEngine:
         except:
             return Decimal('0')
         
-        # Check if within range
-        within_min = min_val is None or policy_value >= Decimal(str(min_val))
-        within_max = max_val is None or policy_value <= Decimal(str(max_val))
-        
-        if within_min and within_max:
-            return Decimal('100')
-        
-        # Outside range - calculate how far out
-        if not within_min:
-            gap = Decimal(str(min_val)) - policy_value
-            penalty = min(gap * 10, Decimal('100'))
-        else:  # not within_max
-            gap = policy_value - Decimal(str(max_val))
-            penalty = min(gap * 10, Decimal('100'))
-        
-        return max(Decimal('100') - penalty, Decimal('0'))
+        return range_score(
+            policy_value,
+            Decimal(str(min_val)) if min_val is not None else None,
+            Decimal(str(max_val)) if max_val is not None else None
+        )
     
     def _calculate_value_score(self, policy: BasePolicy) -> Decimal:
         """
@@ -1069,13 +1212,13 @@ class PolicyComparisonEngine:
         
         # Adjust for waiting period (penalty for long waiting periods)
         if policy.waiting_period_days > 0:
-            waiting_penalty = min(policy.waiting_period_days / 10, Decimal('20'))
+            waiting_penalty = min(Decimal(policy.waiting_period_days) / 10, Decimal('20'))
             base_score = base_score - waiting_penalty
         
         # Adjust for age restrictions (penalty for narrow age ranges)
         age_range = policy.maximum_age - policy.minimum_age
         if age_range < 30:  # Narrow age range
-            age_penalty = (30 - age_range) / 3
+            age_penalty = Decimal(30 - age_range) / 3
             base_score = base_score - age_penalty
         
         return max(base_score, Decimal('0'))
@@ -1084,39 +1227,9 @@ class PolicyComparisonEngine:
         """
         Calculate score based on user reviews with credibility weighting.
         More reviews = more credible score.
+        Reads the policy's precomputed review stats.
         """
-        reviews = policy.reviews.filter(is_approved=True)
-        review_count = reviews.count()
-        
-        if review_count == 0:
-            return Decimal('50')  # Neutral score if no reviews
-        
-        # Get average rating
-        avg_rating = reviews.aggregate(avg=Avg('rating'))['avg']
-        
-        if avg_rating is None:
-            return Decimal('50')
-        
-        # Convert 5-star rating to 0-100 scale
-        base_score = Decimal(str(avg_rating)) * Decimal('20')
-        
-        # Apply credibility factor based on review count
-        # More reviews = higher confidence in the score
-        if review_count >= 50:
-            credibility = Decimal('1.0')
-        elif review_count >= 20:
-            credibility = Decimal('0.95')
-        elif review_count >= 10:
-            credibility = Decimal('0.90')
-        elif review_count >= 5:
-            credibility = Decimal('0.85')
-        else:
-            credibility = Decimal('0.75')
-        
-        # Adjust base score toward neutral (50) based on credibility
-        adjusted_score = base_score * credibility + Decimal('50') * (Decimal('1') - credibility)
-        
-        return adjusted_score
+        return PolicyReviewStats.for_policy(policy).review_score
     
     def _calculate_organization_score(self, policy: BasePolicy) -> Decimal:
         """
@@ -1134,12 +1247,6 @@ class PolicyComparisonEngine:
         if org.is_active:
             score += Decimal('10')
         
-        # Check license status
-        if not org.license_is_expired:
-            score += Decimal('15')
-        else:
-            score -= Decimal('30')  # Big penalty for expired license
-        
         # Featured policy bonus
         if policy.is_featured:
             score += Decimal('5')
@@ -1177,18 +1284,14 @@ class PolicyComparisonEngine:
             
             previous_score = current_score
             
-            # Generate pros and cons (enhanced with survey context if available)
-            if self.survey_context:
-                result['pros'] = self._generate_survey_aware_pros(result['policy'], result['score_data'], self.survey_context)
-                result['cons'] = self._generate_survey_aware_cons(result['policy'], result['score_data'], self.survey_context)
-            else:
-                result['pros'] = self._generate_pros(result['policy'], result['score_data'])
-                result['cons'] = self._generate_cons(result['policy'], result['score_data'])
-            
             # Generate match percentage
             result['match_percentage'] = round(result['score_data']['overall_score'], 1)
         
-        return sorted_results
+        # Pros and cons are generated on first access
+        return [
+            self._attach_narrative(result, position)
+            for position, result in enumerate(sorted_results)
+        ]
     
     def _generate_pros(self, policy: BasePolicy, score_data: Dict) -> List[str]:
         """
@@ -1516,13 +1619,7 @@ class PolicyComparisonEngine:
                 cons.append("No optical/vision coverage")
             if not policy.chronic_medication_covered:
                 cons.append("Chronic medication not covered")
-                
-        elif isinstance(policy, LifePolicy):
-            if policy.medical_exam_required:
-                cons.append("Medical examination required")
-            if not policy.is_renewable:
-                cons.append("Policy not renewable")
-                
+
         elif isinstance(policy, FuneralPolicy):
             if policy.natural_death_waiting_period > 6:
                 cons.append(f"Long natural death waiting period ({policy.natural_death_waiting_period} months)")
@@ -1675,7 +1772,11 @@ class PolicyComparisonEngine:
         session: ComparisonSession,
         ranked_results: List[Dict]
     ):
-        """Save comparison results to database."""
+        """
+        Save comparison results to database.
+        Stored rows are what the results views render, so every row gets its
+        narrative; only results past narrative_top_n are saved without it.
+        """
         if not ranked_results:
             return
         
@@ -1687,11 +1788,10 @@ class PolicyComparisonEngine:
         }
         session.save()
         
-        # Create result objects
-        ComparisonResult.objects.filter(session=session).delete()  # Clear old results
-        
+        # Replace old results with one bulk insert
+        writer = ComparisonResultWriter(ComparisonResult, unique_fields=['session', 'policy'])
         for result in ranked_results:
-            ComparisonResult.objects.create(
+            writer.add(ComparisonResult(
                 session=session,
                 policy=result['policy'],
                 overall_score=Decimal(str(result['score_data']['overall_score'])),
@@ -1699,8 +1799,9 @@ class PolicyComparisonEngine:
                 rank=result['rank'],
                 pros=result['pros'],
                 cons=result['cons'],
-                recommendation_reason=self._generate_recommendation_reason(result)
-            )
+                recommendation_reason=result['recommendation_reason']
+            ))
+        writer.flush(stale=ComparisonResult.objects.filter(session=session))
     
     def _generate_recommendation_reason(self, result: Dict) -> str:
         """Generate detailed explanation for policy ranking."""
@@ -1868,6 +1969,8 @@ class PolicyComparisonEngine:
     def _apply_survey_filters(self, policies: List[BasePolicy], filters: Dict[str, Any]) -> List[BasePolicy]:
         """
         Apply survey-generated filters to remove policies that don't meet hard requirements.
+        Policies from the catalog snapshot are filtered through its eligibility index;
+        any others are checked one by one.
         
         Args:
             policies: List of policies to filter
@@ -1879,16 +1982,23 @@ class PolicyComparisonEngine:
         if not filters:
             return policies
         
+        eligible = None
+        index = self.catalog_snapshot.eligibility if self.catalog_snapshot is not None else None
+        if index is not None:
+            eligible = index.match(filters)
+        
         filtered_policies = []
         
         for policy in policies:
-            meets_requirements = True
-            
-            # Check each filter criterion
-            for filter_key, filter_value in filters.items():
-                if not self._policy_meets_filter(policy, filter_key, filter_value):
-                    meets_requirements = False
-                    break
+            row = index.row_of(policy) if index is not None else None
+            if row is not None:
+                meets_requirements = bool(eligible[row])
+            else:
+                # Check each filter criterion
+                meets_requirements = all(
+                    self._policy_meets_filter(policy, filter_key, filter_value)
+                    for filter_key, filter_value in filters.items()
+                )
             
             if meets_requirements:
                 filtered_policies.append(policy)
@@ -1908,41 +2018,8 @@ class PolicyComparisonEngine:
         Returns:
             True if policy meets the filter criterion
         """
-        # Handle Django ORM-style filters
-        if '__' in filter_key:
-            field_name, operator = filter_key.split('__', 1)
-            policy_value = getattr(policy, field_name, None)
-            
-            if policy_value is None:
-                return False
-            
-            if operator == 'lte':
-                return policy_value <= filter_value
-            elif operator == 'gte':
-                return policy_value >= filter_value
-            elif operator == 'lt':
-                return policy_value < filter_value
-            elif operator == 'gt':
-                return policy_value > filter_value
-            elif operator == 'exact':
-                return policy_value == filter_value
-            elif operator == 'icontains':
-                return str(filter_value).lower() in str(policy_value).lower()
-        
-        # Handle direct field comparisons
-        else:
-            policy_value = getattr(policy, filter_key, None)
-            if policy_value is None:
-                return False
-            
-            # Boolean filters
-            if isinstance(filter_value, bool):
-                return bool(policy_value) == filter_value
-            
-            # Exact match filters
-            return policy_value == filter_value
-        
-        return True
+        field_name, operator = split_filter_key(filter_key)
+        return value_meets_filter(getattr(policy, field_name, None), operator, filter_value)
 
 
 def compare_policies_with_survey_data(
@@ -2042,26 +2119,24 @@ class QuickComparisonEngine:
     @staticmethod
     def compare_by_rating(policy_ids: List[int]) -> List[Dict]:
         """Compare policies by user ratings."""
-        from django.db.models import Avg, Count
-        
-        policies = BasePolicy.objects.filter(
+        policies = list(BasePolicy.objects.filter(
             id__in=policy_ids,
             is_active=True,
             approval_status='APPROVED'
-        ).annotate(
-            avg_rating=Avg('reviews__rating', filter=Q(reviews__is_approved=True)),
-            review_count=Count('reviews', filter=Q(reviews__is_approved=True))
-        ).select_related('organization', 'category', 'policy_type')
+        ).select_related('organization', 'category', 'policy_type'))
+        
+        review_stats = PolicyReviewStats.get_for_policies(policy.id for policy in policies)
         
         results = []
         for policy in policies:
+            stats = review_stats[policy.id]
             results.append({
                 'policy': policy,
                 'policy_id': policy.id,
                 'policy_name': policy.name,
                 'organization': policy.organization.name,
-                'avg_rating': float(policy.avg_rating) if policy.avg_rating else 0,
-                'review_count': policy.review_count,
+                'avg_rating': float(stats.average_rating) if stats.average_rating else 0,
+                'review_count': stats.approved_review_count,
                 'premium': float(policy.base_premium),
                 'coverage': float(policy.coverage_amount)
             })
@@ -2070,4 +2145,4 @@ class QuickComparisonEngine:
             results,
             key=lambda x: (x['avg_rating'], x['review_count']),
             reverse=True
-        )
\ No newline at end of file
+        )
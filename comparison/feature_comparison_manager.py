@@ -9,8 +9,10 @@ from django.db import transaction
 from django.utils import timezone
 from .models import FeatureComparisonResult
 from .feature_matching_engine import FeatureMatchingEngine
+from .result_writer import ComparisonResultWriter
 from simple_surveys.models import SimpleSurvey
 from policies.models import BasePolicy
+from policies.signals import validate_comparison_results
 import logging
 
 logger = logging.getLogger(__name__)
@@ -68,48 +70,70 @@ class FeatureComparisonManager:
             # Get matching engine for the insurance type
             matching_engine = self.get_matching_engine(survey.insurance_type)
             
-            # Calculate compatibility for each policy
-            policy_scores = []
-            for policy in policies:
-                try:
-                    compatibility_result = matching_engine.calculate_policy_compatibility(
-                        policy, user_preferences
-                    )
-                    policy_scores.append((policy, compatibility_result))
-                except Exception as e:
-                    logger.error(f"Error calculating compatibility for policy {policy.id}: {str(e)}")
-                    # Add empty result for failed calculations
-                    policy_scores.append((policy, matching_engine._empty_result()))
+            # Score every policy at once, falling back to one at a time on failure
+            try:
+                policy_scores = list(zip(
+                    policies,
+                    matching_engine.calculate_batch_compatibility(policies, user_preferences)
+                ))
+            except Exception as e:
+                logger.error(f"Error in batch compatibility for survey {survey.id}: {str(e)}")
+                policy_scores = self._calculate_compatibility_individually(
+                    matching_engine, policies, user_preferences
+                )
             
             # Sort by overall score (descending)
             policy_scores.sort(key=lambda x: x[1]['overall_score'], reverse=True)
             
-            # Generate comparison results with transaction
-            with transaction.atomic():
-                # Delete existing results if regenerating
-                if force_regenerate:
-                    FeatureComparisonResult.objects.filter(
-                        survey=survey,
-                        policy__in=policies
-                    ).delete()
-                
-                results = []
-                for rank, (policy, compatibility_result) in enumerate(policy_scores, 1):
-                    result = self._create_comparison_result(
-                        survey=survey,
-                        policy=policy,
-                        compatibility_result=compatibility_result,
-                        rank=rank
-                    )
-                    results.append(result)
-                
-                logger.info(f"Generated {len(results)} comparison results for survey {survey.id}")
-                return results
-                
+            # Write all results in one bulk upsert, replacing old ones if regenerating
+            writer = ComparisonResultWriter(
+                FeatureComparisonResult,
+                unique_fields=['survey', 'policy'],
+                validator=validate_comparison_results
+            )
+            for rank, (policy, compatibility_result) in enumerate(policy_scores, 1):
+                writer.add(self._build_comparison_result(
+                    survey=survey,
+                    policy=policy,
+                    compatibility_result=compatibility_result,
+                    rank=rank
+                ))
+            
+            stale = None
+            if force_regenerate:
+                stale = FeatureComparisonResult.objects.filter(
+                    survey=survey,
+                    policy__in=policies
+                )
+            results = writer.flush(stale=stale)
+            
+            logger.info(f"Generated {len(results)} comparison results for survey {survey.id}")
+            return results
+            
         except Exception as e:
             logger.error(f"Error generating comparison results for survey {survey.id}: {str(e)}")
             raise
     
+    def _calculate_compatibility_individually(
+        self,
+        matching_engine: FeatureMatchingEngine,
+        policies: List[BasePolicy],
+        user_preferences: Dict
+    ) -> List[Tuple[BasePolicy, Dict]]:
+        """Calculate compatibility policy by policy, isolating failures."""
+        policy_scores = []
+        for policy in policies:
+            try:
+                compatibility_result = matching_engine.calculate_policy_compatibility(
+                    policy, user_preferences
+                )
+                policy_scores.append((policy, compatibility_result))
+            except Exception as e:
+                logger.error(f"Error calculating compatibility for policy {policy.id}: {str(e)}")
+                # Add empty result for failed calculations
+                policy_scores.append((policy, matching_engine._empty_result()))
+        return policy_scores
+    
     def _create_comparison_result(
         self,
         survey: SimpleSurvey,
@@ -118,13 +142,25 @@ class FeatureComparisonManager:
         rank: int
     ) -> FeatureComparisonResult:
         """Create a FeatureComparisonResult instance from compatibility calculation."""
+        result = self._build_comparison_result(survey, policy, compatibility_result, rank)
+        result.save()
+        return result
+    
+    def _build_comparison_result(
+        self,
+        survey: SimpleSurvey,
+        policy: BasePolicy,
+        compatibility_result: Dict,
+        rank: int
+    ) -> FeatureComparisonResult:
+        """Build an unsaved FeatureComparisonResult from compatibility calculation."""
         
         # Calculate match and mismatch counts
         matches = compatibility_result.get('matches', [])
         mismatches = compatibility_result.get('mismatches', [])
         
-        # Create the result instance
-        result = FeatureComparisonResult.objects.create(
+        # Build the result instance
+        result = FeatureComparisonResult(
             survey=survey,
             policy=policy,
             overall_compatibility_score=Decimal(str(compatibility_result['overall_score'] * 100)),
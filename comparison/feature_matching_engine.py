@@ -6,10 +6,23 @@ based on standardized health and funeral insurance features.
 
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from django.db.models import prefetch_related_objects
+from .lazy_results import LazyResult
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Score thresholds for listing a feature as a match or a mismatch
+MATCH_THRESHOLD = 0.8
+MISMATCH_THRESHOLD = 0.5
+
+# Numeric features where the policy should meet or exceed the preference
+COVERAGE_FEATURES = ['annual_limit_per_member', 'annual_limit_per_family', 'cover_amount']
+
+# Numeric features where the policy's requirement should not exceed the user's value
+INCOME_FEATURES = ['monthly_household_income', 'monthly_net_income']
+
 
 class FeatureMatchingEngine:
     """
@@ -70,22 +83,7 @@ class FeatureMatchingEngine:
                 feature_scores[feature_name] = score
                 
                 # Categorize as match or mismatch
-                if score >= 0.8:  # High match threshold
-                    matches.append({
-                        'feature': self._get_feature_display_name(feature_name),
-                        'user_preference': self._format_preference_value(feature_name, user_pref),
-                        'policy_value': self._format_policy_value(feature_name, policy_value),
-                        'score': score,
-                        'match_type': 'excellent' if score >= 0.95 else 'good'
-                    })
-                elif score < 0.5:  # Low match threshold
-                    mismatches.append({
-                        'feature': self._get_feature_display_name(feature_name),
-                        'user_preference': self._format_preference_value(feature_name, user_pref),
-                        'policy_value': self._format_policy_value(feature_name, policy_value),
-                        'score': score,
-                        'mismatch_severity': 'major' if score < 0.2 else 'moderate'
-                    })
+                self._categorize_feature(feature_name, policy_value, user_pref, score, matches, mismatches)
             
             # Calculate overall score
             overall_score = self._calculate_overall_score(feature_scores)
@@ -107,6 +105,226 @@ class FeatureMatchingEngine:
             logger.error(f"Error calculating policy compatibility: {str(e)}")
             return self._empty_result(f"Error calculating compatibility: {str(e)}")
     
+    def _categorize_feature(
+        self,
+        feature_name: str,
+        policy_value: Any,
+        user_pref: Any,
+        score: float,
+        matches: List[Dict],
+        mismatches: List[Dict]
+    ) -> None:
+        """
+        Append a feature to matches or mismatches based on its score.
+        Features scoring between the thresholds are neither.
+        """
+        if score >= MATCH_THRESHOLD:
+            matches.append({
+                'feature': self._get_feature_display_name(feature_name),
+                'user_preference': self._format_preference_value(feature_name, user_pref),
+                'policy_value': self._format_policy_value(feature_name, policy_value),
+                'score': score,
+                'match_type': 'excellent' if score >= 0.95 else 'good'
+            })
+        elif score < MISMATCH_THRESHOLD:
+            mismatches.append({
+                'feature': self._get_feature_display_name(feature_name),
+                'user_preference': self._format_preference_value(feature_name, user_pref),
+                'policy_value': self._format_policy_value(feature_name, policy_value),
+                'score': score,
+                'mismatch_severity': 'major' if score < 0.2 else 'moderate'
+            })
+    
+    def calculate_batch_compatibility(self, policies, user_preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Calculate compatibility for many policies against one set of preferences.
+        
+        Feature scores and overall scores are computed a feature column at a
+        time with NumPy. Matches, mismatches and the explanation are only built
+        when a result's fields are read.
+        
+        Args:
+            policies: BasePolicy instances to score
+            user_preferences: Dictionary of user preferences from survey
+            
+        Returns:
+            List of results in the same order and structure as
+            calculate_policy_compatibility
+        """
+        policies = list(policies)
+        prefetch_related_objects(policies, 'policy_features')
+        
+        # Rows whose features match the survey's insurance type
+        rows = []
+        row_features = []
+        for row, policy in enumerate(policies):
+            policy_features = policy.get_policy_features()
+            if policy_features and policy_features.insurance_type == self.insurance_type:
+                rows.append(row)
+                row_features.append(policy_features)
+        
+        feature_names = [
+            feature_name for feature_name in self._get_relevant_features()
+            if user_preferences.get(feature_name) is not None
+        ]
+        feature_weights = self._get_feature_weights()
+        
+        # Score matrix: one row per policy, one column per feature, NaN when not compared
+        values = [
+            [getattr(policy_features, feature_name, None) for policy_features in row_features]
+            for feature_name in feature_names
+        ]
+        scores = np.full((len(rows), len(feature_names)), np.nan)
+        weighted_sum = np.zeros(len(rows))
+        total_weight = np.zeros(len(rows))
+        
+        # Accumulate feature by feature to match the per-policy summation order
+        for col, feature_name in enumerate(feature_names):
+            scores[:, col] = self._score_feature_column(
+                feature_name, values[col], user_preferences[feature_name]
+            )
+            compared = ~np.isnan(scores[:, col])
+            weight = feature_weights.get(feature_name, 1.0)
+            weighted_sum += np.where(compared, scores[:, col] * weight, 0.0)
+            total_weight += np.where(compared, weight, 0.0)
+        
+        results = [None] * len(policies)
+        for index, row in enumerate(rows):
+            feature_scores = {
+                feature_name: float(scores[index, col])
+                for col, feature_name in enumerate(feature_names)
+                if not np.isnan(scores[index, col])
+            }
+            if feature_scores and total_weight[index] != 0:
+                overall_score = round(float(weighted_sum[index] / total_weight[index]), 3)
+            else:
+                overall_score = 0.0
+            
+            policy_values = {
+                feature_name: values[col][index] for col, feature_name in enumerate(feature_names)
+            }
+            results[row] = self._lazy_result(overall_score, feature_scores, policy_values, user_preferences)
+        
+        return [
+            result if result is not None else self._empty_result("Policy type does not match survey type")
+            for result in results
+        ]
+    
+    def _score_feature_column(self, feature_name: str, policy_values: List[Any], user_pref: Any) -> np.ndarray:
+        """
+        Score one feature for every policy, following _calculate_feature_score.
+        
+        Returns:
+            Array of scores from 0.0 to 1.0, NaN where the policy has no value
+        """
+        scores = np.full(len(policy_values), np.nan)
+        
+        user_is_bool = isinstance(user_pref, bool)
+        user_is_numeric = isinstance(user_pref, (int, float, Decimal))
+        user_is_str = isinstance(user_pref, str)
+        
+        bool_rows, numeric_rows, string_rows = [], [], []
+        for row, value in enumerate(policy_values):
+            if value is None:
+                continue
+            if isinstance(value, bool) and user_is_bool:
+                bool_rows.append(row)
+            elif isinstance(value, (int, float, Decimal)) and user_is_numeric:
+                numeric_rows.append(row)
+            elif isinstance(value, str) and user_is_str:
+                string_rows.append(row)
+            else:
+                scores[row] = 0.5  # Unhandled type combination
+        
+        if bool_rows:
+            matched = np.array([policy_values[row] == user_pref for row in bool_rows])
+            scores[bool_rows] = np.where(matched, 1.0, 0.0)
+        
+        if numeric_rows:
+            numeric_values = np.array([float(policy_values[row]) for row in numeric_rows])
+            scores[numeric_rows] = self._score_numeric_column(feature_name, numeric_values, float(user_pref))
+        
+        if string_rows:
+            # Few distinct strings in a catalog, so score each one once
+            string_scores = {}
+            for row in string_rows:
+                value = policy_values[row]
+                if value not in string_scores:
+                    string_scores[value] = self._calculate_feature_score(feature_name, value, user_pref)
+                scores[row] = string_scores[value]
+        
+        return scores
+    
+    def _score_numeric_column(self, feature_name: str, policy_vals: np.ndarray, user_pref: float) -> np.ndarray:
+        """
+        Vectorized _score_numeric_feature for one user preference.
+        
+        Returns:
+            Array of scores from 0.0 to 1.0
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Coverage amounts and limits - higher is generally better
+            if feature_name in COVERAGE_FEATURES:
+                if user_pref > 0:
+                    ratio = policy_vals / user_pref
+                else:
+                    ratio = np.zeros_like(policy_vals)
+                return np.where(policy_vals >= user_pref, 1.0, np.clip(ratio, 0.0, 1.0))
+            
+            # Income requirements - policy should not exceed user's income
+            if feature_name in INCOME_FEATURES:
+                ratio = np.where(policy_vals > 0, user_pref / policy_vals, 0.0)
+                return np.where(policy_vals <= user_pref, 1.0, np.clip(ratio, 0.0, 1.0))
+            
+            # Default numeric comparison - closer is better
+            if user_pref == 0:
+                return np.where(policy_vals == 0, 1.0, 0.0)
+            
+            difference = np.abs(policy_vals - user_pref)
+            max_acceptable_diff = user_pref * 0.2  # 20% tolerance
+            
+            return np.where(
+                difference <= max_acceptable_diff,
+                1.0 - (difference / max_acceptable_diff) * 0.2,
+                np.maximum(0.0, 0.8 - (difference / user_pref))
+            )
+    
+    def _lazy_result(
+        self,
+        overall_score: float,
+        feature_scores: Dict[str, float],
+        policy_values: Dict[str, Any],
+        user_preferences: Dict[str, Any]
+    ) -> LazyResult:
+        """Build a compatibility result whose matches and explanation are built on access."""
+        result = LazyResult({
+            'overall_score': overall_score,
+            'feature_scores': feature_scores,
+            'insurance_type': self.insurance_type,
+            'total_features_compared': len(feature_scores)
+        })
+        
+        categorized = {}
+        
+        def categorize():
+            if not categorized:
+                matches, mismatches = [], []
+                for feature_name, score in feature_scores.items():
+                    self._categorize_feature(
+                        feature_name, policy_values[feature_name],
+                        user_preferences[feature_name], score, matches, mismatches
+                    )
+                categorized.update(matches=matches, mismatches=mismatches)
+            return categorized
+        
+        result.set_lazy('matches', lambda: categorize()['matches'])
+        result.set_lazy('mismatches', lambda: categorize()['mismatches'])
+        result.set_lazy('explanation', lambda: self._generate_explanation(
+            result['matches'], result['mismatches'], overall_score
+        ))
+        
+        return result
+    
     def _get_relevant_features(self) -> List[str]:
         """
         Get list of relevant features based on insurance type.
@@ -186,7 +404,7 @@ class FeatureMatchingEngine:
         user_pref = float(user_preference)
         
         # Coverage amounts and limits - higher is generally better
-        if feature_name in ['annual_limit_per_member', 'annual_limit_per_family', 'cover_amount']:
+        if feature_name in COVERAGE_FEATURES:
             if policy_val >= user_pref:
                 # Policy meets or exceeds preference - excellent
                 return 1.0
@@ -196,7 +414,7 @@ class FeatureMatchingEngine:
                 return max(0.0, min(1.0, ratio))
         
         # Income requirements - policy should not exceed user's income
-        elif feature_name in ['monthly_household_income', 'monthly_net_income']:
+        elif feature_name in INCOME_FEATURES:
             if policy_val <= user_pref:
                 # User meets income requirement - excellent
                 return 1.0
@@ -0,0 +1,121 @@
+"""
+Lazily computed comparison result fields.
+Lets the engine hand back results whose narrative text is only generated when read.
+"""
+
+from typing import Any, Callable, Dict
+
+
+class LazyResult(dict):
+    """
+    A dict whose selected values are computed on first access and memoized.
+
+    Behaves like a plain dict for every reader (item access, get, iteration,
+    templates, JSON encoding), so callers don't need to know which fields were
+    deferred. Pickling or copying resolves every deferred field first.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy: Dict[Any, Callable[[], Any]] = {}
+
+    def set_lazy(self, key: Any, factory: Callable[[], Any]) -> None:
+        """Defer a value until it is first read."""
+        super().pop(key, None)
+        self._lazy[key] = factory
+
+    def is_resolved(self, key: Any) -> bool:
+        """Whether the key holds a computed value rather than a pending one."""
+        return key not in self._lazy and super().__contains__(key)
+
+    def resolved(self) -> Dict[Any, Any]:
+        """Plain dict of the values computed so far, without pending fields."""
+        return {key: value for key, value in super().items()}
+
+    def resolve_all(self) -> 'LazyResult':
+        """Compute every pending value."""
+        for key in list(self._lazy):
+            self._resolve(key)
+        return self
+
+    def _resolve(self, key: Any) -> Any:
+        factory = self._lazy.pop(key)
+        value = factory()
+        super().__setitem__(key, value)
+        return value
+
+    def __getitem__(self, key):
+        if key in self._lazy:
+            return self._resolve(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __contains__(self, key):
+        return key in self._lazy or super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        self._lazy.pop(key, None)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if key in self._lazy:
+            del self._lazy[key]
+        else:
+            super().__delitem__(key)
+
+    def pop(self, key, *default):
+        if key in self._lazy:
+            return self._resolve_and_pop(key)
+        return super().pop(key, *default)
+
+    def _resolve_and_pop(self, key):
+        self._resolve(key)
+        return super().pop(key)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __iter__(self):
+        yield from super().__iter__()
+        yield from list(self._lazy)
+
+    def __len__(self):
+        return super().__len__() + len(self._lazy)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        pending = ', '.join(repr(key) for key in self._lazy)
+        return f"LazyResult({super().__repr__()}, pending=[{pending}])"
+
+    def __reduce__(self):
+        self.resolve_all()
+        return (self.__class__, (self.resolved(),))
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-16 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comparison", "0004_alter_comparisoncriteria_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comparisoncriteria",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from decimal import Decimal
 from django.db import models
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Cast, Least
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from policies.models import BasePolicy, PolicyCategory
 from simple_surveys.models import SimpleSurvey
@@ -159,6 +163,50 @@ class ComparisonSession(models.Model):
         
         self.save(update_fields=['survey_responses_count', 'survey_completion_percentage', 'survey_completed', 'updated_at'])
     
+    def record_survey_response(self, total_questions=None):
+        """
+        Count one newly answered question towards survey progress.
+        
+        The stored counter is bumped in the database with an F() expression,
+        so concurrent answers are not lost and no recount is needed. Completion
+        is derived from the bumped counter in the same UPDATE.
+        
+        Args:
+            total_questions (int, optional): Questions in the survey; completion
+                percentage is left unchanged when not given
+        """
+        answered = F('survey_responses_count') + 1
+        updates = {
+            'survey_responses_count': answered,
+            'updated_at': timezone.now()
+        }
+        
+        self.survey_responses_count += 1
+        
+        if total_questions is not None:
+            if total_questions > 0:
+                updates['survey_completion_percentage'] = Cast(
+                    Least(answered * Value(100.0) / Value(float(total_questions)), Value(100.0)),
+                    output_field=models.DecimalField(max_digits=5, decimal_places=2)
+                )
+                updates['survey_completed'] = Case(
+                    When(survey_responses_count__gte=total_questions - 1, then=Value(True)),
+                    default=F('survey_completed')
+                )
+                percentage = min(100.0, self.survey_responses_count * 100.0 / total_questions)
+            else:
+                # No questions = 100% complete
+                updates['survey_completion_percentage'] = Value(Decimal('100.00'))
+                updates['survey_completed'] = Value(True)
+                percentage = 100.0
+            
+            self.survey_completion_percentage = Decimal(str(round(percentage, 2)))
+            if self.survey_completion_percentage >= 100:
+                self.survey_completed = True
+        
+        ComparisonSession.objects.filter(pk=self.pk).update(**updates)
+        self.updated_at = updates['updated_at']
+    
     def mark_survey_completed(self, user_profile_data=None):
         """
         Mark the survey as completed and optionally update user profile.
@@ -318,6 +366,7 @@ class ComparisonCriteria(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['category', 'display_order', 'name']
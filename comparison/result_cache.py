@@ -0,0 +1,148 @@
+"""
+Memoized comparison results.
+Caches scored and ranked comparisons keyed by category, policy set, criteria and
+the versions of the participating policies, their organizations and the
+category's comparison criteria.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+import logging
+
+from policies.models import BasePolicy
+
+from surveys.cache_codec import encoded_cache
+from surveys.caching import cache_is_shared
+
+logger = logging.getLogger(__name__)
+
+
+class ComparisonResultCache:
+    """
+    Cache for PolicyComparisonEngine output.
+
+    Every policy has a version stamp in the cache that policies.signals bumps
+    whenever the policy, its features or its reviews change. The stamps are part
+    of the result key, so a change to any participating policy makes the old
+    entries unreachable without having to find and delete them. The key also
+    carries the scoring plan version and the organizations' updated_at, so
+    criteria weight and organization edits take effect immediately.
+
+    Entries hold policy IDs and scores only; the engine re-attaches policy
+    instances from the catalog snapshot on a hit.
+
+    Version stamps only reach other workers through a shared cache, so the
+    result cache is off when the default cache is process-local.
+    """
+
+    KEY_PREFIX = 'comparison_result'
+    VERSION_PREFIX = 'comparison_policy_version'
+
+    DEFAULT_TIMEOUT = 60 * 15  # 15 minutes
+    VERSION_TIMEOUT = 3600 * 24 * 7  # 7 days, outlives any result entry
+
+    def __init__(self, timeout: Optional[int] = None):
+        self.enabled = getattr(settings, 'COMPARISON_RESULT_CACHE_ENABLED', True) and cache_is_shared()
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'COMPARISON_RESULT_CACHE_TIMEOUT', self.DEFAULT_TIMEOUT
+        )
+
+    @classmethod
+    def _version_key(cls, policy_id: int) -> str:
+        return f"{cls.VERSION_PREFIX}:{policy_id}"
+
+    @staticmethod
+    def _new_version() -> str:
+        return format(time.time_ns(), 'x')
+
+    def _policy_versions(self, policy_ids: List[int]) -> List[str]:
+        """
+        Get version stamps for the policies, in one cache round trip.
+        Missing stamps are created fresh so evicted ones never revive old entries.
+        """
+        keys = [self._version_key(policy_id) for policy_id in policy_ids]
+        versions = cache.get_many(keys)
+
+        missing = {key: self._new_version() for key in keys if key not in versions}
+        if missing:
+            cache.set_many(missing, timeout=self.VERSION_TIMEOUT)
+            versions.update(missing)
+
+        return [versions[key] for key in keys]
+
+    @staticmethod
+    def _organization_versions(policy_ids: List[int]) -> List[Any]:
+        """Latest organization edit behind each of the policies, in one query."""
+        return list(
+            BasePolicy.objects.filter(id__in=policy_ids).values('organization_id').annotate(
+                updated_at=Max('organization__updated_at')
+            ).order_by('organization_id').values_list('organization_id', 'updated_at')
+        )
+
+    def make_key(
+        self,
+        category_slug: str,
+        policy_ids: Iterable[int],
+        user_criteria: Dict[str, Any],
+        survey_context: Optional[Dict[str, Any]] = None,
+        criteria_version: Any = None
+    ) -> str:
+        """
+        Build the cache key for a comparison request.
+
+        Args:
+            criteria_version: Version of the category's scoring plan
+        """
+        sorted_ids = sorted({int(policy_id) for policy_id in policy_ids})
+
+        payload = json.dumps({
+            'policies': sorted_ids,
+            'versions': self._policy_versions(sorted_ids),
+            'organizations': self._organization_versions(sorted_ids),
+            'criteria_version': criteria_version,
+            'criteria': user_criteria,
+            'survey_context': survey_context or {},
+        }, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+
+        return f"{self.KEY_PREFIX}:{category_slug}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached comparison, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        try:
+            return encoded_cache.get(key, prefix=self.KEY_PREFIX)
+        except Exception as e:
+            logger.warning(f"Error reading comparison result cache: {str(e)}")
+            return None
+
+    def set(self, key: str, data: Dict[str, Any]) -> None:
+        """Store a comparison for the configured timeout."""
+        if not self.enabled:
+            return
+
+        try:
+            encoded_cache.set(key, data, self.timeout, prefix=self.KEY_PREFIX)
+        except Exception as e:
+            logger.warning(f"Error writing comparison result cache: {str(e)}")
+
+    @classmethod
+    def invalidate_policies(cls, policy_ids: Iterable[int]) -> None:
+        """Bump the version stamps of the given policies."""
+        version = cls._new_version()
+        cache.set_many(
+            {cls._version_key(policy_id): version for policy_id in policy_ids},
+            timeout=cls.VERSION_TIMEOUT
+        )
+
+    @classmethod
+    def invalidate_policy(cls, policy_id: int) -> None:
+        """Bump the version stamp of a single policy."""
+        cls.invalidate_policies([policy_id])
@@ -0,0 +1,92 @@
+"""
+Bulk persistence for comparison results.
+Buffers result rows and writes them in one round trip per comparison.
+"""
+
+from typing import Any, Callable, List, Optional, Sequence
+from django.db import transaction
+from django.db.models import Model, QuerySet
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ComparisonResultWriter:
+    """
+    Collects unsaved result instances and flushes them with a single bulk_create.
+
+    When unique_fields is given the insert is an upsert, so rows that already
+    exist for the same key are updated in place instead of raising an
+    IntegrityError. bulk_create does not send post_save, so an optional
+    validator callable receives the flushed rows as one batch instead.
+    """
+
+    def __init__(
+        self,
+        model: type,
+        unique_fields: Optional[Sequence[str]] = None,
+        validator: Optional[Callable[[List[Model]], Any]] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.model = model
+        self.unique_fields = list(unique_fields or [])
+        self.validator = validator
+        self.batch_size = batch_size
+        self._pending: List[Model] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, instance: Model) -> Model:
+        """Buffer an unsaved result instance for the next flush."""
+        self._pending.append(instance)
+        return instance
+
+    def extend(self, instances) -> None:
+        """Buffer several unsaved result instances."""
+        self._pending.extend(instances)
+
+    def _update_fields(self) -> List[str]:
+        """Fields rewritten on conflict: everything except the key and creation time."""
+        excluded = set(self.unique_fields)
+        return [
+            field.name for field in self.model._meta.concrete_fields
+            if not field.primary_key
+            and field.name not in excluded
+            and not getattr(field, 'auto_now_add', False)
+        ]
+
+    def flush(self, stale: Optional[QuerySet] = None) -> List[Model]:
+        """
+        Write all buffered rows and return them with primary keys set.
+
+        Args:
+            stale: Optional queryset of previous results deleted in the same
+                transaction before the new rows are written
+        """
+        pending, self._pending = self._pending, []
+
+        with transaction.atomic():
+            if stale is not None:
+                stale.delete()
+
+            if not pending:
+                saved = []
+            elif self.unique_fields:
+                saved = self.model.objects.bulk_create(
+                    pending,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=self.unique_fields,
+                    update_fields=self._update_fields()
+                )
+            else:
+                saved = self.model.objects.bulk_create(pending, batch_size=self.batch_size)
+
+        if saved and self.validator is not None:
+            try:
+                self.validator(saved)
+            except Exception as e:
+                logger.error(f"Error validating flushed {self.model.__name__} rows: {str(e)}")
+
+        return saved
@@ -0,0 +1,358 @@
+"""
+Compiled scoring plans for comparison criteria.
+Turns a category's ComparisonCriteria rows into precompiled evaluators so that
+per-policy scoring is a loop over callables instead of repeated dispatch.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.db.models import Count, Max
+from .models import ComparisonCriteria
+import logging
+
+logger = logging.getLogger(__name__)
+
+HUNDRED = Decimal('100')
+NEUTRAL = Decimal('50')
+ZERO = Decimal('0')
+
+# Fields scored by dedicated engine methods rather than by comparison type
+ENGINE_EVALUATED_FIELDS = {
+    'in_hospital_benefit_level': '_evaluate_benefit_level_criterion',
+    'out_hospital_benefit_level': '_evaluate_benefit_level_criterion',
+    'annual_limit_family_range': '_evaluate_annual_limit_range_criterion',
+    'annual_limit_member_range': '_evaluate_annual_limit_range_criterion',
+}
+
+# Fields no longer used for comparison, always scored neutral
+NEUTRAL_FIELDS = {'currently_on_medical_aid'}
+
+
+def _progressive_penalty(pct: Decimal) -> Decimal:
+    """First 20% off target costs 1 point per %, then the penalty steepens."""
+    if pct <= 20:
+        return pct
+    elif pct <= 50:
+        return 20 + (pct - 20) * Decimal('1.5')
+    return 65 + (pct - 50) * Decimal('2')
+
+
+def lower_better_score(policy_value: Decimal, user_target: Decimal) -> Decimal:
+    """Score a value where lower is better (e.g., premium, waiting period)."""
+    if policy_value <= user_target:
+        # Better than target - award bonus
+        if policy_value == 0 and user_target > 0:
+            return HUNDRED  # Free is best!
+
+        savings_pct = ((user_target - policy_value) / user_target * 100) if user_target != 0 else ZERO
+        # Cap bonus at 10 points
+        bonus = min(savings_pct / 10, Decimal('10'))
+        return min(HUNDRED + bonus, HUNDRED)
+
+    # Worse than target - apply penalty
+    excess_pct = ((policy_value - user_target) / user_target * 100)
+    return max(HUNDRED - _progressive_penalty(excess_pct), ZERO)
+
+
+def higher_better_score(policy_value: Decimal, user_target: Decimal) -> Decimal:
+    """Score a value where higher is better (e.g., coverage amount, benefits)."""
+    if policy_value >= user_target:
+        # Meets or exceeds target
+        excess_pct = ((policy_value - user_target) / user_target * 100) if user_target != 0 else ZERO
+        # Award bonus for exceeding (capped at 10 points)
+        bonus = min(excess_pct / 20, Decimal('10'))
+        return min(HUNDRED + bonus, HUNDRED)
+
+    # Below target - apply penalty
+    shortfall_pct = ((user_target - policy_value) / user_target * 100)
+    return max(HUNDRED - _progressive_penalty(shortfall_pct), ZERO)
+
+
+def range_score(policy_value: Decimal, min_val: Optional[Decimal], max_val: Optional[Decimal]) -> Decimal:
+    """Full score within range, graduated penalty outside it."""
+    within_min = min_val is None or policy_value >= min_val
+    within_max = max_val is None or policy_value <= max_val
+
+    if within_min and within_max:
+        return HUNDRED
+
+    # Outside range - calculate how far out
+    if not within_min:
+        gap = min_val - policy_value
+    else:  # not within_max
+        gap = policy_value - max_val
+
+    penalty = min(gap * 10, HUNDRED)
+    return max(HUNDRED - penalty, ZERO)
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    """Convert a value to Decimal, or None if it can't be converted."""
+    try:
+        return Decimal(str(value))
+    except Exception:
+        return None
+
+
+def _constant(score: Decimal) -> Callable[[Any], Decimal]:
+    return lambda policy_value: score
+
+
+def _make_numeric_scorer(score_fn: Callable[[Decimal, Decimal], Decimal], user_value: Any):
+    if user_value is None:
+        return _constant(NEUTRAL)
+
+    user_target = _to_decimal(user_value)
+    if user_target is None:
+        return _constant(ZERO)
+
+    def score(policy_value):
+        policy_decimal = _to_decimal(policy_value)
+        if policy_decimal is None:
+            return ZERO
+        return score_fn(policy_decimal, user_target)
+
+    return score
+
+
+def _make_range_scorer(user_range: Any):
+    if not user_range or not isinstance(user_range, dict):
+        return _constant(NEUTRAL)
+
+    min_raw = user_range.get('min')
+    max_raw = user_range.get('max')
+    if min_raw is None and max_raw is None:
+        return _constant(NEUTRAL)
+
+    # Unparseable bounds raise at evaluation time, skipping the criterion
+    min_val = _to_decimal(min_raw) if min_raw is not None else None
+    max_val = _to_decimal(max_raw) if max_raw is not None else None
+    bounds_valid = (min_raw is None or min_val is not None) and (max_raw is None or max_val is not None)
+
+    def score(policy_value):
+        policy_decimal = _to_decimal(policy_value)
+        if policy_decimal is None:
+            return ZERO
+        if not bounds_valid:
+            raise ValueError(f"Invalid range bounds: {user_range}")
+        return range_score(policy_decimal, min_val, max_val)
+
+    return score
+
+
+def _make_exact_match_scorer(user_value: Any):
+    return lambda policy_value: HUNDRED if policy_value == user_value else ZERO
+
+
+def _make_boolean_scorer(user_value: Any):
+    if user_value is None:
+        return _constant(NEUTRAL)  # Neutral if user doesn't care
+
+    wanted = bool(user_value)
+    return lambda policy_value: HUNDRED if bool(policy_value) == wanted else ZERO
+
+
+def _make_smart_scorer(user_value: Any):
+    """Heuristic scoring for fields without a criteria definition."""
+    if user_value is None:
+        return _constant(NEUTRAL)
+
+    user_decimal = _to_decimal(user_value)
+    user_text = str(user_value).lower()
+
+    def score(policy_value):
+        # Boolean comparison
+        if isinstance(policy_value, bool):
+            return HUNDRED if policy_value == user_value else ZERO
+
+        # Numeric comparison - simple proximity scoring
+        if isinstance(policy_value, (int, float, Decimal)):
+            if user_decimal is None:
+                raise ValueError(f"Cannot compare {policy_value} with {user_value!r}")
+            policy_decimal = Decimal(str(policy_value))
+            if policy_decimal == user_decimal:
+                return HUNDRED
+
+            diff_pct = abs((policy_decimal - user_decimal) / user_decimal * 100) if user_decimal != 0 else HUNDRED
+            return max(HUNDRED - diff_pct, ZERO)
+
+        # String comparison - exact match
+        if str(policy_value).lower() == user_text:
+            return HUNDRED
+
+        return NEUTRAL
+
+    return score
+
+
+SCORER_FACTORIES = {
+    'LOWER_BETTER': lambda user_value: _make_numeric_scorer(lower_better_score, user_value),
+    'HIGHER_BETTER': lambda user_value: _make_numeric_scorer(higher_better_score, user_value),
+    'EXACT_MATCH': _make_exact_match_scorer,
+    'RANGE': _make_range_scorer,
+    'BOOLEAN': _make_boolean_scorer,
+}
+
+
+def _make_value_getter(field_name: str) -> Callable[[Any], Any]:
+    """Build an accessor for a criterion's value on a policy."""
+    if '.' in field_name:
+        # Nested value (e.g., organization.is_verified)
+        parts = field_name.split('.')
+
+        def get_nested(policy):
+            obj = policy
+            for part in parts:
+                obj = getattr(obj, part, None)
+                if obj is None:
+                    break
+            return obj
+
+        return get_nested
+
+    def get_value(policy):
+        value = getattr(policy, field_name, None)
+        if value is None:
+            # Fall back to the policy's standardized features
+            try:
+                value = getattr(policy.policy_features, field_name, None)
+            except Exception:
+                pass
+        return value
+
+    return get_value
+
+
+class CompiledCriterion:
+    """A criterion's value accessor and scorer factory, compiled once per field and type."""
+
+    __slots__ = ('field_name', 'comparison_type', '_get_value', '_scorer_factory')
+
+    def __init__(self, field_name: str, comparison_type: Optional[str]):
+        self.field_name = field_name
+        self.comparison_type = comparison_type
+        self._get_value = _make_value_getter(field_name)
+        if comparison_type is None:
+            self._scorer_factory = _make_smart_scorer
+        else:
+            self._scorer_factory = SCORER_FACTORIES.get(
+                comparison_type, lambda user_value: _constant(NEUTRAL)
+            )
+
+    def bind(self, engine, user_value: Any) -> Callable[[Any], Decimal]:
+        """Bind the criterion to a user value, returning policy -> score (0-100)."""
+        if self.field_name in NEUTRAL_FIELDS:
+            return _constant(NEUTRAL)
+
+        engine_method = ENGINE_EVALUATED_FIELDS.get(self.field_name)
+        if engine_method:
+            method = getattr(engine, engine_method)
+            field_name = self.field_name
+            return lambda policy: method(policy, field_name, user_value)
+
+        get_value = self._get_value
+        score = self._scorer_factory(user_value)
+
+        def evaluate(policy):
+            policy_value = get_value(policy)
+            if policy_value is None:
+                return ZERO  # No data = no score
+            return score(policy_value)
+
+        return evaluate
+
+
+@lru_cache(maxsize=None)
+def compile_criterion(field_name: str, comparison_type: Optional[str]) -> CompiledCriterion:
+    """Get the compiled criterion for a field and comparison type."""
+    return CompiledCriterion(field_name, comparison_type)
+
+
+def bind_criteria(
+    engine,
+    weights: Dict[str, Decimal],
+    criteria: Dict[str, ComparisonCriteria],
+    user_criteria: Dict[str, Any]
+) -> List[Tuple[str, Decimal, Callable[[Any], Decimal]]]:
+    """
+    Bind weighted criteria to the user's values for one comparison.
+
+    Returns:
+        List of (field_name, weight, evaluate) with zero weights left out
+    """
+    evaluators = []
+    for field_name, weight in weights.items():
+        if weight == 0:
+            continue
+
+        definition = criteria.get(field_name)
+        compiled = compile_criterion(
+            field_name, definition.comparison_type if definition else None
+        )
+        evaluators.append((field_name, weight, compiled.bind(engine, user_criteria.get(field_name))))
+
+    return evaluators
+
+
+class ScoringPlan:
+    """
+    Immutable snapshot of a category's active criteria with parsed default weights.
+    """
+
+    __slots__ = ('category_slug', 'version', 'criteria')
+
+    def __init__(self, category_slug: str, version: Tuple, criteria_rows: List[ComparisonCriteria]):
+        self.category_slug = category_slug
+        self.version = version
+        self.criteria = tuple(
+            (criteria.field_name, Decimal(str(criteria.weight)), criteria)
+            for criteria in criteria_rows
+        )
+        # Warm the compiled criterion cache
+        for criteria in criteria_rows:
+            compile_criterion(criteria.field_name, criteria.comparison_type)
+
+
+_plans: Dict[str, ScoringPlan] = {}
+_plans_lock = Lock()
+
+
+def _criteria_version(category_slug: str) -> Tuple:
+    """Version of a category's criteria: row count and latest edit."""
+    stats = ComparisonCriteria.objects.filter(category__slug=category_slug).aggregate(
+        count=Count('id'), last_updated=Max('updated_at')
+    )
+    return (stats['count'], stats['last_updated'])
+
+
+def get_scoring_plan(category_slug: str) -> ScoringPlan:
+    """
+    Get the scoring plan for a category.
+    Plans are cached per process and rebuilt only when the category's criteria change.
+    """
+    version = _criteria_version(category_slug)
+
+    plan = _plans.get(category_slug)
+    if plan is not None and plan.version == version:
+        return plan
+
+    with _plans_lock:
+        plan = _plans.get(category_slug)
+        if plan is None or plan.version != version:
+            criteria_rows = list(ComparisonCriteria.objects.filter(
+                category__slug=category_slug,
+                is_active=True
+            ))
+            plan = ScoringPlan(category_slug, version, criteria_rows)
+            _plans[category_slug] = plan
+            logger.info(f"Compiled scoring plan for {category_slug} with {len(criteria_rows)} criteria")
+
+    return plan
+
+
+def clear_scoring_plans() -> None:
+    """Drop all cached scoring plans."""
+    with _plans_lock:
+        _plans.clear()
@@ -0,0 +1,187 @@
+"""
+Unit tests for batch policy scoring.
+Checks that the vectorized scorer matches the per-policy scoring path.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy, PolicyReview
+from .batch_scoring import (
+    BatchPolicyScorer, PolicyColumns,
+    score_lower_better, score_higher_better, score_range
+)
+from .engine import PolicyComparisonEngine
+from .models import ComparisonCriteria
+
+User = get_user_model()
+
+
+class VectorizedScorerFunctionTest(TestCase):
+    """Test the column scoring functions against the scalar engine methods."""
+
+    def setUp(self):
+        self.engine = PolicyComparisonEngine('health')
+        self.values = np.array([0.0, 250.0, 500.0, 600.0, 800.0, 1500.0])
+
+    def assertMatchesScalar(self, column_scores, scalar_method, user_value):
+        for value, score in zip(self.values, column_scores):
+            expected = float(scalar_method(Decimal(str(value)), user_value))
+            self.assertAlmostEqual(score, expected, places=6)
+
+    def test_lower_better_matches_scalar(self):
+        for target in (500, 1000, None):
+            scores = score_lower_better(self.values, target)
+            self.assertMatchesScalar(scores, self.engine._score_lower_better, target)
+
+    def test_higher_better_matches_scalar(self):
+        for target in (500, 1000, None):
+            scores = score_higher_better(self.values, target)
+            self.assertMatchesScalar(scores, self.engine._score_higher_better, target)
+
+    def test_range_matches_scalar(self):
+        for user_range in ({'min': 200, 'max': 700}, {'max': 600}, {}, None):
+            scores = score_range(self.values, user_range)
+            self.assertMatchesScalar(scores, self.engine._score_range, user_range)
+
+    def test_zero_target_marks_criterion_as_skipped(self):
+        scores = score_lower_better(self.values, 0)
+        self.assertEqual(scores[0], 100.0)
+        self.assertTrue(np.isnan(scores[1:]).all())
+
+
+class BatchPolicyScorerTest(TestCase):
+    """Test batch scoring of a candidate set."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="Batch Insurance Co",
+            description="Test insurance company",
+            email="batch@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-BATCH",
+            verification_status=Organization.VerificationStatus.VERIFIED
+        )
+        self.category = PolicyCategory.objects.create(name="Health", slug="health")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="Medical Aid", slug="medical-aid"
+        )
+
+        self.policies = [
+            self._create_policy(i, premium, coverage, waiting, max_age)
+            for i, (premium, coverage, waiting, max_age) in enumerate([
+                (Decimal('450.00'), Decimal('90000.00'), 0, 65),
+                (Decimal('900.00'), Decimal('250000.00'), 90, 70),
+                (Decimal('1200.00'), Decimal('500000.00'), 250, 40),
+            ])
+        ]
+
+        reviewer = User.objects.create_user(username='reviewer', password='pass')
+        PolicyReview.objects.create(
+            policy=self.policies[1], user=reviewer, rating=4,
+            title="Good", comment="Good cover", is_approved=True
+        )
+
+        ComparisonCriteria.objects.create(
+            category=self.category, name="Premium", description="Monthly premium",
+            field_name='base_premium', weight=60, comparison_type='LOWER_BETTER'
+        )
+        ComparisonCriteria.objects.create(
+            category=self.category, name="Coverage", description="Coverage amount",
+            field_name='coverage_amount', weight=40, comparison_type='HIGHER_BETTER'
+        )
+
+        self.user_criteria = {
+            'base_premium': 800,
+            'coverage_amount': 200000,
+            'waiting_period_days': 30,
+            'weights': {'waiting_period_days': 20}
+        }
+
+    def _create_policy(self, index, premium, coverage, waiting, max_age):
+        return BasePolicy.objects.create(
+            organization=self.organization,
+            category=self.category,
+            policy_type=self.policy_type,
+            name=f"Batch Policy {index}",
+            policy_number=f"BATCH-{index}",
+            description="Test policy",
+            short_description="Test policy",
+            base_premium=premium,
+            coverage_amount=coverage,
+            minimum_age=18,
+            maximum_age=max_age,
+            waiting_period_days=waiting,
+            terms_and_conditions="Terms",
+            approval_status=BasePolicy.ApprovalStatus.APPROVED,
+            is_active=True
+        )
+
+    def _loaded_engine(self):
+        engine = PolicyComparisonEngine('health')
+        engine._load_criteria(self.user_criteria)
+        return engine
+
+    def test_batch_scores_match_per_policy_scores(self):
+        """Batch scoring produces the same score_data as per-policy scoring."""
+        engine = self._loaded_engine()
+        batch_scores = BatchPolicyScorer(engine).score_policies(self.policies, self.user_criteria)
+
+        self.assertEqual(len(batch_scores), len(self.policies))
+        for policy, batch in zip(self.policies, batch_scores):
+            scalar = engine._score_policy(policy, self.user_criteria)
+
+            self.assertEqual(set(batch), set(scalar))
+            self.assertEqual(list(batch['criteria_scores']), list(scalar['criteria_scores']))
+            self.assertAlmostEqual(batch['overall_score'], scalar['overall_score'], places=2)
+            for key in ('criteria_score', 'value_score', 'review_score', 'organization_score'):
+                self.assertAlmostEqual(batch[key], scalar[key], places=6)
+            for field_name, scores in scalar['criteria_scores'].items():
+                self.assertAlmostEqual(
+                    batch['criteria_scores'][field_name]['score'], scores['score'], places=6
+                )
+
+    def test_organization_score_component(self):
+        """Organization score is verification, activity and featured status only."""
+        self.policies[2].is_featured = True
+        engine = self._loaded_engine()
+
+        expected = [Decimal('80'), Decimal('80'), Decimal('85')]
+        self.assertEqual(
+            [engine._calculate_organization_score(policy) for policy in self.policies], expected
+        )
+        batch_scores = BatchPolicyScorer(engine).score_policies(self.policies, self.user_criteria)
+        self.assertEqual([batch['organization_score'] for batch in batch_scores], [80.0, 80.0, 85.0])
+
+        self.organization.verification_status = Organization.VerificationStatus.PENDING
+        self.organization.is_active = False
+        self.assertEqual(engine._calculate_organization_score(self.policies[0]), Decimal('50'))
+
+    def test_review_scores_loaded_in_one_query(self):
+        """Review scores for the whole set come from one stats query."""
+        PolicyColumns(self.policies)  # Backfills stats rows for unreviewed policies
+
+        with self.assertNumQueries(1):
+            columns = PolicyColumns(self.policies)
+
+        # One 4-star review: 80 * 0.75 + 50 * 0.25
+        self.assertEqual(columns.review_score.tolist(), [50.0, 72.5, 50.0])
+
+    def test_compare_policies_uses_batch_scoring(self):
+        """compare_policies ranks policies through the batch path."""
+        engine = PolicyComparisonEngine('other')
+        result = engine.compare_policies(
+            [policy.id for policy in self.policies], self.user_criteria
+        )
+
+        self.assertTrue(result.get('success'), result.get('error'))
+        self.assertEqual(len(result['results']), 3)
+        self.assertEqual(result['results'][0]['rank'], 1)
@@ -0,0 +1,142 @@
+"""
+Unit tests for in-memory policy catalog snapshots.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from .batch_scoring import PolicyColumns
+from .catalog import get_catalog_snapshot, clear_catalog_snapshots
+from .engine import PolicyComparisonEngine
+
+
+class CatalogSnapshotTest(TestCase):
+    """Test building, serving and invalidating catalog snapshots."""
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_snapshots()
+        self.organization = Organization.objects.create(
+            name="Catalog Insurance Co",
+            description="Test insurance company",
+            email="catalog@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-CATALOG"
+        )
+        self.category = PolicyCategory.objects.create(name="Other", slug="other")
+        self.other_category = PolicyCategory.objects.create(name="Travel", slug="travel")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="General", slug="general"
+        )
+        self.policies = [
+            self._create_policy(i, self.category, premium)
+            for i, premium in enumerate(['400.00', '700.00', '900.00'])
+        ]
+        self.inactive = self._create_policy(3, self.category, '100.00', is_active=False)
+        self.outside = self._create_policy(4, self.other_category, '300.00')
+
+    def _create_policy(self, index, category, premium, is_active=True):
+        return BasePolicy.objects.create(
+            organization=self.organization,
+            category=category,
+            policy_type=self.policy_type,
+            name=f"Catalog Policy {index}",
+            policy_number=f"CATALOG-{index}",
+            description="Test policy",
+            short_description="Test policy",
+            base_premium=Decimal(premium),
+            coverage_amount=Decimal('100000.00'),
+            minimum_age=18,
+            maximum_age=65,
+            terms_and_conditions="Terms",
+            approval_status=BasePolicy.ApprovalStatus.APPROVED,
+            is_active=is_active
+        )
+
+    def test_snapshot_holds_active_category_policies(self):
+        """Only active, approved policies of the category are in the snapshot."""
+        snapshot = get_catalog_snapshot('other')
+
+        self.assertEqual(
+            sorted(policy.id for policy in snapshot.policies),
+            sorted(policy.id for policy in self.policies)
+        )
+        self.assertNotIn(self.inactive.id, snapshot)
+        self.assertNotIn(self.outside.id, snapshot)
+
+    def test_snapshot_served_without_queries(self):
+        """A warm snapshot is served and scored with only the generation lookup."""
+        get_catalog_snapshot('other')
+
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = get_catalog_snapshot('other')
+            policies = snapshot.get_policies([policy.id for policy in self.policies])
+            for policy in policies:
+                policy.organization.is_verified
+                policy.review_stats.review_score
+
+        self.assertEqual(len(policies), 3)
+        # The database cache backend reads the generation from its cache table
+        self.assertEqual(
+            [query['sql'] for query in queries if 'pholli_cache' not in query['sql']], []
+        )
+
+    def test_policy_change_rebuilds_snapshot(self):
+        """Saving a policy bumps the generation and the snapshot is rebuilt."""
+        snapshot = get_catalog_snapshot('other')
+
+        self.policies[0].base_premium = Decimal('450.00')
+        self.policies[0].save()
+
+        rebuilt = get_catalog_snapshot('other')
+        self.assertIsNot(rebuilt, snapshot)
+        self.assertEqual(
+            rebuilt.get_policies([self.policies[0].id])[0].base_premium, Decimal('450.00')
+        )
+
+    def test_columns_match_freshly_built_columns(self):
+        """Sliced snapshot columns equal columns built from the policies."""
+        snapshot = get_catalog_snapshot('other')
+        policies = snapshot.get_policies([self.policies[2].id, self.policies[0].id])
+
+        sliced = snapshot.columns_for(policies)
+        fresh = PolicyColumns(policies)
+
+        self.assertEqual(sliced.ids.tolist(), fresh.ids.tolist())
+        for field_name, column in fresh.numeric.items():
+            self.assertEqual(sliced.numeric[field_name].tolist(), column.tolist())
+        self.assertEqual(sliced.review_score.tolist(), fresh.review_score.tolist())
+
+    def test_engine_loads_policies_outside_snapshot(self):
+        """IDs outside the engine's category are still loaded from the database."""
+        engine = PolicyComparisonEngine('other')
+        policies = engine._get_policies([self.policies[0].id, self.outside.id])
+
+        self.assertEqual(
+            sorted(policy.id for policy in policies),
+            sorted([self.policies[0].id, self.outside.id])
+        )
+
+    def test_snapshot_off_with_process_local_cache(self):
+        """Generation bumps can't reach other workers through a local-memory cache."""
+        with self.settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }):
+            self.assertIsNone(get_catalog_snapshot('other'))
+
+    def test_snapshot_can_be_disabled(self):
+        """POLICY_CATALOG_SNAPSHOT_ENABLED turns snapshots off."""
+        with self.settings(POLICY_CATALOG_SNAPSHOT_ENABLED=False):
+            self.assertIsNone(get_catalog_snapshot('other'))
+            engine = PolicyComparisonEngine('other')
+            self.assertEqual(len(engine._get_policies([policy.id for policy in self.policies])), 3)
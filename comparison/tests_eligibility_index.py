@@ -0,0 +1,150 @@
+"""
+Unit tests for the hard-filter eligibility index.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from simple_surveys.comparison_adapter import SimpleSurveyComparisonAdapter
+from .catalog import get_catalog_snapshot, clear_catalog_snapshots
+from .eligibility_index import EligibilityIndex, split_filter_key, value_meets_filter
+from .engine import PolicyComparisonEngine
+
+
+class EligibilityIndexTest(TestCase):
+    """Test that indexed filtering matches per-policy filtering."""
+
+    def setUp(self):
+        cache.clear()
+        clear_catalog_snapshots()
+        self.organization = Organization.objects.create(
+            name="Eligible Insurance Co",
+            description="Test insurance company",
+            email="eligible@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-ELIGIBLE"
+        )
+        self.category = PolicyCategory.objects.create(name="Other", slug="other")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="General", slug="general"
+        )
+        self.policies = [
+            BasePolicy.objects.create(
+                organization=self.organization,
+                category=self.category,
+                policy_type=self.policy_type,
+                name=f"Eligible Policy {i}",
+                policy_number=f"ELIGIBLE-{i}",
+                description="Test policy",
+                short_description="Test policy",
+                base_premium=Decimal(premium),
+                coverage_amount=Decimal(coverage),
+                minimum_age=min_age,
+                maximum_age=max_age,
+                terms_and_conditions="Terms",
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True,
+                is_featured=featured
+            )
+            for i, (premium, coverage, min_age, max_age, featured) in enumerate([
+                ('900.00', '300000.00', 18, 65, True),
+                ('400.00', '50000.00', 21, 60, False),
+                ('550.50', '120000.00', 18, 75, True),
+                ('400.00', '200000.00', 30, 80, False),
+            ])
+        ]
+
+    def _expected_ids(self, policies, filters):
+        return [
+            policy.id for policy in policies
+            if all(
+                value_meets_filter(getattr(policy, split_filter_key(key)[0], None), split_filter_key(key)[1], value)
+                for key, value in filters.items()
+            )
+        ]
+
+    def test_match_agrees_with_per_policy_filters(self):
+        """Every filter shape gives the same policies as checking each one."""
+        index = EligibilityIndex(self.policies)
+        filter_sets = [
+            {},
+            {'base_premium__lte': 550.5},
+            {'base_premium__lt': Decimal('550.50'), 'coverage_amount__gte': 100000},
+            {'minimum_age__lte': 25, 'maximum_age__gte': 70},
+            {'base_premium__gt': 400, 'is_featured': True},
+            {'is_featured': False},
+            {'base_premium': Decimal('400.00')},
+            {'maximum_age__exact': 60},
+            {'name__icontains': 'policy 2'},
+            {'base_premium__lte': 100},
+        ]
+
+        for filters in filter_sets:
+            self.assertEqual(
+                index.ids[index.match(filters)].tolist(),
+                self._expected_ids(self.policies, filters),
+                filters
+            )
+
+    def test_eligible_ids_ordered_by_field(self):
+        """eligible_ids can order by a numeric field, ties in catalog order."""
+        index = EligibilityIndex(self.policies)
+        ids = index.eligible_ids({'coverage_amount__gte': 100000}, order_by='base_premium')
+
+        self.assertEqual(ids, [self.policies[3].id, self.policies[2].id, self.policies[0].id])
+
+    def test_engine_filters_with_snapshot_index(self):
+        """Survey filters give the same result with and without the snapshot."""
+        filters = {'base_premium__lte': 600, 'maximum_age__gte': 70}
+        policy_ids = [policy.id for policy in self.policies]
+
+        engine = PolicyComparisonEngine('other')
+        policies = engine._get_policies(policy_ids)
+        self.assertIsNotNone(engine.catalog_snapshot)
+        indexed = engine._apply_survey_filters(policies, filters)
+
+        with self.settings(POLICY_CATALOG_SNAPSHOT_ENABLED=False):
+            engine = PolicyComparisonEngine('other')
+            scanned = engine._apply_survey_filters(engine._get_policies(policy_ids), filters)
+
+        self.assertEqual(
+            sorted(policy.id for policy in indexed),
+            sorted(policy.id for policy in scanned)
+        )
+        self.assertEqual(sorted(policy.id for policy in indexed), [self.policies[2].id, self.policies[3].id])
+
+    def test_adapter_eligible_ids_match_database(self):
+        """The adapter's eligible IDs equal the database query's."""
+        health = PolicyCategory.objects.create(name="Health", slug="health")
+        BasePolicy.objects.filter(category=self.category).update(category=health)
+        adapter = SimpleSurveyComparisonAdapter('health')
+        criteria = {'base_premium': 500, 'age': 25, 'coverage_amount': 100000}
+
+        indexed = adapter._get_eligible_policy_ids(criteria)
+        with self.settings(POLICY_CATALOG_SNAPSHOT_ENABLED=False):
+            queried = adapter._get_eligible_policy_ids(criteria)
+
+        self.assertEqual(indexed, queried)
+        self.assertEqual(indexed, [self.policies[2].id])
+
+    def test_index_rebuilt_with_snapshot(self):
+        """Policy changes are visible through the rebuilt snapshot's index."""
+        filters = {'base_premium__lte': 450}
+        self.assertEqual(
+            len(get_catalog_snapshot('other').eligibility.eligible_ids(filters)), 2
+        )
+
+        self.policies[0].base_premium = Decimal('300.00')
+        self.policies[0].save()
+
+        self.assertEqual(
+            len(get_catalog_snapshot('other').eligibility.eligible_ids(filters)), 3
+        )
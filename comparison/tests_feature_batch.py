@@ -0,0 +1,133 @@
+"""
+Unit tests for batch feature compatibility scoring.
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy, PolicyFeatures
+from .feature_matching_engine import FeatureMatchingEngine
+from .lazy_results import LazyResult
+
+
+class BatchCompatibilityTest(TestCase):
+    """Test that batch scoring matches per-policy scoring."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="Batch Insurance Co",
+            description="Test insurance company",
+            email="batch@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-BATCH"
+        )
+        self.category = PolicyCategory.objects.create(name="Health", slug="health")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="Medical Aid", slug="medical-aid"
+        )
+
+        self.health_features = [
+            (Decimal('100000.00'), Decimal('5000.00'), True, 'comprehensive', True),
+            (Decimal('40000.00'), Decimal('12000.00'), False, 'basic', False),
+            (Decimal('0.00'), Decimal('0.00'), True, 'moderate', None),
+            (None, Decimal('7000.00'), True, None, True),
+        ]
+        self.policies = []
+        for i, (limit, income, ambulance, level, chronic) in enumerate(self.health_features):
+            policy = self._create_policy(i)
+            PolicyFeatures.objects.create(
+                policy=policy,
+                insurance_type='HEALTH',
+                annual_limit_per_member=limit,
+                monthly_household_income=income,
+                ambulance_coverage=ambulance,
+                in_hospital_benefit_level=level,
+                chronic_medication_availability=chronic
+            )
+            self.policies.append(policy)
+
+        # A funeral policy and a policy without features are not compatible
+        self.funeral_policy = self._create_policy(10)
+        PolicyFeatures.objects.create(
+            policy=self.funeral_policy,
+            insurance_type='FUNERAL',
+            cover_amount=Decimal('25000.00')
+        )
+        self.bare_policy = self._create_policy(11)
+
+        self.user_preferences = {
+            'annual_limit_per_member': Decimal('80000.00'),
+            'monthly_household_income': Decimal('6000.00'),
+            'ambulance_coverage': True,
+            'in_hospital_benefit_level': 'moderate',
+            'chronic_medication_availability': True,
+            'out_hospital_benefit_level': None,
+        }
+        self.engine = FeatureMatchingEngine('HEALTH')
+
+    def _create_policy(self, index):
+        return BasePolicy.objects.create(
+            organization=self.organization,
+            category=self.category,
+            policy_type=self.policy_type,
+            name=f"Batch Policy {index}",
+            policy_number=f"BATCH-{index}",
+            description="Test policy",
+            short_description="Test policy",
+            base_premium=Decimal('500.00'),
+            coverage_amount=Decimal('100000.00'),
+            minimum_age=18,
+            maximum_age=65,
+            terms_and_conditions="Terms",
+            approval_status=BasePolicy.ApprovalStatus.APPROVED,
+            is_active=True
+        )
+
+    def test_batch_matches_per_policy_results(self):
+        """Every field of a batch result equals the per-policy result."""
+        policies = self.policies + [self.funeral_policy, self.bare_policy]
+        batch = self.engine.calculate_batch_compatibility(policies, self.user_preferences)
+
+        self.assertEqual(len(batch), len(policies))
+        for policy, result in zip(policies, batch):
+            expected = self.engine.calculate_policy_compatibility(
+                BasePolicy.objects.get(pk=policy.pk), self.user_preferences
+            )
+            self.assertEqual(dict(result), expected, policy.name)
+
+    def test_unhandled_types_score_neutral(self):
+        """Mismatched value types score 0.5, as in per-policy scoring."""
+        preferences = {'annual_limit_per_member': 'high'}
+        batch = self.engine.calculate_batch_compatibility(self.policies[:1], preferences)
+
+        self.assertEqual(batch[0]['feature_scores'], {'annual_limit_per_member': 0.5})
+
+    def test_matches_built_on_access(self):
+        """Matches, mismatches and the explanation are deferred until read."""
+        with patch.object(self.engine, '_generate_explanation', return_value='Explained') as explain:
+            result = self.engine.calculate_batch_compatibility(
+                self.policies[:1], self.user_preferences
+            )[0]
+
+            self.assertIsInstance(result, LazyResult)
+            self.assertFalse(result.is_resolved('matches'))
+            explain.assert_not_called()
+
+            self.assertEqual(result['explanation'], 'Explained')
+            self.assertTrue(result.is_resolved('matches'))
+            self.assertTrue(result.is_resolved('mismatches'))
+            explain.assert_called_once()
+
+    def test_single_query_for_features(self):
+        """Features for all policies are loaded in one prefetch query."""
+        policies = list(BasePolicy.objects.filter(pk__in=[policy.pk for policy in self.policies]))
+
+        with self.assertNumQueries(1):
+            self.engine.calculate_batch_compatibility(policies, self.user_preferences)
@@ -0,0 +1,171 @@
+"""
+Unit tests for lazily generated comparison narrative.
+"""
+
+import json
+import pickle
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from .engine import PolicyComparisonEngine
+from .lazy_results import LazyResult
+from .models import ComparisonResult
+
+
+class LazyResultTest(TestCase):
+    """Test the lazy dict used for comparison results."""
+
+    def setUp(self):
+        self.calls = 0
+
+    def _factory(self):
+        self.calls += 1
+        return ['Low premium']
+
+    def test_value_computed_once_on_access(self):
+        """A deferred value is computed on first read and memoized."""
+        result = LazyResult({'rank': 1})
+        result.set_lazy('pros', self._factory)
+
+        self.assertEqual(self.calls, 0)
+        self.assertIn('pros', result)
+        self.assertEqual(result['pros'], ['Low premium'])
+        self.assertEqual(result.get('pros'), ['Low premium'])
+        self.assertEqual(self.calls, 1)
+
+    def test_behaves_like_a_dict(self):
+        """Iteration, conversion and JSON encoding include deferred values."""
+        result = LazyResult({'rank': 1})
+        result.set_lazy('pros', self._factory)
+
+        self.assertEqual(sorted(result), ['pros', 'rank'])
+        self.assertEqual(len(result), 2)
+        self.assertEqual(dict(result), {'rank': 1, 'pros': ['Low premium']})
+        self.assertEqual(json.loads(json.dumps(result)), {'rank': 1, 'pros': ['Low premium']})
+
+    def test_resolved_excludes_pending_values(self):
+        """resolved() returns only what has been computed."""
+        result = LazyResult({'rank': 1})
+        result.set_lazy('pros', self._factory)
+
+        self.assertEqual(result.resolved(), {'rank': 1})
+        self.assertEqual(self.calls, 0)
+
+    def test_pickle_resolves_pending_values(self):
+        """Pickling materializes deferred values."""
+        result = LazyResult({'rank': 1})
+        result.set_lazy('pros', lambda: ['Low premium'])
+
+        restored = pickle.loads(pickle.dumps(result))
+        self.assertEqual(restored, {'rank': 1, 'pros': ['Low premium']})
+
+
+class LazyNarrativeEngineTest(TestCase):
+    """Test that the engine defers narrative generation."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(
+            name="Lazy Insurance Co",
+            description="Test insurance company",
+            email="lazy@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-LAZY"
+        )
+        self.category = PolicyCategory.objects.create(name="Other", slug="other")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="General", slug="general"
+        )
+        self.policy_ids = [
+            BasePolicy.objects.create(
+                organization=self.organization,
+                category=self.category,
+                policy_type=self.policy_type,
+                name=f"Lazy Policy {i}",
+                policy_number=f"LAZY-{i}",
+                description="Test policy",
+                short_description="Test policy",
+                base_premium=Decimal(premium),
+                coverage_amount=Decimal('100000.00'),
+                minimum_age=18,
+                maximum_age=65,
+                terms_and_conditions="Terms",
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True
+            ).id
+            for i, premium in enumerate(['400.00', '700.00', '900.00'])
+        ]
+        self.user_criteria = {'base_premium': 500}
+
+    def test_insights_generated_on_access(self):
+        """Insights are only generated when the response key is read."""
+        engine = PolicyComparisonEngine('other')
+
+        with patch.object(engine, '_generate_insights', return_value={'tips': []}) as insights:
+            result = engine.compare_policies(self.policy_ids, self.user_criteria)
+            insights.assert_not_called()
+
+            self.assertEqual(result['insights'], {'tips': []})
+            self.assertEqual(result['insights'], {'tips': []})
+            insights.assert_called_once()
+
+    def test_narrative_restricted_to_top_n(self):
+        """Results past narrative_top_n get no pros, cons or reason."""
+        engine = PolicyComparisonEngine('other', narrative_top_n=1)
+
+        with patch.object(engine, '_generate_pros', return_value=['Good value']) as pros:
+            result = engine.compare_policies(self.policy_ids, self.user_criteria)
+
+        self.assertEqual(pros.call_count, 1)
+        self.assertEqual(result['results'][0]['pros'], ['Good value'])
+        self.assertEqual(result['results'][1]['pros'], [])
+
+        saved = ComparisonResult.objects.filter(session_id=result['session_id']).order_by('rank')
+        self.assertEqual(saved[0].pros, ['Good value'])
+        self.assertNotEqual(saved[0].recommendation_reason, '')
+        self.assertEqual(saved[2].recommendation_reason, '')
+
+    def test_saved_results_keep_narrative(self):
+        """Every saved result row gets its pros, cons and reason by default."""
+        result = PolicyComparisonEngine('other').compare_policies(self.policy_ids, self.user_criteria)
+
+        saved = ComparisonResult.objects.filter(session_id=result['session_id']).order_by('rank')
+        self.assertEqual(
+            [row.pros for row in saved],
+            [r['pros'] for r in result['results']]
+        )
+        self.assertTrue(all(row.recommendation_reason for row in saved))
+
+    def test_results_past_top_n_never_generate_narrative(self):
+        """With narrative_top_n set, lower results skip generation even when saved."""
+        engine = PolicyComparisonEngine('other', narrative_top_n=1)
+
+        with patch.object(engine, '_generate_pros', return_value=['Good value']) as pros, \
+                patch.object(engine, '_generate_cons', return_value=['Long wait']) as cons:
+            result = engine.compare_policies(self.policy_ids, self.user_criteria)
+
+        self.assertEqual(pros.call_count, 1)
+        self.assertEqual(cons.call_count, 1)
+        saved = ComparisonResult.objects.filter(session_id=result['session_id']).order_by('rank')
+        self.assertEqual(saved[1].pros, [])
+        self.assertEqual(saved[2].cons, [])
+
+    def test_cached_comparison_regenerates_narrative(self):
+        """Cached comparisons get narrative fields bound to the new request."""
+        first = PolicyComparisonEngine('other').compare_policies(self.policy_ids, self.user_criteria)
+        second = PolicyComparisonEngine('other').compare_policies(self.policy_ids, self.user_criteria)
+
+        self.assertEqual(
+            [r['pros'] for r in second['results']],
+            [r['pros'] for r in first['results']]
+        )
+        self.assertEqual(second['recommendations'], first['recommendations'])
@@ -0,0 +1,187 @@
+"""
+Unit tests for the memoized comparison result cache.
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from .engine import PolicyComparisonEngine
+from .models import ComparisonSession, ComparisonCriteria
+from .result_cache import ComparisonResultCache
+from .scoring_plan import get_scoring_plan
+
+
+class ComparisonResultCacheTest(TestCase):
+    """Test caching of compare_policies output."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(
+            name="Cache Insurance Co",
+            description="Test insurance company",
+            email="cache@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-CACHE"
+        )
+        self.category = PolicyCategory.objects.create(name="Other", slug="other")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="General", slug="general"
+        )
+        self.policies = [
+            BasePolicy.objects.create(
+                organization=self.organization,
+                category=self.category,
+                policy_type=self.policy_type,
+                name=f"Cache Policy {i}",
+                policy_number=f"CACHE-{i}",
+                description="Test policy",
+                short_description="Test policy",
+                base_premium=Decimal(premium),
+                coverage_amount=Decimal('100000.00'),
+                minimum_age=18,
+                maximum_age=65,
+                terms_and_conditions="Terms",
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True
+            )
+            for i, premium in enumerate(['400.00', '700.00'])
+        ]
+        self.policy_ids = [policy.id for policy in self.policies]
+        self.user_criteria = {'base_premium': 500}
+
+    def _compare(self, policy_ids=None, user_criteria=None):
+        engine = PolicyComparisonEngine('other')
+        return engine.compare_policies(
+            policy_ids or self.policy_ids, user_criteria or self.user_criteria
+        )
+
+    def test_repeated_comparison_served_from_cache(self):
+        """An identical request skips scoring but still records a session."""
+        first = self._compare()
+
+        with patch.object(PolicyComparisonEngine, '_score_policies') as score:
+            second = self._compare(list(reversed(self.policy_ids)))
+
+        score.assert_not_called()
+        self.assertTrue(second['success'])
+        self.assertEqual(
+            [r['policy'].id for r in second['results']],
+            [r['policy'].id for r in first['results']]
+        )
+        self.assertNotEqual(second['session_id'], first['session_id'])
+        self.assertEqual(ComparisonSession.objects.count(), 2)
+
+    def test_different_criteria_miss_cache(self):
+        """Changing the criteria produces a different cache key."""
+        cache_entry = ComparisonResultCache()
+        key = cache_entry.make_key('other', self.policy_ids, self.user_criteria)
+
+        self.assertEqual(key, cache_entry.make_key('other', self.policy_ids[::-1], {'base_premium': 500}))
+        self.assertNotEqual(key, cache_entry.make_key('other', self.policy_ids, {'base_premium': 600}))
+        self.assertNotEqual(key, cache_entry.make_key('health', self.policy_ids, self.user_criteria))
+
+    def test_policy_change_invalidates_cache(self):
+        """Saving a participating policy forces a fresh comparison."""
+        self._compare()
+
+        self.policies[0].base_premium = Decimal('900.00')
+        self.policies[0].save()
+
+        with patch.object(
+            PolicyComparisonEngine, '_score_policies',
+            autospec=True, side_effect=PolicyComparisonEngine._score_policies
+        ) as score:
+            result = self._compare()
+
+        score.assert_called_once()
+        self.assertEqual(result['results'][0]['policy'].id, self.policies[1].id)
+
+    def _assert_rescored(self):
+        with patch.object(
+            PolicyComparisonEngine, '_score_policies',
+            autospec=True, side_effect=PolicyComparisonEngine._score_policies
+        ) as score:
+            result = self._compare()
+
+        score.assert_called_once()
+        return result
+
+    def test_criteria_change_invalidates_cache(self):
+        """Editing the category's comparison criteria forces a fresh comparison."""
+        criteria = ComparisonCriteria.objects.create(
+            category=self.category,
+            name="Premium",
+            field_name="base_premium",
+            weight=50,
+            comparison_type='LOWER_BETTER'
+        )
+        self._compare()
+
+        criteria.weight = 80
+        criteria.save()
+
+        self._assert_rescored()
+
+    def test_organization_change_invalidates_cache(self):
+        """Saving a participating policy's organization forces a fresh comparison."""
+        self._compare()
+
+        self.organization.description = "Updated description"
+        self.organization.save()
+
+        self._assert_rescored()
+
+    def test_cache_stores_policy_ids_not_instances(self):
+        """Cached entries hold IDs and scores; hits re-attach policy instances."""
+        engine = PolicyComparisonEngine('other')
+        engine.compare_policies(self.policy_ids, self.user_criteria)
+        key = engine.result_cache.make_key(
+            'other', self.policy_ids, self.user_criteria,
+            criteria_version=engine.scoring_plan.version
+        )
+
+        cached = engine.result_cache.get(key)
+        self.assertCountEqual(cached['policy_ids'], self.policy_ids)
+        for cached_result in cached['ranked_results']:
+            self.assertNotIn('policy', cached_result)
+            self.assertIn(cached_result['policy_id'], self.policy_ids)
+
+        result = self._compare()
+        self.assertIsInstance(result['results'][0]['policy'], BasePolicy)
+
+    def test_scoring_plan_fetched_once_per_comparison(self):
+        """The cache key and scoring share one criteria freshness check."""
+        for _ in range(2):  # miss, then hit
+            with patch('comparison.engine.get_scoring_plan', wraps=get_scoring_plan) as get_plan:
+                self.assertTrue(self._compare()['success'])
+            get_plan.assert_called_once_with('other')
+
+    def test_cache_off_with_process_local_backend(self):
+        """Version stamps can't reach other workers through a local-memory cache."""
+        with self.settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }):
+            self.assertFalse(ComparisonResultCache().enabled)
+
+        self.assertTrue(ComparisonResultCache().enabled)
+
+    def test_cache_can_be_disabled(self):
+        """COMPARISON_RESULT_CACHE_ENABLED turns the cache off."""
+        with self.settings(COMPARISON_RESULT_CACHE_ENABLED=False):
+            self._compare()
+            with patch.object(
+                PolicyComparisonEngine, '_score_policies',
+                autospec=True, side_effect=PolicyComparisonEngine._score_policies
+            ) as score:
+                self._compare()
+
+        score.assert_called_once()
@@ -0,0 +1,153 @@
+"""
+Unit tests for bulk comparison result persistence.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from policies.signals import get_cached_validation_errors
+from simple_surveys.models import SimpleSurvey
+from .feature_comparison_manager import FeatureComparisonManager
+from .models import ComparisonSession, ComparisonResult, FeatureComparisonResult
+from .result_writer import ComparisonResultWriter
+
+
+class ComparisonResultWriterTest(TestCase):
+    """Test buffering and bulk flushing of comparison results."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(
+            name="Writer Insurance Co",
+            description="Test insurance company",
+            email="writer@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-WRITER"
+        )
+        self.category = PolicyCategory.objects.create(name="Health", slug="health")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="Medical Aid", slug="medical-aid"
+        )
+        self.policies = [
+            BasePolicy.objects.create(
+                organization=self.organization,
+                category=self.category,
+                policy_type=self.policy_type,
+                name=f"Writer Policy {i}",
+                policy_number=f"WRITER-{i}",
+                description="Test policy",
+                short_description="Test policy",
+                base_premium=Decimal('500.00'),
+                coverage_amount=Decimal('100000.00'),
+                minimum_age=18,
+                maximum_age=65,
+                terms_and_conditions="Terms",
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True
+            )
+            for i in range(3)
+        ]
+        self.session = ComparisonSession.objects.create(
+            session_key="writer-session", category=self.category
+        )
+
+    def _result(self, policy, rank, score='80.00'):
+        return ComparisonResult(
+            session=self.session,
+            policy=policy,
+            overall_score=Decimal(score),
+            criteria_scores={},
+            rank=rank
+        )
+
+    def test_flush_writes_all_rows_in_one_insert(self):
+        """All buffered rows are written with a single INSERT."""
+        writer = ComparisonResultWriter(ComparisonResult)
+        for rank, policy in enumerate(self.policies, 1):
+            writer.add(self._result(policy, rank))
+
+        with CaptureQueriesContext(connection) as queries:
+            saved = writer.flush()
+
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        self.assertEqual(len(saved), 3)
+        self.assertTrue(all(result.pk for result in saved))
+        self.assertEqual(len(writer), 0)
+
+    def test_flush_upserts_existing_rows(self):
+        """Rows with an existing unique key are updated instead of failing."""
+        self._result(self.policies[0], 1, '50.00').save()
+
+        writer = ComparisonResultWriter(ComparisonResult, unique_fields=['session', 'policy'])
+        writer.add(self._result(self.policies[0], 2, '90.00'))
+        writer.add(self._result(self.policies[1], 1, '95.00'))
+        writer.flush()
+
+        self.assertEqual(self.session.results.count(), 2)
+        updated = self.session.results.get(policy=self.policies[0])
+        self.assertEqual(updated.overall_score, Decimal('90.00'))
+        self.assertEqual(updated.rank, 2)
+
+    def test_flush_deletes_stale_rows(self):
+        """The stale queryset is removed in the same transaction."""
+        self._result(self.policies[2], 1).save()
+
+        writer = ComparisonResultWriter(ComparisonResult)
+        writer.add(self._result(self.policies[0], 1))
+        writer.flush(stale=self.session.results.all())
+
+        self.assertEqual(
+            list(self.session.results.values_list('policy_id', flat=True)),
+            [self.policies[0].id]
+        )
+
+    def test_validator_receives_flushed_batch(self):
+        """The validator is called once with every flushed row."""
+        batches = []
+        writer = ComparisonResultWriter(ComparisonResult, validator=batches.append)
+        for rank, policy in enumerate(self.policies, 1):
+            writer.add(self._result(policy, rank))
+        saved = writer.flush()
+
+        self.assertEqual(batches, [saved])
+
+    def test_feature_results_validated_as_batch(self):
+        """Feature comparison results written in bulk still get validated."""
+        cache.clear()
+        survey = SimpleSurvey.objects.create(
+            first_name="John",
+            last_name="Doe",
+            date_of_birth=timezone.now().date(),
+            email="john@example.com",
+            insurance_type=SimpleSurvey.InsuranceType.HEALTH,
+            preferred_annual_limit=Decimal('50000.00'),
+            household_income=Decimal('10000.00'),
+            wants_ambulance_coverage=True,
+            needs_chronic_medication=False
+        )
+
+        manager = FeatureComparisonManager()
+        results = manager.generate_comparison_results(survey, self.policies)
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            FeatureComparisonResult.objects.filter(survey=survey).count(), 3
+        )
+        # Policies without features are flagged by the batched validator
+        for result in results:
+            self.assertEqual(
+                get_cached_validation_errors('comparison', result.id),
+                ["Policy has no associated features for comparison"]
+            )
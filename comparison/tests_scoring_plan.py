@@ -0,0 +1,140 @@
+"""
+Unit tests for compiled comparison scoring plans.
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+
+from organizations.models import Organization
+from policies.models import PolicyCategory, PolicyType, BasePolicy
+from .engine import PolicyComparisonEngine
+from .models import ComparisonCriteria
+from .scoring_plan import get_scoring_plan, clear_scoring_plans
+
+
+class ScoringPlanTest(TestCase):
+    """Test compilation, caching and evaluation of scoring plans."""
+
+    def setUp(self):
+        clear_scoring_plans()
+        self.organization = Organization.objects.create(
+            name="Plan Insurance Co",
+            description="Test insurance company",
+            email="plan@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-PLAN"
+        )
+        self.category = PolicyCategory.objects.create(name="Health", slug="health")
+        self.policy_type = PolicyType.objects.create(
+            category=self.category, name="Medical Aid", slug="medical-aid"
+        )
+        self.policies = [
+            BasePolicy.objects.create(
+                organization=self.organization,
+                category=self.category,
+                policy_type=self.policy_type,
+                name=f"Plan Policy {i}",
+                policy_number=f"PLAN-{i}",
+                description="Test policy",
+                short_description="Test policy",
+                base_premium=premium,
+                coverage_amount=coverage,
+                minimum_age=18,
+                maximum_age=max_age,
+                waiting_period_days=waiting,
+                terms_and_conditions="Terms",
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True,
+                is_featured=featured
+            )
+            for i, (premium, coverage, max_age, waiting, featured) in enumerate([
+                (Decimal('0.00'), Decimal('50000.00'), 60, 0, True),
+                (Decimal('650.00'), Decimal('180000.00'), 70, 30, False),
+                (Decimal('1400.00'), Decimal('400000.00'), 80, 120, True),
+            ])
+        ]
+
+        self.premium = ComparisonCriteria.objects.create(
+            category=self.category, name="Premium", description="Monthly premium",
+            field_name='base_premium', weight=50, comparison_type='LOWER_BETTER'
+        )
+        ComparisonCriteria.objects.create(
+            category=self.category, name="Coverage", description="Coverage amount",
+            field_name='coverage_amount', weight=30, comparison_type='HIGHER_BETTER'
+        )
+        ComparisonCriteria.objects.create(
+            category=self.category, name="Age", description="Maximum age",
+            field_name='maximum_age', weight=10, comparison_type='RANGE'
+        )
+        ComparisonCriteria.objects.create(
+            category=self.category, name="Featured", description="Featured policy",
+            field_name='is_featured', weight=10, comparison_type='BOOLEAN'
+        )
+
+        self.user_criteria = {
+            'base_premium': 600,
+            'coverage_amount': '200000',
+            'maximum_age': {'min': 65, 'max': 75},
+            'is_featured': True,
+            'waiting_period_days': 30,
+            'weights': {'waiting_period_days': 15, 'coverage_amount': 25}
+        }
+
+    def test_plan_cached_until_criteria_change(self):
+        """The plan is reused until an admin edits the criteria."""
+        plan = get_scoring_plan('health')
+
+        with self.assertNumQueries(1):
+            self.assertIs(get_scoring_plan('health'), plan)
+
+        self.premium.weight = 70
+        self.premium.save()
+
+        rebuilt = get_scoring_plan('health')
+        self.assertIsNot(rebuilt, plan)
+        self.assertIn(('base_premium', Decimal('70'), self.premium), [
+            (field_name, weight, criteria) for field_name, weight, criteria in rebuilt.criteria
+            if field_name == 'base_premium'
+        ])
+
+    def test_deleted_criteria_rebuild_plan(self):
+        """Deleting a criterion changes the plan version."""
+        plan = get_scoring_plan('health')
+        self.premium.delete()
+
+        rebuilt = get_scoring_plan('health')
+        self.assertNotIn('base_premium', [field_name for field_name, _, _ in rebuilt.criteria])
+        self.assertNotEqual(rebuilt.version, plan.version)
+
+    def test_compiled_evaluators_match_criterion_evaluation(self):
+        """Compiled evaluators score exactly like _evaluate_criterion."""
+        engine = PolicyComparisonEngine('health')
+        engine._load_criteria(self.user_criteria)
+
+        evaluators = engine._criterion_evaluators(self.user_criteria)
+        self.assertEqual(
+            [field_name for field_name, _, _ in evaluators],
+            [field_name for field_name, weight in engine.weights.items() if weight != 0]
+        )
+
+        for policy in self.policies:
+            for field_name, weight, evaluate in evaluators:
+                self.assertEqual(weight, engine.weights[field_name])
+                self.assertEqual(
+                    evaluate(policy),
+                    engine._evaluate_criterion(policy, field_name, self.user_criteria.get(field_name)),
+                    f"{field_name} for {policy.name}"
+                )
+
+    def test_missing_user_values_score_neutral(self):
+        """Criteria without a user value score neutral, as before."""
+        engine = PolicyComparisonEngine('health')
+        engine._load_criteria({})
+
+        for field_name, weight, evaluate in engine._criterion_evaluators({}):
+            self.assertEqual(evaluate(self.policies[1]), Decimal('50'), field_name)
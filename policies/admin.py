@@ -19,6 +19,7 @@ from .models import (
     Rewards
 )
 from .forms import PolicyFeaturesAdminForm, AdditionalFeaturesAdminForm
+from .counters import policy_views, policy_comparisons
 
 
 # Inline Admin Classes
@@ -218,7 +219,7 @@ class BasePolicyAdmin(admin.ModelAdmin):
         'approval_status_display',
         'active_status',
         'featured_status',
-        'views_count',
+        'views_display',
         'created_at'
     ]
     
@@ -245,8 +246,8 @@ class BasePolicyAdmin(admin.ModelAdmin):
         'policy_number',
         'approved_at',
         'approved_by',
-        'views_count',
-        'comparison_count',
+        'views_display',
+        'comparisons_display',
         'created_at',
         'updated_at'
     ]
@@ -306,8 +307,8 @@ class BasePolicyAdmin(admin.ModelAdmin):
         }),
         (_('Metadata'), {
             'fields': (
-                'views_count',
-                'comparison_count',
+                'views_display',
+                'comparisons_display',
                 'created_at',
                 'updated_at'
             ),
@@ -358,6 +359,18 @@ class BasePolicyAdmin(admin.ModelAdmin):
     base_premium_display.short_description = _('Premium')
     base_premium_display.admin_order_field = 'base_premium'
     
+    def views_display(self, obj):
+        """View count including increments not yet written"""
+        return policy_views.total(obj)
+    views_display.short_description = _('Views count')
+    views_display.admin_order_field = 'views_count'
+    
+    def comparisons_display(self, obj):
+        """Comparison count including increments not yet written"""
+        return policy_comparisons.total(obj)
+    comparisons_display.short_description = _('Comparison count')
+    comparisons_display.admin_order_field = 'comparison_count'
+    
     def approval_status_display(self, obj):
         colors = {
             'DRAFT': '#6c757d',
@@ -0,0 +1,187 @@
+"""
+Buffered counters for frequently incremented model fields.
+Increments are accumulated in a per-process buffer and written as one
+aggregated delta per row, instead of a read-modify-write save per hit.
+"""
+
+import atexit
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, List
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models import F
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedCounter:
+    """
+    Counts increments of an integer field in memory and flushes them as deltas.
+
+    A flush groups rows by pending delta and issues one
+    UPDATE ... SET field = field + delta per group, so no row lock is held
+    between a read and a write and no increment is lost to a concurrent
+    save. Flushes happen when COUNTER_FLUSH_SIZE increments are pending or
+    the oldest is COUNTER_FLUSH_INTERVAL seconds old (checked on increment
+    and at the end of each request), and at process exit.
+
+    Updates bypass save(), so model signals do not fire for counter writes.
+    Increments not yet flushed are visible through total() in the process
+    that made them.
+    """
+
+    def __init__(self, model_label: str, field: str):
+        """
+        Initialize the counter.
+
+        Args:
+            model_label: 'app_label.ModelName' of the counted model
+            field: Name of the integer field to increment
+        """
+        self.model_label = model_label
+        self.field = field
+        self.flush_size = getattr(settings, 'COUNTER_FLUSH_SIZE', 100)
+        self.flush_interval = getattr(settings, 'COUNTER_FLUSH_INTERVAL', 10)
+        self._pending: Dict[int, int] = defaultdict(int)
+        self._pending_total = 0
+        self._started_at = 0.0
+        self._lock = Lock()
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.model_label)
+
+    def increment(self, pk: int, amount: int = 1) -> None:
+        """Buffer an increment for one row, flushing if a threshold is reached."""
+        with self._lock:
+            if not self._pending:
+                self._started_at = time.monotonic()
+            self._pending[pk] += amount
+            self._pending_total += amount
+            due = self._is_due()
+
+        if due:
+            self.flush()
+
+    def pending(self, pk: int) -> int:
+        """Increments buffered for a row and not yet written."""
+        with self._lock:
+            return self._pending.get(pk, 0)
+
+    def total(self, instance) -> int:
+        """Stored value of the field plus this process's unflushed increments."""
+        return getattr(instance, self.field) + self.pending(instance.pk)
+
+    def flush(self) -> int:
+        """
+        Write buffered increments.
+
+        Returns:
+            Number of rows updated
+        """
+        with self._lock:
+            pending = dict(self._pending)
+            self._pending.clear()
+            self._pending_total = 0
+
+        if not pending:
+            return 0
+
+        # One UPDATE per distinct delta
+        pks_by_delta: Dict[int, List[int]] = defaultdict(list)
+        for pk, delta in pending.items():
+            pks_by_delta[delta].append(pk)
+
+        try:
+            updated = 0
+            with transaction.atomic():
+                for delta, pks in pks_by_delta.items():
+                    updated += self.model.objects.filter(pk__in=pks).update(
+                        **{self.field: F(self.field) + delta}
+                    )
+            return updated
+        except Exception as e:
+            # Keep the increments for the next flush
+            logger.error(f"Error flushing {self.model_label}.{self.field} counters: {str(e)}")
+            with self._lock:
+                if not self._pending:
+                    self._started_at = time.monotonic()
+                for pk, delta in pending.items():
+                    self._pending[pk] += delta
+                    self._pending_total += delta
+            return 0
+
+    def flush_if_due(self) -> int:
+        """Flush if the size or time threshold has been reached."""
+        with self._lock:
+            due = self._pending_total > 0 and self._is_due()
+        return self.flush() if due else 0
+
+    def discard(self) -> None:
+        """Drop buffered increments without writing them."""
+        with self._lock:
+            self._pending.clear()
+            self._pending_total = 0
+
+    def _is_due(self) -> bool:
+        return (
+            self._pending_total >= self.flush_size or
+            time.monotonic() - self._started_at >= self.flush_interval
+        )
+
+
+_counters: List[BufferedCounter] = []
+
+
+def register_counter(model_label: str, field: str) -> BufferedCounter:
+    """Create a counter that is flushed with flush_counters()."""
+    counter = BufferedCounter(model_label, field)
+    _counters.append(counter)
+    return counter
+
+
+def flush_counters(due_only: bool = False) -> int:
+    """
+    Flush every registered counter.
+
+    Args:
+        due_only: Only flush counters whose threshold has been reached
+
+    Returns:
+        Number of rows updated
+    """
+    return sum(
+        counter.flush_if_due() if due_only else counter.flush()
+        for counter in _counters
+    )
+
+
+def discard_counters() -> None:
+    """Drop the buffered increments of every registered counter."""
+    for counter in _counters:
+        counter.discard()
+
+
+def _flush_due_counters(**kwargs) -> None:
+    flush_counters(due_only=True)
+
+
+def _flush_at_exit() -> None:
+    try:
+        flush_counters()
+    except Exception as e:
+        logger.error(f"Error flushing counters at exit: {str(e)}")
+
+
+request_finished.connect(_flush_due_counters, dispatch_uid='policies.counters.flush_due_counters')
+atexit.register(_flush_at_exit)
+
+
+policy_views = register_counter('policies.BasePolicy', 'views_count')
+policy_comparisons = register_counter('policies.BasePolicy', 'comparison_count')
+ab_test_participants = register_counter('surveys.ABTestVariant', 'participants_count')
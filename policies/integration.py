@@ -5,6 +5,7 @@ Handles cross-module validation, feature synchronization, and data consistency.
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils.translation import gettext_lazy as _
 from typing import Dict, List, Any, Optional, Tuple
 import logging
@@ -325,6 +326,24 @@ class CrossModuleValidator:
         
         return errors
     
+    @classmethod
+    def validate_comparison_results(cls, comparison_results: List[FeatureComparisonResult]) -> Dict[int, List[str]]:
+        """
+        Validate a batch of comparison results.
+        
+        Surveys and policy features are loaded for the whole batch up front,
+        so validation costs a fixed number of queries instead of a few per row.
+        
+        Returns:
+            Dict of result id to validation errors
+        """
+        prefetch_related_objects(comparison_results, 'survey', 'policy__policy_features')
+        
+        return {
+            result.id: cls.validate_comparison_consistency(result)
+            for result in comparison_results
+        }
+    
     @classmethod
     def _validate_field_value(cls, value: Any, data_type: str, validation_rules: Dict, field_name: str) -> List[str]:
         """
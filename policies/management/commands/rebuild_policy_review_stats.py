@@ -0,0 +1,30 @@
+"""
+Management command to rebuild denormalized policy review stats.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from policies.models import PolicyReviewStats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild approved review count, average rating and review score for every policy'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of stats rows written per query (default: 500)'
+        )
+    
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding policy review stats...')
+        
+        try:
+            rebuilt = PolicyReviewStats.rebuild_all(batch_size=options['batch_size'])
+        except Exception as e:
+            raise CommandError(f'Review stats rebuild failed: {str(e)}')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt review stats for {rebuilt} policies')
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-16 20:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("policies", "0009_add_benefit_levels_and_ranges"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PolicyReviewStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("approved_review_count", models.PositiveIntegerField(default=0, help_text="Number of approved reviews")),
+                ("average_rating", models.DecimalField(blank=True, decimal_places=2, help_text="Average rating of approved reviews (1-5)", max_digits=3, null=True)),
+                ("review_score", models.DecimalField(decimal_places=2, default=50, help_text="Credibility-adjusted review score (0-100)", max_digits=5)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("policy", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name="review_stats", to="policies.basepolicy")),
+            ],
+            options={
+                "verbose_name": "Policy Review Stats",
+                "verbose_name_plural": "Policy Review Stats",
+            },
+        ),
+    ]
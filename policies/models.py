@@ -1,8 +1,11 @@
+from decimal import Decimal, ROUND_HALF_UP
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 from organizations.models import Organization
 from .managers import BasePolicyManager
+from .counters import policy_views, policy_comparisons
 
 
 class PolicyCategory(models.Model):
@@ -359,14 +362,22 @@ class BasePolicy(models.Model):
         )
     
     def increment_views(self):
-        """Increment the view count."""
+        """
+        Increment the view count.
+        The increment is buffered and written later as part of an aggregated
+        delta; this instance reflects it immediately.
+        """
+        policy_views.increment(self.pk)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
     
     def increment_comparisons(self):
-        """Increment the comparison count."""
+        """
+        Increment the comparison count.
+        The increment is buffered and written later as part of an aggregated
+        delta; this instance reflects it immediately.
+        """
+        policy_comparisons.increment(self.pk)
         self.comparison_count += 1
-        self.save(update_fields=['comparison_count'])
 
 
 class PolicyFeatures(models.Model):
@@ -1030,4 +1041,203 @@ class PolicyReview(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.title} - {self.policy.name} ({self.rating}★)"
\ No newline at end of file
+        return f"{self.title} - {self.policy.name} ({self.rating}★)"
+
+
+class PolicyReviewStats(models.Model):
+    """
+    Denormalized review aggregates for a policy.
+    Kept current from PolicyReview signals so scoring can read review data
+    without aggregating the reviews table on every comparison.
+    """
+    
+    policy = models.OneToOneField(
+        BasePolicy,
+        on_delete=models.CASCADE,
+        related_name='review_stats'
+    )
+    
+    approved_review_count = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Number of approved reviews")
+    )
+    
+    average_rating = models.DecimalField(
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_("Average rating of approved reviews (1-5)")
+    )
+    
+    review_score = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=50,
+        help_text=_("Credibility-adjusted review score (0-100)")
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _("Policy Review Stats")
+        verbose_name_plural = _("Policy Review Stats")
+    
+    def __str__(self):
+        return f"{self.policy.name} - {self.approved_review_count} reviews"
+    
+    @staticmethod
+    def calculate_review_score(review_count, average_rating):
+        """
+        Calculate a 0-100 review score with credibility weighting.
+        More reviews = the score moves further from neutral (50).
+        """
+        if not review_count or average_rating is None:
+            return Decimal('50.00')
+        
+        # Convert 5-star rating to 0-100 scale
+        base_score = Decimal(str(average_rating)) * Decimal('20')
+        
+        if review_count >= 50:
+            credibility = Decimal('1.0')
+        elif review_count >= 20:
+            credibility = Decimal('0.95')
+        elif review_count >= 10:
+            credibility = Decimal('0.90')
+        elif review_count >= 5:
+            credibility = Decimal('0.85')
+        else:
+            credibility = Decimal('0.75')
+        
+        adjusted_score = base_score * credibility + Decimal('50') * (Decimal('1') - credibility)
+        return adjusted_score.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    
+    @classmethod
+    def _aggregate_values(cls, review_count, average_rating):
+        """Field values for the given approved review aggregates."""
+        if average_rating is not None:
+            average_rating = Decimal(str(average_rating)).quantize(
+                Decimal('0.01'), rounding=ROUND_HALF_UP
+            )
+        
+        return {
+            'approved_review_count': review_count,
+            'average_rating': average_rating if review_count else None,
+            'review_score': cls.calculate_review_score(review_count, average_rating),
+        }
+    
+    @classmethod
+    def refresh_for_policy(cls, policy_id, create=True):
+        """
+        Recompute the stats row for one policy from its approved reviews.
+        Uses the (policy, is_approved) index, so cost does not depend on catalog size.
+        
+        With create=False an existing row is updated but a missing one is not
+        created, and None is returned.
+        """
+        aggregates = PolicyReview.objects.filter(
+            policy_id=policy_id,
+            is_approved=True
+        ).aggregate(
+            review_count=models.Count('id'),
+            average_rating=models.Avg('rating')
+        )
+        
+        values = cls._aggregate_values(
+            aggregates['review_count'], aggregates['average_rating']
+        )
+        
+        if not create:
+            cls.objects.filter(policy_id=policy_id).update(updated_at=timezone.now(), **values)
+            return None
+        
+        stats, _created = cls.objects.update_or_create(
+            policy_id=policy_id,
+            defaults=values
+        )
+        return stats
+    
+    @classmethod
+    def get_for_policies(cls, policy_ids):
+        """
+        Get stats rows for many policies, creating any missing rows in bulk.
+        
+        Returns:
+            Dictionary mapping policy ID to PolicyReviewStats
+        """
+        policy_ids = list(policy_ids)
+        stats_by_policy = {
+            stats.policy_id: stats
+            for stats in cls.objects.filter(policy_id__in=policy_ids)
+        }
+        
+        missing_ids = [policy_id for policy_id in policy_ids if policy_id not in stats_by_policy]
+        if missing_ids:
+            aggregates = {
+                row['policy_id']: row
+                for row in PolicyReview.objects.filter(
+                    policy_id__in=missing_ids,
+                    is_approved=True
+                ).values('policy_id').annotate(
+                    review_count=models.Count('id'),
+                    average_rating=models.Avg('rating')
+                )
+            }
+            
+            new_stats = []
+            for policy_id in missing_ids:
+                row = aggregates.get(policy_id, {})
+                new_stats.append(cls(
+                    policy_id=policy_id,
+                    **cls._aggregate_values(
+                        row.get('review_count', 0), row.get('average_rating')
+                    )
+                ))
+            
+            cls.objects.bulk_create(new_stats, ignore_conflicts=True)
+            stats_by_policy.update({stats.policy_id: stats for stats in new_stats})
+        
+        return stats_by_policy
+    
+    @classmethod
+    def for_policy(cls, policy):
+        """Get the stats row for a policy, creating it if it does not exist yet."""
+        try:
+            return policy.review_stats
+        except cls.DoesNotExist:
+            return cls.refresh_for_policy(policy.id)
+    
+    @classmethod
+    def rebuild_all(cls, batch_size=500):
+        """
+        Rebuild stats for every policy from the reviews table.
+        
+        Returns:
+            Number of stats rows written
+        """
+        aggregates = {
+            row['policy_id']: row
+            for row in PolicyReview.objects.filter(is_approved=True).values(
+                'policy_id'
+            ).annotate(
+                review_count=models.Count('id'),
+                average_rating=models.Avg('rating')
+            )
+        }
+        
+        rows = []
+        for policy_id in BasePolicy.objects.values_list('id', flat=True).iterator():
+            row = aggregates.get(policy_id, {})
+            rows.append(cls(
+                policy_id=policy_id,
+                **cls._aggregate_values(row.get('review_count', 0), row.get('average_rating'))
+            ))
+        
+        cls.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['policy'],
+            update_fields=['approved_review_count', 'average_rating', 'review_score', 'updated_at']
+        )
+        return len(rows)
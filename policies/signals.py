@@ -5,13 +5,23 @@ Signal handlers for maintaining system integration and consistency.
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 import logging
 
-from .models import BasePolicy, PolicyFeatures, AdditionalFeatures
+from .models import (
+    BasePolicy, PolicyCategory, PolicyFeatures, AdditionalFeatures, PolicyReview, PolicyReviewStats
+)
 from .integration import CrossModuleValidator, SystemIntegrationManager
 from simple_surveys.models import SimpleSurvey, SimpleSurveyQuestion
 from comparison.models import FeatureComparisonResult
+from comparison import catalog
+from comparison.result_cache import ComparisonResultCache
+from health_policies.models import HealthPolicy
+from funeral_policies.models import FuneralPolicy
+from organizations.models import Organization
+from surveys.caching import CacheNamespaces, SurveyCacheManager
+from surveys.models import SurveyTemplate, SurveyQuestion, TemplateQuestion, QuestionDependency
 
 logger = logging.getLogger(__name__)
 
@@ -32,11 +42,11 @@ def validate_policy_features_on_save(sender, instance, created, **kwargs):
             )
             
             # Cache validation errors for admin interface
-            cache_key = f"policy_validation_errors_{instance.policy.id}"
+            cache_key = validation_cache_key('policy', instance.policy.id)
             cache.set(cache_key, errors, timeout=3600)  # 1 hour
         else:
             # Clear any cached validation errors
-            cache_key = f"policy_validation_errors_{instance.policy.id}"
+            cache_key = validation_cache_key('policy', instance.policy.id)
             cache.delete(cache_key)
             
             if created:
@@ -64,11 +74,11 @@ def validate_survey_on_save(sender, instance, created, **kwargs):
             )
             
             # Cache validation errors
-            cache_key = f"survey_validation_errors_{instance.id}"
+            cache_key = validation_cache_key('survey', instance.id)
             cache.set(cache_key, errors, timeout=3600)  # 1 hour
         else:
             # Clear any cached validation errors
-            cache_key = f"survey_validation_errors_{instance.id}"
+            cache_key = validation_cache_key('survey', instance.id)
             cache.delete(cache_key)
             
             if created:
@@ -89,20 +99,9 @@ def validate_comparison_result_on_save(sender, instance, created, **kwargs):
     try:
         # Validate comparison result consistency
         errors = CrossModuleValidator.validate_comparison_consistency(instance)
+        _cache_comparison_validation_errors({instance.id: errors})
         
-        if errors:
-            logger.warning(
-                f"Comparison result validation issues for result {instance.id}: {errors}"
-            )
-            
-            # Cache validation errors
-            cache_key = f"comparison_validation_errors_{instance.id}"
-            cache.set(cache_key, errors, timeout=3600)  # 1 hour
-        else:
-            # Clear any cached validation errors
-            cache_key = f"comparison_validation_errors_{instance.id}"
-            cache.delete(cache_key)
-            
+        if not errors:
             if created:
                 logger.info(f"Comparison result created and validated: {instance.id}")
             else:
@@ -112,6 +111,46 @@ def validate_comparison_result_on_save(sender, instance, created, **kwargs):
         logger.error(f"Error validating comparison result {instance.id}: {str(e)}")
 
 
+def validate_comparison_results(results):
+    """
+    Validate a batch of comparison results written with bulk_create.
+    bulk_create does not send post_save, so bulk writers call this once per flush.
+    """
+    try:
+        errors_by_id = CrossModuleValidator.validate_comparison_results(results)
+        _cache_comparison_validation_errors(errors_by_id)
+        
+        logger.info(
+            f"Validated {len(errors_by_id)} comparison results, "
+            f"{sum(1 for errors in errors_by_id.values() if errors)} with issues"
+        )
+    
+    except Exception as e:
+        logger.error(f"Error validating comparison result batch: {str(e)}")
+
+
+def _cache_comparison_validation_errors(errors_by_id):
+    """Cache validation errors per result and clear them for valid results."""
+    invalid = {}
+    valid_keys = []
+    generation = CacheNamespaces.generation(validation_namespace('comparison'))
+    
+    for result_id, errors in errors_by_id.items():
+        cache_key = validation_cache_key('comparison', result_id, generation)
+        if errors:
+            logger.warning(
+                f"Comparison result validation issues for result {result_id}: {errors}"
+            )
+            invalid[cache_key] = errors
+        else:
+            valid_keys.append(cache_key)
+    
+    if invalid:
+        cache.set_many(invalid, timeout=3600)  # 1 hour
+    if valid_keys:
+        cache.delete_many(valid_keys)
+
+
 @receiver(pre_save, sender=PolicyFeatures)
 def ensure_insurance_type_consistency(sender, instance, **kwargs):
     """
@@ -154,7 +193,7 @@ def cleanup_related_data_on_policy_features_delete(sender, instance, **kwargs):
         policy_id = instance.policy.id
         
         # Clear cached validation errors
-        cache_key = f"policy_validation_errors_{policy_id}"
+        cache_key = validation_cache_key('policy', policy_id)
         cache.delete(cache_key)
         
         # Log the deletion
@@ -178,7 +217,7 @@ def cleanup_related_data_on_survey_delete(sender, instance, **kwargs):
         survey_id = instance.id
         
         # Clear cached validation errors
-        cache_key = f"survey_validation_errors_{survey_id}"
+        cache_key = validation_cache_key('survey', survey_id)
         cache.delete(cache_key)
         
         # Delete related comparison results
@@ -205,10 +244,8 @@ def invalidate_survey_cache_on_question_change(sender, instance, created, **kwar
         cache_key = f"survey_questions_{category}"
         cache.delete(cache_key)
         
-        # Clear validation cache for surveys of this category
-        cache_pattern = f"survey_validation_errors_*"
-        # Note: Django cache doesn't support pattern deletion by default
-        # This would need a custom cache backend or manual tracking
+        # Retire cached survey validation errors, which depend on the questions
+        CacheNamespaces.invalidate(validation_namespace('survey'))
         
         if created:
             logger.info(f"Survey question created for {category}: {instance.question_text[:50]}")
@@ -219,6 +256,114 @@ def invalidate_survey_cache_on_question_change(sender, instance, created, **kwar
         logger.error(f"Error handling survey question change: {str(e)}")
 
 
+@receiver(post_save, sender=SurveyTemplate)
+@receiver(post_delete, sender=SurveyTemplate)
+@receiver(post_save, sender=SurveyQuestion)
+@receiver(post_delete, sender=SurveyQuestion)
+@receiver(post_save, sender=TemplateQuestion)
+@receiver(post_delete, sender=TemplateQuestion)
+@receiver(post_save, sender=QuestionDependency)
+@receiver(post_delete, sender=QuestionDependency)
+def invalidate_survey_structure_on_change(sender, instance, **kwargs):
+    """
+    Retire cached survey templates, questions and compiled structures for
+    the affected categories when a template or its questions are edited.
+    """
+    try:
+        if isinstance(instance, TemplateQuestion):
+            category_ids = {instance.template.category_id, instance.question.category_id}
+        elif isinstance(instance, QuestionDependency):
+            category_ids = {instance.parent_question.category_id, instance.child_question.category_id}
+        else:
+            category_ids = {instance.category_id}
+        
+        cache_manager = SurveyCacheManager()
+        for category_slug in PolicyCategory.objects.filter(id__in=category_ids).values_list('slug', flat=True):
+            cache_manager.invalidate_template_cache(category_slug)
+    
+    except Exception as e:
+        logger.error(f"Error invalidating survey structure cache: {str(e)}")
+
+
+@receiver(post_save, sender=PolicyReview)
+def update_review_stats_on_review_save(sender, instance, **kwargs):
+    """
+    Keep the policy's denormalized review stats in step with its reviews.
+    Only the reviewed policy's row is recomputed.
+    """
+    try:
+        PolicyReviewStats.refresh_for_policy(instance.policy_id)
+    except Exception as e:
+        logger.error(f"Error updating review stats for policy {instance.policy_id}: {str(e)}")
+
+
+@receiver(post_delete, sender=PolicyReview)
+def update_review_stats_on_review_delete(sender, instance, **kwargs):
+    """
+    Update review stats after a review is deleted, without creating a row.
+    When the policy itself is being deleted its stats row is already gone.
+    """
+    try:
+        PolicyReviewStats.refresh_for_policy(instance.policy_id, create=False)
+    except Exception as e:
+        logger.error(f"Error updating review stats for policy {instance.policy_id}: {str(e)}")
+
+
+@receiver(post_save, sender=BasePolicy)
+@receiver(post_delete, sender=BasePolicy)
+@receiver(post_save, sender=HealthPolicy)
+@receiver(post_delete, sender=HealthPolicy)
+@receiver(post_save, sender=FuneralPolicy)
+@receiver(post_delete, sender=FuneralPolicy)
+def invalidate_comparison_cache_on_policy_change(sender, instance, **kwargs):
+    """
+    Drop cached comparisons that include a changed policy.
+    Subclass saves do not send post_save for BasePolicy, so they are connected too.
+    """
+    try:
+        ComparisonResultCache.invalidate_policy(instance.pk)
+    except Exception as e:
+        logger.error(f"Error invalidating comparison cache for policy {instance.pk}: {str(e)}")
+
+
+@receiver(post_save, sender=PolicyFeatures)
+@receiver(post_delete, sender=PolicyFeatures)
+@receiver(post_save, sender=PolicyReview)
+@receiver(post_delete, sender=PolicyReview)
+def invalidate_comparison_cache_on_policy_data_change(sender, instance, **kwargs):
+    """
+    Drop cached comparisons when a policy's features or reviews change.
+    """
+    try:
+        ComparisonResultCache.invalidate_policy(instance.policy_id)
+    except Exception as e:
+        logger.error(f"Error invalidating comparison cache for policy {instance.policy_id}: {str(e)}")
+
+
+@receiver(post_save, sender=BasePolicy)
+@receiver(post_delete, sender=BasePolicy)
+@receiver(post_save, sender=HealthPolicy)
+@receiver(post_delete, sender=HealthPolicy)
+@receiver(post_save, sender=FuneralPolicy)
+@receiver(post_delete, sender=FuneralPolicy)
+@receiver(post_save, sender=PolicyFeatures)
+@receiver(post_delete, sender=PolicyFeatures)
+@receiver(post_save, sender=PolicyReview)
+@receiver(post_delete, sender=PolicyReview)
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def bump_catalog_generation_on_change(sender, instance, **kwargs):
+    """
+    Outdate in-memory catalog snapshots when catalog data changes.
+    Bumped again on commit so other processes can't rebuild from pre-commit data.
+    """
+    try:
+        catalog.bump_generation()
+        transaction.on_commit(catalog.bump_generation)
+    except Exception as e:
+        logger.error(f"Error bumping catalog generation: {str(e)}")
+
+
 # System health monitoring signals
 @receiver(post_save, sender=BasePolicy)
 def monitor_system_health_on_policy_change(sender, instance, created, **kwargs):
@@ -255,8 +400,27 @@ def get_cached_validation_errors(model_type, object_id):
     Returns:
         List of validation errors or empty list
     """
-    cache_key = f"{model_type}_validation_errors_{object_id}"
-    return cache.get(cache_key, [])
+    return cache.get(validation_cache_key(model_type, object_id), [])
+
+
+def validation_namespace(model_type):
+    """Cache namespace holding validation errors for one model type."""
+    return f"validation:{model_type}"
+
+
+def validation_cache_key(model_type, object_id, generation=None):
+    """
+    Cache key for an object's validation errors under the current generation
+    of its model type's validation namespace.
+    
+    Args:
+        model_type: 'policy', 'survey', or 'comparison'
+        object_id: ID of the object
+        generation: Namespace generation, if already looked up
+    """
+    if generation is None:
+        generation = CacheNamespaces.generation(validation_namespace(model_type))
+    return f"{model_type}_validation_errors_{generation}_{object_id}"
 
 
 def clear_all_validation_caches():
@@ -265,9 +429,9 @@ def clear_all_validation_caches():
     Useful after system-wide fixes or updates.
     """
     try:
-        # This is a simplified approach - in production you might want
-        # to track cache keys more systematically
-        cache.clear()
+        # Retire every validation entry without flushing unrelated cache data
+        for model_type in ('policy', 'survey', 'comparison'):
+            CacheNamespaces.invalidate(validation_namespace(model_type))
         logger.info("All validation caches cleared")
     except Exception as e:
         logger.error(f"Error clearing validation caches: {str(e)}")
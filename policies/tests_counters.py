@@ -0,0 +1,117 @@
+"""
+Tests for buffered view and comparison counters.
+"""
+
+from decimal import Decimal
+
+from django.test import TestCase
+
+from organizations.models import Organization
+from .counters import BufferedCounter, discard_counters, policy_views, policy_comparisons
+from .models import PolicyCategory, PolicyType, BasePolicy
+
+
+class BufferedCounterTest(TestCase):
+    """Test buffering and delta flushing of policy counters."""
+
+    def setUp(self):
+        """Set up test data."""
+        discard_counters()
+        organization = Organization.objects.create(
+            name="Counter Insurance Co",
+            description="Test insurance company",
+            email="counter@example.com",
+            phone="123-456-7890",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-COUNTER"
+        )
+        category = PolicyCategory.objects.create(
+            name="Health Insurance",
+            slug="health",
+            description="Health insurance policies"
+        )
+        policy_type = PolicyType.objects.create(
+            category=category,
+            name="Comprehensive",
+            slug="comprehensive",
+            description="Comprehensive health coverage"
+        )
+        self.policies = [
+            BasePolicy.objects.create(
+                organization=organization,
+                category=category,
+                policy_type=policy_type,
+                name=f"Test Health Policy {i}",
+                policy_number=f"TEST-00{i}",
+                description="Test health policy description",
+                short_description="Test health policy",
+                base_premium=Decimal('500.00'),
+                coverage_amount=Decimal('100000.00'),
+                minimum_age=18,
+                maximum_age=65,
+                terms_and_conditions="Test terms and conditions"
+            )
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        discard_counters()
+
+    def test_increments_are_buffered(self):
+        """Views are not written per hit but are visible in totals."""
+        policy = self.policies[0]
+
+        with self.assertNumQueries(0):
+            policy.increment_views()
+
+        stored = BasePolicy.objects.get(pk=policy.pk)
+        self.assertEqual(policy.views_count, 1)
+        self.assertEqual(stored.views_count, 0)
+        self.assertEqual(policy_views.total(stored), 1)
+
+    def test_flush_writes_one_update_per_delta(self):
+        """Rows with the same pending delta share one UPDATE."""
+        first, second, third = self.policies
+        for policy, views in ((first, 2), (second, 2), (third, 5)):
+            for _ in range(views):
+                BasePolicy.objects.get(pk=policy.pk).increment_views()
+
+        # Savepoint, two updates and release
+        with self.assertNumQueries(4):
+            self.assertEqual(policy_views.flush(), 3)
+
+        self.assertEqual(
+            dict(BasePolicy.objects.values_list('pk', 'views_count')),
+            {first.pk: 2, second.pk: 2, third.pk: 5}
+        )
+        self.assertEqual(policy_views.pending(first.pk), 0)
+
+    def test_flush_on_size_threshold(self):
+        """Reaching the size threshold writes the buffer."""
+        counter = BufferedCounter('policies.BasePolicy', 'comparison_count')
+        counter.flush_size = 3
+        counter.flush_interval = 3600
+
+        counter.increment(self.policies[0].pk)
+        counter.increment(self.policies[0].pk)
+        self.assertEqual(BasePolicy.objects.get(pk=self.policies[0].pk).comparison_count, 0)
+
+        counter.increment(self.policies[1].pk)
+        self.assertEqual(
+            dict(BasePolicy.objects.filter(comparison_count__gt=0).values_list('pk', 'comparison_count')),
+            {self.policies[0].pk: 2, self.policies[1].pk: 1}
+        )
+
+    def test_discard_counters_drops_buffered_increments(self):
+        """Discarded increments are never written."""
+        self.policies[0].increment_views()
+        self.policies[0].increment_comparisons()
+
+        discard_counters()
+
+        self.assertEqual(policy_views.flush(), 0)
+        self.assertEqual(policy_comparisons.flush(), 0)
+        self.assertEqual(BasePolicy.objects.get(pk=self.policies[0].pk).comparison_count, 0)
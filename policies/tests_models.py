@@ -10,10 +10,11 @@ from decimal import Decimal
 from datetime import date
 
 from organizations.models import Organization
+from .counters import discard_counters
 from .models import (
     PolicyCategory, PolicyType, BasePolicy, PolicyFeatures, 
     AdditionalFeatures, PolicyEligibility, PolicyExclusion,
-    PolicyDocument, PolicyPremiumCalculation, PolicyReview
+    PolicyDocument, PolicyPremiumCalculation, PolicyReview, PolicyReviewStats
 )
 
 User = get_user_model()
@@ -167,6 +168,10 @@ class BasePolicyModelTest(TestCase):
             terms_and_conditions="Test terms and conditions"
         )
     
+    def tearDown(self):
+        """Drop counter increments buffered against the test database."""
+        discard_counters()
+    
     def test_policy_creation(self):
         """Test policy creation and string representation."""
         self.assertEqual(self.policy.name, "Test Health Policy")
@@ -921,4 +926,116 @@ class PolicyReviewModelTest(TestCase):
         # Invalid rating (too high)
         review.rating = 6
         with self.assertRaises(ValidationError):
-            review.full_clean()
\ No newline at end of file
+            review.full_clean()
+
+
+class PolicyReviewStatsModelTest(TestCase):
+    """Test PolicyReviewStats maintenance from review changes."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.organization = Organization.objects.create(
+            name="Stats Insurance Co",
+            description="Test insurance company",
+            email="stats@insurance.com",
+            phone="+268123456789",
+            address_line1="1 Test Street",
+            city="Mbabane",
+            state_province="Hhohho",
+            postal_code="H100",
+            registration_number="REG-STATS"
+        )
+        
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance",
+            slug="health",
+            description="Health insurance policies"
+        )
+        
+        self.policy_type = PolicyType.objects.create(
+            category=self.category,
+            name="Comprehensive",
+            slug="comprehensive",
+            description="Comprehensive health coverage"
+        )
+        
+        self.policy = BasePolicy.objects.create(
+            organization=self.organization,
+            category=self.category,
+            policy_type=self.policy_type,
+            name="Stats Health Policy",
+            policy_number="STATS-001",
+            description="Test health policy",
+            short_description="Test health",
+            base_premium=Decimal('500.00'),
+            coverage_amount=Decimal('100000.00'),
+            minimum_age=18,
+            maximum_age=65,
+            terms_and_conditions="Test terms"
+        )
+        
+        self.users = [
+            User.objects.create_user(username=f'reviewer{i}', password='testpass123')
+            for i in range(3)
+        ]
+    
+    def _review(self, user, rating, is_approved=True):
+        return PolicyReview.objects.create(
+            policy=self.policy,
+            user=user,
+            rating=rating,
+            title="Review",
+            comment="Review comment",
+            is_approved=is_approved
+        )
+    
+    def test_stats_follow_review_saves_and_deletes(self):
+        """Test that stats track approved reviews as they change."""
+        self._review(self.users[0], 5)
+        pending = self._review(self.users[1], 1, is_approved=False)
+        third = self._review(self.users[2], 3)
+        
+        stats = PolicyReviewStats.objects.get(policy=self.policy)
+        self.assertEqual(stats.approved_review_count, 2)
+        self.assertEqual(stats.average_rating, Decimal('4.00'))
+        
+        pending.is_approved = True
+        pending.save()
+        stats.refresh_from_db()
+        self.assertEqual(stats.approved_review_count, 3)
+        self.assertEqual(stats.average_rating, Decimal('3.00'))
+        
+        third.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.approved_review_count, 2)
+        self.assertEqual(stats.average_rating, Decimal('3.00'))
+    
+    def test_deleting_reviewed_policy(self):
+        """Test that a policy with reviews can be deleted along with its stats."""
+        self._review(self.users[0], 5)
+        self._review(self.users[1], 2)
+        self.assertTrue(PolicyReviewStats.objects.filter(policy=self.policy).exists())
+        
+        self.policy.delete()
+        
+        self.assertFalse(BasePolicy.objects.filter(pk=self.policy.pk).exists())
+        self.assertFalse(PolicyReview.objects.exists())
+        self.assertFalse(PolicyReviewStats.objects.exists())
+    
+    def test_review_score_credibility_weighting(self):
+        """Test credibility-adjusted review score."""
+        self.assertEqual(PolicyReviewStats.calculate_review_score(0, None), Decimal('50.00'))
+        self.assertEqual(PolicyReviewStats.calculate_review_score(1, 5), Decimal('87.50'))
+        self.assertEqual(PolicyReviewStats.calculate_review_score(50, 5), Decimal('100.00'))
+    
+    def test_rebuild_all_restores_stats(self):
+        """Test rebuilding stats from the reviews table."""
+        self._review(self.users[0], 4)
+        PolicyReviewStats.objects.all().delete()
+        
+        rebuilt = PolicyReviewStats.rebuild_all()
+        
+        self.assertEqual(rebuilt, 1)
+        stats = PolicyReviewStats.for_policy(BasePolicy.objects.get(pk=self.policy.pk))
+        self.assertEqual(stats.approved_review_count, 1)
+        self.assertEqual(stats.review_score, Decimal('72.50'))
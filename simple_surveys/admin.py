@@ -6,7 +6,7 @@ from django.core.exceptions import ValidationError
 from django.forms import ModelForm, CharField, ChoiceField
 from django import forms
 from .models import (
-    SimpleSurveyQuestion, SimpleSurveyResponse, QuotationSession, SimpleSurvey,
+    SimpleSurveyQuestion, SimpleSurveyResponse, QuotationSession, QuotationResult, SimpleSurvey,
     HOSPITAL_BENEFIT_CHOICES, OUT_HOSPITAL_BENEFIT_CHOICES,
     ANNUAL_LIMIT_FAMILY_RANGES, ANNUAL_LIMIT_MEMBER_RANGES
 )
@@ -673,6 +673,23 @@ class QuotationSessionAdmin(admin.ModelAdmin):
     cleanup_expired.short_description = "Delete expired sessions"
 
 
+@admin.register(QuotationResult)
+class QuotationResultAdmin(admin.ModelAdmin):
+    """Admin interface for QuotationResult"""
+    
+    list_display = ['result_id_short', 'quotation_session', 'created_at', 'expires_at']
+    list_filter = ['created_at', 'expires_at']
+    search_fields = ['result_id', 'quotation_session__session_key']
+    ordering = ['-created_at']
+    raw_id_fields = ['quotation_session']
+    readonly_fields = ['result_id', 'created_at']
+    
+    def result_id_short(self, obj):
+        """Display shortened result ID"""
+        return obj.result_id[:12] + "..." if len(obj.result_id) > 12 else obj.result_id
+    result_id_short.short_description = "Result"
+
+
 # Custom admin site configuration
 admin.site.site_header = "Simple Surveys Administration"
 admin.site.site_title = "Simple Surveys Admin"
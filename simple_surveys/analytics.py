@@ -9,14 +9,15 @@ from typing import Dict, List, Optional, Any
 from django.db import models
 from django.db.models import Count, Avg, Q, F
 from django.utils import timezone
-from django.core.cache import cache
 from collections import defaultdict, Counter
 
+from surveys.cache_codec import encoded_cache
 from .models import (
     SimpleSurveyQuestion, SimpleSurveyResponse, QuotationSession,
     HOSPITAL_BENEFIT_CHOICES, OUT_HOSPITAL_BENEFIT_CHOICES,
     ANNUAL_LIMIT_FAMILY_RANGES, ANNUAL_LIMIT_MEMBER_RANGES
 )
+from .time_series import session_time_series
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,43 @@ logger = logging.getLogger(__name__)
 class SimpleSurveyAnalytics:
     """
     Analytics collector for SimpleSurvey system focusing on benefit levels and ranges.
+    
+    Every report runs a fixed number of grouped queries whatever the length
+    of the period.
     """
     
+    # Questions left out of completion and drop-off analysis
+    EXCLUDED_COMPLETION_FIELDS = ['currently_on_medical_aid', 'medical_aid_status']
+    
     def __init__(self):
         self.cache_timeout = 3600  # 1 hour cache
+        self.time_series = session_time_series
+    
+    def _value_counts(
+        self,
+        category: str,
+        field_names: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[str, Counter]:
+        """
+        Count each response value of several questions with one grouped query.
+        
+        Returns:
+            Counter of response values by question field name
+        """
+        counts = {field_name: Counter() for field_name in field_names}
+        rows = SimpleSurveyResponse.objects.filter(
+            category=category,
+            question__field_name__in=field_names,
+            created_at__gte=start_date,
+            created_at__lte=end_date
+        ).order_by().values('question__field_name', 'response_value').annotate(count=Count('id'))
+        
+        for row in rows:
+            counts[row['question__field_name']][row['response_value']] += row['count']
+        
+        return counts
     
     def get_benefit_level_analytics(self, category: str, days: int = 30) -> Dict[str, Any]:
         """
@@ -43,24 +77,12 @@ class SimpleSurveyAnalytics:
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get responses for benefit level questions
-        hospital_responses = SimpleSurveyResponse.objects.filter(
-            category=category,
-            question__field_name='in_hospital_benefit_level',
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).values_list('response_value', flat=True)
-        
-        out_hospital_responses = SimpleSurveyResponse.objects.filter(
-            category=category,
-            question__field_name='out_hospital_benefit_level',
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).values_list('response_value', flat=True)
-        
         # Count selections for each benefit level
-        hospital_counts = Counter(hospital_responses)
-        out_hospital_counts = Counter(out_hospital_responses)
+        value_counts = self._value_counts(
+            category, ['in_hospital_benefit_level', 'out_hospital_benefit_level'], start_date, end_date
+        )
+        hospital_counts = value_counts['in_hospital_benefit_level']
+        out_hospital_counts = value_counts['out_hospital_benefit_level']
         
         # Get choice labels for display
         hospital_choices_dict = {choice[0]: choice[1] for choice in HOSPITAL_BENEFIT_CHOICES}
@@ -120,24 +142,12 @@ class SimpleSurveyAnalytics:
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get responses for range questions
-        family_responses = SimpleSurveyResponse.objects.filter(
-            category=category,
-            question__field_name='annual_limit_family_range',
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).values_list('response_value', flat=True)
-        
-        member_responses = SimpleSurveyResponse.objects.filter(
-            category=category,
-            question__field_name='annual_limit_member_range',
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        ).values_list('response_value', flat=True)
-        
         # Count selections for each range
-        family_counts = Counter(family_responses)
-        member_counts = Counter(member_responses)
+        value_counts = self._value_counts(
+            category, ['annual_limit_family_range', 'annual_limit_member_range'], start_date, end_date
+        )
+        family_counts = value_counts['annual_limit_family_range']
+        member_counts = value_counts['annual_limit_member_range']
         
         # Get choice labels for display
         family_choices_dict = {choice[0]: choice[1] for choice in ANNUAL_LIMIT_FAMILY_RANGES}
@@ -208,36 +218,46 @@ class SimpleSurveyAnalytics:
         end_date = timezone.now()
         start_date = end_date - timedelta(days=days)
         
-        # Get all sessions in the period
-        sessions = QuotationSession.objects.filter(
+        # Count all and completed sessions in the period
+        session_counts = QuotationSession.objects.filter(
             category=category,
             created_at__gte=start_date,
             created_at__lte=end_date
+        ).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(is_completed=True))
         )
         
-        total_sessions = sessions.count()
-        completed_sessions = sessions.filter(is_completed=True).count()
+        total_sessions = session_counts['total']
+        completed_sessions = session_counts['completed']
         
         # Calculate completion rate
         overall_completion_rate = (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0
         
         # Analyze completion by question type (exclude medical aid questions)
-        question_completion = {}
-        questions = SimpleSurveyQuestion.objects.filter(
+        questions = list(SimpleSurveyQuestion.objects.filter(
             category=category, 
             is_required=True
         ).exclude(
-            field_name__in=['currently_on_medical_aid', 'medical_aid_status']
-        )
+            field_name__in=self.EXCLUDED_COMPLETION_FIELDS
+        ).order_by('display_order'))
         
-        for question in questions:
-            responses_count = SimpleSurveyResponse.objects.filter(
+        # A session answers a question at most once, so response counts are
+        # also the number of sessions that reached each question
+        response_counts = dict(
+            SimpleSurveyResponse.objects.filter(
                 category=category,
-                question=question,
+                question__in=questions,
                 created_at__gte=start_date,
                 created_at__lte=end_date
-            ).count()
-            
+            ).order_by().values('question_id').annotate(
+                count=Count('id')
+            ).values_list('question_id', 'count')
+        ) if questions else {}
+        
+        question_completion = {}
+        for question in questions:
+            responses_count = response_counts.get(question.id, 0)
             completion_rate = (responses_count / total_sessions * 100) if total_sessions > 0 else 0
             
             question_completion[question.field_name] = {
@@ -248,29 +268,10 @@ class SimpleSurveyAnalytics:
             }
         
         # Analyze drop-off points
-        drop_off_analysis = self._analyze_drop_off_points(category, start_date, end_date)
+        drop_off_analysis = self._analyze_drop_off_points(questions, response_counts)
         
         # Daily completion trends
-        daily_trends = []
-        for i in range(days):
-            day_start = start_date + timedelta(days=i)
-            day_end = day_start + timedelta(days=1)
-            
-            day_sessions = sessions.filter(
-                created_at__gte=day_start,
-                created_at__lt=day_end
-            )
-            
-            day_total = day_sessions.count()
-            day_completed = day_sessions.filter(is_completed=True).count()
-            day_completion_rate = (day_completed / day_total * 100) if day_total > 0 else 0
-            
-            daily_trends.append({
-                'date': day_start.date().isoformat(),
-                'total_sessions': day_total,
-                'completed_sessions': day_completed,
-                'completion_rate': round(day_completion_rate, 2)
-            })
+        daily_trends = self.time_series.daily(category, days)
         
         return {
             'category': category,
@@ -318,39 +319,30 @@ class SimpleSurveyAnalytics:
             'generated_at': timezone.now().isoformat()
         }
     
-    def _analyze_drop_off_points(self, category: str, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    def _analyze_drop_off_points(
+        self,
+        questions: List[SimpleSurveyQuestion],
+        response_counts: Dict[int, int]
+    ) -> List[Dict[str, Any]]:
         """
         Analyze where users typically drop off in the survey.
-        """
-        questions = SimpleSurveyQuestion.objects.filter(
-            category=category,
-            is_required=True
-        ).exclude(
-            field_name__in=['currently_on_medical_aid', 'medical_aid_status']
-        ).order_by('display_order')
         
+        Args:
+            questions: Required questions in display order
+            response_counts: Responses in the period by question ID
+        """
         drop_off_points = []
         
         for i, question in enumerate(questions):
             # Count sessions that reached this question
-            sessions_reached = SimpleSurveyResponse.objects.filter(
-                category=category,
-                question=question,
-                created_at__gte=start_date,
-                created_at__lte=end_date
-            ).values('session_key').distinct().count()
+            sessions_reached = response_counts.get(question.id, 0)
             
             # Count sessions that reached the next question (if exists)
             next_question = questions[i + 1] if i + 1 < len(questions) else None
             sessions_continued = 0
             
             if next_question:
-                sessions_continued = SimpleSurveyResponse.objects.filter(
-                    category=category,
-                    question=next_question,
-                    created_at__gte=start_date,
-                    created_at__lte=end_date
-                ).values('session_key').distinct().count()
+                sessions_continued = response_counts.get(next_question.id, 0)
             
             drop_off_rate = 0
             if sessions_reached > 0:
@@ -420,13 +412,13 @@ class SimpleSurveyAnalytics:
         """
         Get cached analytics data.
         """
-        return cache.get(cache_key)
+        return encoded_cache.get(cache_key, prefix='simple_survey_analytics')
     
     def set_cached_analytics(self, cache_key: str, data: Dict[str, Any]) -> None:
         """
         Cache analytics data.
         """
-        cache.set(cache_key, data, self.cache_timeout)
+        encoded_cache.set(cache_key, data, self.cache_timeout, prefix='simple_survey_analytics')
 
 
 class AnalyticsDashboard:
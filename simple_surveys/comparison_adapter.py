@@ -7,16 +7,19 @@ into the format expected by the comparison engine and simplifies the scoring
 algorithm by removing complex survey context features.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 from decimal import Decimal, ROUND_HALF_UP
+from itertools import count, islice
 from django.utils import timezone
 from django.db import models
+from comparison.catalog import get_catalog_snapshot, catalog_queryset
 from comparison.engine import PolicyComparisonEngine
 from comparison.models import ComparisonSession, ComparisonCriteria
-from policies.models import BasePolicy, PolicyCategory
+from policies.models import BasePolicy, PolicyCategory, PolicyReviewStats
 from .models import SimpleSurveyResponse, QuotationSession
 from .engine import SimpleSurveyEngine
 from .response_migration import ResponseMigrationHandler
+import heapq
 import logging
 import uuid
 
@@ -81,15 +84,11 @@ class SimpleSurveyComparisonAdapter:
                     'criteria': criteria
                 }
             
-            # Limit to max_results for performance
-            if len(policy_ids) > max_results * 2:
-                # Get more than needed for better selection
-                policy_ids = policy_ids[:max_results * 2]
-            
-            # Use comparison engine with simplified criteria
-            comparison_result = self.comparison_engine.compare_policies(
+            # Score the full eligible set and keep only the best max_results
+            comparison_result = self.comparison_engine.compare_top_policies(
                 policy_ids=policy_ids,
                 user_criteria=criteria,
+                top_k=max_results,
                 session_key=session_key
             )
             
@@ -469,6 +468,8 @@ class SimpleSurveyComparisonAdapter:
     def _get_eligible_policy_ids(self, criteria: Dict[str, Any]) -> List[int]:
         """
         Get list of policy IDs that are eligible based on basic criteria.
+        Answered from the category's eligibility index when a catalog snapshot
+        is available, otherwise from the database.
         
         Args:
             criteria: Comparison criteria
@@ -477,34 +478,35 @@ class SimpleSurveyComparisonAdapter:
             List of eligible policy IDs
         """
         try:
-            # Get category object
-            category = PolicyCategory.objects.get(slug=self.category)
-            
-            # Base query for active, approved policies
-            queryset = BasePolicy.objects.filter(
-                category=category,
-                is_active=True,
-                approval_status='APPROVED'
-            )
-            
             # Apply basic filtering based on criteria
+            filters = {}
             if 'base_premium' in criteria:
-                max_premium = criteria['base_premium'] * 1.2  # Allow 20% over budget
-                queryset = queryset.filter(base_premium__lte=max_premium)
+                filters['base_premium__lte'] = criteria['base_premium'] * 1.2  # Allow 20% over budget
             
             if 'age' in criteria:
-                age = criteria['age']
-                queryset = queryset.filter(
-                    minimum_age__lte=age,
-                    maximum_age__gte=age
-                )
+                filters['minimum_age__lte'] = criteria['age']
+                filters['maximum_age__gte'] = criteria['age']
             
             if 'coverage_amount' in criteria:
-                min_coverage = criteria['coverage_amount'] * 0.8  # Allow 20% under desired
-                queryset = queryset.filter(coverage_amount__gte=min_coverage)
+                filters['coverage_amount__gte'] = criteria['coverage_amount'] * 0.8  # Allow 20% under desired
             
-            # Order by premium for consistent results
-            policy_ids = list(queryset.order_by('base_premium').values_list('id', flat=True))
+            snapshot = get_catalog_snapshot(self.category, typed=False)
+            if snapshot is not None:
+                # Order by premium for consistent results
+                policy_ids = snapshot.eligibility.eligible_ids(filters, order_by='base_premium')
+            else:
+                # Get category object
+                category = PolicyCategory.objects.get(slug=self.category)
+                
+                # Base query for active, approved policies
+                queryset = BasePolicy.objects.filter(
+                    category=category,
+                    is_active=True,
+                    approval_status='APPROVED'
+                ).filter(**filters)
+                
+                # Order by premium for consistent results
+                policy_ids = list(queryset.order_by('base_premium').values_list('id', flat=True))
             
             logger.info(f"Found {len(policy_ids)} eligible policies for {self.category} category")
             return policy_ids
@@ -769,6 +771,9 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
     REVIEW_WEIGHT = Decimal('0.05')    # 5% - Reduced review weight
     ORGANIZATION_WEIGHT = Decimal('0.05')  # 5% - Reduced organization weight
     
+    # Number of policies loaded and scored at a time by compare_top_policies
+    SCORING_CHUNK_SIZE = 200
+    
     def compare_policies(
         self,
         policy_ids: List[int],
@@ -807,9 +812,6 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
             # Store user criteria (no survey context)
             self.user_criteria = user_criteria
             
-            # Create simplified comparison session
-            session = self._create_simplified_session(policies, user_criteria, user, session_key)
-            
             # Load simplified criteria
             self._load_simplified_criteria(user_criteria)
             
@@ -817,48 +819,172 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
             logger.info(f"Scoring {len(policies)} policies with simplified algorithm")
             results = []
             for policy in policies:
-                try:
-                    score_data = self._score_policy_simplified(policy, user_criteria)
-                    results.append({
-                        'policy': policy,
-                        'score_data': score_data
-                    })
-                except Exception as e:
-                    logger.error(f"Error scoring policy {policy.id}: {str(e)}")
-                    continue
+                scored = self._score_result_simplified(policy, user_criteria)
+                if scored:
+                    results.append(scored)
             
             if not results:
                 return {'error': 'Failed to score policies'}
             
-            # Rank policies by simplified score
-            ranked_results = self._rank_policies_simplified(results)
+            return self._build_simplified_comparison(
+                results, user_criteria, user, session_key, total_policies=len(policies)
+            )
+            
+        except Exception as e:
+            logger.error(f"Simplified comparison engine error: {str(e)}")
+            return {'error': f'Comparison failed: {str(e)}'}
+    
+    def compare_top_policies(
+        self,
+        policy_ids: Iterable[int],
+        user_criteria: Dict[str, Any],
+        top_k: int = 5,
+        user=None,
+        session_key: str = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Score every policy in policy_ids and return only the top_k best matches.
+        
+        Policies are loaded and scored in chunks and only the top_k results are
+        kept in a bounded heap, so memory use does not grow with catalog size.
+        
+        Args:
+            policy_ids: Iterable of candidate policy IDs (e.g. the full eligible set)
+            user_criteria: Dictionary of user preferences and criteria
+            top_k: Number of best-scoring policies to keep
+            user: User object (optional for anonymous)
+            session_key: Session key for anonymous users
+            chunk_size: Policies loaded per query (defaults to SCORING_CHUNK_SIZE)
+            
+        Returns:
+            Dictionary with comparison results for the top_k policies
+        """
+        try:
+            if top_k < 1:
+                return {'error': 'At least 1 result must be requested'}
+            
+            self.user_criteria = user_criteria
+            self._load_simplified_criteria(user_criteria)
             
-            # Generate simplified analysis
-            analysis = self._generate_simplified_analysis(ranked_results, user_criteria)
+            results, scored_count = self._select_top_results(
+                policy_ids, user_criteria, top_k, chunk_size or self.SCORING_CHUNK_SIZE
+            )
             
-            # Save results to session
-            self._save_simplified_results(session, ranked_results)
+            if not results:
+                return {'error': 'No valid policies found for comparison'}
             
-            return {
-                'success': True,
-                'session_id': session.id,
-                'session_key': session.session_key,
-                'category': session.category.name,
-                'total_policies': len(policies),
-                'best_match': ranked_results[0]['policy'] if ranked_results else None,
-                'results': ranked_results,
-                'analysis': analysis,
-                'created_at': session.created_at,
-                'simplified_engine': True  # Flag to indicate simplified processing
-            }
+            logger.info(f"Selected top {len(results)} of {scored_count} scored policies")
+            
+            return self._build_simplified_comparison(
+                results, user_criteria, user, session_key, total_policies=scored_count
+            )
             
         except Exception as e:
-            logger.error(f"Simplified comparison engine error: {str(e)}")
+            logger.error(f"Simplified top-K comparison error: {str(e)}")
             return {'error': f'Comparison failed: {str(e)}'}
     
+    def _select_top_results(
+        self,
+        policy_ids: Iterable[int],
+        user_criteria: Dict[str, Any],
+        top_k: int,
+        chunk_size: int
+    ) -> tuple:
+        """
+        Stream policies in chunks and keep the top_k scored results in a min-heap.
+        
+        Ties on overall score go to the policy that appears first in policy_ids.
+        
+        Returns:
+            Tuple of (results in candidate order of arrival, number of policies scored)
+        """
+        heap = []
+        sequence = count()
+        scored_count = 0
+        ids = iter(policy_ids)
+        
+        while True:
+            chunk = list(islice(ids, chunk_size))
+            if not chunk:
+                break
+            
+            position = {policy_id: i for i, policy_id in enumerate(chunk)}
+            policies = sorted(
+                self._get_policies_simplified(chunk),
+                key=lambda policy: position[policy.id]
+            )
+            
+            for policy in policies:
+                scored = self._score_result_simplified(policy, user_criteria)
+                if not scored:
+                    continue
+                
+                scored_count += 1
+                entry = (scored['score_data']['overall_score'], -next(sequence), scored)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
+        
+        # Restore arrival order so ranking ties resolve as in compare_policies
+        ordered = sorted(heap, key=lambda entry: -entry[1])
+        return [entry[2] for entry in ordered], scored_count
+    
+    def _score_result_simplified(
+        self,
+        policy: BasePolicy,
+        user_criteria: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Score a single policy, returning None if scoring fails."""
+        try:
+            return {
+                'policy': policy,
+                'score_data': self._score_policy_simplified(policy, user_criteria)
+            }
+        except Exception as e:
+            logger.error(f"Error scoring policy {policy.id}: {str(e)}")
+            return None
+    
+    def _build_simplified_comparison(
+        self,
+        results: List[Dict],
+        user_criteria: Dict[str, Any],
+        user,
+        session_key: str,
+        total_policies: int
+    ) -> Dict[str, Any]:
+        """Rank scored results, persist them to a session and build the response."""
+        policies = [result['policy'] for result in results]
+        
+        # Create simplified comparison session
+        session = self._create_simplified_session(policies, user_criteria, user, session_key)
+        
+        # Rank policies by simplified score
+        ranked_results = self._rank_policies_simplified(results)
+        
+        # Generate simplified analysis
+        analysis = self._generate_simplified_analysis(ranked_results, user_criteria)
+        
+        # Save results to session
+        self._save_simplified_results(session, ranked_results)
+        
+        return {
+            'success': True,
+            'session_id': session.id,
+            'session_key': session.session_key,
+            'category': session.category.name,
+            'total_policies': total_policies,
+            'best_match': ranked_results[0]['policy'] if ranked_results else None,
+            'results': ranked_results,
+            'analysis': analysis,
+            'created_at': session.created_at,
+            'simplified_engine': True  # Flag to indicate simplified processing
+        }
+    
     def _get_policies_simplified(self, policy_ids: List[int]) -> List[BasePolicy]:
         """
-        Get policies with minimal prefetching for performance.
+        Get policies from the in-memory catalog snapshot.
         
         Args:
             policy_ids: List of policy IDs
@@ -866,18 +992,21 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
         Returns:
             List of BasePolicy instances with essential relations loaded
         """
-        base_query = {
-            'id__in': policy_ids,
-            'is_active': True,
-            'approval_status': 'APPROVED'
-        }
-        
-        # Use base policy model with minimal prefetching
-        policies = BasePolicy.objects.filter(**base_query).select_related(
-            'organization', 'category', 'policy_type'
-        ).prefetch_related('policy_features')
+        # Serve from the category's catalog snapshot of base policies
+        self.catalog_snapshot = get_catalog_snapshot(self.category_slug, typed=False)
+        if self.catalog_snapshot is None:
+            return list(catalog_queryset(self.category_slug, typed=False).filter(id__in=policy_ids))
+        
+        policies = self.catalog_snapshot.get_policies(policy_ids)
+        
+        # Load anything outside the snapshot from the database
+        missing_ids = [policy_id for policy_id in policy_ids if policy_id not in self.catalog_snapshot]
+        if missing_ids:
+            policies.extend(
+                catalog_queryset(self.category_slug, typed=False).filter(id__in=missing_ids)
+            )
         
-        return list(policies)
+        return policies
     
     def _create_simplified_session(
         self,
@@ -1150,14 +1279,10 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
     def _calculate_simplified_review_score(self, policy: BasePolicy) -> Decimal:
         """Simplified review scoring - basic average if available."""
         try:
-            if hasattr(policy, 'reviews') and policy.reviews.exists():
-                avg_rating = policy.reviews.aggregate(
-                    avg_rating=models.Avg('rating')
-                )['avg_rating']
-                
-                if avg_rating:
-                    # Convert 1-5 rating to 0-100 score
-                    return Decimal(str((avg_rating - 1) * 25))
+            stats = PolicyReviewStats.for_policy(policy)
+            if stats.approved_review_count and stats.average_rating:
+                # Convert 1-5 rating to 0-100 score
+                return (stats.average_rating - 1) * 25
             
             # Default score if no reviews
             return Decimal('60')
@@ -1265,13 +1390,12 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
         try:
             # Import here to avoid circular imports
             from comparison.models import ComparisonResult
+            from comparison.result_writer import ComparisonResultWriter
             
-            # Clear existing results
-            session.results.all().delete()
-            
-            # Save new results
+            # Replace existing results with one bulk insert
+            writer = ComparisonResultWriter(ComparisonResult, unique_fields=['session', 'policy'])
             for result in ranked_results:
-                ComparisonResult.objects.create(
+                writer.add(ComparisonResult(
                     session=session,
                     policy=result['policy'],
                     overall_score=result['score_data']['overall_score'],
@@ -1280,7 +1404,8 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
                     pros=result.get('pros', []),
                     cons=result.get('cons', []),
                     recommendation_reason=f"Simplified scoring: {result['score_data']['overall_score']:.1f}% match"
-                )
+                ))
+            writer.flush(stale=session.results.all())
             
             # Update session
             if ranked_results:
@@ -1299,7 +1424,8 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
         self,
         policy: BasePolicy,
         user_criteria: Dict[str, Any],
-        survey_context: Dict[str, Any]
+        survey_context: Dict[str, Any],
+        base_score_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Override to use simplified scoring instead of survey-enhanced scoring.
@@ -1308,6 +1434,7 @@ class SimplifiedPolicyComparisonEngine(PolicyComparisonEngine):
             policy: Policy to score
             user_criteria: User criteria
             survey_context: Ignored in simplified version
+            base_score_data: Ignored in simplified version
             
         Returns:
             Simplified score data without survey enhancements
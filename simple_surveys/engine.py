@@ -10,6 +10,8 @@ This module provides the core SimpleSurveyEngine class that handles:
 
 from typing import List, Dict, Any, Optional
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
 from .models import SimpleSurveyQuestion, SimpleSurveyResponse, QuotationSession
 import logging
@@ -43,6 +45,9 @@ class SimpleSurveyEngine:
         
         self.category = category
         self.questions = self._load_questions()
+        self._questions_by_id = {question.id: question for question in self.questions}
+        # Answered counts by session key, loaded once and kept current by save_response
+        self._answered_counts: Dict[str, Dict[str, int]] = {}
         logger.info(f"SimpleSurveyEngine initialized for category: {category}")
     
     def _load_questions(self) -> List[SimpleSurveyQuestion]:
@@ -53,9 +58,9 @@ class SimpleSurveyEngine:
             List of SimpleSurveyQuestion objects ordered by display_order
         """
         try:
-            questions = SimpleSurveyQuestion.objects.for_category(self.category)
-            logger.debug(f"Loaded {questions.count()} questions for category: {self.category}")
-            return list(questions)
+            questions = list(SimpleSurveyQuestion.objects.for_category(self.category))
+            logger.debug(f"Loaded {len(questions)} questions for category: {self.category}")
+            return questions
         except Exception as e:
             logger.error(f"Error loading questions for category {self.category}: {e}")
             return []
@@ -102,7 +107,7 @@ class SimpleSurveyEngine:
             SimpleSurveyQuestion instance or None if not found
         """
         try:
-            return next((q for q in self.questions if q.id == question_id), None)
+            return self._questions_by_id.get(question_id)
         except Exception as e:
             logger.error(f"Error getting question {question_id}: {e}")
             return None
@@ -233,6 +238,12 @@ class SimpleSurveyEngine:
                 }
             )
             
+            if created and session_key in self._answered_counts:
+                counts = self._answered_counts[session_key]
+                counts['answered_total'] += 1
+                if self._get_question(question_id).is_required:
+                    counts['answered_required'] += 1
+            
             action = "created" if created else "updated"
             logger.info(f"Response {action} for session {session_key[:8]}, question {question_id}")
             
@@ -250,6 +261,76 @@ class SimpleSurveyEngine:
                 'response_id': None
             }
     
+    def save_responses(self, session_key: str, answers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate and save a batch of responses.
+        
+        Answers are validated against the loaded questions, then the valid ones
+        are upserted with one bulk statement in a single transaction. Invalid
+        answers are reported and not saved; a question answered more than once
+        keeps its last answer.
+        
+        Args:
+            session_key: Session identifier for the user
+            answers: Dictionaries with 'question_id' and 'response_value'
+            
+        Returns:
+            Dictionary with save results:
+            {
+                'success': bool (True if every answer was saved),
+                'errors': Dict[int, List[str]] (by question ID),
+                'response_ids': Dict[int, int] (by question ID)
+            }
+        """
+        errors = {}
+        responses = {}
+        for answer in answers:
+            question_id = answer.get('question_id')
+            validation_result = self.validate_response(question_id, answer.get('response_value'))
+            
+            if not validation_result['is_valid']:
+                errors[question_id] = validation_result['errors']
+                responses.pop(question_id, None)
+                continue
+            
+            errors.pop(question_id, None)
+            responses[question_id] = SimpleSurveyResponse(
+                session_key=session_key,
+                question_id=question_id,
+                category=self.category,
+                response_value=validation_result['cleaned_value']
+            )
+        
+        response_ids = {}
+        if responses:
+            try:
+                with transaction.atomic():
+                    SimpleSurveyResponse.objects.bulk_create(
+                        list(responses.values()),
+                        update_conflicts=True,
+                        unique_fields=['session_key', 'question'],
+                        update_fields=['category', 'response_value', 'updated_at']
+                    )
+            except Exception as e:
+                logger.error(f"Error saving {len(responses)} responses for session {session_key}: {e}")
+                errors.update({question_id: ['Failed to save response'] for question_id in responses})
+                return {
+                    'success': False,
+                    'errors': errors,
+                    'response_ids': {}
+                }
+            
+            # Created and updated answers are not told apart; recount once on next use
+            self._answered_counts.pop(session_key, None)
+            response_ids = {question_id: response.pk for question_id, response in responses.items()}
+            logger.info(f"Saved {len(responses)} responses for session {session_key[:8]}")
+        
+        return {
+            'success': not errors,
+            'errors': errors,
+            'response_ids': response_ids
+        }
+    
     def get_session_responses(self, session_key: str) -> Dict[str, Any]:
         """
         Get all responses for a session.
@@ -332,6 +413,31 @@ class SimpleSurveyEngine:
                 }
             }
     
+    def _count_answered(self, session_key: str) -> Dict[str, int]:
+        """
+        Count a session's answered questions, in total and required.
+        
+        Counted in one query the first time, then kept current by save_response
+        as answers are added through this engine.
+        
+        Args:
+            session_key: Session identifier
+            
+        Returns:
+            Dictionary with 'answered_total' and 'answered_required'
+        """
+        counts = self._answered_counts.get(session_key)
+        if counts is None:
+            counts = SimpleSurveyResponse.objects.filter(
+                session_key=session_key,
+                category=self.category
+            ).aggregate(
+                answered_total=Count('id'),
+                answered_required=Count('id', filter=Q(question__is_required=True))
+            )
+            self._answered_counts[session_key] = counts
+        return counts
+    
     def is_survey_complete(self, session_key: str) -> bool:
         """
         Check if all required questions have been answered for a session.
@@ -343,18 +449,11 @@ class SimpleSurveyEngine:
             True if all required questions are answered, False otherwise
         """
         try:
-            # Get count of required questions
-            required_count = SimpleSurveyQuestion.objects.filter(
-                category=self.category,
-                is_required=True
-            ).count()
+            # Required questions come from the loaded questions
+            required_count = sum(1 for q in self.questions if q.is_required)
             
             # Get count of answered required questions
-            answered_count = SimpleSurveyResponse.objects.filter(
-                session_key=session_key,
-                category=self.category,
-                question__is_required=True
-            ).count()
+            answered_count = self._count_answered(session_key)['answered_required']
             
             is_complete = answered_count >= required_count
             logger.debug(f"Survey completion check for {session_key[:8]}: {answered_count}/{required_count} = {is_complete}")
@@ -379,12 +478,9 @@ class SimpleSurveyEngine:
             total_questions = len(self.questions)
             required_questions = sum(1 for q in self.questions if q.is_required)
             
-            responses = SimpleSurveyResponse.objects.for_session_category(
-                session_key, self.category
-            )
-            
-            answered_total = responses.count()
-            answered_required = responses.filter(question__is_required=True).count()
+            answered = self._count_answered(session_key)
+            answered_total = answered['answered_total']
+            answered_required = answered['answered_required']
             
             is_complete = answered_required >= required_questions
             
@@ -1,6 +1,10 @@
 """
 Management command to clean up expired survey sessions and associated data.
-This command should be run periodically (e.g., via cron job) to maintain database cleanliness.
+This command should be run periodically (e.g., via cron job) to maintain database cleanliness:
+
+    */15 * * * * python manage.py cleanup_expired_sessions --force --verbosity 0
+
+Concurrent runs are safe; only one of them deletes at a time.
 """
 
 from django.core.management.base import BaseCommand, CommandError
@@ -8,6 +12,7 @@ from django.utils import timezone
 from datetime import timedelta
 import logging
 
+from simple_surveys.reaper import ExpiredSessionReaper
 from simple_surveys.session_manager import SessionManager
 
 logger = logging.getLogger(__name__)
@@ -20,8 +25,8 @@ class Command(BaseCommand):
         parser.add_argument(
             '--batch-size',
             type=int,
-            default=100,
-            help='Number of sessions to process in each batch (default: 100)'
+            default=1000,
+            help='Number of rows to delete per statement (default: 1000)'
         )
         
         parser.add_argument(
@@ -76,17 +81,20 @@ class Command(BaseCommand):
             if stats_only:
                 return
             
-            # Calculate cutoff time if older_than_hours is specified
-            cutoff_time = None
+            # Rows that expired before the cutoff are deleted
+            cutoff_time = timezone.now()
             if older_than_hours > 0:
-                cutoff_time = timezone.now() - timedelta(hours=older_than_hours)
+                cutoff_time -= timedelta(hours=older_than_hours)
                 self.stdout.write(
-                    f"Only cleaning sessions older than {older_than_hours} hours "
+                    f"Only cleaning sessions expired more than {older_than_hours} hours ago "
                     f"(before {cutoff_time.strftime('%Y-%m-%d %H:%M:%S')})"
                 )
             
+            reaper = ExpiredSessionReaper(chunk_size=batch_size)
+            
             # Check if there's anything to clean up
-            expired_count = stats['quotation_sessions']['expired']
+            expired_counts = reaper.count_expired(cutoff_time)
+            expired_count = sum(expired_counts.values())
             if expired_count == 0:
                 self.stdout.write(self.style.SUCCESS('No expired sessions to clean up.'))
                 return
@@ -104,42 +112,21 @@ class Command(BaseCommand):
             # Perform cleanup
             if dry_run:
                 self.stdout.write(self.style.WARNING('\n=== DRY RUN MODE ==='))
-                self.stdout.write(f"Would clean up {expired_count} expired sessions")
+                for name, count in expired_counts.items():
+                    self.stdout.write(f"Would clean up {count} expired {name.replace('_', ' ')}")
             else:
                 self.stdout.write(self.style.SUCCESS('\n=== Starting Cleanup ==='))
                 
-                total_stats = {
-                    'quotation_sessions_deleted': 0,
-                    'responses_deleted': 0,
-                    'django_sessions_deleted': 0,
-                    'errors': []
-                }
+                metrics = reaper.run(cutoff=cutoff_time)
                 
-                # Process in batches
-                processed = 0
-                while processed < expired_count:
-                    batch_stats = SessionManager.cleanup_expired_sessions(batch_size)
-                    
-                    # Accumulate stats
-                    total_stats['quotation_sessions_deleted'] += batch_stats['quotation_sessions_deleted']
-                    total_stats['responses_deleted'] += batch_stats['responses_deleted']
-                    total_stats['django_sessions_deleted'] += batch_stats['django_sessions_deleted']
-                    total_stats['errors'].extend(batch_stats['errors'])
-                    
-                    processed += batch_stats['quotation_sessions_deleted']
-                    
-                    if batch_stats['quotation_sessions_deleted'] == 0:
-                        # No more sessions to process
-                        break
-                    
-                    if options['verbosity'] >= 1:
-                        self.stdout.write(
-                            f"Processed batch: {batch_stats['quotation_sessions_deleted']} sessions, "
-                            f"{batch_stats['responses_deleted']} responses"
-                        )
+                if not metrics['lock_acquired']:
+                    self.stdout.write(self.style.WARNING(
+                        'Another cleanup is already running; nothing was deleted.'
+                    ))
+                    return
                 
                 # Display final results
-                self._display_cleanup_results(total_stats)
+                self._display_cleanup_results(metrics)
         
         except KeyboardInterrupt:
             self.stdout.write(self.style.ERROR('\nCleanup interrupted by user.'))
@@ -167,17 +154,18 @@ class Command(BaseCommand):
         
         self.stdout.write(f"\nTimestamp: {stats['timestamp']}")
     
-    def _display_cleanup_results(self, stats):
+    def _display_cleanup_results(self, metrics):
         """Display cleanup results."""
         self.stdout.write(self.style.SUCCESS('\n=== Cleanup Results ==='))
         
-        self.stdout.write(f"Quotation sessions deleted: {stats['quotation_sessions_deleted']}")
-        self.stdout.write(f"Survey responses deleted: {stats['responses_deleted']}")
-        self.stdout.write(f"Django sessions deleted: {stats['django_sessions_deleted']}")
+        self.stdout.write(f"Comparison sessions marked expired: {metrics['expired']}")
+        for label, count in sorted(metrics['deleted'].items()):
+            self.stdout.write(f"{label} deleted: {count}")
+        self.stdout.write(f"Chunks: {metrics['chunks']} in {metrics['duration_seconds']}s")
         
-        if stats['errors']:
-            self.stdout.write(self.style.ERROR(f"\nErrors encountered: {len(stats['errors'])}"))
-            for error in stats['errors']:
+        if metrics['errors']:
+            self.stdout.write(self.style.ERROR(f"\nErrors encountered: {len(metrics['errors'])}"))
+            for error in metrics['errors']:
                 self.stdout.write(self.style.ERROR(f"  - {error}"))
         else:
             self.stdout.write(self.style.SUCCESS("No errors encountered."))
@@ -1,7 +1,11 @@
 """
-Middleware for handling session validation and cleanup in simple surveys.
+Middleware for handling session validation and expiry in simple surveys.
+Expired sessions are removed by the cleanup_expired_sessions management command.
 """
 
+import json
+import re
+
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -15,57 +19,116 @@ from .models import QuotationSession
 logger = logging.getLogger(__name__)
 
 
-class SessionValidationMiddleware(MiddlewareMixin):
+class SurveySessionMiddleware(MiddlewareMixin):
     """
-    Middleware to validate and clean up expired sessions for simple survey views.
+    Session handling for simple survey views.
     
     This middleware:
-    1. Validates sessions for simple survey URLs
-    2. Cleans up expired sessions automatically
-    3. Handles session validation errors gracefully
+    1. Ensures a Django session exists on survey entry pages and cleans up
+       its expired quotation sessions
+    2. Validates the quotation session on protected URLs
+    3. Extends the quotation session expiry after successful survey requests
+    
+    Paths are matched against ROUTES through one precompiled pattern, longest
+    prefix first. Extensions go through SessionManager.extend_session, which
+    only writes when the session is close to expiring, so regular survey
+    traffic causes no extra database writes.
+    
+    Not listed in settings.MIDDLEWARE; deployments serving the survey under
+    the /simple-surveys/ prefix enable it after SessionMiddleware.
     """
     
-    # URLs that require session validation
-    PROTECTED_URLS = [
-        '/simple-surveys/save-response/',
-        '/simple-surveys/health/process/',
-        '/simple-surveys/funeral/process/',
-        '/simple-surveys/health/status/',
-        '/simple-surveys/funeral/status/',
+    CREATE = 'create'
+    VALIDATE = 'validate'
+    
+    # (path prefix, action, category); category None is read from the request
+    ROUTES = [
+        ('/simple-surveys/save-response/', VALIDATE, None),
+        ('/simple-surveys/health/process/', VALIDATE, 'health'),
+        ('/simple-surveys/funeral/process/', VALIDATE, 'funeral'),
+        ('/simple-surveys/health/status/', VALIDATE, 'health'),
+        ('/simple-surveys/funeral/status/', VALIDATE, 'funeral'),
+        ('/simple-surveys/health/', CREATE, 'health'),
+        ('/simple-surveys/funeral/', CREATE, 'funeral'),
     ]
     
-    # URLs that should create sessions if they don't exist
-    SESSION_CREATION_URLS = [
-        '/simple-surveys/health/',
-        '/simple-surveys/funeral/',
-    ]
+    validate_sessions = True
+    extend_sessions = True
+    
+    def __init__(self, get_response):
+        """Initialize middleware and compile the route table."""
+        super().__init__(get_response)
+        self._routes = sorted(self.ROUTES, key=lambda route: len(route[0]), reverse=True)
+        self._pattern = re.compile('|'.join(
+            f'(?P<route{index}>{re.escape(prefix)})'
+            for index, (prefix, action, category) in enumerate(self._routes)
+        ))
+    
+    def match_route(self, path):
+        """
+        Find the route for a path.
+        
+        Returns:
+            tuple: (prefix, action, category), or None for non-survey paths
+        """
+        match = self._pattern.match(path)
+        if not match:
+            return None
+        return self._routes[int(match.lastgroup[len('route'):])]
     
     def process_request(self, request):
         """Process incoming request for session validation."""
-        path = request.path
-        
-        # Skip non-survey URLs
-        if not path.startswith('/simple-surveys/'):
+        if not self.validate_sessions:
             return None
         
-        # Handle session creation URLs
-        if any(path.startswith(url) for url in self.SESSION_CREATION_URLS):
-            return self._handle_session_creation(request, path)
+        route = self.match_route(request.path)
+        if route is None:
+            return None
         
-        # Handle protected URLs
-        if any(path.startswith(url) for url in self.PROTECTED_URLS):
-            return self._handle_protected_url(request, path)
+        request.survey_session_route = route
+        prefix, action, category = route
         
-        return None
+        if action == self.CREATE:
+            return self._handle_session_creation(request)
+        return self._handle_protected_url(request, request.path, category)
     
-    def _handle_session_creation(self, request, path):
-        """Handle URLs that should create sessions."""
+    def process_response(self, request, response):
+        """Extend session expiry after successful requests."""
+        if not self.extend_sessions:
+            return response
+        
         try:
-            # Extract category from path
-            category = self._extract_category_from_path(path)
+            # Only extend for successful responses
+            if response.status_code >= 400:
+                return response
+            
+            route = getattr(request, 'survey_session_route', None) or self.match_route(request.path)
+            if route is None:
+                return response
+            
+            session_key = request.session.session_key
+            if not session_key:
+                return response
+            
+            quotation_session = getattr(request, 'quotation_session', None)
+            category = route[2] or (quotation_session.category if quotation_session else None)
             if not category:
-                return None
+                return response
             
+            if quotation_session is not None and quotation_session.category != category:
+                quotation_session = None
+            
+            SessionManager.extend_session(session_key, category, quotation_session=quotation_session)
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error in session extension middleware: {e}")
+            return response
+    
+    def _handle_session_creation(self, request):
+        """Handle URLs that should create sessions."""
+        try:
             # Ensure session exists
             if not request.session.session_key:
                 request.session.create()
@@ -79,7 +142,7 @@ class SessionValidationMiddleware(MiddlewareMixin):
             logger.error(f"Error in session creation middleware: {e}")
             return None
     
-    def _handle_protected_url(self, request, path):
+    def _handle_protected_url(self, request, path, category):
         """Handle URLs that require valid sessions."""
         try:
             session_key = request.session.session_key
@@ -88,8 +151,8 @@ class SessionValidationMiddleware(MiddlewareMixin):
             if not session_key:
                 return self._handle_no_session(request, path)
             
-            # Extract category from request data or path
-            category = self._extract_category_from_request(request, path)
+            # Fall back to request data when the route has no category
+            category = category or self._extract_category_from_request(request)
             if not category:
                 return None  # Let the view handle category validation
             
@@ -108,25 +171,11 @@ class SessionValidationMiddleware(MiddlewareMixin):
             logger.error(f"Error in session validation middleware: {e}")
             return None
     
-    def _extract_category_from_path(self, path):
-        """Extract category from URL path."""
-        if '/health/' in path:
-            return 'health'
-        elif '/funeral/' in path:
-            return 'funeral'
-        return None
-    
-    def _extract_category_from_request(self, request, path):
-        """Extract category from request data or path."""
-        # Try to get from path first
-        category = self._extract_category_from_path(path)
-        if category:
-            return category
-        
+    def _extract_category_from_request(self, request):
+        """Extract category from request data."""
         # Try to get from POST data for AJAX requests
         if request.method == 'POST':
             try:
-                import json
                 if hasattr(request, 'body'):
                     data = json.loads(request.body)
                     return data.get('category')
@@ -182,125 +231,19 @@ class SessionValidationMiddleware(MiddlewareMixin):
             logger.error(f"Error cleaning up expired sessions for {session_key[:8]}: {e}")
 
 
-class SessionExtensionMiddleware(MiddlewareMixin):
+class SessionValidationMiddleware(SurveySessionMiddleware):
     """
-    Middleware to automatically extend session expiry on activity.
-    
-    This middleware extends the session expiry time whenever a user
-    makes a request to survey-related URLs, keeping active users' sessions alive.
+    Session creation and validation only.
+    Kept for settings that list it; use SurveySessionMiddleware instead.
     """
     
-    # URLs that should extend session expiry
-    ACTIVITY_URLS = [
-        '/simple-surveys/save-response/',
-        '/simple-surveys/health/',
-        '/simple-surveys/funeral/',
-        '/simple-surveys/health/status/',
-        '/simple-surveys/funeral/status/',
-    ]
-    
-    def process_response(self, request, response):
-        """Extend session expiry after successful requests."""
-        try:
-            path = request.path
-            
-            # Only extend for survey URLs
-            if not any(path.startswith(url) for url in self.ACTIVITY_URLS):
-                return response
-            
-            # Only extend for successful responses
-            if response.status_code >= 400:
-                return response
-            
-            # Get session and category
-            session_key = request.session.session_key
-            if not session_key:
-                return response
-            
-            category = self._extract_category_from_request(request, path)
-            if not category:
-                return response
-            
-            # Extend session expiry
-            SessionManager.extend_session(session_key, category)
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error in session extension middleware: {e}")
-            return response
-    
-    def _extract_category_from_request(self, request, path):
-        """Extract category from request."""
-        # Try path first
-        if '/health/' in path:
-            return 'health'
-        elif '/funeral/' in path:
-            return 'funeral'
-        
-        # Try request data
-        if hasattr(request, 'quotation_session'):
-            return request.quotation_session.category
-        
-        return None
+    extend_sessions = False
 
 
-class SessionCleanupMiddleware(MiddlewareMixin):
+class SessionExtensionMiddleware(SurveySessionMiddleware):
     """
-    Middleware to periodically trigger session cleanup.
-    
-    This middleware triggers automatic cleanup of expired sessions
-    on a subset of requests to avoid performance impact.
+    Session expiry extension only.
+    Kept for settings that list it; use SurveySessionMiddleware instead.
     """
     
-    # Cleanup probability (1 in N requests will trigger cleanup)
-    CLEANUP_PROBABILITY = 100
-    
-    def __init__(self, get_response):
-        """Initialize middleware."""
-        super().__init__(get_response)
-        self._request_count = 0
-    
-    def process_request(self, request):
-        """Periodically trigger session cleanup."""
-        try:
-            # Only cleanup on survey requests
-            if not request.path.startswith('/simple-surveys/'):
-                return None
-            
-            self._request_count += 1
-            
-            # Trigger cleanup based on probability
-            if self._request_count % self.CLEANUP_PROBABILITY == 0:
-                logger.info("Triggering periodic session cleanup")
-                
-                # Run cleanup in background (non-blocking)
-                from threading import Thread
-                cleanup_thread = Thread(
-                    target=self._background_cleanup,
-                    daemon=True
-                )
-                cleanup_thread.start()
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error in session cleanup middleware: {e}")
-            return None
-    
-    def _background_cleanup(self):
-        """Run session cleanup in background."""
-        try:
-            stats = SessionManager.cleanup_expired_sessions(batch_size=50)
-            
-            if stats['quotation_sessions_deleted'] > 0:
-                logger.info(
-                    f"Background cleanup: {stats['quotation_sessions_deleted']} sessions, "
-                    f"{stats['responses_deleted']} responses deleted"
-                )
-            
-            if stats['errors']:
-                logger.warning(f"Background cleanup errors: {len(stats['errors'])}")
-                
-        except Exception as e:
-            logger.error(f"Error in background session cleanup: {e}")
\ No newline at end of file
+    validate_sessions = False
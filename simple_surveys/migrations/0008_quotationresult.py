@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-16 20:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("simple_surveys", "0007_merge_20260128_0727"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuotationResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "result_id",
+                    models.CharField(
+                        help_text="Opaque identifier stored in the user's session",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Quotations, criteria and metadata shown on the results page",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        help_text="Time after which the result is no longer served"
+                    ),
+                ),
+                (
+                    "quotation_session",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Quotation session the result was generated for",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="simple_surveys.quotationsession",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["expires_at"], name="simple_surv_expires_fe5aad_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -368,6 +368,44 @@ class QuotationSession(models.Model):
         return int((completed / total_required) * 100)
 
 
+class QuotationResult(models.Model):
+    """Persisted quotation payload, looked up by an opaque result ID kept in the session"""
+
+    result_id = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Opaque identifier stored in the user's session"
+    )
+    quotation_session = models.ForeignKey(
+        QuotationSession,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='results',
+        help_text="Quotation session the result was generated for"
+    )
+    payload = models.JSONField(
+        default=dict,
+        help_text="Quotations, criteria and metadata shown on the results page"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(
+        help_text="Time after which the result is no longer served"
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"Result {self.result_id[:8]}"
+
+    def is_expired(self):
+        """Check if the result has expired"""
+        return timezone.now() > self.expires_at
+
+
 class SimpleSurvey(models.Model):
     """
     Simplified survey focusing only on policy features and contact info.
@@ -0,0 +1,271 @@
+"""
+Expired session reaper.
+Marks expired comparison sessions EXPIRED and deletes expired quotation
+sessions with their responses, anonymous comparison sessions and Django
+sessions in chunked set-based statements. Runs from the
+cleanup_expired_sessions management command, one worker at a time.
+"""
+
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.db.models import Q
+from django.utils import timezone
+import logging
+
+from comparison.models import ComparisonSession
+from .models import QuotationSession, SimpleSurveyResponse, QuotationResult
+
+logger = logging.getLogger(__name__)
+
+
+class ReaperBusy(Exception):
+    """Raised when another reaper holds the lock."""
+
+
+class ReaperLock:
+    """
+    Lock ensuring only one reaper runs at a time across workers.
+
+    On PostgreSQL it is a transaction-level advisory lock, taken inside each
+    chunk's transaction and released by its commit or rollback. A session
+    lock would stay on the server connection when the pooler (PgBouncer in
+    transaction mode) or a persistent connection outlives the run. Other
+    databases use an atomic cache add held for the whole run.
+    """
+
+    ADVISORY_LOCK_ID = 0x51A5E55  # Arbitrary constant identifying the reaper
+    CACHE_KEY = 'session_reaper:lock'
+
+    def __init__(self, timeout: int = 3600):
+        self.timeout = timeout
+        self._token = None
+
+    @property
+    def per_transaction(self) -> bool:
+        """Whether the lock only lasts for the current transaction."""
+        return connection.vendor == 'postgresql'
+
+    def acquire(self) -> bool:
+        """
+        Try to take the lock without waiting.
+
+        With a per-transaction lock this must run inside transaction.atomic().
+        """
+        if self.per_transaction:
+            if not connection.in_atomic_block:
+                raise TransactionManagementError(
+                    "The reaper lock must be taken inside transaction.atomic()."
+                )
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [self.ADVISORY_LOCK_ID])
+                return cursor.fetchone()[0]
+
+        token = uuid.uuid4().hex
+        if cache.add(self.CACHE_KEY, token, self.timeout):
+            self._token = token
+            return True
+        return False
+
+    def release(self) -> None:
+        """Release the lock if this instance holds it."""
+        if self._token is not None:
+            if cache.get(self.CACHE_KEY) == self._token:
+                cache.delete(self.CACHE_KEY)
+            self._token = None
+
+
+class ExpiredSessionReaper:
+    """
+    Deletes expired session data in chunks.
+
+    Active comparison sessions past expiry are first marked EXPIRED, in
+    chunks of chunk_size. Each deletion chunk then selects up to chunk_size
+    primary keys of expired rows and deletes them with one statement per
+    table in its own transaction, so
+    locks stay short and an interrupted run keeps the work already done.
+    Survey responses of a chunk of quotation sessions are deleted in one
+    statement, and persisted quotation results go with their sessions.
+
+    Anonymous comparison sessions are kept for
+    SESSION_REAPER_COMPARISON_RETENTION_DAYS (default 7) after expiry, the
+    audit window of the EXPIRED status; sessions owned by users are kept.
+    """
+
+    METRICS_CACHE_KEY = 'session_reaper:last_run'
+    METRICS_TIMEOUT = 3600 * 24 * 7  # 7 days
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size or getattr(
+            settings, 'SESSION_REAPER_CHUNK_SIZE', self.DEFAULT_CHUNK_SIZE
+        )
+        self.comparison_retention = timedelta(
+            days=getattr(settings, 'SESSION_REAPER_COMPARISON_RETENTION_DAYS', 7)
+        )
+
+    def _querysets(self, cutoff) -> List[Tuple[str, Any]]:
+        """Expired rows of each table, in processing order."""
+        return [
+            ('active_comparison_sessions', ComparisonSession.objects.filter(
+                status=ComparisonSession.Status.ACTIVE, expires_at__lt=cutoff
+            )),
+            ('quotation_sessions', QuotationSession.objects.filter(expires_at__lt=cutoff)),
+            ('quotation_results', QuotationResult.objects.filter(expires_at__lt=cutoff)),
+            ('comparison_sessions', ComparisonSession.objects.filter(
+                user__isnull=True,
+                expires_at__lt=cutoff - self.comparison_retention
+            )),
+            ('django_sessions', Session.objects.filter(expire_date__lt=cutoff)),
+        ]
+
+    def count_expired(self, cutoff=None) -> Dict[str, int]:
+        """
+        Count rows a run would expire or delete, without changing anything.
+
+        Args:
+            cutoff: Delete rows that expired before this time (default: now)
+        """
+        cutoff = cutoff or timezone.now()
+        return {name: queryset.count() for name, queryset in self._querysets(cutoff)}
+
+    def run(self, cutoff=None, max_chunks: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Expire comparison sessions and delete expired session data.
+
+        Args:
+            cutoff: Delete rows that expired before this time (default: now)
+            max_chunks: Stop each table after this many chunks (default: no limit)
+
+        Returns:
+            Run metrics: 'lock_acquired', 'expired' comparison sessions,
+            'deleted' rows by model label (cascaded rows included), 'chunks',
+            'errors', 'started_at' and 'duration_seconds'
+        """
+        cutoff = cutoff or timezone.now()
+        metrics = {
+            'lock_acquired': False,
+            'started_at': timezone.now().isoformat(),
+            'cutoff': cutoff.isoformat(),
+            'expired': 0,
+            'deleted': {},
+            'chunks': 0,
+            'errors': [],
+            'duration_seconds': 0.0,
+        }
+        started = time.monotonic()
+
+        lock = ReaperLock()
+        if not lock.per_transaction:
+            if not lock.acquire():
+                logger.info("Session reaper already running elsewhere, skipping")
+                return metrics
+            metrics['lock_acquired'] = True
+
+        try:
+            for name, queryset in self._querysets(cutoff):
+                try:
+                    self._reap(name, queryset, metrics, max_chunks, lock)
+                except ReaperBusy:
+                    logger.info("Session reaper already running elsewhere, stopping")
+                    break
+                except Exception as e:
+                    error_msg = f"Error reaping {name}: {e}"
+                    logger.error(error_msg)
+                    metrics['errors'].append(error_msg)
+        finally:
+            lock.release()
+
+        if not metrics['lock_acquired']:
+            return metrics
+
+        metrics['duration_seconds'] = round(time.monotonic() - started, 3)
+        cache.set(self.METRICS_CACHE_KEY, metrics, self.METRICS_TIMEOUT)
+
+        logger.info(
+            f"Session reaper expired {metrics['expired']} comparison sessions and deleted "
+            f"{metrics['deleted']} in {metrics['chunks']} chunks "
+            f"({metrics['duration_seconds']}s)"
+        )
+        return metrics
+
+    def _reap(self, name: str, queryset, metrics: Dict[str, Any], max_chunks: Optional[int],
+              lock: ReaperLock) -> None:
+        """Expire or delete one table's expired rows chunk by chunk."""
+        deleted = metrics['deleted']
+        chunks = 0
+
+        while max_chunks is None or chunks < max_chunks:
+            with transaction.atomic():
+                if lock.per_transaction:
+                    if not lock.acquire():
+                        raise ReaperBusy()
+                    metrics['lock_acquired'] = True
+
+                if name == 'active_comparison_sessions':
+                    counts = self._expire_comparison_sessions(queryset)
+                elif name == 'quotation_sessions':
+                    counts = self._delete_quotation_sessions(queryset)
+                else:
+                    pks = list(queryset.order_by().values_list('pk', flat=True)[:self.chunk_size])
+                    counts = queryset.model.objects.filter(pk__in=pks).delete()[1] if pks else {}
+
+            if not counts:
+                break
+
+            if name == 'active_comparison_sessions':
+                metrics['expired'] += sum(counts.values())
+            else:
+                for label, count in counts.items():
+                    deleted[label] = deleted.get(label, 0) + count
+            chunks += 1
+            metrics['chunks'] += 1
+
+    def _expire_comparison_sessions(self, queryset) -> Dict[str, int]:
+        """Mark a chunk of expired comparison sessions EXPIRED, keeping them for audit."""
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:self.chunk_size])
+        if not pks:
+            return {}
+
+        expired = ComparisonSession.objects.filter(pk__in=pks).update(
+            status=ComparisonSession.Status.EXPIRED, updated_at=timezone.now()
+        )
+        return {ComparisonSession._meta.label: expired}
+
+    def _delete_quotation_sessions(self, queryset) -> Dict[str, int]:
+        """Delete a chunk of quotation sessions and their survey responses."""
+        rows = list(queryset.order_by().values_list('pk', 'session_key', 'category')[:self.chunk_size])
+        if not rows:
+            return {}
+
+        keys_by_category: Dict[str, List[str]] = {}
+        for pk, session_key, category in rows:
+            keys_by_category.setdefault(category, []).append(session_key)
+
+        responses = Q()
+        for category, session_keys in keys_by_category.items():
+            responses |= Q(category=category, session_key__in=session_keys)
+
+        _, counts = SimpleSurveyResponse.objects.filter(responses).delete()
+        _, session_counts = QuotationSession.objects.filter(pk__in=[row[0] for row in rows]).delete()
+
+        counts = dict(counts)
+        for label, count in session_counts.items():
+            counts[label] = counts.get(label, 0) + count
+        return counts
+
+    @classmethod
+    def last_run(cls) -> Optional[Dict[str, Any]]:
+        """Metrics of the most recent run, if still cached."""
+        return cache.get(cls.METRICS_CACHE_KEY)
+
+
+# Global reaper instance
+session_reaper = ExpiredSessionReaper()
@@ -0,0 +1,168 @@
+"""
+Out-of-session storage for quotation results.
+Keeps the quotations, criteria and metadata of a completed survey in the cache
+and the database under an opaque result ID, so the session only carries that ID.
+"""
+
+import secrets
+from datetime import timedelta
+from typing import Any, Dict, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+import logging
+
+from .models import QuotationResult
+
+logger = logging.getLogger(__name__)
+
+
+class QuotationResultStore:
+    """
+    Store for quotation payloads shown on the results page.
+
+    Payloads are written to the cache for QUOTATION_RESULT_TIMEOUT seconds
+    (default 24 hours, the quotation session lifetime) and to QuotationResult
+    rows, which are read back on a cache miss. The rows let results survive
+    restarts and cache eviction and reach every worker process when the cache
+    is local-memory. Persisted rows are deleted with their quotation session.
+    Set QUOTATION_RESULT_PERSIST to False only with a shared cache backend.
+    """
+
+    KEY_PREFIX = 'quotation_result'
+    SESSION_KEY_PREFIX = 'quotation_result'
+
+    # Keys used before results moved out of the session
+    LEGACY_SESSION_KEYS = ('quotations', 'criteria', 'quotation_metadata')
+
+    DEFAULT_TIMEOUT = 3600 * 24  # 24 hours
+
+    def __init__(self, timeout: Optional[int] = None, persist: Optional[bool] = None):
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'QUOTATION_RESULT_TIMEOUT', self.DEFAULT_TIMEOUT
+        )
+        self.persist = persist if persist is not None else getattr(
+            settings, 'QUOTATION_RESULT_PERSIST', True
+        )
+
+    def _key(self, result_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{result_id}"
+
+    @classmethod
+    def session_key(cls, category: str) -> str:
+        """Session key holding the result ID for a category."""
+        return f"{cls.SESSION_KEY_PREFIX}_{category}"
+
+    def save(self, payload: Dict[str, Any], quotation_session=None) -> str:
+        """
+        Store a payload under a new result ID.
+
+        Args:
+            payload: Quotations, criteria and metadata to store
+            quotation_session: QuotationSession the result belongs to
+
+        Returns:
+            Opaque result ID
+        """
+        result_id = secrets.token_urlsafe(24)
+        cache.set(self._key(result_id), payload, self.timeout)
+
+        if self.persist:
+            try:
+                QuotationResult.objects.create(
+                    result_id=result_id,
+                    quotation_session=quotation_session,
+                    payload=payload,
+                    expires_at=timezone.now() + timedelta(seconds=self.timeout)
+                )
+            except Exception as e:
+                logger.error(f"Error persisting quotation result {result_id[:8]}: {e}")
+
+        return result_id
+
+    def load(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored payload.
+
+        Returns:
+            The payload, or None if it is unknown or has expired
+        """
+        payload = cache.get(self._key(result_id))
+        if payload is not None or not self.persist:
+            return payload
+
+        result = QuotationResult.objects.filter(
+            result_id=result_id,
+            expires_at__gt=timezone.now()
+        ).only('payload', 'expires_at').first()
+        if result is None:
+            return None
+
+        remaining = int((result.expires_at - timezone.now()).total_seconds())
+        if remaining > 0:
+            cache.set(self._key(result_id), result.payload, remaining)
+        return result.payload
+
+    def delete(self, result_id: str) -> None:
+        """Remove a stored payload."""
+        cache.delete(self._key(result_id))
+        if self.persist:
+            QuotationResult.objects.filter(result_id=result_id).delete()
+
+    def delete_expired(self) -> int:
+        """
+        Delete persisted results past their expiry.
+
+        Returns:
+            Number of results deleted
+        """
+        deleted, _ = QuotationResult.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def save_to_session(self, session, category: str, payload: Dict[str, Any], quotation_session=None) -> str:
+        """
+        Store a payload and keep only its ID in the session.
+
+        Replaces the category's previous result and drops any payload stored
+        in the session by earlier versions.
+
+        Returns:
+            Opaque result ID
+        """
+        previous_id = session.get(self.session_key(category))
+        if previous_id:
+            self.delete(previous_id)
+
+        for prefix in self.LEGACY_SESSION_KEYS:
+            session.pop(f"{prefix}_{category}", None)
+
+        result_id = self.save(payload, quotation_session)
+        session[self.session_key(category)] = result_id
+        return result_id
+
+    def load_from_session(self, session, category: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the payload for a category's result ID in the session.
+
+        Sessions written before results moved out of the session still hold
+        the payload itself, which is returned as is.
+
+        Returns:
+            Dictionary with 'quotations', 'criteria' and 'metadata', or None
+        """
+        result_id = session.get(self.session_key(category))
+        if result_id:
+            return self.load(result_id)
+
+        quotations = session.get(f"quotations_{category}")
+        if quotations is None:
+            return None
+        return {
+            'quotations': quotations,
+            'criteria': session.get(f"criteria_{category}"),
+            'metadata': session.get(f"quotation_metadata_{category}", {}),
+        }
+
+
+# Global result store instance
+quotation_result_store = QuotationResultStore()
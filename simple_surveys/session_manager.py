@@ -3,6 +3,8 @@ Session management utilities for simple surveys.
 Handles session creation, validation, expiry, and cleanup.
 """
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from django.contrib.sessions.models import Session
 from django.db import transaction
@@ -10,6 +12,7 @@ from datetime import timedelta
 import logging
 
 from .models import QuotationSession, SimpleSurveyResponse
+from .reaper import ExpiredSessionReaper
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,10 @@ class SessionManager:
     
     SESSION_LIFETIME_HOURS = 24
     
+    # Expiry is only rewritten once less than this much lifetime remains
+    EXTENSION_THRESHOLD_HOURS = 22
+    EXTENSION_CACHE_PREFIX = 'quotation_session_fresh'
+    
     @classmethod
     def create_or_get_session(cls, request, category):
         """
@@ -61,8 +68,8 @@ class SessionManager:
                         quotation_session = cls._create_new_session(session_key, category)
                         created = True
                     else:
-                        # Extend expiry for active session
-                        quotation_session.extend_expiry(cls.SESSION_LIFETIME_HOURS)
+                        # Extend expiry for active session if it is due
+                        cls.extend_session(session_key, category, quotation_session=quotation_session)
                         created = False
                 else:
                     # Create new session
@@ -153,7 +160,10 @@ class SessionManager:
     @classmethod
     def cleanup_expired_sessions(cls, batch_size=100):
         """
-        Clean up expired sessions and their associated data.
+        Clean up one batch of expired sessions and their associated data.
+        
+        Runs the session reaper for a single chunk per table; the
+        cleanup_expired_sessions management command runs it to completion.
         
         Args:
             batch_size: Number of sessions to process in each batch
@@ -161,76 +171,15 @@ class SessionManager:
         Returns:
             dict: Cleanup statistics
         """
-        stats = {
-            'quotation_sessions_deleted': 0,
-            'responses_deleted': 0,
-            'django_sessions_deleted': 0,
-            'errors': []
-        }
+        metrics = ExpiredSessionReaper(chunk_size=batch_size).run(max_chunks=1)
+        deleted = metrics['deleted']
         
-        try:
-            # Get expired quotation sessions in batches
-            expired_sessions = QuotationSession.objects.expired_sessions()[:batch_size]
-            
-            for session in expired_sessions:
-                try:
-                    with transaction.atomic():
-                        # Count responses before deletion
-                        response_count = SimpleSurveyResponse.objects.filter(
-                            session_key=session.session_key,
-                            category=session.category
-                        ).count()
-                        
-                        # Delete associated responses
-                        SimpleSurveyResponse.objects.filter(
-                            session_key=session.session_key,
-                            category=session.category
-                        ).delete()
-                        
-                        # Delete quotation session
-                        session.delete()
-                        
-                        stats['quotation_sessions_deleted'] += 1
-                        stats['responses_deleted'] += response_count
-                        
-                        logger.info(f"Cleaned up expired session {session.session_key[:8]} "
-                                  f"with {response_count} responses")
-                        
-                except Exception as e:
-                    error_msg = f"Error cleaning up session {session.session_key[:8]}: {e}"
-                    logger.error(error_msg)
-                    stats['errors'].append(error_msg)
-            
-            # Clean up expired Django sessions
-            try:
-                expired_django_sessions = Session.objects.filter(
-                    expire_date__lt=timezone.now()
-                )
-                
-                # Count before deletion
-                django_count = expired_django_sessions.count()
-                
-                # Delete in batches to avoid issues with limit/offset
-                session_keys = list(expired_django_sessions.values_list('session_key', flat=True)[:batch_size])
-                if session_keys:
-                    Session.objects.filter(session_key__in=session_keys).delete()
-                    stats['django_sessions_deleted'] = len(session_keys)
-                
-                if stats['django_sessions_deleted'] > 0:
-                    logger.info(f"Cleaned up {stats['django_sessions_deleted']} expired Django sessions")
-                    
-            except Exception as e:
-                error_msg = f"Error cleaning up Django sessions: {e}"
-                logger.error(error_msg)
-                stats['errors'].append(error_msg)
-            
-            return stats
-            
-        except Exception as e:
-            error_msg = f"Error during session cleanup: {e}"
-            logger.error(error_msg)
-            stats['errors'].append(error_msg)
-            return stats
+        return {
+            'quotation_sessions_deleted': deleted.get(QuotationSession._meta.label, 0),
+            'responses_deleted': deleted.get(SimpleSurveyResponse._meta.label, 0),
+            'django_sessions_deleted': deleted.get(Session._meta.label, 0),
+            'errors': metrics['errors']
+        }
     
     @classmethod
     def _cleanup_expired_session(cls, quotation_session):
@@ -324,34 +273,76 @@ class SessionManager:
             raise
     
     @classmethod
-    def extend_session(cls, session_key, category, hours=None):
+    def _extension_threshold(cls, hours):
+        """Remaining lifetime below which an extension is written."""
+        threshold = getattr(
+            settings, 'SIMPLE_SURVEY_SESSION_EXTEND_THRESHOLD_HOURS', cls.EXTENSION_THRESHOLD_HOURS
+        )
+        return timedelta(hours=min(threshold, hours))
+    
+    @classmethod
+    def _extension_cache_key(cls, session_key, category):
+        return f"{cls.EXTENSION_CACHE_PREFIX}:{session_key}:{category}"
+    
+    @classmethod
+    def extend_session(cls, session_key, category, hours=None, quotation_session=None):
         """
         Extend the expiry time for a session.
         
+        The expiry is only written once the remaining lifetime drops below
+        SIMPLE_SURVEY_SESSION_EXTEND_THRESHOLD_HOURS (default 22). Until then
+        a cache entry, timed out when the session becomes due, marks it as
+        fresh, so repeated activity costs no database access at all.
+        
         Args:
             session_key: Session key to extend
             category: Session category
             hours: Hours to extend (default: SESSION_LIFETIME_HOURS)
+            quotation_session: Already loaded QuotationSession, saves a query
             
         Returns:
-            bool: True if extended successfully, False otherwise
+            bool: True if the session is extended or still fresh, False otherwise
         """
         if hours is None:
             hours = cls.SESSION_LIFETIME_HOURS
         
+        cache_key = cls._extension_cache_key(session_key, category)
+        
         try:
-            quotation_session = QuotationSession.objects.get(
-                session_key=session_key,
-                category=category
-            )
+            if cache.get(cache_key):
+                return True
             
-            quotation_session.extend_expiry(hours)
-            logger.info(f"Extended session {session_key[:8]} by {hours} hours")
+            if quotation_session is not None:
+                expires_at = quotation_session.expires_at
+            else:
+                expires_at = QuotationSession.objects.filter(
+                    session_key=session_key,
+                    category=category
+                ).values_list('expires_at', flat=True).first()
+                
+                if expires_at is None:
+                    logger.warning(f"Attempted to extend non-existent session {session_key[:8]}")
+                    return False
+            
+            now = timezone.now()
+            threshold = cls._extension_threshold(hours)
+            
+            if expires_at - now < threshold:
+                expires_at = now + timedelta(hours=hours)
+                QuotationSession.objects.filter(
+                    session_key=session_key,
+                    category=category
+                ).update(expires_at=expires_at)
+                if quotation_session is not None:
+                    quotation_session.expires_at = expires_at
+                logger.info(f"Extended session {session_key[:8]} by {hours} hours")
+            
+            # Fresh until the remaining lifetime reaches the threshold again
+            fresh_seconds = int((expires_at - now - threshold).total_seconds())
+            if fresh_seconds > 0:
+                cache.set(cache_key, True, fresh_seconds)
             return True
             
-        except QuotationSession.DoesNotExist:
-            logger.warning(f"Attempted to extend non-existent session {session_key[:8]}")
-            return False
         except Exception as e:
             logger.error(f"Error extending session {session_key[:8]}: {e}")
             return False
@@ -1588,4 +1588,97 @@ class SimpleSurveyFormTest(TestCase):
         
         # Test range fields have select widgets with choices
         self.assertIn('range-select', form.fields['annual_limit_family_range'].widget.attrs['class'])
-        self.assertIn('range-select', form.fields['annual_limit_member_range'].widget.attrs['class'])
\ No newline at end of file
+        self.assertIn('range-select', form.fields['annual_limit_member_range'].widget.attrs['class'])
+
+
+class SimplifiedTopPoliciesTest(TestCase):
+    """Test cases for full-catalog top-K selection in SimplifiedPolicyComparisonEngine"""
+    
+    def setUp(self):
+        """Set up a catalog where the best match is not among the cheapest policies"""
+        from decimal import Decimal
+        from organizations.models import Organization
+        from policies.models import PolicyCategory, PolicyType, BasePolicy
+        
+        organization = Organization.objects.create(
+            name='Top K Insurance',
+            description='Test insurer',
+            email='topk@example.com',
+            phone='123-456-7890',
+            address_line1='1 Test Street',
+            city='Manzini',
+            state_province='Manzini',
+            postal_code='M200',
+            registration_number='REG-TOPK'
+        )
+        category = PolicyCategory.objects.create(name='Funeral', slug='funeral')
+        policy_type = PolicyType.objects.create(category=category, name='Family', slug='family')
+        
+        # Cheap policies with poor coverage, then one pricier policy with ideal coverage
+        catalog = [(Decimal('100.00') + i, Decimal('5000.00')) for i in range(12)]
+        catalog.append((Decimal('180.00'), Decimal('30000.00')))
+        
+        self.policy_ids = []
+        for i, (premium, coverage) in enumerate(catalog):
+            policy = BasePolicy.objects.create(
+                organization=organization,
+                category=category,
+                policy_type=policy_type,
+                name=f'Top K Policy {i}',
+                policy_number=f'TOPK-{i}',
+                description='Test policy',
+                short_description='Test policy',
+                base_premium=premium,
+                coverage_amount=coverage,
+                minimum_age=18,
+                maximum_age=80,
+                waiting_period_days=0,
+                terms_and_conditions='Terms',
+                approval_status=BasePolicy.ApprovalStatus.APPROVED,
+                is_active=True
+            )
+            self.policy_ids.append(policy.id)
+        
+        self.best_policy_id = self.policy_ids[-1]
+        self.criteria = {'base_premium': 200, 'coverage_amount': 30000, 'waiting_period_days': 0}
+    
+    def test_best_policy_found_beyond_premium_cut(self):
+        """Test that the best match is kept even when it is the most expensive policy"""
+        from .comparison_adapter import SimplifiedPolicyComparisonEngine
+        
+        engine = SimplifiedPolicyComparisonEngine('funeral')
+        result = engine.compare_top_policies(
+            self.policy_ids, self.criteria, top_k=3, session_key='topk-session', chunk_size=4
+        )
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_policies'], len(self.policy_ids))
+        self.assertEqual(len(result['results']), 3)
+        self.assertEqual(result['results'][0]['policy'].id, self.best_policy_id)
+        self.assertEqual([r['rank'] for r in result['results']], [1, 2, 3])
+    
+    def test_top_k_matches_full_comparison_order(self):
+        """Test that chunked top-K selection ranks like scoring every policy at once"""
+        from .comparison_adapter import SimplifiedPolicyComparisonEngine
+        
+        engine = SimplifiedPolicyComparisonEngine('funeral')
+        engine._load_simplified_criteria(self.criteria)
+        top_results, scored_count = engine._select_top_results(
+            iter(self.policy_ids), self.criteria, top_k=5, chunk_size=3
+        )
+        
+        full_results = [
+            engine._score_result_simplified(policy, self.criteria)
+            for policy in engine._get_policies_simplified(self.policy_ids)
+        ]
+        expected = sorted(
+            full_results,
+            key=lambda r: (-r['score_data']['overall_score'], self.policy_ids.index(r['policy'].id))
+        )[:5]
+        ranked = engine._rank_policies_simplified(top_results)
+        
+        self.assertEqual(scored_count, len(self.policy_ids))
+        self.assertEqual(
+            [r['policy'].id for r in ranked],
+            [r['policy'].id for r in expected]
+        )
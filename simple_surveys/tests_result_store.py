@@ -0,0 +1,111 @@
+"""
+Unit tests for the out-of-session quotation result store.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import QuotationSession, QuotationResult
+from .result_store import QuotationResultStore
+from surveys.testing import AppQueriesMixin
+
+
+class QuotationResultStoreTest(AppQueriesMixin, TestCase):
+    """Test storing quotation payloads outside the session."""
+
+    def setUp(self):
+        cache.clear()
+        self.payload = {
+            'quotations': [{'policy_id': 1, 'name': 'Basic Health'}],
+            'criteria': {'age': 30},
+            'metadata': {'total_policies_evaluated': 4, 'best_match': {'policy_id': 1}, 'summary': {}},
+        }
+        self.quotation_session = QuotationSession.objects.create(
+            session_key='result-store',
+            category='health',
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+
+    def test_save_and_load_from_cache(self):
+        """Without persistence payloads round-trip through the cache only."""
+        store = QuotationResultStore(persist=False)
+
+        with self.assertNumAppQueries(0):
+            result_id = store.save(self.payload, self.quotation_session)
+            self.assertEqual(store.load(result_id), self.payload)
+
+        self.assertEqual(QuotationResult.objects.count(), 0)
+        self.assertIsNone(store.load('unknown'))
+
+    def test_persisted_result_survives_cache_eviction(self):
+        """With persistence enabled a cache miss falls back to the database."""
+        store = QuotationResultStore(persist=True)
+        result_id = store.save(self.payload, self.quotation_session)
+
+        cache.clear()
+        self.assertEqual(store.load(result_id), self.payload)
+
+        # The cache is repopulated from the row
+        with self.assertNumAppQueries(0):
+            self.assertEqual(store.load(result_id), self.payload)
+
+    def test_results_persisted_by_default(self):
+        """Results are written to the database unless QUOTATION_RESULT_PERSIST is off."""
+        result_id = QuotationResultStore().save(self.payload, self.quotation_session)
+        self.assertTrue(QuotationResult.objects.filter(result_id=result_id).exists())
+
+        with self.settings(QUOTATION_RESULT_PERSIST=False):
+            self.assertFalse(QuotationResultStore().persist)
+
+    def test_expired_and_orphaned_results(self):
+        """Expired rows are not served and rows go with their quotation session."""
+        store = QuotationResultStore(persist=True)
+        expired_id = store.save(self.payload, self.quotation_session)
+        QuotationResult.objects.filter(result_id=expired_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+        cache.clear()
+
+        self.assertIsNone(store.load(expired_id))
+        self.assertEqual(store.delete_expired(), 1)
+
+        store.save(self.payload, self.quotation_session)
+        self.quotation_session.delete()
+        self.assertEqual(QuotationResult.objects.count(), 0)
+
+    def test_session_holds_only_the_result_id(self):
+        """Saving to a session replaces the previous result and legacy payload keys."""
+        store = QuotationResultStore()
+        session = {'quotations_health': [{'policy_id': 9}], 'criteria_health': {}}
+
+        first_id = store.save_to_session(session, 'health', self.payload)
+        second_id = store.save_to_session(session, 'health', self.payload)
+
+        self.assertEqual(session, {'quotation_result_health': second_id})
+        self.assertIsNone(store.load(first_id))
+        self.assertEqual(store.load_from_session(session, 'health'), self.payload)
+
+    def test_load_from_legacy_session(self):
+        """Sessions written before the store still show their results."""
+        session = {
+            'quotations_health': self.payload['quotations'],
+            'criteria_health': self.payload['criteria'],
+            'quotation_metadata_health': self.payload['metadata'],
+        }
+
+        self.assertEqual(QuotationResultStore().load_from_session(session, 'health'), self.payload)
+        self.assertIsNone(QuotationResultStore().load_from_session({}, 'funeral'))
+
+    def test_results_view_loads_payload(self):
+        """The results page reads the payload for the result ID in the session."""
+        session = self.client.session
+        QuotationResultStore().save_to_session(session, 'health', self.payload)
+        session.save()
+
+        response = self.client.get(reverse('simple_surveys:results', args=['health']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['quotations'], self.payload['quotations'])
+        self.assertEqual(response.context['best_match'], {'policy_id': 1})
@@ -0,0 +1,166 @@
+"""
+Unit tests for survey session routing and throttled expiry extension.
+"""
+
+from datetime import timedelta
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, modify_settings, override_settings
+from django.urls import path
+from django.utils import timezone
+
+from .middleware import SurveySessionMiddleware, SessionValidationMiddleware
+from .models import QuotationSession
+from .session_manager import SessionManager
+from surveys.testing import AppQueriesMixin
+
+
+def _survey_view(request):
+    return HttpResponse('survey')
+
+
+# URL configuration for the client tests; the middleware routes are path prefixes
+urlpatterns = [
+    path('simple-surveys/health/', _survey_view),
+    path('simple-surveys/health/process/', _survey_view),
+]
+
+
+class SessionExtensionThrottleTest(AppQueriesMixin, TestCase):
+    """Test that expiry is only written when a session is close to expiring."""
+
+    def setUp(self):
+        cache.clear()
+        self.expires_at = timezone.now() + timedelta(hours=24)
+        self.quotation_session = QuotationSession.objects.create(
+            session_key='throttle-session', category='health', expires_at=self.expires_at
+        )
+
+    def test_fresh_session_is_not_written(self):
+        """A fresh session costs one read, then nothing."""
+        with self.assertNumAppQueries(1):
+            self.assertTrue(SessionManager.extend_session('throttle-session', 'health'))
+        with self.assertNumAppQueries(0):
+            self.assertTrue(SessionManager.extend_session('throttle-session', 'health'))
+
+        self.quotation_session.refresh_from_db()
+        self.assertEqual(self.quotation_session.expires_at, self.expires_at)
+
+    def test_session_near_expiry_is_extended_once(self):
+        """A session below the threshold is extended, and later calls are coalesced."""
+        QuotationSession.objects.filter(pk=self.quotation_session.pk).update(
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+
+        with self.assertNumAppQueries(2):
+            SessionManager.extend_session('throttle-session', 'health')
+        with self.assertNumAppQueries(0):
+            SessionManager.extend_session('throttle-session', 'health')
+
+        self.quotation_session.refresh_from_db()
+        self.assertGreater(self.quotation_session.expires_at, timezone.now() + timedelta(hours=23))
+
+    def test_loaded_session_saves_the_read(self):
+        """Passing the loaded session avoids querying it again."""
+        with self.assertNumAppQueries(0):
+            self.assertTrue(SessionManager.extend_session(
+                'throttle-session', 'health', quotation_session=self.quotation_session
+            ))
+
+    def test_missing_session(self):
+        """Extending an unknown session reports failure."""
+        self.assertFalse(SessionManager.extend_session('missing-session', 'health'))
+
+
+class SurveySessionMiddlewareTest(AppQueriesMixin, TestCase):
+    """Test route matching and extension in the combined middleware."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = SurveySessionMiddleware(lambda request: HttpResponse())
+
+    def test_longest_prefix_wins(self):
+        """Specific routes take precedence over their parent prefixes."""
+        self.assertEqual(
+            self.middleware.match_route('/simple-surveys/health/status/')[1:],
+            (SurveySessionMiddleware.VALIDATE, 'health')
+        )
+        self.assertEqual(
+            self.middleware.match_route('/simple-surveys/funeral/start/')[1:],
+            (SurveySessionMiddleware.CREATE, 'funeral')
+        )
+        self.assertEqual(
+            self.middleware.match_route('/simple-surveys/save-response/')[1:],
+            (SurveySessionMiddleware.VALIDATE, None)
+        )
+        self.assertIsNone(self.middleware.match_route('/survey/health/'))
+
+    def test_survey_request_does_not_write(self):
+        """Repeated survey requests on a fresh session cause no writes."""
+        session = SessionStore()
+        session.create()
+        expires_at = timezone.now() + timedelta(hours=24)
+        QuotationSession.objects.create(session_key=session.session_key, category='health', expires_at=expires_at)
+
+        for _ in range(3):
+            request = self.factory.get('/simple-surveys/health/')
+            request.session = session
+            self.middleware(request)
+
+        with self.assertNumAppQueries(1):
+            # Only the expired-session lookup of the entry page remains
+            request = self.factory.get('/simple-surveys/health/')
+            request.session = session
+            self.middleware(request)
+
+        self.assertEqual(QuotationSession.objects.get(session_key=session.session_key).expires_at, expires_at)
+
+    def test_split_middleware_keeps_one_half(self):
+        """The legacy validation middleware no longer extends sessions."""
+        middleware = SessionValidationMiddleware(lambda request: HttpResponse())
+        request = self.factory.get('/simple-surveys/health/')
+        request.session = SessionStore()
+
+        with self.assertNumAppQueries(0):
+            middleware.process_response(request, HttpResponse())
+
+
+@override_settings(ROOT_URLCONF='simple_surveys.tests_session_middleware')
+@modify_settings(MIDDLEWARE={'append': 'simple_surveys.middleware.SurveySessionMiddleware'})
+class SurveySessionMiddlewareClientTest(TestCase):
+    """Test the middleware through the full request cycle."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_entry_page_creates_session(self):
+        """Survey entry pages start a Django session."""
+        response = self.client.get('/simple-surveys/health/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.client.session.session_key)
+
+    def test_protected_url_without_session_is_rejected(self):
+        """Process URLs are validated, not treated as entry pages."""
+        response = self.client.post('/simple-surveys/health/process/')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_valid_session_is_passed_through_and_extended(self):
+        """A valid session reaches the view, and is extended when close to expiring."""
+        session = self.client.session
+        session.save()
+        expires_at = timezone.now() + timedelta(hours=1)
+        QuotationSession.objects.create(session_key=session.session_key, category='health', expires_at=expires_at)
+
+        response = self.client.post('/simple-surveys/health/process/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'survey')
+        self.assertGreater(
+            QuotationSession.objects.get(session_key=session.session_key).expires_at, expires_at
+        )
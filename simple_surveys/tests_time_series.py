@@ -0,0 +1,126 @@
+"""
+Unit tests for grouped time-series analytics.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from .analytics import SimpleSurveyAnalytics, AnalyticsDashboard
+from .models import SimpleSurveyQuestion, SimpleSurveyResponse, QuotationSession
+from .time_series import SessionTimeSeries
+from surveys.testing import AppQueriesMixin
+
+
+class SessionTimeSeriesTest(AppQueriesMixin, TestCase):
+    """Test bucketed session counts and the rolled-forward daily cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        self._session('today-1', days_ago=0, completed=True)
+        self._session('today-2', days_ago=0)
+        self._session('old-1', days_ago=5, completed=True)
+
+    def _session(self, session_key, days_ago, completed=False):
+        session = QuotationSession.objects.create(
+            session_key=session_key,
+            category='health',
+            is_completed=completed,
+            expires_at=self.now + timedelta(hours=24)
+        )
+        QuotationSession.objects.filter(pk=session.pk).update(created_at=self.now - timedelta(days=days_ago))
+        return session
+
+    def test_daily_series_in_one_query(self):
+        """Every day of the window gets an entry from one grouped query."""
+        with self.assertNumAppQueries(1):
+            trends = SessionTimeSeries().daily('health', 90)
+
+        self.assertEqual(len(trends), 90)
+        self.assertEqual(trends[-1]['date'], timezone.localdate().isoformat())
+        self.assertEqual((trends[-1]['total_sessions'], trends[-1]['completed_sessions']), (2, 1))
+        self.assertEqual(trends[-1]['completion_rate'], 50.0)
+        self.assertEqual(trends[-6]['total_sessions'], 1)
+        self.assertEqual(sum(entry['total_sessions'] for entry in trends), 3)
+
+    def test_daily_series_rolls_forward(self):
+        """Settled days come from the cache; open days are re-queried."""
+        series = SessionTimeSeries()
+        series.daily('health', 30)
+
+        # A change to a settled day is not picked up, one to an open day is
+        QuotationSession.objects.filter(session_key='old-1').update(is_completed=False)
+        self._session('today-3', days_ago=0)
+        trends = series.daily('health', 30)
+
+        self.assertEqual(trends[-6]['completed_sessions'], 1)
+        self.assertEqual(trends[-1]['total_sessions'], 3)
+
+    def test_hourly_and_weekly_buckets(self):
+        """Other granularities use the same grouped query."""
+        series = SessionTimeSeries()
+        hourly = series.series('health', self.now - timedelta(hours=3), self.now + timedelta(hours=1), 'hour')
+        weekly = series.series('health', self.now - timedelta(days=14), self.now + timedelta(hours=1), 'week')
+
+        self.assertEqual(sum(entry['total_sessions'] for entry in hourly), 2)
+        self.assertEqual(sum(entry['total_sessions'] for entry in weekly), 3)
+
+
+class CompletionAnalyticsQueryCountTest(AppQueriesMixin, TestCase):
+    """Test that completion analytics cost a fixed number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        # Start from an empty question set rather than the seeded one
+        SimpleSurveyQuestion.objects.all().delete()
+        self.questions = [
+            SimpleSurveyQuestion.objects.create(
+                category='health',
+                question_text=f"{field_name}?",
+                field_name=field_name,
+                input_type='text',
+                display_order=order
+            )
+            for order, field_name in enumerate(['age', 'gender', 'location'], start=1)
+        ]
+        for i, answered in enumerate([3, 2, 2]):
+            session_key = f"completion-{i}"
+            QuotationSession.objects.create(
+                session_key=session_key,
+                category='health',
+                is_completed=(answered == 3),
+                expires_at=timezone.now() + timedelta(hours=24)
+            )
+            for question in self.questions[:answered]:
+                SimpleSurveyResponse.objects.create(
+                    session_key=session_key, category='health', question=question, response_value='x'
+                )
+
+    def test_completion_analytics(self):
+        """Question completion and drop-off come from one grouped count."""
+        analytics = SimpleSurveyAnalytics()
+
+        with self.assertNumAppQueries(4):
+            data = analytics.get_completion_analytics('health', days=90)
+
+        self.assertEqual(data['summary']['completion_rate'], 33.33)
+        self.assertEqual(data['question_completion']['location']['responses'], 1)
+        self.assertEqual(
+            [point['sessions_reached'] for point in data['drop_off_analysis']], [3, 3, 1]
+        )
+        self.assertEqual(data['drop_off_analysis'][1]['drop_off_rate'], 66.67)
+        self.assertEqual(len(data['daily_trends']), 90)
+
+    def test_dashboard_query_count_independent_of_window(self):
+        """Dashboard data costs the same queries for short and long windows."""
+        dashboard = AnalyticsDashboard()
+
+        with self.assertNumAppQueries(6):
+            dashboard.get_dashboard_data('health', days=7)
+        with self.assertNumAppQueries(6):
+            data = dashboard.get_dashboard_data('health', days=90)
+
+        self.assertEqual(data['summary']['total_sessions'], 3)
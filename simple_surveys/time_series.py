@@ -0,0 +1,172 @@
+"""
+Time-series aggregation of quotation sessions for SimpleSurvey analytics.
+Buckets session and completion counts by hour, day or week with one grouped
+query per series.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Any, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate, TruncHour, TruncWeek
+from django.utils import timezone
+
+from .models import QuotationSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionTimeSeries:
+    """
+    Session and completion counts per time bucket.
+
+    Daily series are cached per (category, window) and rolled forward: a
+    later request only re-queries the days that can still change and keeps
+    the cached counts of older days. A session can be completed after the
+    day it was created, so days stay open for SIMPLE_SURVEY_ANALYTICS_SETTLE_DAYS
+    (default 2, covering the 24 hour session lifetime) before their counts
+    are reused.
+    """
+
+    CACHE_PREFIX = 'simple_survey_timeseries'
+
+    TRUNCATE = {
+        'hour': TruncHour,
+        'day': TruncDate,
+        'week': TruncWeek,
+    }
+
+    def __init__(self):
+        self.cache_timeout = 3600 * 24
+        self.settle_days = getattr(settings, 'SIMPLE_SURVEY_ANALYTICS_SETTLE_DAYS', 2)
+
+    def buckets(
+        self,
+        category: str,
+        start: datetime,
+        end: datetime,
+        granularity: str = 'day'
+    ) -> Dict[Any, Tuple[int, int]]:
+        """
+        Count sessions created in [start, end) per bucket with one query.
+
+        Args:
+            category: 'health' or 'funeral'
+            start: Start of the period
+            end: End of the period
+            granularity: 'hour', 'day' or 'week'
+
+        Returns:
+            (total sessions, completed sessions) by bucket start; buckets
+            without sessions are absent
+        """
+        truncate = self.TRUNCATE[granularity]
+        rows = QuotationSession.objects.filter(
+            category=category,
+            created_at__gte=start,
+            created_at__lt=end
+        ).annotate(
+            bucket=truncate('created_at')
+        ).order_by().values('bucket').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(is_completed=True))
+        )
+
+        return {row['bucket']: (row['total'], row['completed']) for row in rows}
+
+    def series(
+        self,
+        category: str,
+        start: datetime,
+        end: datetime,
+        granularity: str = 'day'
+    ) -> List[Dict[str, Any]]:
+        """
+        Trend entries for every bucket of a period, including empty ones.
+
+        Args:
+            category: 'health' or 'funeral'
+            start: Start of the period
+            end: End of the period
+            granularity: 'hour', 'day' or 'week'
+
+        Returns:
+            List of trend dictionaries in time order
+        """
+        counts = self.buckets(category, start, end, granularity)
+
+        if granularity == 'day':
+            keys = self._days(timezone.localdate(start), timezone.localdate(end - timedelta(microseconds=1)))
+        else:
+            # Walk bucket starts the way the database truncates them
+            bucket = timezone.localtime(start).replace(minute=0, second=0, microsecond=0)
+            step = timedelta(hours=1)
+            if granularity == 'week':
+                bucket = bucket.replace(hour=0) - timedelta(days=bucket.weekday())
+                step = timedelta(weeks=1)
+            keys = []
+            while bucket < end:
+                keys.append(bucket)
+                bucket = timezone.localtime(bucket + step)
+
+        return [self._trend_entry(key, *counts.get(key, (0, 0))) for key in keys]
+
+    def daily(self, category: str, days: int) -> List[Dict[str, Any]]:
+        """
+        Daily trend entries for the last `days` calendar days, including today.
+
+        Args:
+            category: 'health' or 'funeral'
+            days: Number of days in the window
+
+        Returns:
+            List of trend dictionaries, oldest day first
+        """
+        today = timezone.localdate()
+        first_day = today - timedelta(days=days - 1)
+        cache_key = f"{self.CACHE_PREFIX}:{category}:{days}"
+
+        entry = cache.get(cache_key)
+        refresh_from = first_day
+        counts = {}
+        if entry:
+            settled_through = date.fromisoformat(entry['settled_through'])
+            refresh_from = max(first_day, settled_through + timedelta(days=1))
+            counts = {
+                date.fromisoformat(day): tuple(day_counts)
+                for day, day_counts in entry['counts'].items()
+                if first_day <= date.fromisoformat(day) < refresh_from
+            }
+
+        counts.update(self.buckets(
+            category, self._day_start(refresh_from), self._day_start(today + timedelta(days=1))
+        ))
+
+        cache.set(cache_key, {
+            'settled_through': (today - timedelta(days=self.settle_days)).isoformat(),
+            'counts': {day.isoformat(): day_counts for day, day_counts in counts.items()}
+        }, self.cache_timeout)
+
+        return [self._trend_entry(day, *counts.get(day, (0, 0))) for day in self._days(first_day, today)]
+
+    def _days(self, first_day: date, last_day: date) -> List[date]:
+        return [first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1)]
+
+    def _day_start(self, day: date) -> datetime:
+        start = datetime.combine(day, time.min)
+        return timezone.make_aware(start) if settings.USE_TZ else start
+
+    def _trend_entry(self, bucket: Any, total: int, completed: int) -> Dict[str, Any]:
+        completion_rate = (completed / total * 100) if total > 0 else 0
+        return {
+            'date': bucket.isoformat(),
+            'total_sessions': total,
+            'completed_sessions': completed,
+            'completion_rate': round(completion_rate, 2)
+        }
+
+
+# Global time-series instance
+session_time_series = SessionTimeSeries()
@@ -54,6 +54,7 @@ urlpatterns = [
     
     # AJAX endpoints
     path('ajax/save-response/', views.save_response_ajax, name='save_response'),
+    path('ajax/save-responses/', views.save_responses_ajax, name='save_responses'),
     path('ajax/survey-status/<str:category>/', views.survey_status_ajax, name='survey_status'),
     path('ajax/policy-benefits/<int:policy_id>/', views.policy_benefits_ajax, name='policy_benefits'),
     
@@ -16,6 +16,7 @@ from .engine import SimpleSurveyEngine
 from .comparison_adapter import SimpleSurveyComparisonAdapter
 from .session_manager import SessionManager, SessionValidationError
 from .response_migration import ResponseMigrationHandler
+from .result_store import quotation_result_store
 
 logger = logging.getLogger(__name__)
 
@@ -128,15 +129,17 @@ class FeatureSurveyView(View):
             # Mark session as completed
             quotation_session.mark_completed()
             
-            # Store quotations in session for results page
-            request.session[f'quotations_{category}'] = quotations
-            request.session[f'criteria_{category}'] = criteria
-            request.session[f'quotation_metadata_{category}'] = {
-                'total_policies_evaluated': quotation_result.get('total_policies_evaluated', 0),
-                'best_match': quotation_result.get('best_match'),
-                'summary': quotation_result.get('summary', {}),
-                'generated_at': quotation_result.get('generated_at')
-            }
+            # Store quotations for the results page; the session keeps only the result ID
+            quotation_result_store.save_to_session(request.session, category, {
+                'quotations': quotations,
+                'criteria': criteria,
+                'metadata': {
+                    'total_policies_evaluated': quotation_result.get('total_policies_evaluated', 0),
+                    'best_match': quotation_result.get('best_match'),
+                    'summary': quotation_result.get('summary', {}),
+                    'generated_at': quotation_result.get('generated_at')
+                }
+            }, quotation_session)
             
             return JsonResponse({
                 'success': True,
@@ -164,14 +167,12 @@ class FeatureResultsView(View):
         if category not in ['health', 'funeral']:
             raise Http404("Invalid survey category")
         
-        # Check for quotations in session
-        quotations_key = f'quotations_{category}'
-        criteria_key = f'criteria_{category}'
-        metadata_key = f'quotation_metadata_{category}'
+        # Load quotations for the result ID in session
+        result = quotation_result_store.load_from_session(request.session, category) or {}
         
-        quotations = request.session.get(quotations_key)
-        criteria = request.session.get(criteria_key)
-        metadata = request.session.get(metadata_key, {})
+        quotations = result.get('quotations')
+        criteria = result.get('criteria')
+        metadata = result.get('metadata') or {}
         
         if not quotations:
             # No quotations found, redirect to survey
@@ -319,7 +320,9 @@ def save_response_ajax(request):
         
         if result['success']:
             # Extend session expiry on successful response
-            SessionManager.extend_session(session_key, category)
+            SessionManager.extend_session(
+                session_key, category, quotation_session=validation_result['session']
+            )
             
             # Check if survey is now complete
             is_complete = engine.is_survey_complete(session_key)
@@ -350,6 +353,88 @@ def save_response_ajax(request):
         }, status=500)
 
 
+@require_POST
+@csrf_exempt
+def save_responses_ajax(request):
+    """
+    AJAX endpoint for saving a batch of responses in one request.
+    Expects JSON data with category and responses, a list of objects with
+    question_id and response_value.
+    """
+    try:
+        # Parse JSON data
+        data = json.loads(request.body)
+        answers = data.get('responses')
+        category = data.get('category')
+        
+        # Validate required fields
+        if not category or not isinstance(answers, list) or not answers:
+            return JsonResponse({
+                'success': False,
+                'errors': ['Missing required fields: responses and category']
+            }, status=400)
+        
+        if not all(isinstance(answer, dict) and answer.get('question_id') for answer in answers):
+            return JsonResponse({
+                'success': False,
+                'errors': ['Each response needs a question_id']
+            }, status=400)
+        
+        # Validate category
+        if category not in ['health', 'funeral']:
+            return JsonResponse({
+                'success': False,
+                'errors': ['Invalid category']
+            }, status=400)
+        
+        # Validate session
+        session_key = request.session.session_key
+        if not session_key:
+            return JsonResponse({
+                'success': False,
+                'errors': ['No active session']
+            }, status=400)
+        
+        validation_result = SessionManager.validate_session(session_key, category)
+        if not validation_result['valid']:
+            return JsonResponse({
+                'success': False,
+                'errors': [f'Session validation failed: {validation_result["error"]}']
+            }, status=400)
+        
+        # Initialize survey engine and save the batch
+        engine = SimpleSurveyEngine(category)
+        result = engine.save_responses(session_key, answers)
+        
+        if result['response_ids']:
+            # Extend session expiry once for the batch
+            SessionManager.extend_session(
+                session_key, category, quotation_session=validation_result['session']
+            )
+        
+        completion_status = engine.get_completion_status(session_key)
+        
+        return JsonResponse({
+            'success': result['success'],
+            'response_ids': result['response_ids'],
+            'errors': result['errors'],
+            'is_complete': completion_status.get('is_complete', False),
+            'completion_status': completion_status
+        }, status=200 if result['response_ids'] else 400)
+            
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'errors': ['Invalid JSON data']
+        }, status=400)
+    except Exception as e:
+        logger.error(f"Error saving responses via AJAX: {e}")
+        return JsonResponse({
+            'success': False,
+            'errors': ['Server error occurred']
+        }, status=500)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ProcessSurveyView(View):
     """
@@ -413,15 +498,17 @@ class ProcessSurveyView(View):
             # Mark session as completed
             quotation_session.mark_completed()
             
-            # Store quotations in session for results page
-            request.session[f'quotations_{category}'] = quotations
-            request.session[f'criteria_{category}'] = criteria
-            request.session[f'quotation_metadata_{category}'] = {
-                'total_policies_evaluated': quotation_result.get('total_policies_evaluated', 0),
-                'best_match': quotation_result.get('best_match'),
-                'summary': quotation_result.get('summary', {}),
-                'generated_at': quotation_result.get('generated_at')
-            }
+            # Store quotations for the results page; the session keeps only the result ID
+            quotation_result_store.save_to_session(request.session, category, {
+                'quotations': quotations,
+                'criteria': criteria,
+                'metadata': {
+                    'total_policies_evaluated': quotation_result.get('total_policies_evaluated', 0),
+                    'best_match': quotation_result.get('best_match'),
+                    'summary': quotation_result.get('summary', {}),
+                    'generated_at': quotation_result.get('generated_at')
+                }
+            }, quotation_session)
             
             return JsonResponse({
                 'success': True,
@@ -456,14 +543,12 @@ class SurveyResultsView(View):
         if category not in ['health', 'funeral']:
             raise Http404("Invalid survey category")
         
-        # Check for quotations in session
-        quotations_key = f'quotations_{category}'
-        criteria_key = f'criteria_{category}'
-        metadata_key = f'quotation_metadata_{category}'
+        # Load quotations for the result ID in session
+        result = quotation_result_store.load_from_session(request.session, category) or {}
         
-        quotations = request.session.get(quotations_key)
-        criteria = request.session.get(criteria_key)
-        metadata = request.session.get(metadata_key, {})
+        quotations = result.get('quotations')
+        criteria = result.get('criteria')
+        metadata = result.get('metadata') or {}
         
         if not quotations:
             # No quotations found, redirect to survey
@@ -12,12 +12,15 @@ from django.core.cache import cache
 from django.conf import settings
 import logging
 
-from .models import SurveyQuestion, SurveyResponse, ComparisonSession
+from policies.counters import ab_test_participants
+from .models import (
+    SurveyQuestion, SurveyResponse, ComparisonSession, ABTestVariant, ABTestParticipant
+)
 
 logger = logging.getLogger(__name__)
 
 
-# A/B testing models are defined in models.py to avoid circular imports
+# A/B testing models are defined in models.py
 
 
 class ABTestManager:
@@ -34,7 +37,6 @@ class ABTestManager:
         tests = cache.get(cache_key)
         
         if tests is None:
-            from .models import ABTestVariant
             tests = list(ABTestVariant.objects.filter(
                 status=ABTestVariant.Status.ACTIVE,
                 start_date__lte=timezone.now()
@@ -69,9 +71,9 @@ class ABTestManager:
                 )
                 
                 if created:
-                    # Update test participant count
-                    test.participants_count += 1
-                    test.save(update_fields=['participants_count'])
+                    # Update test participant count; tests come from the
+                    # cache, so never save them back
+                    ab_test_participants.increment(test.pk)
         
         return assignments
     
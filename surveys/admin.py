@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse, path
 from django.shortcuts import redirect
+from policies.counters import ab_test_participants
 from .models import (
     SurveyTemplate, SurveyQuestion, TemplateQuestion, 
     SurveyResponse, QuestionDependency, SurveyAnalytics,
@@ -237,10 +238,10 @@ class SavedSurveyProfileAdmin(admin.ModelAdmin):
 @admin.register(ABTestVariant)
 class ABTestVariantAdmin(admin.ModelAdmin):
     """Admin interface for A/B Test Variants."""
-    list_display = ('name', 'status', 'traffic_percentage', 'participants_count', 'primary_metric', 'winning_variant', 'start_date')
+    list_display = ('name', 'status', 'traffic_percentage', 'participants_display', 'primary_metric', 'winning_variant', 'start_date')
     list_filter = ('status', 'primary_metric', 'start_date', 'created_at')
     search_fields = ('name', 'description')
-    readonly_fields = ('participants_count', 'results_data', 'statistical_significance', 'winning_variant', 'created_at', 'updated_at')
+    readonly_fields = ('participants_display', 'results_data', 'statistical_significance', 'winning_variant', 'created_at', 'updated_at')
     
     fieldsets = (
         (None, {
@@ -253,7 +254,7 @@ class ABTestVariantAdmin(admin.ModelAdmin):
             'fields': ('variants_config',)
         }),
         ('Results', {
-            'fields': ('participants_count', 'results_data', 'statistical_significance', 'winning_variant'),
+            'fields': ('participants_display', 'results_data', 'statistical_significance', 'winning_variant'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -264,6 +265,12 @@ class ABTestVariantAdmin(admin.ModelAdmin):
     
     actions = ['start_test', 'stop_test', 'calculate_results']
     
+    def participants_display(self, obj):
+        """Participant count including increments not yet written."""
+        return ab_test_participants.total(obj)
+    participants_display.short_description = 'Participants count'
+    participants_display.admin_order_field = 'participants_count'
+    
     def start_test(self, request, queryset):
         """Start selected A/B tests."""
         from .ab_testing import ABTestManager
@@ -13,6 +13,7 @@ from .models import (
     SurveyQuestion, SurveyResponse, SurveyAnalytics, 
     ComparisonSession, SurveyTemplate
 )
+from .cache_codec import encoded_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +21,19 @@ logger = logging.getLogger(__name__)
 class SurveyAnalyticsCollector:
     """
     Collects and processes survey analytics data.
+    
+    Analytics for a set of questions come from a few grouped aggregate
+    queries over all of their responses rather than queries per question.
+    A session answers a question at most once, so a question's response
+    count is also the number of sessions that reached it.
     """
     
+    # Question types whose distribution is built from individual values
+    VALUE_DISTRIBUTION_TYPES = ['CHOICE', 'MULTI_CHOICE', 'BOOLEAN', 'NUMBER', 'RANGE']
+    
     def __init__(self):
         self.cache_timeout = 3600  # 1 hour cache
+        self.batch_size = 500  # questions per aggregate query and upsert
     
     def collect_question_analytics(self, question_id: int) -> Dict[str, Any]:
         """
@@ -31,51 +41,7 @@ class SurveyAnalyticsCollector:
         """
         try:
             question = SurveyQuestion.objects.get(id=question_id)
-            responses = SurveyResponse.objects.filter(question=question)
-            
-            # Basic metrics
-            total_responses = responses.count()
-            if total_responses == 0:
-                return self._empty_analytics()
-            
-            # Calculate completion rate
-            # Get all sessions that reached this question
-            sessions_with_question = ComparisonSession.objects.filter(
-                survey_responses__question=question
-            ).distinct()
-            
-            # Get all sessions for this category
-            total_sessions = ComparisonSession.objects.filter(
-                category=question.category
-            ).count()
-            
-            completion_rate = float((sessions_with_question.count() / max(total_sessions, 1)) * 100)
-            
-            # Calculate skip rate
-            sessions_that_skipped = total_sessions - sessions_with_question.count()
-            skip_rate = float((sessions_that_skipped / max(total_sessions, 1)) * 100)
-            
-            # Response distribution
-            response_distribution = self._calculate_response_distribution(responses, question)
-            
-            # Most common response
-            most_common_response = self._get_most_common_response(responses, question)
-            
-            # Average confidence level
-            avg_confidence = responses.aggregate(
-                avg_confidence=Avg('confidence_level')
-            )['avg_confidence'] or 0
-            
-            return {
-                'question_id': question_id,
-                'total_responses': total_responses,
-                'completion_rate': round(completion_rate, 2),
-                'skip_rate': round(skip_rate, 2),
-                'response_distribution': response_distribution,
-                'most_common_response': most_common_response,
-                'average_confidence': float(round(avg_confidence, 2)),
-                'last_updated': timezone.now().isoformat()
-            }
+            return self.collect_questions_analytics([question])[question_id]
             
         except SurveyQuestion.DoesNotExist:
             logger.error(f"Question with id {question_id} not found")
@@ -84,44 +50,117 @@ class SurveyAnalyticsCollector:
             logger.error(f"Error collecting analytics for question {question_id}: {str(e)}")
             return self._empty_analytics()
     
+    def collect_questions_analytics(self, questions: List[SurveyQuestion]) -> Dict[int, Dict[str, Any]]:
+        """
+        Collect analytics for several questions with grouped aggregate queries.
+        
+        Args:
+            questions: SurveyQuestion instances
+            
+        Returns:
+            Analytics dictionaries by question ID
+        """
+        if not questions:
+            return {}
+        
+        question_ids = [question.id for question in questions]
+        
+        # Response count and average confidence per question
+        response_stats = {
+            row['question_id']: row
+            for row in SurveyResponse.objects.filter(
+                question_id__in=question_ids
+            ).order_by().values('question_id').annotate(
+                total=Count('id'),
+                avg_confidence=Avg('confidence_level')
+            )
+        }
+        
+        # Sessions per category
+        category_sessions = dict(
+            ComparisonSession.objects.filter(
+                category_id__in={question.category_id for question in questions}
+            ).order_by().values('category_id').annotate(
+                total=Count('id')
+            ).values_list('category_id', 'total')
+        )
+        
+        # Count of each distinct value for questions whose values are analysed
+        value_counts: Dict[int, List] = {}
+        value_question_ids = [
+            question.id for question in questions
+            if question.question_type in self.VALUE_DISTRIBUTION_TYPES and question.id in response_stats
+        ]
+        if value_question_ids:
+            for row in SurveyResponse.objects.filter(
+                question_id__in=value_question_ids
+            ).order_by().values('question_id', 'response_value').annotate(count=Count('id')):
+                value_counts.setdefault(row['question_id'], []).append((row['response_value'], row['count']))
+        
+        now = timezone.now().isoformat()
+        analytics = {}
+        for question in questions:
+            stats = response_stats.get(question.id)
+            if not stats:
+                analytics[question.id] = self._empty_analytics()
+                continue
+            
+            total_responses = stats['total']
+            total_sessions = max(category_sessions.get(question.category_id, 0), 1)
+            counts = value_counts.get(question.id, [])
+            
+            # Sessions that reached the question are those that answered it
+            completion_rate = float((total_responses / total_sessions) * 100)
+            skip_rate = float(((total_sessions - total_responses) / total_sessions) * 100)
+            
+            analytics[question.id] = {
+                'question_id': question.id,
+                'total_responses': total_responses,
+                'completion_rate': round(completion_rate, 2),
+                'skip_rate': round(skip_rate, 2),
+                'response_distribution': self._calculate_response_distribution(
+                    question.question_type, counts, total_responses
+                ),
+                'most_common_response': self._get_most_common_response(question.question_type, counts),
+                'average_confidence': float(round(stats['avg_confidence'] or 0, 2)),
+                'last_updated': now
+            }
+        
+        return analytics
+    
     def collect_template_analytics(self, template_id: int) -> Dict[str, Any]:
         """
         Collect analytics for an entire survey template.
         """
         try:
-            template = SurveyTemplate.objects.get(id=template_id)
-            questions = SurveyQuestion.objects.filter(
+            template = SurveyTemplate.objects.select_related('category').get(id=template_id)
+            questions = list(SurveyQuestion.objects.filter(
                 category=template.category,
                 is_active=True
-            )
+            ).order_by('display_order'))
             
             # Overall completion metrics
-            total_sessions = ComparisonSession.objects.filter(
+            session_stats = ComparisonSession.objects.filter(
                 category=template.category
-            ).count()
-            
-            completed_sessions = ComparisonSession.objects.filter(
-                category=template.category,
-                survey_completed=True
-            ).count()
+            ).aggregate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(survey_completed=True)),
+                avg_completion=Avg('survey_completion_percentage')
+            )
+            total_sessions = session_stats['total']
+            completed_sessions = session_stats['completed']
             
             overall_completion_rate = (completed_sessions / max(total_sessions, 1)) * 100
             
             # Average completion percentage
-            avg_completion_percentage = ComparisonSession.objects.filter(
-                category=template.category
-            ).aggregate(
-                avg_completion=Avg('survey_completion_percentage')
-            )['avg_completion'] or 0
+            avg_completion_percentage = session_stats['avg_completion'] or 0
             
             # Question-level analytics
-            question_analytics = []
-            for question in questions:
-                question_data = self.collect_question_analytics(question.id)
-                question_analytics.append(question_data)
+            analytics_by_question = self.collect_questions_analytics(questions)
+            question_analytics = [analytics_by_question[question.id] for question in questions]
             
             # Drop-off analysis
-            drop_off_points = self._analyze_drop_off_points(template)
+            drop_off_points = self._analyze_drop_off_points(questions, analytics_by_question)
             
             return {
                 'template_id': template_id,
@@ -149,18 +188,21 @@ class SurveyAnalyticsCollector:
         """
         cache_key = f"question_analytics_{question_id}"
         analytics_data = self.collect_question_analytics(question_id)
-        cache.set(cache_key, analytics_data, self.cache_timeout)
+        encoded_cache.set(cache_key, analytics_data, self.cache_timeout, prefix='question_analytics')
     
     def get_cached_analytics(self, question_id: int) -> Optional[Dict[str, Any]]:
         """
         Get cached analytics for a question.
         """
         cache_key = f"question_analytics_{question_id}"
-        return cache.get(cache_key)
+        return encoded_cache.get(cache_key, prefix='question_analytics')
     
     def bulk_update_analytics(self, question_ids: List[int] = None) -> Dict[str, int]:
         """
         Bulk update analytics for multiple questions.
+        
+        Questions are processed in batches of batch_size; each batch is
+        collected with grouped aggregates and written with one upsert.
         """
         if question_ids is None:
             questions = SurveyQuestion.objects.filter(is_active=True)
@@ -169,37 +211,51 @@ class SurveyAnalyticsCollector:
         updated_count = 0
         error_count = 0
         
-        for question_id in question_ids:
+        for start in range(0, len(question_ids), self.batch_size):
+            batch_ids = question_ids[start:start + self.batch_size]
             try:
-                analytics_data = self.collect_question_analytics(question_id)
+                questions = list(SurveyQuestion.objects.filter(id__in=batch_ids))
+                # Unknown question IDs cannot be stored
+                error_count += len(set(batch_ids) - {question.id for question in questions})
                 
-                # Update or create SurveyAnalytics record
-                analytics, created = SurveyAnalytics.objects.get_or_create(
-                    question_id=question_id,
-                    defaults={
-                        'total_responses': analytics_data['total_responses'],
-                        'completion_rate': analytics_data['completion_rate'],
-                        'skip_rate': analytics_data['skip_rate'],
-                        'most_common_response': analytics_data['most_common_response'],
-                        'response_distribution': analytics_data['response_distribution']
-                    }
-                )
+                analytics_by_question = self.collect_questions_analytics(questions)
                 
-                if not created:
-                    analytics.total_responses = analytics_data['total_responses']
-                    analytics.completion_rate = analytics_data['completion_rate']
-                    analytics.skip_rate = analytics_data['skip_rate']
-                    analytics.most_common_response = analytics_data['most_common_response']
-                    analytics.response_distribution = analytics_data['response_distribution']
-                    analytics.save()
+                # Update or create SurveyAnalytics records
+                with transaction.atomic():
+                    SurveyAnalytics.objects.bulk_create(
+                        [
+                            SurveyAnalytics(
+                                question_id=question_id,
+                                total_responses=analytics_data['total_responses'],
+                                completion_rate=analytics_data['completion_rate'],
+                                skip_rate=analytics_data['skip_rate'],
+                                most_common_response=analytics_data['most_common_response'],
+                                response_distribution=analytics_data['response_distribution']
+                            )
+                            for question_id, analytics_data in analytics_by_question.items()
+                        ],
+                        update_conflicts=True,
+                        unique_fields=['question'],
+                        update_fields=[
+                            'total_responses', 'completion_rate', 'skip_rate',
+                            'most_common_response', 'response_distribution', 'last_updated'
+                        ]
+                    )
                 
                 # Update cache
-                self.update_analytics_cache(question_id)
-                updated_count += 1
+                encoded_cache.set_many(
+                    {
+                        f"question_analytics_{question_id}": analytics_data
+                        for question_id, analytics_data in analytics_by_question.items()
+                    },
+                    self.cache_timeout,
+                    prefix='question_analytics'
+                )
+                updated_count += len(analytics_by_question)
                 
             except Exception as e:
-                logger.error(f"Error updating analytics for question {question_id}: {str(e)}")
-                error_count += 1
+                logger.error(f"Error updating analytics for questions {batch_ids[0]}-{batch_ids[-1]}: {str(e)}")
+                error_count += len(batch_ids)
         
         return {
             'updated': updated_count,
@@ -207,37 +263,47 @@ class SurveyAnalyticsCollector:
             'total': len(question_ids)
         }
     
-    def _calculate_response_distribution(self, responses, question) -> Dict[str, Any]:
+    def _calculate_response_distribution(
+        self,
+        question_type: str,
+        value_counts: List,
+        total_responses: int
+    ) -> Dict[str, Any]:
         """
         Calculate response distribution based on question type.
+        
+        Args:
+            question_type: Type of the question
+            value_counts: (response value, number of responses) pairs
+            total_responses: Number of responses to the question
         """
-        if question.question_type in ['CHOICE', 'MULTI_CHOICE']:
+        if question_type in ['CHOICE', 'MULTI_CHOICE']:
             # For choice questions, count each option
             distribution = {}
-            for response in responses:
-                value = response.response_value
+            for value, count in value_counts:
                 if isinstance(value, list):
                     # Multi-choice
                     for choice in value:
-                        distribution[str(choice)] = distribution.get(str(choice), 0) + 1
+                        distribution[str(choice)] = distribution.get(str(choice), 0) + count
                 else:
                     # Single choice
-                    distribution[str(value)] = distribution.get(str(value), 0) + 1
+                    distribution[str(value)] = distribution.get(str(value), 0) + count
             return distribution
         
-        elif question.question_type == 'BOOLEAN':
+        elif question_type == 'BOOLEAN':
             # For boolean questions
-            true_count = responses.filter(response_value=True).count()
-            false_count = responses.filter(response_value=False).count()
+            true_count = sum(count for value, count in value_counts if value is True)
+            false_count = sum(count for value, count in value_counts if value is False)
             return {'true': true_count, 'false': false_count}
         
-        elif question.question_type in ['NUMBER', 'RANGE']:
+        elif question_type in ['NUMBER', 'RANGE']:
             # For numeric questions, create ranges
-            values = [r.response_value for r in responses if isinstance(r.response_value, (int, float))]
+            values = [(value, count) for value, count in value_counts if isinstance(value, (int, float))]
             if not values:
                 return {}
             
-            min_val, max_val = min(values), max(values)
+            min_val = min(value for value, _ in values)
+            max_val = max(value for value, _ in values)
             range_size = (max_val - min_val) / 5 if max_val > min_val else 1
             
             distribution = {}
@@ -245,73 +311,74 @@ class SurveyAnalyticsCollector:
                 range_start = min_val + (i * range_size)
                 range_end = min_val + ((i + 1) * range_size)
                 range_key = f"{range_start:.1f}-{range_end:.1f}"
-                count = sum(1 for v in values if range_start <= v < range_end)
-                distribution[range_key] = count
+                distribution[range_key] = sum(count for value, count in values if range_start <= value < range_end)
             
             return distribution
         
         else:
             # For text questions, just return count
-            return {'total_responses': len(responses)}
+            return {'total_responses': total_responses}
     
-    def _get_most_common_response(self, responses, question) -> Any:
+    def _get_most_common_response(self, question_type: str, value_counts: List) -> Any:
         """
         Get the most common response for a question.
+        
+        Args:
+            question_type: Type of the question
+            value_counts: (response value, number of responses) pairs
         """
-        if question.question_type in ['CHOICE', 'BOOLEAN']:
+        if question_type in ['CHOICE', 'BOOLEAN']:
             # For single-value responses
             response_counts = {}
-            for response in responses:
-                value = str(response.response_value)
-                response_counts[value] = response_counts.get(value, 0) + 1
+            for value, count in value_counts:
+                response_counts[str(value)] = response_counts.get(str(value), 0) + count
             
             if response_counts:
                 return max(response_counts.items(), key=lambda x: x[1])[0]
         
-        elif question.question_type == 'MULTI_CHOICE':
+        elif question_type == 'MULTI_CHOICE':
             # For multi-choice, find most common individual choice
             choice_counts = {}
-            for response in responses:
-                if isinstance(response.response_value, list):
-                    for choice in response.response_value:
-                        choice_counts[str(choice)] = choice_counts.get(str(choice), 0) + 1
+            for value, count in value_counts:
+                if isinstance(value, list):
+                    for choice in value:
+                        choice_counts[str(choice)] = choice_counts.get(str(choice), 0) + count
             
             if choice_counts:
                 return max(choice_counts.items(), key=lambda x: x[1])[0]
         
-        elif question.question_type in ['NUMBER', 'RANGE']:
+        elif question_type in ['NUMBER', 'RANGE']:
             # For numeric, return average
-            values = [r.response_value for r in responses if isinstance(r.response_value, (int, float))]
+            values = [(value, count) for value, count in value_counts if isinstance(value, (int, float))]
             if values:
-                return float(sum(values) / len(values))
+                return float(sum(value * count for value, count in values) / sum(count for _, count in values))
         
         return None
     
-    def _analyze_drop_off_points(self, template) -> List[Dict[str, Any]]:
+    def _analyze_drop_off_points(
+        self,
+        questions: List[SurveyQuestion],
+        analytics_by_question: Dict[int, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
         """
         Analyze where users typically drop off in the survey.
-        """
-        questions = SurveyQuestion.objects.filter(
-            category=template.category,
-            is_active=True
-        ).order_by('display_order')
         
+        Args:
+            questions: The template's questions in display order
+            analytics_by_question: Analytics for those questions by ID
+        """
         drop_off_points = []
         
         for i, question in enumerate(questions):
             # Count sessions that reached this question
-            sessions_reached = ComparisonSession.objects.filter(
-                survey_responses__question=question
-            ).distinct().count()
+            sessions_reached = analytics_by_question[question.id]['total_responses']
             
             # Count sessions that reached the next question (if exists)
             next_question = questions[i + 1] if i + 1 < len(questions) else None
             sessions_continued = 0
             
             if next_question:
-                sessions_continued = ComparisonSession.objects.filter(
-                    survey_responses__question=next_question
-                ).distinct().count()
+                sessions_continued = analytics_by_question[next_question.id]['total_responses']
             
             drop_off_rate = 0
             if sessions_reached > 0:
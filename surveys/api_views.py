@@ -11,7 +11,7 @@ from django.db import transaction
 from comparison.models import ComparisonSession
 from policies.models import PolicyCategory
 from .models import SurveyQuestion, SurveyResponse
-# from .engine import SurveyEngine
+from .engine import SurveyEngine
 import logging
 import uuid
 
@@ -166,8 +166,10 @@ def save_survey_response(request):
                 'errors': []
             }
         
-        # Simple progress calculation
-        total_responses = SurveyResponse.objects.filter(session=session).count()
+        # Simple progress calculation from the session's response counter
+        if result['created']:
+            session.record_survey_response()
+        total_responses = session.survey_responses_count
         completion_percentage = min(100.0, (total_responses / 10) * 100)  # Assume 10 questions for now
         
         return Response({
@@ -190,6 +192,83 @@ def save_survey_response(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def save_survey_responses(request):
+    """
+    Save a batch of survey responses.
+    
+    POST /api/surveys/responses/batch/
+    
+    Expected payload:
+    {
+        "session_key": "unique-session-identifier",
+        "category_slug": "health",
+        "responses": [
+            {"question_id": 123, "response_value": "answer", "confidence_level": 4},
+            ...
+        ]
+    }
+    
+    Validates all answers, saves the valid ones in one transaction and
+    reports errors by question ID.
+    """
+    try:
+        # Extract data from request
+        session_key = request.data.get('session_key')
+        category_slug = request.data.get('category_slug')
+        answers = request.data.get('responses')
+        
+        # Validate required fields
+        if not all([session_key, category_slug]) or not isinstance(answers, list) or not answers:
+            return Response({
+                'error': 'Missing required fields: session_key, category_slug, responses'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not all(isinstance(answer, dict) and answer.get('question_id') is not None for answer in answers):
+            return Response({
+                'error': 'Each response needs a question_id'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Validate category exists
+        category, error_response = get_category_or_404(category_slug)
+        if error_response:
+            return error_response
+        
+        # Get or create comparison session
+        session, created = ComparisonSession.objects.get_or_create(
+            session_key=session_key,
+            defaults={
+                'category': category,
+                'user': request.user if request.user.is_authenticated else None
+            }
+        )
+        
+        # Ensure session is for the correct category
+        if session.category != category:
+            return Response({
+                'error': f'Session category mismatch. Expected: {category_slug}, Got: {session.category.slug}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        survey_engine = SurveyEngine(category_slug)
+        result = survey_engine.save_responses(session, answers)
+        
+        return Response({
+            'success': result['success'],
+            'response_ids': result['response_ids'],
+            'errors': result['errors'],
+            'session_key': session_key,
+            'completion_percentage': float(session.survey_completion_percentage),
+            'survey_completed': session.survey_completed
+        }, status=status.HTTP_200_OK if result['response_ids'] else status.HTTP_400_BAD_REQUEST)
+        
+    except Exception as e:
+        logger.error(f"Error saving survey responses: {str(e)}")
+        return Response({
+            'error': 'Failed to save survey responses'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_survey_progress(request, session_key):
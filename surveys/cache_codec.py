@@ -0,0 +1,404 @@
+"""
+Compact encoding for cached survey and comparison payloads.
+Values are serialized to a compact binary or JSON form, compressed above a size
+threshold, and stored as bytes, with per-prefix payload size statistics.
+"""
+
+import hashlib
+import json
+import pickle
+import zlib
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional
+from uuid import UUID
+from django.conf import settings
+from django.core.cache import cache
+import logging
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Unencodable(Exception):
+    """Raised when a value has no compact encoding and must be pickled."""
+
+
+# Key marking a tagged value in the JSON encoding
+_TAG = '\x00t'
+
+# Extension type codes in the msgpack encoding
+_EXT_DECIMAL = 1
+_EXT_DATETIME = 2
+_EXT_DATE = 3
+_EXT_TIME = 4
+_EXT_UUID = 5
+
+_DECODERS: Dict[str, Callable[[str], Any]] = {
+    'decimal': Decimal,
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'time': time.fromisoformat,
+    'uuid': UUID,
+}
+
+
+def _to_json(value: Any) -> Any:
+    """
+    Convert a value to JSON-compatible data, tagging Decimal, date/time and
+    UUID values. Only exact builtin types are accepted, so a decoded value
+    always has the type it was written with.
+    """
+    value_type = type(value)
+    if value is None or value_type in (str, int, float, bool):
+        return value
+    if value_type is list:
+        return [_to_json(item) for item in value]
+    if value_type is dict:
+        converted = {}
+        for key, item in value.items():
+            if type(key) is not str or key == _TAG:
+                raise _Unencodable(f"dict key {key!r}")
+            converted[key] = _to_json(item)
+        return converted
+    if value_type is Decimal:
+        return {_TAG: ['decimal', str(value)]}
+    if value_type is datetime:
+        return {_TAG: ['datetime', value.isoformat()]}
+    if value_type is date:
+        return {_TAG: ['date', value.isoformat()]}
+    if value_type is time:
+        return {_TAG: ['time', value.isoformat()]}
+    if value_type is UUID:
+        return {_TAG: ['uuid', str(value)]}
+    raise _Unencodable(value_type.__name__)
+
+
+def _from_json_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and _TAG in obj:
+        kind, text = obj[_TAG]
+        return _DECODERS[kind](text)
+    return obj
+
+
+def _msgpack_default(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is Decimal:
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode())
+    if value_type is datetime:
+        return msgpack.ExtType(_EXT_DATETIME, value.isoformat().encode())
+    if value_type is date:
+        return msgpack.ExtType(_EXT_DATE, value.isoformat().encode())
+    if value_type is time:
+        return msgpack.ExtType(_EXT_TIME, value.isoformat().encode())
+    if value_type is UUID:
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    raise _Unencodable(value_type.__name__)
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_UUID:
+        return UUID(bytes=data)
+    decoder = {
+        _EXT_DECIMAL: Decimal,
+        _EXT_DATETIME: datetime.fromisoformat,
+        _EXT_DATE: date.fromisoformat,
+        _EXT_TIME: time.fromisoformat,
+    }.get(code)
+    if decoder is None:
+        return msgpack.ExtType(code, data)
+    return decoder(data.decode())
+
+
+class CacheCodec:
+    """
+    Serializer and compressor for cache values.
+
+    SURVEY_CACHE_SERIALIZER selects 'json' (default), 'msgpack' (when the
+    msgpack package is installed) or 'pickle'. The json and msgpack forms
+    cover dicts with string keys, lists, scalars, Decimal, date/time and UUID;
+    anything else (tuples, model instances, compiled structures) is pickled,
+    so every value round-trips with its original types.
+
+    Encoded payloads of at least SURVEY_CACHE_COMPRESS_MIN_BYTES are
+    compressed with SURVEY_CACHE_COMPRESSION, 'zlib' (default) or 'lz4' when
+    installed; None disables compression. Every payload starts with a three
+    byte header naming its serializer and compression, so settings can change
+    while older entries are still in the cache.
+    """
+
+    MAGIC = b'\xc5'
+
+    SERIALIZERS = {'json': b'j', 'msgpack': b'm', 'pickle': b'p'}
+    COMPRESSORS = {None: b'-', 'zlib': b'z', 'lz4': b'l'}
+
+    DEFAULT_COMPRESS_MIN_BYTES = 1024
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = 'default',
+        compress_min_bytes: Optional[int] = None
+    ):
+        serializer = serializer or getattr(settings, 'SURVEY_CACHE_SERIALIZER', 'json')
+        if compression == 'default':
+            compression = getattr(settings, 'SURVEY_CACHE_COMPRESSION', 'zlib')
+
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning("msgpack is not installed, falling back to json cache serialization")
+            serializer = 'json'
+        if compression == 'lz4' and lz4_frame is None:
+            logger.warning("lz4 is not installed, falling back to zlib cache compression")
+            compression = 'zlib'
+        if serializer not in self.SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in self.COMPRESSORS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes if compress_min_bytes is not None else getattr(
+            settings, 'SURVEY_CACHE_COMPRESS_MIN_BYTES', self.DEFAULT_COMPRESS_MIN_BYTES
+        )
+        self.compress_level = getattr(settings, 'SURVEY_CACHE_COMPRESS_LEVEL', 6)
+
+    def serialize(self, value: Any) -> tuple:
+        """
+        Serialize a value without compressing it.
+
+        Returns:
+            (serializer tag, serialized bytes)
+        """
+        if self.serializer == 'msgpack':
+            try:
+                return b'm', msgpack.packb(
+                    value, default=_msgpack_default, use_bin_type=True, strict_types=True
+                )
+            except (_Unencodable, TypeError, ValueError, OverflowError):
+                pass
+        elif self.serializer == 'json':
+            try:
+                return b'j', json.dumps(
+                    _to_json(value), separators=(',', ':'), ensure_ascii=False
+                ).encode()
+            except (_Unencodable, RecursionError):
+                pass
+
+        return b'p', pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value as a self-describing payload."""
+        return self.encode_with_size(value)[0]
+
+    def encode_with_size(self, value: Any) -> tuple:
+        """
+        Encode a value and report its size before compression.
+
+        Returns:
+            (payload, serialized size in bytes)
+        """
+        serializer_tag, body = self.serialize(value)
+        serialized_bytes = len(body)
+
+        compression = self.compression if len(body) >= self.compress_min_bytes else None
+        if compression == 'zlib':
+            body = zlib.compress(body, self.compress_level)
+        elif compression == 'lz4':
+            body = lz4_frame.compress(body)
+
+        return self.MAGIC + serializer_tag + self.COMPRESSORS[compression] + body, serialized_bytes
+
+    def is_encoded(self, payload: Any) -> bool:
+        return isinstance(payload, bytes) and payload[:1] == self.MAGIC
+
+    def decode(self, payload: Any) -> Any:
+        """
+        Decode a payload written by encode().
+
+        Values that are not encoded payloads, such as entries written before
+        the codec was introduced, are returned unchanged.
+        """
+        if not self.is_encoded(payload):
+            return payload
+
+        serializer_tag, compression_tag, body = payload[1:2], payload[2:3], payload[3:]
+
+        if compression_tag == b'z':
+            body = zlib.decompress(body)
+        elif compression_tag == b'l':
+            if lz4_frame is None:
+                raise ValueError("Cached payload is lz4 compressed but lz4 is not installed")
+            body = lz4_frame.decompress(body)
+
+        if serializer_tag == b'j':
+            return json.loads(body, object_hook=_from_json_object)
+        if serializer_tag == b'm':
+            if msgpack is None:
+                raise ValueError("Cached payload is msgpack encoded but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False, ext_hook=_msgpack_ext_hook)
+        return pickle.loads(body)
+
+
+class EncodedCache:
+    """
+    Django cache wrapper that stores values through a CacheCodec.
+
+    Keeps per-process statistics of payload sizes grouped by key prefix
+    (the text before the first ':' unless a prefix is given), to show which
+    caches hold the most bytes and how well they compress.
+    """
+
+    def __init__(self, codec: Optional[CacheCodec] = None, backend=None):
+        self._codec = codec
+        self.backend = backend if backend is not None else cache
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = Lock()
+
+    @property
+    def codec(self) -> CacheCodec:
+        # Created on first use so settings overrides apply
+        if self._codec is None:
+            self._codec = CacheCodec()
+        return self._codec
+
+    @staticmethod
+    def _prefix(key: str, prefix: Optional[str]) -> str:
+        return prefix or key.split(':', 1)[0]
+
+    def _record_write(self, prefix: str, value_bytes: int, stored_bytes: int) -> None:
+        with self._lock:
+            stats = self._stats[prefix]
+            stats['writes'] += 1
+            stats['serialized_bytes'] += value_bytes
+            stats['stored_bytes'] += stored_bytes
+
+    def _record_read(self, prefix: str, payload: Any) -> None:
+        with self._lock:
+            stats = self._stats[prefix]
+            stats['reads'] += 1
+            if payload is None:
+                stats['misses'] += 1
+            elif isinstance(payload, bytes):
+                stats['read_bytes'] += len(payload)
+
+    def _encode(self, key: str, value: Any, prefix: Optional[str]) -> bytes:
+        payload, serialized_bytes = self.codec.encode_with_size(value)
+        self._record_write(self._prefix(key, prefix), serialized_bytes, len(payload))
+        return payload
+
+    def get(self, key: str, default: Any = None, prefix: Optional[str] = None) -> Any:
+        payload = self.backend.get(key)
+        self._record_read(self._prefix(key, prefix), payload)
+        if payload is None:
+            return default
+        return self.codec.decode(payload)
+
+    def set(self, key: str, value: Any, timeout: Any = None, prefix: Optional[str] = None) -> None:
+        self.backend.set(key, self._encode(key, value, prefix), timeout)
+
+    def get_many(self, keys: Iterable[str], prefix: Optional[str] = None) -> Dict[str, Any]:
+        keys = list(keys)
+        found = self.backend.get_many(keys)
+        for key in keys:
+            self._record_read(self._prefix(key, prefix), found.get(key))
+        return {key: self.codec.decode(payload) for key, payload in found.items()}
+
+    def set_many(self, data: Dict[str, Any], timeout: Any = None, prefix: Optional[str] = None) -> None:
+        self.backend.set_many(
+            {key: self._encode(key, value, prefix) for key, value in data.items()},
+            timeout
+        )
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Payload statistics by key prefix.
+
+        Returns:
+            For each prefix: writes, reads, misses, serialized/stored/read
+            byte totals, average stored size and compression ratio
+            (serialized bytes over stored bytes)
+        """
+        with self._lock:
+            snapshot = {prefix: dict(stats) for prefix, stats in self._stats.items()}
+
+        for stats in snapshot.values():
+            writes = stats.get('writes', 0)
+            stored = stats.get('stored_bytes', 0)
+            stats['avg_stored_bytes'] = round(stored / writes, 1) if writes else 0
+            stats['compression_ratio'] = round(stats.get('serialized_bytes', 0) / stored, 2) if stored else 0
+        return snapshot
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _feed(update: Callable[[bytes], None], value: Any) -> None:
+    """Feed a canonical, type-tagged form of a value to a hash."""
+    if value is None:
+        update(b'N')
+    elif value is True or value is False:
+        update(b'T' if value else b'F')
+    elif isinstance(value, str):
+        data = value.encode()
+        update(b's%d:' % len(data))
+        update(data)
+    elif isinstance(value, (int, float, Decimal)):
+        data = str(value).encode()
+        update(b'n%d:' % len(data))
+        update(data)
+    elif isinstance(value, dict):
+        update(b'{%d:' % len(value))
+        for key in sorted(value, key=str):
+            _feed(update, key)
+            _feed(update, value[key])
+        update(b'}')
+    elif isinstance(value, (list, tuple)):
+        update(b'[%d:' % len(value))
+        for item in value:
+            _feed(update, item)
+        update(b']')
+    elif isinstance(value, (set, frozenset)):
+        _feed(update, sorted(value, key=str))
+    elif isinstance(value, (datetime, date, time)):
+        _feed(update, value.isoformat())
+    else:
+        _feed(update, str(value))
+
+
+def stable_hash(data: Any, length: int = 8) -> str:
+    """
+    Hash a nested structure without serializing it first.
+
+    Dict keys are visited in sorted order and every value is fed with its
+    type and length, so equal structures hash equally and distinct ones do
+    not collide by concatenation.
+
+    Args:
+        data: Value to hash
+        length: Number of hex characters to return
+
+    Returns:
+        Hex digest prefix
+    """
+    hasher = hashlib.md5()
+    _feed(hasher.update, data)
+    return hasher.hexdigest()[:length]
+
+
+# Global encoded cache instance
+encoded_cache = EncodedCache()
@@ -3,19 +3,107 @@ Caching utilities for survey performance optimization.
 Implements question template caching, response processing caching, and lazy loading.
 """
 
-import hashlib
-import json
-from typing import Dict, List, Any, Optional, Union
-from django.core.cache import cache
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, List, Any, Optional, Union
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
 from django.conf import settings
 from django.db.models import QuerySet
 from django.utils import timezone
 from datetime import timedelta
 import logging
 
+from .cache_codec import encoded_cache, stable_hash
+
 logger = logging.getLogger(__name__)
 
 
+def cache_is_shared() -> bool:
+    """
+    Whether the default cache is shared between worker processes.
+    Process-local backends can't carry invalidation from one worker to another.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+class CacheNamespaces:
+    """
+    Generation counters for groups of cache keys.
+    
+    Keys embed the current generation of every namespace they belong to.
+    Invalidating a namespace is a single atomic increment: entries written
+    under an older generation are never read again and age out with their
+    own timeout, so nothing has to be deleted by pattern or flushed.
+    
+    Counters only reach other workers through a shared cache backend; see
+    cache_is_shared().
+    """
+    
+    KEY_PREFIX = 'cache_ns'
+    
+    @classmethod
+    def _counter_key(cls, namespace: str) -> str:
+        return f"{cls.KEY_PREFIX}:{namespace}"
+    
+    @staticmethod
+    def _initial_generation() -> int:
+        # Millisecond clock, so a counter recreated after eviction never
+        # goes back to a generation that was already used
+        return int(time.time() * 1000)
+    
+    @classmethod
+    def generations(cls, namespaces: List[str]) -> List[int]:
+        """
+        Get the current generation of each namespace, in one cache round trip.
+        
+        Args:
+            namespaces: Namespace names
+            
+        Returns:
+            Generations in the same order as namespaces
+        """
+        keys = [cls._counter_key(namespace) for namespace in namespaces]
+        found = cache.get_many(keys)
+        
+        for key in keys:
+            if key not in found:
+                generation = cls._initial_generation()
+                if not cache.add(key, generation, None):
+                    generation = cache.get(key, generation)
+                found[key] = generation
+        
+        return [found[key] for key in keys]
+    
+    @classmethod
+    def generation(cls, namespace: str) -> int:
+        """Get the current generation of a namespace."""
+        return cls.generations([namespace])[0]
+    
+    @classmethod
+    def invalidate(cls, namespace: str) -> int:
+        """
+        Move a namespace to a new generation.
+        
+        Args:
+            namespace: Namespace name
+            
+        Returns:
+            The new generation
+        """
+        key = cls._counter_key(namespace)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # No counter yet (or it was evicted), so no live keys use it
+            generation = cls._initial_generation()
+            if cache.add(key, generation, None):
+                return generation
+            return cache.incr(key)
+
+
 class SurveyCacheManager:
     """
     Centralized cache manager for survey-related data.
@@ -29,6 +117,7 @@ class SurveyCacheManager:
     CRITERIA_PREFIX = 'survey_criteria'
     SECTIONS_PREFIX = 'survey_sections'
     ANALYTICS_PREFIX = 'survey_analytics'
+    STRUCTURE_PREFIX = 'survey_structure'
     
     # Cache timeouts (in seconds)
     TEMPLATE_TIMEOUT = 3600 * 24  # 24 hours
@@ -37,44 +126,64 @@ class SurveyCacheManager:
     CRITERIA_TIMEOUT = 3600 * 4    # 4 hours
     SECTIONS_TIMEOUT = 3600 * 6    # 6 hours
     ANALYTICS_TIMEOUT = 3600 * 1   # 1 hour
+    STRUCTURE_TIMEOUT = 3600 * 24  # 24 hours
     
     def __init__(self):
-        """Initialize the cache manager."""
-        self.cache_enabled = getattr(settings, 'SURVEY_CACHE_ENABLED', True)
+        """
+        Initialize the cache manager.
+        Caching is off when the default cache is process-local, since
+        namespace invalidations would not reach other workers.
+        """
+        self.cache_enabled = getattr(settings, 'SURVEY_CACHE_ENABLED', True) and cache_is_shared()
         self.cache_prefix = getattr(settings, 'SURVEY_CACHE_PREFIX', 'survey')
     
-    def _make_key(self, prefix: str, *args) -> str:
+    def _make_key(self, prefix: str, *args, namespaces: Optional[List[str]] = None) -> str:
         """
         Create a cache key with consistent formatting.
         
+        The key embeds the generation of the manager-wide namespace and of
+        each given namespace, so invalidating any of them retires the key.
+        
         Args:
             prefix: Cache key prefix
             *args: Additional key components
+            namespaces: Namespaces the key belongs to
             
         Returns:
             Formatted cache key
         """
-        key_parts = [self.cache_prefix, prefix] + [str(arg) for arg in args]
+        generations = CacheNamespaces.generations([self.cache_prefix] + list(namespaces or []))
+        version = 'v' + '.'.join(str(generation) for generation in generations)
+        
+        key_parts = [self.cache_prefix, prefix, version] + [str(arg) for arg in args]
         return ':'.join(key_parts)
     
+    def _category_namespace(self, category_slug: str) -> str:
+        """Namespace for a category's template, questions and sections."""
+        return f"{self.cache_prefix}:category:{category_slug}"
+    
+    def _session_namespace(self, session_id: int) -> str:
+        """Namespace for a session's response processing results."""
+        return f"{self.cache_prefix}:session:{session_id}"
+    
+    def _responses_namespace(self, responses_hash: str) -> str:
+        """Namespace for data derived from one set of responses."""
+        return f"{self.cache_prefix}:responses:{responses_hash}"
+    
     def _hash_data(self, data: Any) -> str:
         """
         Create a hash of data for cache key generation.
         
+        The structure is fed to the hash field by field instead of being
+        dumped to JSON first.
+        
         Args:
             data: Data to hash
             
         Returns:
             MD5 hash string
         """
-        if isinstance(data, dict):
-            # Sort dict for consistent hashing
-            # Use default=str to handle Decimal and other non-serializable types
-            data_str = json.dumps(data, sort_keys=True, default=str)
-        else:
-            data_str = str(data)
-        
-        return hashlib.md5(data_str.encode()).hexdigest()[:8]
+        return stable_hash(data)
     
     def get_template_cache(self, category_slug: str) -> Optional[Dict[str, Any]]:
         """
@@ -89,8 +198,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return None
         
-        key = self._make_key(self.TEMPLATE_PREFIX, category_slug)
-        return cache.get(key)
+        key = self._make_key(
+            self.TEMPLATE_PREFIX, category_slug,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        return encoded_cache.get(key, prefix=self.TEMPLATE_PREFIX)
     
     def set_template_cache(self, category_slug: str, template_data: Dict[str, Any]) -> None:
         """
@@ -103,10 +215,57 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        key = self._make_key(self.TEMPLATE_PREFIX, category_slug)
-        cache.set(key, template_data, self.TEMPLATE_TIMEOUT)
+        key = self._make_key(
+            self.TEMPLATE_PREFIX, category_slug,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        encoded_cache.set(key, template_data, self.TEMPLATE_TIMEOUT, prefix=self.TEMPLATE_PREFIX)
         logger.debug(f"Cached template data for category: {category_slug}")
     
+    def get_structure_key(self, category_slug: str, template_id: int, template_version: str) -> str:
+        """
+        Cache key for a compiled survey structure.
+        Changes whenever the category's cache generation moves on.
+        
+        Args:
+            category_slug: Policy category slug
+            template_id: Survey template ID
+            template_version: Survey template version
+        """
+        return self._make_key(
+            self.STRUCTURE_PREFIX, category_slug, template_id, template_version,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+    
+    def get_structure_cache(self, structure_key: str) -> Optional[Any]:
+        """
+        Get a cached compiled survey structure.
+        
+        Args:
+            structure_key: Key from get_structure_key
+            
+        Returns:
+            Cached structure or None
+        """
+        if not self.cache_enabled:
+            return None
+        
+        return encoded_cache.get(structure_key, prefix=self.STRUCTURE_PREFIX)
+    
+    def set_structure_cache(self, structure_key: str, structure: Any) -> None:
+        """
+        Cache a compiled survey structure.
+        
+        Args:
+            structure_key: Key from get_structure_key
+            structure: Compiled structure to cache
+        """
+        if not self.cache_enabled:
+            return
+        
+        encoded_cache.set(structure_key, structure, self.STRUCTURE_TIMEOUT, prefix=self.STRUCTURE_PREFIX)
+        logger.debug(f"Cached survey structure: {structure_key}")
+    
     def get_questions_cache(self, category_slug: str, section: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Get cached question data.
@@ -125,8 +284,11 @@ class SurveyCacheManager:
         if section:
             key_parts.append(section)
         
-        key = self._make_key(self.QUESTIONS_PREFIX, *key_parts)
-        return cache.get(key)
+        key = self._make_key(
+            self.QUESTIONS_PREFIX, *key_parts,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        return encoded_cache.get(key, prefix=self.QUESTIONS_PREFIX)
     
     def set_questions_cache(
         self, 
@@ -149,8 +311,11 @@ class SurveyCacheManager:
         if section:
             key_parts.append(section)
         
-        key = self._make_key(self.QUESTIONS_PREFIX, *key_parts)
-        cache.set(key, questions_data, self.QUESTIONS_TIMEOUT)
+        key = self._make_key(
+            self.QUESTIONS_PREFIX, *key_parts,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        encoded_cache.set(key, questions_data, self.QUESTIONS_TIMEOUT, prefix=self.QUESTIONS_PREFIX)
         logger.debug(f"Cached questions for category: {category_slug}, section: {section}")
     
     def get_sections_cache(self, category_slug: str) -> Optional[List[Dict[str, Any]]]:
@@ -166,8 +331,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return None
         
-        key = self._make_key(self.SECTIONS_PREFIX, category_slug)
-        return cache.get(key)
+        key = self._make_key(
+            self.SECTIONS_PREFIX, category_slug,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        return encoded_cache.get(key, prefix=self.SECTIONS_PREFIX)
     
     def set_sections_cache(self, category_slug: str, sections_data: List[Dict[str, Any]]) -> None:
         """
@@ -180,8 +348,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        key = self._make_key(self.SECTIONS_PREFIX, category_slug)
-        cache.set(key, sections_data, self.SECTIONS_TIMEOUT)
+        key = self._make_key(
+            self.SECTIONS_PREFIX, category_slug,
+            namespaces=[self._category_namespace(category_slug)]
+        )
+        encoded_cache.set(key, sections_data, self.SECTIONS_TIMEOUT, prefix=self.SECTIONS_PREFIX)
         logger.debug(f"Cached sections for category: {category_slug}")
     
     def get_response_processing_cache(self, session_id: int, responses_hash: str) -> Optional[Dict[str, Any]]:
@@ -198,8 +369,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return None
         
-        key = self._make_key(self.RESPONSES_PREFIX, session_id, responses_hash)
-        return cache.get(key)
+        key = self._make_key(
+            self.RESPONSES_PREFIX, session_id, responses_hash,
+            namespaces=[self._session_namespace(session_id)]
+        )
+        return encoded_cache.get(key, prefix=self.RESPONSES_PREFIX)
     
     def set_response_processing_cache(
         self, 
@@ -218,8 +392,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        key = self._make_key(self.RESPONSES_PREFIX, session_id, responses_hash)
-        cache.set(key, processing_results, self.RESPONSES_TIMEOUT)
+        key = self._make_key(
+            self.RESPONSES_PREFIX, session_id, responses_hash,
+            namespaces=[self._session_namespace(session_id)]
+        )
+        encoded_cache.set(key, processing_results, self.RESPONSES_TIMEOUT, prefix=self.RESPONSES_PREFIX)
         logger.debug(f"Cached response processing for session: {session_id}")
     
     def get_criteria_cache(self, criteria_hash: str) -> Optional[Dict[str, Any]]:
@@ -235,8 +412,11 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return None
         
-        key = self._make_key(self.CRITERIA_PREFIX, criteria_hash)
-        return cache.get(key)
+        key = self._make_key(
+            self.CRITERIA_PREFIX, criteria_hash,
+            namespaces=[self._responses_namespace(criteria_hash)]
+        )
+        return encoded_cache.get(key, prefix=self.CRITERIA_PREFIX)
     
     def set_criteria_cache(self, criteria_hash: str, criteria_data: Dict[str, Any]) -> None:
         """
@@ -249,13 +429,18 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        key = self._make_key(self.CRITERIA_PREFIX, criteria_hash)
-        cache.set(key, criteria_data, self.CRITERIA_TIMEOUT)
+        key = self._make_key(
+            self.CRITERIA_PREFIX, criteria_hash,
+            namespaces=[self._responses_namespace(criteria_hash)]
+        )
+        encoded_cache.set(key, criteria_data, self.CRITERIA_TIMEOUT, prefix=self.CRITERIA_PREFIX)
         logger.debug(f"Cached criteria with hash: {criteria_hash}")
     
     def invalidate_template_cache(self, category_slug: str) -> None:
         """
         Invalidate template cache for a category.
+        Also retires the category's cached questions, sections and compiled
+        survey structure.
         
         Args:
             category_slug: Policy category slug
@@ -263,17 +448,7 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        # Invalidate template cache
-        template_key = self._make_key(self.TEMPLATE_PREFIX, category_slug)
-        cache.delete(template_key)
-        
-        # Invalidate related caches
-        questions_key = self._make_key(self.QUESTIONS_PREFIX, category_slug)
-        cache.delete(questions_key)
-        
-        sections_key = self._make_key(self.SECTIONS_PREFIX, category_slug)
-        cache.delete(sections_key)
-        
+        CacheNamespaces.invalidate(self._category_namespace(category_slug))
         logger.info(f"Invalidated template cache for category: {category_slug}")
     
     def invalidate_session_cache(self, session_id: int) -> None:
@@ -286,11 +461,33 @@ class SurveyCacheManager:
         if not self.cache_enabled:
             return
         
-        # We can't easily delete all keys with a pattern in Django's cache
-        # So we'll use a versioning approach or manual tracking
-        # For now, we'll just log the invalidation
+        CacheNamespaces.invalidate(self._session_namespace(session_id))
         logger.info(f"Invalidated session cache for session: {session_id}")
     
+    def invalidate_responses_cache(self, responses_hash: str) -> None:
+        """
+        Invalidate cached criteria derived from a set of responses.
+        
+        Args:
+            responses_hash: Hash of the responses
+        """
+        if not self.cache_enabled:
+            return
+        
+        CacheNamespaces.invalidate(self._responses_namespace(responses_hash))
+        logger.info(f"Invalidated responses cache for hash: {responses_hash}")
+    
+    def invalidate_all(self) -> None:
+        """
+        Invalidate every entry written by this cache manager, leaving the
+        rest of the cache untouched.
+        """
+        if not self.cache_enabled:
+            return
+        
+        CacheNamespaces.invalidate(self.cache_prefix)
+        logger.info(f"Invalidated all survey cache entries under prefix: {self.cache_prefix}")
+    
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics and health information.
@@ -311,10 +508,13 @@ class SurveyCacheManager:
                 'responses': self.RESPONSES_TIMEOUT,
                 'criteria': self.CRITERIA_TIMEOUT,
                 'sections': self.SECTIONS_TIMEOUT,
-                'analytics': self.ANALYTICS_TIMEOUT
+                'analytics': self.ANALYTICS_TIMEOUT,
+                'structure': self.STRUCTURE_TIMEOUT
             }
         }
         
+        stats['payloads'] = encoded_cache.get_stats()
+        
         # Try to get cache backend info if available
         try:
             cache_info = cache._cache.get_stats()
@@ -709,10 +909,124 @@ class LazyQuestionLoader:
 cache_manager = SurveyCacheManager()
 
 
+class _LocalEntry:
+    """Value held by LocalLRUCache with its expiry time."""
+    
+    __slots__ = ('value', 'expires_at')
+    
+    def __init__(self, value: Any, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class LocalLRUCache:
+    """
+    In-process cache bounded by entry count and age.
+    
+    Entries are evicted least recently used first once max_entries is
+    reached, and are dropped when read after ttl seconds. Hits, misses,
+    evictions and expirations are counted per key prefix (the part of the
+    key before the first ':').
+    """
+    
+    def __init__(self, max_entries: int = 1000, ttl: float = 300):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries held
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, _LocalEntry]' = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+    
+    def _count(self, key: str, event: str) -> None:
+        prefix = key.split(':', 1)[0]
+        counters = self._counters.get(prefix)
+        if counters is None:
+            counters = self._counters[prefix] = {
+                'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0
+            }
+        counters[event] += 1
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live value, marking it most recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._count(key, 'misses')
+                return None
+            
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._count(key, 'expirations')
+                self._count(key, 'misses')
+                return None
+            
+            self._entries.move_to_end(key)
+            self._count(key, 'hits')
+            return entry.value
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = _LocalEntry(value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._count(evicted_key, 'evictions')
+    
+    def delete_matching(self, predicate: Callable[[str], bool]) -> int:
+        """
+        Delete every entry whose key matches the predicate.
+        
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+    
+    def clear(self) -> None:
+        """Delete every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Size, limits and per-prefix counters."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'prefixes': {prefix: dict(counters) for prefix, counters in self._counters.items()}
+            }
+
+
 class ResponseProcessingCache:
     """
     Specialized caching for response processing to avoid recomputation.
     Handles caching of criteria mapping, weight calculations, and user profiles.
+    
+    Two tiers: a bounded in-process LRU (L1) in front of the Django cache
+    backend (L2). L1 limits come from SURVEY_LOCAL_CACHE_MAX_ENTRIES and
+    SURVEY_LOCAL_CACHE_TTL.
     """
     
     def __init__(self, cache_manager: Optional[SurveyCacheManager] = None):
@@ -723,7 +1037,94 @@ class ResponseProcessingCache:
             cache_manager: Optional cache manager instance
         """
         self.cache_manager = cache_manager or SurveyCacheManager()
-        self._local_cache = {}
+        self._local_cache = LocalLRUCache(
+            max_entries=getattr(settings, 'SURVEY_LOCAL_CACHE_MAX_ENTRIES', 1000),
+            ttl=getattr(settings, 'SURVEY_LOCAL_CACHE_TTL', 300)
+        )
+        self._l2_counters: Dict[str, Dict[str, int]] = {}
+        self._stage_counters: Dict[str, Dict[str, int]] = {}
+    
+    def _count_l2(self, prefix: str, hit: bool) -> None:
+        counters = self._l2_counters.setdefault(prefix, {'hits': 0, 'misses': 0})
+        counters['hits' if hit else 'misses'] += 1
+    
+    def _count_stage(self, stage: str, hit: bool) -> None:
+        counters = self._stage_counters.setdefault(stage, {'hits': 0, 'misses': 0})
+        counters['hits' if hit else 'misses'] += 1
+    
+    def get_processing_result_cache(self, session_id: int, responses_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session's cached processing result for one set of responses.
+        
+        Args:
+            session_id: Comparison session ID
+            responses_hash: Hash of the session's responses
+            
+        Returns:
+            Cached processing result or None
+        """
+        result = self.cache_manager.get_response_processing_cache(session_id, responses_hash)
+        self._count_stage('result', result is not None)
+        return result
+    
+    def set_processing_result_cache(
+        self,
+        session_id: int,
+        responses_hash: str,
+        result: Dict[str, Any]
+    ) -> None:
+        """
+        Cache a session's processing result.
+        
+        Args:
+            session_id: Comparison session ID
+            responses_hash: Hash of the session's responses
+            result: Processing result to cache
+        """
+        self.cache_manager.set_response_processing_cache(session_id, responses_hash, result)
+    
+    def get_stage_cache(self, stage: str, category_slug: str, stage_hash: str) -> Optional[Any]:
+        """
+        Get the cached output of one response processing stage.
+        
+        Args:
+            stage: 'criteria', 'weights', 'filters' or 'profile'
+            category_slug: Policy category slug
+            stage_hash: Hash of the stage's inputs
+            
+        Returns:
+            Cached stage output or None
+        """
+        if stage == 'criteria':
+            value = self.get_criteria_mapping_cache(category_slug, stage_hash)
+        elif stage == 'weights':
+            value = self.get_weight_calculation_cache(stage_hash)
+        elif stage == 'filters':
+            value = self.get_filters_cache(stage_hash)
+        else:
+            value = self.get_user_profile_cache(stage_hash)
+        
+        self._count_stage(stage, value is not None)
+        return value
+    
+    def set_stage_cache(self, stage: str, category_slug: str, stage_hash: str, value: Any) -> None:
+        """
+        Cache the output of one response processing stage.
+        
+        Args:
+            stage: 'criteria', 'weights', 'filters' or 'profile'
+            category_slug: Policy category slug
+            stage_hash: Hash of the stage's inputs
+            value: Stage output to cache
+        """
+        if stage == 'criteria':
+            self.set_criteria_mapping_cache(category_slug, stage_hash, value)
+        elif stage == 'weights':
+            self.set_weight_calculation_cache(stage_hash, value)
+        elif stage == 'filters':
+            self.set_filters_cache(stage_hash, value)
+        else:
+            self.set_user_profile_cache(stage_hash, value)
     
     def get_criteria_mapping_cache(self, category_slug: str, responses_hash: str) -> Optional[Dict[str, Any]]:
         """
@@ -736,16 +1137,18 @@ class ResponseProcessingCache:
         Returns:
             Cached criteria mapping or None
         """
-        cache_key = f"criteria_mapping_{category_slug}_{responses_hash}"
+        cache_key = f"criteria_mapping:{category_slug}:{responses_hash}"
         
         # Check local cache first
-        if cache_key in self._local_cache:
-            return self._local_cache[cache_key]
+        cached_data = self._local_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
         
         # Check distributed cache
         cached_data = self.cache_manager.get_criteria_cache(responses_hash)
+        self._count_l2('criteria_mapping', bool(cached_data))
         if cached_data:
-            self._local_cache[cache_key] = cached_data
+            self._local_cache.set(cache_key, cached_data)
             return cached_data
         
         return None
@@ -764,10 +1167,10 @@ class ResponseProcessingCache:
             responses_hash: Hash of survey responses
             criteria_data: Criteria mapping data to cache
         """
-        cache_key = f"criteria_mapping_{category_slug}_{responses_hash}"
+        cache_key = f"criteria_mapping:{category_slug}:{responses_hash}"
         
         # Store in local cache
-        self._local_cache[cache_key] = criteria_data
+        self._local_cache.set(cache_key, criteria_data)
         
         # Store in distributed cache
         self.cache_manager.set_criteria_cache(responses_hash, criteria_data)
@@ -782,16 +1185,18 @@ class ResponseProcessingCache:
         Returns:
             Cached weight calculations or None
         """
-        cache_key = f"weights_{responses_hash}"
+        cache_key = f"weights:{responses_hash}"
         
-        if cache_key in self._local_cache:
-            return self._local_cache[cache_key]
+        weights = self._local_cache.get(cache_key)
+        if weights is not None:
+            return weights
         
         # Try to get from criteria cache (weights are part of criteria)
         cached_criteria = self.cache_manager.get_criteria_cache(responses_hash)
+        self._count_l2('weights', bool(cached_criteria and 'weights' in cached_criteria))
         if cached_criteria and 'weights' in cached_criteria:
             weights = cached_criteria['weights']
-            self._local_cache[cache_key] = weights
+            self._local_cache.set(cache_key, weights)
             return weights
         
         return None
@@ -804,8 +1209,8 @@ class ResponseProcessingCache:
             responses_hash: Hash of survey responses
             weights: Weight calculations to cache
         """
-        cache_key = f"weights_{responses_hash}"
-        self._local_cache[cache_key] = weights
+        cache_key = f"weights:{responses_hash}"
+        self._local_cache.set(cache_key, weights)
     
     def get_user_profile_cache(self, responses_hash: str) -> Optional[Dict[str, Any]]:
         """
@@ -817,16 +1222,18 @@ class ResponseProcessingCache:
         Returns:
             Cached user profile or None
         """
-        cache_key = f"profile_{responses_hash}"
+        cache_key = f"profile:{responses_hash}"
         
-        if cache_key in self._local_cache:
-            return self._local_cache[cache_key]
+        profile = self._local_cache.get(cache_key)
+        if profile is not None:
+            return profile
         
         # Try to get from criteria cache (profile is part of criteria)
         cached_criteria = self.cache_manager.get_criteria_cache(responses_hash)
+        self._count_l2('profile', bool(cached_criteria and 'user_profile' in cached_criteria))
         if cached_criteria and 'user_profile' in cached_criteria:
             profile = cached_criteria['user_profile']
-            self._local_cache[cache_key] = profile
+            self._local_cache.set(cache_key, profile)
             return profile
         
         return None
@@ -839,8 +1246,30 @@ class ResponseProcessingCache:
             responses_hash: Hash of survey responses
             profile_data: User profile data to cache
         """
-        cache_key = f"profile_{responses_hash}"
-        self._local_cache[cache_key] = profile_data
+        cache_key = f"profile:{responses_hash}"
+        self._local_cache.set(cache_key, profile_data)
+    
+    def get_filters_cache(self, responses_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached policy filters.
+        
+        Args:
+            responses_hash: Hash of survey responses
+            
+        Returns:
+            Cached filters or None
+        """
+        return self._local_cache.get(f"filters:{responses_hash}")
+    
+    def set_filters_cache(self, responses_hash: str, filters: Dict[str, Any]) -> None:
+        """
+        Cache policy filters.
+        
+        Args:
+            responses_hash: Hash of survey responses
+            filters: Filters to cache
+        """
+        self._local_cache.set(f"filters:{responses_hash}", filters)
     
     def generate_responses_hash(self, responses: List[Dict[str, Any]]) -> str:
         """
@@ -855,15 +1284,20 @@ class ResponseProcessingCache:
         # Sort responses by question ID for consistent hashing
         sorted_responses = sorted(responses, key=lambda r: r.get('question_id', 0))
         
-        # Create a simplified representation for hashing
-        hash_data = []
-        for response in sorted_responses:
-            hash_data.append({
-                'question_id': response.get('question_id'),
-                'field_name': response.get('field_name'),
-                'response_value': response.get('response_value'),
-                'confidence_level': response.get('confidence_level', 3)
-            })
+        # Hash one tuple of the relevant fields per response
+        hash_data = [
+            (
+                response.get('question_id'),
+                response.get('field_name'),
+                response.get('section'),
+                response.get('question_type'),
+                response.get('weight_impact'),
+                response.get('question_text'),
+                response.get('response_value'),
+                response.get('confidence_level', 3)
+            )
+            for response in sorted_responses
+        ]
         
         return self.cache_manager._hash_data(hash_data)
     
@@ -875,16 +1309,10 @@ class ResponseProcessingCache:
             responses_hash: Hash of responses to invalidate
         """
         # Remove from local cache
-        keys_to_remove = [
-            key for key in self._local_cache.keys()
-            if responses_hash in key
-        ]
+        self._local_cache.delete_matching(lambda key: key.endswith(f":{responses_hash}"))
         
-        for key in keys_to_remove:
-            del self._local_cache[key]
-        
-        # Remove from distributed cache
-        self.cache_manager.invalidate_session_cache(0)  # Generic invalidation
+        # Retire distributed cache entries for these responses
+        self.cache_manager.invalidate_responses_cache(responses_hash)
         logger.info(f"Invalidated response cache for hash: {responses_hash}")
     
     def clear_local_cache(self) -> None:
@@ -898,9 +1326,20 @@ class ResponseProcessingCache:
         Returns:
             Dictionary with cache statistics
         """
+        local_stats = self._local_cache.get_stats()
         return {
-            'local_cache_size': len(self._local_cache),
-            'local_cache_keys': list(self._local_cache.keys()),
+            'local_cache_size': local_stats['size'],
+            'local_cache': local_stats,
+            'distributed_cache': {
+                prefix: dict(counters) for prefix, counters in self._l2_counters.items()
+            },
+            'stages': {
+                stage: dict(
+                    counters,
+                    hit_rate=counters['hits'] / (counters['hits'] + counters['misses'])
+                )
+                for stage, counters in self._stage_counters.items()
+            },
             'cache_manager_stats': self.cache_manager.get_cache_stats()
         }
 
@@ -1039,11 +1478,11 @@ class SurveyPerformanceOptimizer:
                 section_questions = lazy_loader.load_section_questions(section['name'])
                 for question in section_questions:
                     prefetched_data['questions'][question['id']] = question
-                    
-                    # Load dependencies for this question
-                    deps = lazy_loader.get_question_dependencies(question['id'])
-                    if deps:
-                        prefetched_data['dependencies'][question['id']] = deps
+            
+            # Dependencies come from the compiled survey's graph
+            prefetched_data['dependencies'] = self._prefetch_dependencies(
+                category_slug, prefetched_data['questions']
+            )
             
             # Load responses if session provided
             if session_id:
@@ -1060,6 +1499,58 @@ class SurveyPerformanceOptimizer:
             logger.error(f"Error prefetching survey data: {str(e)}")
             return prefetched_data
     
+    def _prefetch_dependencies(
+        self,
+        category_slug: str,
+        questions: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Dependency rules of the given questions, keyed by parent question ID.
+        
+        Args:
+            category_slug: Policy category slug
+            questions: Question data by ID, used for child field names
+            
+        Returns:
+            Lists of dependency rules in LazyQuestionLoader.get_question_dependencies format
+        """
+        from .engine import SurveyEngine
+        from .models import SurveyQuestion
+        
+        structure = SurveyEngine(category_slug).get_structure()
+        if structure is None:
+            return {}
+        
+        edges = {
+            question_id: structure.children[question_id]
+            for question_id in questions
+            if question_id in structure.children
+        }
+        
+        field_names = {question_id: question['field_name'] for question_id, question in questions.items()}
+        field_names.update(
+            (question_id, question['field_name']) for question_id, question in structure.questions.items()
+        )
+        missing = {
+            child_id for question_edges in edges.values()
+            for child_id, _, _ in question_edges if child_id not in field_names
+        }
+        if missing:
+            field_names.update(SurveyQuestion.objects.filter(id__in=missing).values_list('id', 'field_name'))
+        
+        return {
+            question_id: [
+                {
+                    'child_question_id': child_id,
+                    'condition_value': condition_value,
+                    'condition_operator': condition_operator,
+                    'child_field_name': field_names.get(child_id)
+                }
+                for child_id, condition_operator, condition_value in question_edges
+            ]
+            for question_id, question_edges in edges.items()
+        }
+    
     def optimize_session_queries(self, session_id: int) -> Dict[str, Any]:
         """
         Optimize queries for a specific session with prefetching.
@@ -0,0 +1,230 @@
+"""
+Write-behind buffer for draft survey responses.
+Auto-saved drafts are coalesced in the cache per session and question, keeping
+only the latest value, and written to SurveyResponse in batches.
+"""
+
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import transaction
+from comparison.models import ComparisonSession
+from .caching import cache_is_shared
+from .models import SurveyResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DraftResponseBuffer:
+    """
+    Coalesces draft responses in the cache and flushes them in batches.
+
+    Drafts for a session are flushed when the buffer holds flush_size
+    questions, when its oldest draft is older than flush_interval seconds
+    (checked as drafts arrive and at the end of every request the process
+    serves), or explicitly. Code that needs the session's responses to be
+    complete - response processing, completion checks and explicit answers,
+    which must not be overwritten by an older draft - calls flush first.
+
+    Buffering needs a cache shared by every worker, so that a flush in one
+    worker sees drafts buffered by another. With a process-local cache drafts
+    are written straight away instead.
+
+    Drafts of one session are expected to come from one client, so buffer
+    updates are plain read-modify-write.
+    """
+
+    KEY_PREFIX = 'survey_drafts'
+
+    def __init__(
+        self,
+        flush_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        timeout: Optional[int] = None
+    ):
+        self.flush_size = flush_size or getattr(settings, 'SURVEY_DRAFT_FLUSH_SIZE', 20)
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'SURVEY_DRAFT_FLUSH_INTERVAL', 30
+        )
+        self.timeout = timeout or getattr(settings, 'SURVEY_DRAFT_TIMEOUT', 3600)
+        # Sessions this process buffered drafts for, by when buffering started
+        self._buffered: Dict[int, float] = {}
+        self._lock = Lock()
+
+    def _key(self, session: ComparisonSession) -> str:
+        return f"{self.KEY_PREFIX}:{session.pk}"
+
+    def pending(self, session: ComparisonSession) -> Dict[int, Dict[str, Any]]:
+        """
+        Drafts waiting to be written for a session.
+
+        Returns:
+            Dictionaries with response_value and confidence_level by question ID
+        """
+        entry = cache.get(self._key(session))
+        return dict(entry['drafts']) if entry else {}
+
+    def add(self, session: ComparisonSession, drafts: List[Dict[str, Any]]) -> int:
+        """
+        Buffer drafts, replacing earlier drafts for the same questions.
+
+        Args:
+            session: ComparisonSession instance
+            drafts: Validated dictionaries with 'question_id', 'response_value'
+                and optionally 'confidence_level'
+
+        Returns:
+            Number of responses written if the buffer was flushed, otherwise 0
+        """
+        latest = {
+            draft['question_id']: {
+                'response_value': draft['response_value'],
+                'confidence_level': draft.get('confidence_level', 3)
+            }
+            for draft in drafts
+        }
+
+        if not cache_is_shared():
+            return self._write(session, latest)
+
+        key = self._key(session)
+        entry = cache.get(key) or {'started_at': time.time(), 'drafts': {}}
+        entry['drafts'].update(latest)
+
+        if (
+            len(entry['drafts']) >= self.flush_size or
+            time.time() - entry['started_at'] >= self.flush_interval
+        ):
+            cache.delete(key)
+            self._forget(session.pk)
+            return self._write(session, entry['drafts'])
+
+        cache.set(key, entry, self.timeout)
+        self._remember(session.pk, entry['started_at'])
+        return 0
+
+    def flush(self, session: ComparisonSession) -> int:
+        """
+        Write a session's buffered drafts to the database.
+
+        Returns:
+            Number of responses written
+        """
+        key = self._key(session)
+        self._forget(session.pk)
+        entry = cache.get(key)
+        if not entry:
+            return 0
+
+        cache.delete(key)
+        return self._write(session, entry['drafts'])
+
+    def flush_due(self) -> int:
+        """
+        Flush sessions this process buffered whose oldest draft is older than
+        flush_interval, so drafts of an abandoned session are still written.
+
+        Returns:
+            Number of responses written
+        """
+        now = time.time()
+        with self._lock:
+            due = [
+                session_id for session_id, started_at in self._buffered.items()
+                if now - started_at >= self.flush_interval
+            ]
+        if not due:
+            return 0
+
+        written = 0
+        found = set()
+        for session in ComparisonSession.objects.select_related('category').filter(pk__in=due):
+            found.add(session.pk)
+            try:
+                written += self.flush(session)
+            except Exception as e:
+                logger.error(f"Error flushing due drafts for session {session.pk}: {str(e)}")
+
+        # Sessions deleted in the meantime have nothing left to write
+        for session_id in set(due) - found:
+            self._forget(session_id)
+        return written
+
+    def discard(self, session: ComparisonSession) -> None:
+        """Drop a session's buffered drafts without writing them."""
+        self._forget(session.pk)
+        cache.delete(self._key(session))
+
+    def _remember(self, session_id: int, started_at: float) -> None:
+        with self._lock:
+            self._buffered[session_id] = started_at
+
+    def _forget(self, session_id: int) -> None:
+        with self._lock:
+            self._buffered.pop(session_id, None)
+
+    def _write(self, session: ComparisonSession, drafts: Dict[int, Dict[str, Any]]) -> int:
+        """Upsert drafts with one bulk statement and update session progress."""
+        if not drafts:
+            return 0
+
+        responses = [
+            SurveyResponse(
+                session=session,
+                question_id=question_id,
+                response_value=draft['response_value'],
+                confidence_level=draft['confidence_level']
+            )
+            for question_id, draft in drafts.items()
+        ]
+
+        try:
+            with transaction.atomic():
+                SurveyResponse.objects.bulk_create(
+                    responses,
+                    update_conflicts=True,
+                    unique_fields=['session', 'question'],
+                    update_fields=['response_value', 'confidence_level', 'updated_at']
+                )
+        except Exception as e:
+            # Put the drafts back so a later flush can retry them
+            logger.error(f"Error flushing {len(responses)} draft responses for session {session.pk}: {str(e)}")
+            started_at = time.time()
+            cache.set(self._key(session), {'started_at': started_at, 'drafts': drafts}, self.timeout)
+            self._remember(session.pk, started_at)
+            raise
+
+        self._update_progress(session)
+        logger.debug(f"Flushed {len(responses)} draft responses for session {session.pk}")
+        return len(responses)
+
+    def _update_progress(self, session: ComparisonSession) -> None:
+        from .engine import SurveyEngine
+
+        try:
+            SurveyEngine(session.category.slug)._update_session_progress(session)
+        except Exception as e:
+            logger.error(f"Error updating progress after draft flush for session {session.pk}: {str(e)}")
+
+
+# Global buffer instance
+draft_buffer = DraftResponseBuffer()
+
+
+def flush_drafts(session: ComparisonSession) -> int:
+    """Write any buffered drafts of a session before reading its responses."""
+    return draft_buffer.flush(session)
+
+
+def _flush_due_drafts(**kwargs) -> None:
+    try:
+        draft_buffer.flush_due()
+    except Exception as e:
+        logger.error(f"Error flushing due drafts: {str(e)}")
+
+
+request_finished.connect(_flush_due_drafts, dispatch_uid='surveys.draft_buffer.flush_due_drafts')
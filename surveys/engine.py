@@ -7,6 +7,7 @@ Includes performance optimizations with caching and lazy loading.
 from decimal import Decimal
 from typing import List, Dict, Any, Optional, Union
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -20,6 +21,8 @@ from .caching import (
     SurveyCacheManager, LazyQuestionLoader, 
     ResponseProcessingCache, performance_optimizer
 )
+from .survey_structure import CompiledSurvey, get_compiled_survey
+from .draft_buffer import flush_drafts
 import logging
 import json
 
@@ -55,6 +58,7 @@ class SurveyEngine:
         self.cache_manager = SurveyCacheManager()
         self.lazy_loader = LazyQuestionLoader(category_slug, self.cache_manager)
         self.response_cache = ResponseProcessingCache(self.cache_manager)
+        self._structure = None
         self._load_category()
         self._load_template()
     
@@ -82,6 +86,20 @@ class SurveyEngine:
                 is_active=True
             ).order_by('-created_at').first()
     
+    def get_structure(self) -> Optional[CompiledSurvey]:
+        """
+        Get the compiled structure of the active template.
+        
+        Returns:
+            CompiledSurvey or None if the category has no active template
+        """
+        if not self.template:
+            return None
+        
+        if self._structure is None:
+            self._structure = get_compiled_survey(self.category, self.template, self.cache_manager)
+        return self._structure
+    
     def get_survey_sections(self) -> List[Dict[str, Any]]:
         """
         Return organized survey sections with questions.
@@ -89,56 +107,11 @@ class SurveyEngine:
         Returns:
             List of dictionaries containing section information and questions
         """
-        if not self.template:
+        structure = self.get_structure()
+        if structure is None:
             return []
         
-        # Get all questions for this template, ordered by display_order
-        template_questions = TemplateQuestion.objects.filter(
-            template=self.template
-        ).select_related('question').order_by('display_order')
-        
-        # Group questions by section
-        sections = {}
-        for tq in template_questions:
-            question = tq.question
-            if not question.is_active:
-                continue
-                
-            section_name = question.section
-            if section_name not in sections:
-                sections[section_name] = {
-                    'name': section_name,
-                    'questions': []
-                }
-            
-            # Prepare question data
-            question_data = {
-                'id': question.id,
-                'question_text': question.question_text,
-                'question_type': question.question_type,
-                'field_name': question.field_name,
-                'choices': question.choices,
-                'validation_rules': question.validation_rules,
-                'help_text': question.help_text,
-                'is_required': tq.is_required,  # Use template override if available
-                'display_order': tq.display_order,
-                'weight_impact': float(question.weight_impact)
-            }
-            
-            sections[section_name]['questions'].append(question_data)
-        
-        # Convert to list and sort by first question's display order
-        section_list = []
-        for section_name, section_data in sections.items():
-            if section_data['questions']:
-                # Sort questions within section by display order
-                section_data['questions'].sort(key=lambda q: q['display_order'])
-                section_list.append(section_data)
-        
-        # Sort sections by the display order of their first question
-        section_list.sort(key=lambda s: s['questions'][0]['display_order'] if s['questions'] else 0)
-        
-        return section_list
+        return structure.get_sections()
     
     def get_question_by_id(self, question_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -150,6 +123,10 @@ class SurveyEngine:
         Returns:
             Question data dictionary or None if not found
         """
+        structure = self.get_structure()
+        if structure is not None:
+            return structure.get_question(question_id)
+        
         try:
             question = SurveyQuestion.objects.get(
                 id=question_id,
@@ -481,12 +458,10 @@ class SurveyEngine:
             }
         
         try:
-            # Get the question
-            question = SurveyQuestion.objects.get(
-                id=question_id,
-                category=self.category,
-                is_active=True
-            )
+            # validate_response has already checked the question is an active one of this category
+            
+            # Write pending drafts first so they cannot overwrite this answer later
+            flush_drafts(session)
             
             # Validate confidence level
             if not (1 <= confidence_level <= 5):
@@ -495,28 +470,25 @@ class SurveyEngine:
             # Save or update the response
             survey_response, created = SurveyResponse.objects.update_or_create(
                 session=session,
-                question=question,
+                question_id=question_id,
                 defaults={
                     'response_value': validation_result['cleaned_value'],
                     'confidence_level': confidence_level
                 }
             )
             
-            # Update session progress
-            self._update_session_progress(session)
+            # Only a newly answered question changes session progress
+            if created:
+                self._record_new_response(session)
             
             return {
                 'success': True,
                 'response_id': survey_response.id,
+                'response_value': survey_response.response_value,
                 'created': created,
                 'errors': []
             }
             
-        except SurveyQuestion.DoesNotExist:
-            return {
-                'success': False,
-                'errors': ['Question not found']
-            }
         except Exception as e:
             logger.error(f"Error saving response for question {question_id}: {str(e)}")
             return {
@@ -524,6 +496,80 @@ class SurveyEngine:
                 'errors': ['Failed to save response']
             }
     
+    def save_responses(self, session: ComparisonSession, answers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Validate and save a batch of responses.
+        
+        Every answer is validated against the compiled question map; valid
+        ones are upserted with a single bulk statement in one transaction and
+        session progress is recomputed once for the batch. Invalid answers are
+        reported per question and not saved. A question answered more than
+        once in the batch keeps its last answer.
+        
+        Args:
+            session: ComparisonSession instance
+            answers: Dictionaries with 'question_id', 'response_value' and
+                optionally 'confidence_level' (1-5)
+            
+        Returns:
+            Dictionary with save result, response IDs by question ID and error
+            messages by question ID
+        """
+        errors = {}
+        responses = {}
+        for answer in answers:
+            question_id = answer.get('question_id')
+            validation_result = self.validate_response(question_id, answer.get('response_value'))
+            
+            if not validation_result['is_valid']:
+                errors[question_id] = validation_result['errors']
+                responses.pop(question_id, None)
+                continue
+            
+            confidence_level = answer.get('confidence_level', 3)
+            if not isinstance(confidence_level, int) or not (1 <= confidence_level <= 5):
+                confidence_level = 3  # Default to neutral
+            
+            errors.pop(question_id, None)
+            responses[question_id] = SurveyResponse(
+                session=session,
+                question_id=question_id,
+                response_value=validation_result['cleaned_value'],
+                confidence_level=confidence_level
+            )
+        
+        response_ids = {}
+        if responses:
+            try:
+                # Write pending drafts first so they cannot overwrite these answers later
+                flush_drafts(session)
+                
+                with transaction.atomic():
+                    SurveyResponse.objects.bulk_create(
+                        list(responses.values()),
+                        update_conflicts=True,
+                        unique_fields=['session', 'question'],
+                        update_fields=['response_value', 'confidence_level', 'updated_at']
+                    )
+                    
+                    # Update session progress once for the batch
+                    self._update_session_progress(session)
+            except Exception as e:
+                logger.error(f"Error saving {len(responses)} responses for session {session.session_key}: {str(e)}")
+                return {
+                    'success': False,
+                    'response_ids': {},
+                    'errors': {**errors, **{question_id: ['Failed to save response'] for question_id in responses}}
+                }
+            
+            response_ids = {question_id: response.pk for question_id, response in responses.items()}
+        
+        return {
+            'success': not errors,
+            'response_ids': response_ids,
+            'errors': errors
+        }
+    
     def calculate_completion_percentage(self, session: ComparisonSession) -> float:
         """
         Calculate survey completion percentage for a session.
@@ -537,11 +583,11 @@ class SurveyEngine:
         if not self.template:
             return 0.0
         
+        # Count buffered drafts as answered
+        flush_drafts(session)
+        
         # Get total number of questions in the template
-        total_questions = TemplateQuestion.objects.filter(
-            template=self.template,
-            question__is_active=True
-        ).count()
+        total_questions = self.get_structure().question_count
         
         if total_questions == 0:
             return 100.0  # No questions = 100% complete
@@ -570,6 +616,13 @@ class SurveyEngine:
             completion_percentage=completion_percentage
         )
     
+    def _record_new_response(self, session: ComparisonSession):
+        """Count a newly answered question towards session progress without recounting."""
+        structure = self.get_structure()
+        session.record_survey_response(
+            total_questions=structure.question_count if structure is not None else None
+        )
+    
     def get_session_responses(self, session: ComparisonSession) -> Dict[str, Any]:
         """
         Get all responses for a session organized by section.
@@ -580,6 +633,8 @@ class SurveyEngine:
         Returns:
             Dictionary with responses organized by section
         """
+        flush_drafts(session)
+        
         responses = SurveyResponse.objects.filter(
             session=session,
             question__category=self.category
@@ -622,15 +677,26 @@ class SurveyEngine:
         Returns:
             List of question IDs that should be shown
         """
-        dependencies = QuestionDependency.objects.filter(
-            parent_question_id=parent_question_id,
-            is_active=True
-        )
+        structure = self.get_structure()
+        if structure is not None and structure.has_question(parent_question_id):
+            dependencies = [
+                QuestionDependency(
+                    child_question_id=child_id,
+                    condition_operator=operator,
+                    condition_value=value
+                )
+                for child_id, operator, value in structure.children.get(parent_question_id, ())
+            ]
+        else:
+            dependencies = QuestionDependency.objects.filter(
+                parent_question_id=parent_question_id,
+                is_active=True
+            )
         
         questions_to_show = []
         for dependency in dependencies:
             if dependency.evaluate_condition(parent_response):
-                questions_to_show.append(dependency.child_question.id)
+                questions_to_show.append(dependency.child_question_id)
         
         return questions_to_show
     
@@ -14,6 +14,7 @@ from policies.models import PolicyCategory
 from .models import SurveyQuestion, SurveyResponse, QuestionDependency
 from .engine import SurveyEngine
 from .response_processor import ResponseProcessor
+from .draft_buffer import draft_buffer, flush_drafts
 import logging
 import uuid
 
@@ -39,6 +40,9 @@ class SurveyFlowController:
         self.category = None
         self.session = None
         self.engine = None
+        self._answers = None
+        self._answered_ids = None
+        self._visibility = None
         
         self._load_category()
         self._load_or_create_session()
@@ -98,12 +102,7 @@ class SurveyFlowController:
             return None, None
         
         # Get answered question IDs
-        answered_question_ids = set(
-            SurveyResponse.objects.filter(
-                session=self.session,
-                question__category=self.category
-            ).values_list('question_id', flat=True)
-        )
+        answered_question_ids = self._get_answered_ids()
         
         # Find first unanswered question
         for section in sections:
@@ -121,6 +120,77 @@ class SurveyFlowController:
         # All questions answered
         return None, None
     
+    def _load_answers(self) -> None:
+        """Load the session's response values in one query."""
+        flush_drafts(self.session)
+        self._answers = {}
+        self._answered_ids = set()
+        responses = SurveyResponse.objects.filter(session=self.session).values_list(
+            'question_id', 'question__category_id', 'response_value'
+        )
+        for question_id, category_id, response_value in responses:
+            self._answers[question_id] = response_value
+            if category_id == self.category.id:
+                self._answered_ids.add(question_id)
+        self._visibility = None
+    
+    def _get_answers(self) -> Dict[int, Any]:
+        """Response values of the session by question ID."""
+        if self._answers is None:
+            self._load_answers()
+        return self._answers
+    
+    def _get_answered_ids(self) -> set:
+        """IDs of this category's questions the session has answered."""
+        if self._answered_ids is None:
+            self._load_answers()
+        return self._answered_ids
+    
+    def _get_visibility(self) -> Dict[int, bool]:
+        """Visibility of every conditional question for the session's answers."""
+        if self._visibility is None:
+            self._visibility = self._dependency_graph().evaluate(self._get_answers())
+        return self._visibility
+    
+    def _dependency_graph(self):
+        structure = self.engine.get_structure()
+        return structure.graph if structure is not None else None
+    
+    def _record_answer(self, question_id: int, response_value: Any, prune_hidden: bool = False) -> List[int]:
+        """
+        Apply a saved answer to the loaded answers and re-evaluate its dependants.
+        
+        Returns:
+            IDs of dependent questions hidden after the change
+        """
+        answers = self._get_answers()
+        answers[question_id] = response_value
+        # The engine only saves answers to this category's questions
+        self._answered_ids.add(question_id)
+        
+        graph = self._dependency_graph()
+        if graph is None:
+            # No compiled survey; check direct dependants against the database
+            dependent_questions = QuestionDependency.objects.filter(
+                parent_question_id=question_id,
+                is_active=True
+            ).values_list('child_question_id', flat=True)
+            hidden = [
+                dep_question_id for dep_question_id in dependent_questions
+                if not self._should_show_question(dep_question_id)
+            ]
+            if prune_hidden:
+                for dep_question_id in hidden:
+                    answers.pop(dep_question_id, None)
+            return hidden
+        return graph.refresh(question_id, answers, self._get_visibility(), prune_hidden=prune_hidden)
+    
+    def _forget_answers(self) -> None:
+        """Drop loaded answers so they are reloaded on next use."""
+        self._answers = None
+        self._answered_ids = None
+        self._visibility = None
+    
     def _should_show_question(self, question_id: int) -> bool:
         """
         Check if a question should be shown based on conditional logic.
@@ -131,7 +201,11 @@ class SurveyFlowController:
         Returns:
             True if question should be shown, False otherwise
         """
-        # Get dependencies for this question
+        graph = self._dependency_graph()
+        if graph is not None and graph.covers(question_id):
+            return self._get_visibility().get(question_id, True)
+        
+        # Question outside the compiled survey
         dependencies = QuestionDependency.objects.filter(
             child_question_id=question_id,
             is_active=True
@@ -153,14 +227,7 @@ class SurveyFlowController:
     
     def _get_response_value(self, question_id: int) -> Any:
         """Get the response value for a specific question."""
-        try:
-            response = SurveyResponse.objects.get(
-                session=self.session,
-                question_id=question_id
-            )
-            return response.response_value
-        except SurveyResponse.DoesNotExist:
-            return None
+        return self._get_answers().get(question_id)
     
     def get_section_progress(self) -> Dict[str, Any]:
         """
@@ -173,12 +240,7 @@ class SurveyFlowController:
         progress = {}
         
         # Get answered question IDs
-        answered_question_ids = set(
-            SurveyResponse.objects.filter(
-                session=self.session,
-                question__category=self.category
-            ).values_list('question_id', flat=True)
-        )
+        answered_question_ids = self._get_answered_ids()
         
         for section in sections:
             section_name = section['name']
@@ -243,6 +305,9 @@ class SurveyFlowController:
                 'next_action': None
             }
         
+        # Re-evaluate the questions that depend on this answer
+        self._record_answer(question_id, save_result['response_value'])
+        
         # Check if this response triggers any conditional questions
         triggered_questions = self.engine.check_conditional_questions(
             self.session, 
@@ -330,12 +395,7 @@ class SurveyFlowController:
             }
         
         # Get answered question IDs
-        answered_question_ids = set(
-            SurveyResponse.objects.filter(
-                session=self.session,
-                question__category=self.category
-            ).values_list('question_id', flat=True)
-        )
+        answered_question_ids = self._get_answered_ids()
         
         # Find first unanswered question in section
         for question in target_section['questions']:
@@ -454,11 +514,15 @@ class SurveyFlowController:
         try:
             with transaction.atomic():
                 if not preserve_responses:
+                    # Drop buffered drafts along with saved responses
+                    draft_buffer.discard(self.session)
+                    
                     # Delete all responses for this session
                     SurveyResponse.objects.filter(
                         session=self.session,
                         question__category=self.category
                     ).delete()
+                    self._forget_answers()
                 
                 # Reset survey data in session
                 self.session.reset_survey_data()
@@ -504,6 +568,9 @@ class SurveyFlowController:
         """
         try:
             with transaction.atomic():
+                # A buffered draft counts as an existing response
+                flush_drafts(self.session)
+                
                 # Check if response exists
                 try:
                     existing_response = SurveyResponse.objects.get(
@@ -516,12 +583,6 @@ class SurveyFlowController:
                         'error': 'Response not found'
                     }
                 
-                # Get questions that depend on this one
-                dependent_questions = QuestionDependency.objects.filter(
-                    parent_question_id=question_id,
-                    is_active=True
-                ).values_list('child_question_id', flat=True)
-                
                 # Save the new response
                 save_result = self.engine.save_response(
                     self.session,
@@ -533,16 +594,25 @@ class SurveyFlowController:
                 if not save_result['success']:
                     return save_result
                 
-                # Check if dependent questions should be removed
-                affected_questions = []
-                for dep_question_id in dependent_questions:
-                    if not self._should_show_question(dep_question_id):
-                        # Remove response for dependent question
-                        SurveyResponse.objects.filter(
-                            session=self.session,
-                            question_id=dep_question_id
-                        ).delete()
-                        affected_questions.append(dep_question_id)
+                # Re-evaluate the questions below this one; a question that is
+                # now hidden loses its response, which its own dependants see
+                answers = self._get_answers()
+                answered_before = set(answers)
+                affected_questions = self._record_answer(
+                    question_id, save_result['response_value'], prune_hidden=True
+                )
+                
+                # Remove responses for hidden dependent questions
+                pruned = [
+                    dep_question_id for dep_question_id in affected_questions
+                    if dep_question_id in answered_before
+                ]
+                if pruned:
+                    SurveyResponse.objects.filter(
+                        session=self.session,
+                        question_id__in=pruned
+                    ).delete()
+                    self._answered_ids.difference_update(pruned)
                 
                 # Update session progress
                 self.engine._update_session_progress(self.session)
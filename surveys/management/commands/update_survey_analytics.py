@@ -63,10 +63,10 @@ class Command(BaseCommand):
         # Check if we should skip recently updated analytics
         if not options['force']:
             recent_threshold = timezone.now() - timezone.timedelta(hours=1)
-            recently_updated = SurveyAnalytics.objects.filter(
+            recently_updated = set(SurveyAnalytics.objects.filter(
                 question_id__in=question_ids,
                 last_updated__gte=recent_threshold
-            ).values_list('question_id', flat=True)
+            ).values_list('question_id', flat=True))
             
             if recently_updated:
                 question_ids = [qid for qid in question_ids if qid not in recently_updated]
@@ -3,12 +3,15 @@ Response Processor for Policy Comparison Surveys.
 Converts survey responses to comparison criteria and generates dynamic weights.
 """
 
+import copy
 from decimal import Decimal
 from typing import Dict, List, Any, Optional, Tuple
 from django.db.models import Avg
 from django.utils.translation import gettext_lazy as _
 from comparison.models import ComparisonSession
 from .models import SurveyResponse, SurveyQuestion
+from .draft_buffer import flush_drafts
+from .caching import response_processing_cache
 import logging
 import json
 
@@ -19,8 +22,24 @@ class ResponseProcessor:
     """
     Processes survey responses and converts them to comparison engine criteria.
     Handles dynamic weight calculation and criteria mapping for different insurance categories.
+    
+    Results are memoized by a fingerprint of the session's responses. On a
+    miss, each stage is looked up by a hash of only the inputs it reads, so
+    changing one answer recomputes just the stages that answer feeds.
     """
     
+    # Response and question fields read by the processing stages
+    RESPONSE_FIELDS = {
+        'question_id': 'question_id',
+        'field_name': 'question__field_name',
+        'section': 'question__section',
+        'question_type': 'question__question_type',
+        'weight_impact': 'question__weight_impact',
+        'question_text': 'question__question_text',
+        'response_value': 'response_value',
+        'confidence_level': 'confidence_level'
+    }
+    
     def __init__(self, category_slug: str):
         """
         Initialize the response processor for a specific category.
@@ -204,13 +223,13 @@ class ResponseProcessor:
             Dictionary containing processed criteria, weights, and user profile
         """
         try:
+            # Buffered drafts must be part of the processed responses
+            flush_drafts(session)
+            
             # Get all responses for this session
-            responses = SurveyResponse.objects.filter(
-                session=session,
-                question__category__slug=self.category_slug
-            ).select_related('question').order_by('question__display_order')
+            rows = self._load_response_rows(session)
             
-            if not responses.exists():
+            if not rows:
                 logger.warning(f"No survey responses found for session {session.id}")
                 return {
                     'success': False,
@@ -223,22 +242,35 @@ class ResponseProcessor:
                     'total_responses': 0
                 }
             
+            responses_hash = response_processing_cache.generate_responses_hash(rows)
+            cached_result = response_processing_cache.get_processing_result_cache(session.id, responses_hash)
+            if cached_result is not None:
+                return cached_result
+            
             # Process responses into structured data
-            processed_data = self._structure_responses(responses)
+            processed_data = self._structure_rows(rows)
             
             # Generate comparison criteria
-            criteria = self._generate_criteria(processed_data)
+            criteria = self._run_stage(
+                'criteria', self._criteria_inputs(processed_data), self._generate_criteria, processed_data
+            )
             
             # Calculate dynamic weights
-            weights = self._calculate_weights(processed_data)
+            weights = self._run_stage(
+                'weights', self._weight_inputs(processed_data), self._calculate_weights, processed_data
+            )
             
             # Generate policy filters
-            filters = self._generate_filters(processed_data)
+            filters = self._run_stage(
+                'filters', self._filter_inputs(processed_data), self._generate_filters, processed_data
+            )
             
             # Create user profile
-            user_profile = self._create_user_profile(processed_data)
+            user_profile = self._run_stage(
+                'profile', self._profile_inputs(processed_data), self._create_user_profile, processed_data
+            )
             
-            return {
+            result = {
                 'success': True,
                 'criteria': criteria,
                 'weights': weights,
@@ -246,8 +278,11 @@ class ResponseProcessor:
                 'user_profile': user_profile,
                 'processed_responses': processed_data,
                 'category': self.category_slug,
-                'total_responses': len(responses)
+                'total_responses': len(rows)
             }
+            response_processing_cache.set_processing_result_cache(session.id, responses_hash, result)
+            
+            return result
             
         except Exception as e:
             logger.error(f"Error processing responses for session {session.id}: {str(e)}")
@@ -271,6 +306,112 @@ class ResponseProcessor:
             'total_responses': 0
         }
     
+    def _load_response_rows(self, session: ComparisonSession) -> List[Dict[str, Any]]:
+        """
+        Load the fields processing reads from a session's responses in one query.
+        
+        Args:
+            session: ComparisonSession instance
+            
+        Returns:
+            List of response dictionaries keyed as in RESPONSE_FIELDS
+        """
+        values = SurveyResponse.objects.filter(
+            session=session,
+            question__category__slug=self.category_slug
+        ).order_by('question__display_order').values(*self.RESPONSE_FIELDS.values())
+        
+        return [
+            {key: row[lookup] for key, lookup in self.RESPONSE_FIELDS.items()}
+            for row in values
+        ]
+    
+    def _response_row(self, response: SurveyResponse) -> Dict[str, Any]:
+        """Convert a SurveyResponse to the row format used by _structure_rows."""
+        question = response.question
+        return {
+            'question_id': question.id,
+            'field_name': question.field_name,
+            'section': question.section,
+            'question_type': question.question_type,
+            'weight_impact': question.weight_impact,
+            'question_text': question.question_text,
+            'response_value': response.response_value,
+            'confidence_level': response.confidence_level
+        }
+    
+    def _run_stage(
+        self,
+        stage: str,
+        inputs: Dict[str, Any],
+        compute,
+        processed_data: Dict[str, Any]
+    ) -> Any:
+        """
+        Return a stage's cached output for its inputs, computing it on a miss.
+        
+        Args:
+            stage: Stage name ('criteria', 'weights', 'filters' or 'profile')
+            inputs: The parts of processed_data the stage reads
+            compute: Stage function taking processed_data
+            processed_data: Structured response data
+            
+        Returns:
+            Stage output
+        """
+        stage_hash = response_processing_cache.cache_manager._hash_data({
+            'stage': stage,
+            'category': self.category_slug,
+            'inputs': inputs
+        })
+        
+        cached = response_processing_cache.get_stage_cache(stage, self.category_slug, stage_hash)
+        if cached is not None:
+            # The local tier hands out shared objects
+            return copy.deepcopy(cached)
+        
+        output = compute(processed_data)
+        response_processing_cache.set_stage_cache(stage, self.category_slug, stage_hash, copy.deepcopy(output))
+        return output
+    
+    def _criteria_inputs(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Values and types of the mapped and specially processed fields."""
+        fields = set(self.mapping_rules.get('field_mappings', {})) | set(self.mapping_rules.get('special_processing', {}))
+        responses = processed_data['responses_by_field']
+        return {
+            field: (responses[field]['value'], responses[field]['question_type'])
+            for field in fields if field in responses
+        }
+    
+    def _weight_inputs(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Weight impact, priority and confidence of the mapped fields."""
+        responses = processed_data['responses_by_field']
+        return {
+            field: (
+                responses[field]['weight_impact'],
+                processed_data['priorities'].get(field),
+                responses[field]['confidence']
+            )
+            for field in self.mapping_rules.get('field_mappings', {}) if field in responses
+        }
+    
+    def _filter_inputs(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Values and types of the high-confidence responses, the only ones filtered on."""
+        return {
+            field: (response_data['value'], response_data['question_type'])
+            for field, response_data in processed_data['responses_by_field'].items()
+            if response_data['confidence'] >= 4
+        }
+    
+    def _profile_inputs(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Values, priorities, confidence levels and sections."""
+        return {
+            'user_values': processed_data['user_values'],
+            'priorities': processed_data['priorities'],
+            'confidence_levels': processed_data['confidence_levels'],
+            'sections': list(processed_data['responses_by_section'])
+        }
+    
     def _structure_responses(self, responses: List[SurveyResponse]) -> Dict[str, Any]:
         """
         Structure raw survey responses into organized data.
@@ -278,6 +419,18 @@ class ResponseProcessor:
         Args:
             responses: List of SurveyResponse objects
             
+        Returns:
+            Dictionary with structured response data
+        """
+        return self._structure_rows([self._response_row(response) for response in responses])
+    
+    def _structure_rows(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Structure response rows into organized data.
+        
+        Args:
+            rows: Response dictionaries keyed as in RESPONSE_FIELDS
+            
         Returns:
             Dictionary with structured response data
         """
@@ -289,17 +442,17 @@ class ResponseProcessor:
             'user_values': {}
         }
         
-        for response in responses:
-            field_name = response.question.field_name
-            section = response.question.section
+        for row in rows:
+            field_name = row['field_name']
+            section = row['section']
             
             # Store response by field name
             structured['responses_by_field'][field_name] = {
-                'value': response.response_value,
-                'confidence': response.confidence_level,
-                'question_type': response.question.question_type,
-                'weight_impact': float(response.question.weight_impact),
-                'question_text': response.question.question_text
+                'value': row['response_value'],
+                'confidence': row['confidence_level'],
+                'question_type': row['question_type'],
+                'weight_impact': float(row['weight_impact']),
+                'question_text': row['question_text']
             }
             
             # Group by section
@@ -309,14 +462,14 @@ class ResponseProcessor:
             structured['responses_by_section'][section][field_name] = structured['responses_by_field'][field_name]
             
             # Store confidence levels
-            structured['confidence_levels'][field_name] = response.confidence_level
+            structured['confidence_levels'][field_name] = row['confidence_level']
             
             # Extract priorities from response values
-            if self._is_priority_question(response.question, response.response_value):
-                structured['priorities'][field_name] = response.response_value
+            if self._is_priority_response(row['question_text'], row['response_value']):
+                structured['priorities'][field_name] = row['response_value']
             
             # Store user values for criteria generation
-            structured['user_values'][field_name] = response.response_value
+            structured['user_values'][field_name] = row['response_value']
         
         return structured
     
@@ -331,9 +484,22 @@ class ResponseProcessor:
         Returns:
             Boolean indicating if this is a priority question
         """
+        return self._is_priority_response(question.question_text, response_value)
+    
+    def _is_priority_response(self, question_text: str, response_value: Any) -> bool:
+        """
+        Determine if a response to a question with this text is a priority level.
+        
+        Args:
+            question_text: Text of the question
+            response_value: The response value
+            
+        Returns:
+            Boolean indicating if this is a priority response
+        """
         # Check if question text contains priority-related keywords
         priority_keywords = ['priority', 'importance', 'how important', 'rank', 'prefer']
-        question_text_lower = question.question_text.lower()
+        question_text_lower = question_text.lower()
         
         if any(keyword in question_text_lower for keyword in priority_keywords):
             return True
@@ -19,7 +19,9 @@ from django.conf import settings
 
 from comparison.models import ComparisonSession
 from surveys.models import SurveyResponse, SurveyQuestion, SurveyTemplate
+from surveys.draft_buffer import draft_buffer, flush_drafts
 from policies.models import PolicyCategory
+from simple_surveys.reaper import ExpiredSessionReaper
 
 
 class SurveySessionManager:
@@ -191,6 +193,9 @@ class SurveySessionManager:
         # Validate response value
         self._validate_response_value(question, response_value)
         
+        # Write pending drafts first so they cannot overwrite this answer later
+        flush_drafts(session)
+        
         # Create or update response
         response, created = SurveyResponse.objects.update_or_create(
             session=session,
@@ -212,38 +217,63 @@ class SurveySessionManager:
         
         return response
     
-    def auto_save_responses(self, session: ComparisonSession, responses_data: List[Dict]) -> List[SurveyResponse]:
+    def auto_save_responses(self, session: ComparisonSession, responses_data: List[Dict]) -> Dict:
         """
         Auto-save multiple survey responses.
         
+        Responses are validated now and buffered as drafts; the draft buffer
+        writes them to the database in batches.
+        
         Args:
             session: ComparisonSession instance
             responses_data: List of response data dictionaries
             
         Returns:
-            List[SurveyResponse]: List of saved responses
+            Dict: Buffered question IDs, the number of responses written if the
+            buffer was flushed, and validation errors of skipped responses
         """
-        saved_responses = []
+        question_ids = [response_data['question_id'] for response_data in responses_data]
+        questions = {
+            question.id: question for question in SurveyQuestion.objects.filter(
+                id__in=question_ids,
+                category=session.category,
+                is_active=True
+            )
+        }
         
-        with transaction.atomic():
-            for response_data in responses_data:
-                try:
-                    response = self.save_survey_response(
-                        session=session,
-                        question_id=response_data['question_id'],
-                        response_value=response_data['response_value'],
-                        confidence_level=response_data.get('confidence_level', 3),
-                        auto_save=True
-                    )
-                    saved_responses.append(response)
-                except ValidationError:
-                    # Skip invalid responses in auto-save
-                    continue
+        drafts = []
+        errors = []
+        for response_data in responses_data:
+            question = questions.get(response_data['question_id'])
+            try:
+                if question is None:
+                    raise ValidationError(f"Question with ID {response_data['question_id']} does not exist")
+                self._validate_response_value(question, response_data['response_value'])
+            except ValidationError as e:
+                # Skip invalid responses in auto-save
+                errors.append({
+                    'question_id': response_data['question_id'],
+                    'error': str(e)
+                })
+                continue
             
-            # Update progress after all auto-saves
-            self._update_session_progress(session)
+            drafts.append({
+                'question_id': question.id,
+                'response_value': response_data['response_value'],
+                'confidence_level': response_data.get('confidence_level', 3)
+            })
         
-        return saved_responses
+        flushed_count = draft_buffer.add(session, drafts) if drafts else 0
+        
+        # Store drafts in session for anonymous users
+        if drafts and not self.is_authenticated:
+            self._store_drafts_in_session(drafts, questions)
+        
+        return {
+            'buffered': [draft['question_id'] for draft in drafts],
+            'flushed_count': flushed_count,
+            'errors': errors
+        }
     
     def recover_session_data(self, session: ComparisonSession) -> Dict:
         """
@@ -255,6 +285,9 @@ class SurveySessionManager:
         Returns:
             Dict: Recovered session data including responses and progress
         """
+        # Buffered drafts are part of the session's responses
+        flush_drafts(session)
+        
         # Get existing responses
         responses = SurveyResponse.objects.filter(session=session).select_related('question')
         
@@ -295,6 +328,9 @@ class SurveySessionManager:
         Returns:
             Dict: Progress information including completion percentage and section status
         """
+        # Buffered drafts are part of the session's responses
+        flush_drafts(session)
+        
         # Get survey template for this category
         try:
             template = SurveyTemplate.objects.get(
@@ -369,6 +405,9 @@ class SurveySessionManager:
         Returns:
             Dict: Validation results including errors and warnings
         """
+        # Buffered drafts are part of the session's responses
+        flush_drafts(session)
+        
         validation_results = {
             'is_valid': True,
             'errors': [],
@@ -434,21 +473,16 @@ class SurveySessionManager:
     
     def cleanup_expired_sessions(self) -> int:
         """
-        Clean up expired anonymous survey sessions.
+        Clean up expired survey sessions.
+        
+        Runs the session reaper, which marks expired sessions EXPIRED and
+        deletes anonymous ones once their retention window has passed.
         
         Returns:
-            int: Number of sessions cleaned up
+            int: Number of sessions marked expired
         """
-        expired_sessions = ComparisonSession.objects.filter(
-            user__isnull=True,  # Anonymous sessions only
-            expires_at__lt=timezone.now(),
-            status=ComparisonSession.Status.ACTIVE
-        )
-        
-        count = expired_sessions.count()
-        expired_sessions.update(status=ComparisonSession.Status.EXPIRED)
-        
-        return count
+        metrics = ExpiredSessionReaper().run()
+        return metrics['expired']
     
     def _initialize_session_metadata(self, session: ComparisonSession, category: PolicyCategory):
         """Initialize session metadata for tracking."""
@@ -506,6 +540,28 @@ class SurveySessionManager:
         
         self.session_store.save()
     
+    def _store_drafts_in_session(self, drafts: List[Dict], questions: Dict[int, SurveyQuestion]):
+        """Store buffered drafts in session for anonymous users, with one session save."""
+        survey_data = self.session_store.get(self.SURVEY_DATA_KEY, {})
+        now = timezone.now().isoformat()
+        
+        for draft in drafts:
+            survey_data[questions[draft['question_id']].field_name] = {
+                'question_id': draft['question_id'],
+                'response_value': draft['response_value'],
+                'confidence_level': draft['confidence_level'],
+                'updated_at': now
+            }
+        
+        self.session_store[self.SURVEY_DATA_KEY] = survey_data
+        
+        # Update metadata
+        metadata = self.session_store.get(self.SURVEY_METADATA_KEY, {})
+        metadata['last_auto_save'] = now
+        self.session_store[self.SURVEY_METADATA_KEY] = metadata
+        
+        self.session_store.save()
+    
     def _validate_response_value(self, question: SurveyQuestion, response_value: Any):
         """Validate response value against question rules."""
         validation_rules = question.validation_rules or {}
@@ -615,6 +671,9 @@ class SurveyAutoSaveManager:
         """
         Save draft responses (partial/incomplete responses).
         
+        Drafts are buffered and written to the database in batches; see
+        DraftResponseBuffer.
+        
         Args:
             session: ComparisonSession instance
             draft_data: Dictionary of draft response data
@@ -622,27 +681,22 @@ class SurveyAutoSaveManager:
         Returns:
             Dict: Save results including success/failure status
         """
-        results = {
-            'saved_count': 0,
-            'failed_count': 0,
-            'errors': []
+        field_names = {
+            response_data['question_id']: field_name
+            for field_name, response_data in draft_data.items()
         }
         
-        for field_name, response_data in draft_data.items():
-            try:
-                self.session_manager.save_survey_response(
-                    session=session,
-                    question_id=response_data['question_id'],
-                    response_value=response_data['response_value'],
-                    confidence_level=response_data.get('confidence_level', 3),
-                    auto_save=True
-                )
-                results['saved_count'] += 1
-            except Exception as e:
-                results['failed_count'] += 1
-                results['errors'].append({
-                    'field_name': field_name,
-                    'error': str(e)
-                })
+        result = self.session_manager.auto_save_responses(session, list(draft_data.values()))
         
-        return results
\ No newline at end of file
+        return {
+            'saved_count': len(result['buffered']),
+            'failed_count': len(result['errors']),
+            'flushed_count': result['flushed_count'],
+            'errors': [
+                {
+                    'field_name': field_names.get(error['question_id']),
+                    'error': error['error']
+                }
+                for error in result['errors']
+            ]
+        }
@@ -15,9 +15,11 @@ from django.contrib.sessions.models import Session
 
 from comparison.models import ComparisonSession
 from policies.models import PolicyCategory
+from simple_surveys.reaper import ExpiredSessionReaper
 from .models import SurveyResponse, SurveyQuestion
 from .session_manager import SurveySessionManager
 from .error_handling import SurveySessionError, survey_error_handler
+from .cache_codec import encoded_cache
 
 logger = logging.getLogger(__name__)
 
@@ -371,6 +373,10 @@ class SessionRecoveryService:
         """
         Clean up expired sessions older than specified days.
         
+        Runs the session reaper with the cutoff moved back by days_old.
+        Expired sessions are marked EXPIRED for the audit trail; anonymous
+        ones past the reaper's retention window are deleted with their responses.
+        
         Args:
             days_old: Number of days old to consider for cleanup
             
@@ -379,33 +385,26 @@ class SessionRecoveryService:
         """
         try:
             cutoff_date = timezone.now() - timedelta(days=days_old)
+            metrics = ExpiredSessionReaper().run(cutoff=cutoff_date)
             
-            # Find expired sessions to clean up
-            expired_sessions = ComparisonSession.objects.filter(
-                expires_at__lt=cutoff_date,
-                status=ComparisonSession.Status.ACTIVE
-            )
-            
-            session_count = expired_sessions.count()
-            
-            # Get response count before deletion
-            response_count = SurveyResponse.objects.filter(
-                session__in=expired_sessions
-            ).count()
+            if not metrics['lock_acquired']:
+                return {
+                    'success': False,
+                    'error': 'Session cleanup is already running'
+                }
             
-            # Mark sessions as expired (don't delete, for audit trail)
-            updated_count = expired_sessions.update(
-                status=ComparisonSession.Status.EXPIRED,
-                updated_at=timezone.now()
+            response_count = metrics['deleted'].get(SurveyResponse._meta.label, 0)
+            logger.info(
+                f"Cleaned up {metrics['expired']} expired sessions, "
+                f"deleting {response_count} responses"
             )
             
-            logger.info(f"Cleaned up {updated_count} expired sessions with {response_count} responses")
-            
             return {
-                'success': True,
-                'sessions_cleaned': updated_count,
+                'success': not metrics['errors'],
+                'sessions_cleaned': metrics['expired'],
                 'responses_affected': response_count,
-                'cutoff_date': cutoff_date.isoformat()
+                'cutoff_date': cutoff_date.isoformat(),
+                'errors': metrics['errors']
             }
             
         except Exception as e:
@@ -458,7 +457,7 @@ class SessionRecoveryService:
             
             # Store backup in cache with extended timeout
             backup_key = f"session_backup:{session.session_key}:{timezone.now().strftime('%Y%m%d_%H%M%S')}"
-            cache.set(backup_key, backup_data, timeout=self.RECOVERY_CACHE_TIMEOUT * 7)  # 7 days
+            encoded_cache.set(backup_key, backup_data, timeout=self.RECOVERY_CACHE_TIMEOUT * 7)  # 7 days
             
             return {
                 'success': True,
@@ -487,7 +486,7 @@ class SessionRecoveryService:
         """
         try:
             # Get backup data from cache
-            backup_data = cache.get(backup_key)
+            backup_data = encoded_cache.get(backup_key)
             if not backup_data:
                 return {
                     'success': False,
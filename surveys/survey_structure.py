@@ -0,0 +1,353 @@
+"""
+Compiled survey structure.
+Sections, ordered questions, a question lookup and the conditional-question
+graph of a category's active template, loaded once and shared between
+requests until the survey is edited.
+"""
+
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from django.db.models import Exists, OuterRef, Q, Subquery
+from .models import SurveyQuestion, TemplateQuestion, QuestionDependency
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (other question ID, condition operator, condition value)
+DependencyEdge = Tuple[int, str, Any]
+
+
+class DependencyGraph:
+    """
+    Conditional-question dependencies compiled into a DAG.
+
+    Each edge carries a predicate compiled from QuestionDependency.evaluate_condition,
+    so checking a condition needs neither a query nor a model instance per
+    call. A question is visible when every parent has an answer that meets
+    the edge's condition; questions without parents are always visible.
+    Questions are kept in topological order so changes can be propagated to
+    descendants in a single pass.
+    """
+
+    def __init__(
+        self,
+        question_ids: FrozenSet[int],
+        children: Dict[int, Tuple[DependencyEdge, ...]],
+        parents: Dict[int, Tuple[DependencyEdge, ...]]
+    ):
+        self.question_ids = question_ids
+        self.children = {
+            parent_id: tuple(child_id for child_id, _, _ in edges)
+            for parent_id, edges in children.items()
+        }
+        self.conditions: Dict[int, Tuple[Tuple[int, Callable[[Any], bool]], ...]] = {
+            child_id: tuple(
+                (parent_id, self._compile_predicate(operator, value))
+                for parent_id, operator, value in edges
+            )
+            for child_id, edges in parents.items()
+        }
+        self.order = self._topological_order()
+        self._position = {question_id: position for position, question_id in enumerate(self.order)}
+        self._descendants: Dict[int, Tuple[int, ...]] = {}
+
+    @staticmethod
+    def _compile_predicate(operator: str, value: Any) -> Callable[[Any], bool]:
+        return QuestionDependency(condition_operator=operator, condition_value=value).evaluate_condition
+
+    def _topological_order(self) -> Tuple[int, ...]:
+        """Dependent questions ordered so parents come before their children."""
+        nodes = set(self.children) | set(self.conditions)
+        in_degree = {node: len(self.conditions.get(node, ())) for node in nodes}
+        ready = deque(sorted(node for node, degree in in_degree.items() if degree == 0))
+
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for child_id in self.children.get(node, ()):
+                in_degree[child_id] -= 1
+                if in_degree[child_id] == 0:
+                    ready.append(child_id)
+
+        if len(order) < len(nodes):
+            # Cycles cannot be ordered; their questions still follow their parents' answers
+            cyclic = sorted(nodes.difference(order))
+            logger.warning(f"Question dependency cycle between questions {cyclic}")
+            order.extend(cyclic)
+
+        return tuple(order)
+
+    def covers(self, question_id: int) -> bool:
+        """Whether the graph holds every dependency of the question."""
+        return question_id in self.question_ids
+
+    def is_visible(self, question_id: int, answers: Dict[int, Any]) -> bool:
+        """
+        Check a question's conditions against a session's answers.
+
+        Args:
+            question_id: ID of the question to check
+            answers: Response values by question ID
+        """
+        for parent_id, predicate in self.conditions.get(question_id, ()):
+            parent_response = answers.get(parent_id)
+            if parent_response is None:
+                return False  # Parent not answered yet
+            if not predicate(parent_response):
+                return False  # Condition not met
+        return True
+
+    def evaluate(self, answers: Dict[int, Any]) -> Dict[int, bool]:
+        """Visibility of every conditional question, from one set of answers."""
+        return {
+            question_id: self.is_visible(question_id, answers)
+            for question_id in self.order
+            if question_id in self.conditions
+        }
+
+    def descendants(self, question_id: int) -> Tuple[int, ...]:
+        """Questions depending on a question, directly or not, in topological order."""
+        descendants = self._descendants.get(question_id)
+        if descendants is None:
+            seen = set()
+            pending = list(self.children.get(question_id, ()))
+            while pending:
+                child_id = pending.pop()
+                if child_id not in seen:
+                    seen.add(child_id)
+                    pending.extend(self.children.get(child_id, ()))
+            seen.discard(question_id)
+            descendants = tuple(sorted(seen, key=self._position.__getitem__))
+            self._descendants[question_id] = descendants
+        return descendants
+
+    def refresh(
+        self,
+        question_id: int,
+        answers: Dict[int, Any],
+        visibility: Dict[int, bool],
+        prune_hidden: bool = False
+    ) -> List[int]:
+        """
+        Re-evaluate the questions below one whose answer changed.
+
+        Only descendants of the question are evaluated, parents first, and
+        visibility is updated in place.
+
+        Args:
+            question_id: ID of the question whose answer changed
+            answers: Response values by question ID, already holding the new answer
+            visibility: Visibility map from evaluate, updated in place
+            prune_hidden: Drop answers of hidden questions from answers as the
+                walk goes, so their own dependants see them as unanswered
+
+        Returns:
+            IDs of descendants that are hidden after the change
+        """
+        hidden = []
+        for child_id in self.descendants(question_id):
+            visible = self.is_visible(child_id, answers)
+            visibility[child_id] = visible
+            if not visible:
+                hidden.append(child_id)
+                if prune_hidden:
+                    answers.pop(child_id, None)
+        return hidden
+
+
+class CompiledSurvey:
+    """
+    Immutable structure of one survey template.
+
+    Question dicts are shared between requests; accessors hand out copies so
+    callers can annotate them freely. The dependency graph is built on first
+    use in each process and is not stored in the shared cache.
+    """
+
+    __slots__ = (
+        'category_slug', 'template_id', 'template_version', 'sections', 'questions', 'children', 'parents',
+        '_graph'
+    )
+
+    def __init__(
+        self,
+        category_slug: str,
+        template_id: int,
+        template_version: str,
+        sections: Tuple[Dict[str, Any], ...],
+        questions: Dict[int, Dict[str, Any]],
+        children: Dict[int, Tuple[DependencyEdge, ...]],
+        parents: Dict[int, Tuple[DependencyEdge, ...]]
+    ):
+        self.category_slug = category_slug
+        self.template_id = template_id
+        self.template_version = template_version
+        self.sections = sections
+        self.questions = questions
+        self.children = children
+        self.parents = parents
+        self._graph = None
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != '_graph'}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._graph = None
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """Conditional-question graph of the survey."""
+        if self._graph is None:
+            question_ids = set(self.questions)
+            question_ids.update(question['id'] for section in self.sections for question in section['questions'])
+            self._graph = DependencyGraph(frozenset(question_ids), self.children, self.parents)
+        return self._graph
+
+    @property
+    def question_count(self) -> int:
+        """Number of active questions in the template."""
+        return sum(len(section['questions']) for section in self.sections)
+
+    def get_sections(self) -> List[Dict[str, Any]]:
+        """Sections in display order, each with its questions in display order."""
+        return [
+            {'name': section['name'], 'questions': [dict(question) for question in section['questions']]}
+            for section in self.sections
+        ]
+
+    def get_question(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """Active question of the category by ID, or None."""
+        question = self.questions.get(question_id)
+        return dict(question) if question is not None else None
+
+    def has_question(self, question_id: int) -> bool:
+        return question_id in self.questions
+
+
+def compile_survey(category, template) -> CompiledSurvey:
+    """
+    Load a template's structure from the database.
+
+    Questions, with their template ordering and required overrides, come
+    from one query; active dependencies touching them from a second.
+
+    Args:
+        category: PolicyCategory of the survey
+        template: Active SurveyTemplate for the category
+    """
+    template_question = TemplateQuestion.objects.filter(template=template, question=OuterRef('pk'))
+
+    rows = SurveyQuestion.objects.filter(is_active=True).filter(
+        Q(category=category) |
+        Q(id__in=TemplateQuestion.objects.filter(template=template).values('question_id'))
+    ).annotate(
+        in_template=Exists(template_question),
+        template_display_order=Subquery(template_question.values('display_order')[:1]),
+        template_required_override=Subquery(template_question.values('is_required_override')[:1])
+    )
+
+    questions = {}
+    sections = {}
+    for question in rows:
+        question_data = {
+            'id': question.id,
+            'question_text': question.question_text,
+            'question_type': question.question_type,
+            'field_name': question.field_name,
+            'choices': question.choices,
+            'validation_rules': question.validation_rules,
+            'help_text': question.help_text,
+            'is_required': question.is_required,
+            'weight_impact': float(question.weight_impact)
+        }
+
+        if question.category_id == category.id:
+            questions[question.id] = question_data
+
+        if question.in_template:
+            template_required = question.template_required_override
+            sections.setdefault(question.section, []).append(dict(
+                question_data,
+                # Use template override if available
+                is_required=question.is_required if template_required is None else template_required,
+                display_order=question.template_display_order
+            ))
+
+    # Sort questions within sections, then sections by their first question
+    section_list = []
+    for section_name, section_questions in sections.items():
+        section_questions.sort(key=lambda q: q['display_order'])
+        section_list.append({'name': section_name, 'questions': tuple(section_questions)})
+    section_list.sort(key=lambda s: s['questions'][0]['display_order'])
+
+    question_ids = list(questions) + [
+        q['id'] for section in section_list for q in section['questions'] if q['id'] not in questions
+    ]
+    children: Dict[int, List[DependencyEdge]] = {}
+    parents: Dict[int, List[DependencyEdge]] = {}
+    dependencies = QuestionDependency.objects.filter(
+        Q(parent_question_id__in=question_ids) | Q(child_question_id__in=question_ids),
+        is_active=True
+    ).values_list('parent_question_id', 'child_question_id', 'condition_operator', 'condition_value')
+    for parent_id, child_id, operator, value in dependencies:
+        children.setdefault(parent_id, []).append((child_id, operator, value))
+        parents.setdefault(child_id, []).append((parent_id, operator, value))
+
+    return CompiledSurvey(
+        category_slug=category.slug,
+        template_id=template.id,
+        template_version=template.version,
+        sections=tuple(section_list),
+        questions=questions,
+        children={question_id: tuple(edges) for question_id, edges in children.items()},
+        parents={question_id: tuple(edges) for question_id, edges in parents.items()}
+    )
+
+
+_compiled: Dict[str, Tuple[str, CompiledSurvey]] = {}
+_compiled_lock = Lock()
+
+
+def get_compiled_survey(category, template, cache_manager) -> CompiledSurvey:
+    """
+    Get the compiled structure for a template.
+
+    Served from this process when possible, then from the shared cache, and
+    compiled from the database otherwise. The cache key embeds the category's
+    cache generation, which survey edits bump, so both tiers follow edits.
+
+    Args:
+        category: PolicyCategory of the survey
+        template: Active SurveyTemplate for the category
+        cache_manager: SurveyCacheManager for the shared tier
+    """
+    if not cache_manager.cache_enabled:
+        return compile_survey(category, template)
+
+    key = cache_manager.get_structure_key(category.slug, template.id, template.version)
+
+    local = _compiled.get(category.slug)
+    if local is not None and local[0] == key:
+        return local[1]
+
+    compiled = cache_manager.get_structure_cache(key)
+    if compiled is None:
+        compiled = compile_survey(category, template)
+        cache_manager.set_structure_cache(key, compiled)
+        logger.info(
+            f"Compiled survey structure for {category.slug} with {compiled.question_count} questions"
+        )
+
+    with _compiled_lock:
+        _compiled[category.slug] = (key, compiled)
+    return compiled
+
+
+def clear_compiled_surveys() -> None:
+    """Drop all structures held by this process."""
+    with _compiled_lock:
+        _compiled.clear()
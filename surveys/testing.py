@@ -0,0 +1,68 @@
+"""
+Test helpers shared by the survey apps.
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _cache_tables():
+    """Tables used by database cache backends."""
+    return [
+        config['LOCATION']
+        for config in settings.CACHES.values()
+        if config['BACKEND'] == 'django.core.cache.backends.db.DatabaseCache'
+    ]
+
+
+def _app_queries(queries):
+    """
+    Drop cache table statements, and the savepoints the cache wraps them in.
+    """
+    tables = _cache_tables()
+    kept = []
+    savepoints = []
+    for sql in queries:
+        if any(f'"{table}"' in sql for table in tables):
+            continue
+        if sql.startswith('SAVEPOINT '):
+            savepoints.append(len(kept))
+        elif sql.startswith('RELEASE SAVEPOINT ') and savepoints:
+            start = savepoints.pop()
+            if len(kept) == start + 1:
+                # Nothing but cache statements ran inside it
+                kept.pop()
+                continue
+        kept.append(sql)
+    return kept
+
+
+class _AppQueriesContext(CaptureQueriesContext):
+    """Captures queries and checks how many of them are not cache reads or writes."""
+
+    def __init__(self, testcase, num):
+        super().__init__(connection)
+        self.testcase = testcase
+        self.num = num
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+
+        queries = _app_queries([query['sql'] for query in self.captured_queries])
+        self.testcase.assertEqual(
+            len(queries), self.num,
+            f"{len(queries)} queries executed, {self.num} expected\n" + '\n'.join(queries)
+        )
+
+
+class AppQueriesMixin:
+    """
+    Adds assertNumAppQueries, an assertNumQueries that ignores the cache table.
+    Keeps query budgets the same whether the cache is in the database or not.
+    """
+
+    def assertNumAppQueries(self, num):
+        return _AppQueriesContext(self, num)
@@ -0,0 +1,97 @@
+"""
+Unit tests for set-based survey analytics collection.
+"""
+
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from .analytics import SurveyAnalyticsCollector
+from .models import SurveyTemplate, SurveyQuestion, SurveyResponse, SurveyAnalytics
+
+
+class SurveyAnalyticsCollectorTest(TestCase):
+    """Test analytics computed with grouped aggregates."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        self.template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.smoker = self._question('smoker', SurveyQuestion.QuestionType.BOOLEAN, 1)
+        self.plan = self._question('plan', SurveyQuestion.QuestionType.CHOICE, 2)
+        self.age = self._question('age', SurveyQuestion.QuestionType.NUMBER, 3)
+        self.notes = self._question('notes', SurveyQuestion.QuestionType.TEXT, 4)
+
+        answers = [
+            {self.smoker: True, self.plan: 'basic', self.age: 30, self.notes: 'none'},
+            {self.smoker: False, self.plan: 'basic', self.age: 50},
+            {self.smoker: True, self.plan: 'premium'},
+            {self.smoker: True},
+        ]
+        for i, session_answers in enumerate(answers):
+            session = ComparisonSession.objects.create(
+                session_key=f"analytics-{i}", category=self.category, survey_completed=(i == 0)
+            )
+            for question, value in session_answers.items():
+                SurveyResponse.objects.create(
+                    session=session, question=question, response_value=value, confidence_level=4
+                )
+
+    def _question(self, field_name, question_type, order):
+        return SurveyQuestion.objects.create(
+            category=self.category,
+            section="Basics",
+            question_text=f"{field_name}?",
+            question_type=question_type,
+            field_name=field_name,
+            display_order=order
+        )
+
+    def test_question_metrics(self):
+        """Counts, rates, distributions and most common answers per question type."""
+        analytics = SurveyAnalyticsCollector().collect_questions_analytics(
+            [self.smoker, self.plan, self.age, self.notes]
+        )
+
+        self.assertEqual(analytics[self.smoker.id]['response_distribution'], {'true': 3, 'false': 1})
+        self.assertEqual(analytics[self.smoker.id]['most_common_response'], 'True')
+        self.assertEqual(analytics[self.plan.id]['response_distribution'], {'basic': 2, 'premium': 1})
+        self.assertEqual(analytics[self.plan.id]['completion_rate'], 75.0)
+        self.assertEqual(analytics[self.plan.id]['skip_rate'], 25.0)
+        self.assertEqual(analytics[self.age.id]['most_common_response'], 40.0)
+        self.assertEqual(analytics[self.notes.id]['response_distribution'], {'total_responses': 1})
+        self.assertEqual(analytics[self.notes.id]['average_confidence'], 4.0)
+
+    def test_template_analytics_query_count(self):
+        """A template's analytics cost a fixed number of queries."""
+        with self.assertNumQueries(6):
+            data = SurveyAnalyticsCollector().collect_template_analytics(self.template.id)
+
+        self.assertEqual((data['total_sessions'], data['completed_sessions']), (4, 1))
+        self.assertEqual(
+            [point['sessions_reached'] for point in data['drop_off_points']], [4, 3, 2, 1]
+        )
+        self.assertEqual(data['drop_off_points'][1]['drop_off_rate'], 33.33)
+
+    def test_bulk_update_upserts(self):
+        """Analytics rows are created, then updated in place."""
+        collector = SurveyAnalyticsCollector()
+        result = collector.bulk_update_analytics([self.smoker.id, self.plan.id, 999999])
+        self.assertEqual(result, {'updated': 2, 'errors': 1, 'total': 3})
+
+        SurveyResponse.objects.filter(question=self.plan, response_value='premium').delete()
+        call_command('update_survey_analytics', '--force', '--category', 'health', stdout=StringIO())
+
+        self.assertEqual(SurveyAnalytics.objects.count(), 4)
+        plan_analytics = SurveyAnalytics.objects.get(question=self.plan)
+        self.assertEqual(plan_analytics.total_responses, 2)
+        self.assertEqual(plan_analytics.response_distribution, {'basic': 2})
+        self.assertEqual(collector.get_cached_analytics(self.plan.id)['total_responses'], 2)
@@ -0,0 +1,139 @@
+"""
+Unit tests for saving survey responses in batches.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from simple_surveys.engine import SimpleSurveyEngine
+from simple_surveys.models import SimpleSurveyQuestion, SimpleSurveyResponse
+from .api_views import save_survey_responses
+from .engine import SurveyEngine
+from .models import SurveyTemplate, SurveyQuestion, TemplateQuestion, SurveyResponse
+from .survey_structure import clear_compiled_surveys
+
+
+class SurveyEngineBatchSaveTest(TestCase):
+    """Test SurveyEngine.save_responses and the batch API view."""
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_surveys()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.questions = []
+        for order, field_name in enumerate(['age', 'dependants', 'monthly_budget', 'hospital_cover'], start=1):
+            question = SurveyQuestion.objects.create(
+                category=self.category,
+                section="Basics",
+                question_text=f"{field_name}?",
+                question_type=SurveyQuestion.QuestionType.NUMBER,
+                field_name=field_name,
+                validation_rules={'min_value': 0}
+            )
+            TemplateQuestion.objects.create(template=template, question=question, display_order=order)
+            self.questions.append(question)
+        self.session = ComparisonSession.objects.create(session_key="batch-session", category=self.category)
+
+    def test_batch_saves_valid_answers(self):
+        """Valid answers are saved, invalid ones reported, and progress counts the batch."""
+        engine = SurveyEngine('health')
+        result = engine.save_responses(self.session, [
+            {'question_id': self.questions[0].id, 'response_value': 30, 'confidence_level': 5},
+            {'question_id': self.questions[1].id, 'response_value': -2},
+            {'question_id': self.questions[2].id, 'response_value': 800},
+            {'question_id': 999999, 'response_value': 1},
+        ])
+
+        self.assertFalse(result['success'])
+        self.assertEqual(set(result['errors']), {self.questions[1].id, 999999})
+        self.assertEqual(set(result['response_ids']), {self.questions[0].id, self.questions[2].id})
+        saved = SurveyResponse.objects.get(session=self.session, question=self.questions[0])
+        self.assertEqual(saved.pk, result['response_ids'][self.questions[0].id])
+        self.assertEqual(saved.confidence_level, 5)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 2)
+        self.assertEqual(self.session.survey_completion_percentage, Decimal('50.00'))
+
+    def test_batch_updates_existing_answers(self):
+        """Existing answers are overwritten in place; the last answer in a batch wins."""
+        engine = SurveyEngine('health')
+        first = engine.save_response(self.session, self.questions[0].id, 30)
+
+        result = engine.save_responses(self.session, [
+            {'question_id': self.questions[0].id, 'response_value': 31},
+            {'question_id': self.questions[0].id, 'response_value': 32},
+            {'question_id': self.questions[1].id, 'response_value': 1},
+        ])
+
+        self.assertTrue(result['success'])
+        self.assertEqual(SurveyResponse.objects.filter(session=self.session).count(), 2)
+        updated = SurveyResponse.objects.get(session=self.session, question=self.questions[0])
+        self.assertEqual(updated.pk, first['response_id'])
+        self.assertEqual(updated.response_value, 32.0)
+
+    def test_batch_api_view(self):
+        """The batch view saves answers and returns the session's progress."""
+        request = APIRequestFactory().post('/api/surveys/responses/batch/', {
+            'session_key': 'batch-session',
+            'category_slug': 'health',
+            'responses': [
+                {'question_id': question.id, 'response_value': 1} for question in self.questions
+            ]
+        }, format='json')
+
+        response = save_survey_responses(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['success'])
+        self.assertEqual(response.data['completion_percentage'], 100.0)
+        self.assertTrue(response.data['survey_completed'])
+
+
+class SimpleSurveyEngineBatchSaveTest(TestCase):
+    """Test SimpleSurveyEngine.save_responses."""
+
+    def setUp(self):
+        # Start from an empty question set rather than the seeded one
+        SimpleSurveyQuestion.objects.all().delete()
+        for order, field_name in enumerate(['age', 'gender'], start=1):
+            SimpleSurveyQuestion.objects.create(
+                category='health',
+                question_text=f"{field_name}?",
+                field_name=field_name,
+                input_type='text',
+                display_order=order
+            )
+        self.engine = SimpleSurveyEngine('health')
+        self.age, self.gender = self.engine.questions
+
+    def test_batch_upserts_and_refreshes_status(self):
+        """A batch upserts answers and completion status reflects them."""
+        self.engine.save_response('simple-batch', self.age.id, '30')
+        self.assertFalse(self.engine.get_completion_status('simple-batch')['is_complete'])
+
+        result = self.engine.save_responses('simple-batch', [
+            {'question_id': self.age.id, 'response_value': '35'},
+            {'question_id': self.gender.id, 'response_value': 'Female'},
+            {'question_id': 999999, 'response_value': 'x'},
+        ])
+
+        self.assertFalse(result['success'])
+        self.assertEqual(list(result['errors']), [999999])
+        self.assertEqual(SimpleSurveyResponse.objects.filter(session_key='simple-batch').count(), 2)
+        self.assertEqual(
+            SimpleSurveyResponse.objects.get(session_key='simple-batch', question=self.age).response_value, '35'
+        )
+        status = self.engine.get_completion_status('simple-batch')
+        self.assertTrue(status['is_complete'])
+        self.assertEqual(status['answered_total'], 2)
@@ -0,0 +1,100 @@
+"""
+Unit tests for the cache codec and streaming hash.
+"""
+
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .cache_codec import CacheCodec, EncodedCache, stable_hash
+from .caching import SurveyCacheManager
+
+
+class CacheCodecTest(TestCase):
+    """Test encoding, compression and type preservation."""
+
+    def setUp(self):
+        cache.clear()
+        self.payload = {
+            'premium': Decimal('512.50'),
+            'generated_at': datetime(2026, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc),
+            'effective': date(2026, 2, 1),
+            'reference': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'policies': [{'id': 1, 'score': 0.75, 'tags': ['a', 'b'], 'active': True, 'notes': None}],
+        }
+
+    def test_json_round_trip_keeps_types(self):
+        """Decimal, date/time and UUID values come back with their types."""
+        codec = CacheCodec(serializer='json', compression=None)
+        payload = codec.encode(self.payload)
+
+        self.assertEqual(payload[1:3], b'j-')
+        self.assertEqual(codec.decode(payload), self.payload)
+        self.assertIsInstance(codec.decode(payload)['premium'], Decimal)
+
+    def test_unencodable_values_are_pickled(self):
+        """Tuples and non-string keys fall back to pickle rather than change type."""
+        codec = CacheCodec(serializer='json', compression=None)
+
+        for value in [{1: 'one'}, {'pair': (1, 2)}, {'ids': {1, 2}}]:
+            payload = codec.encode(value)
+            self.assertEqual(payload[1:2], b'p')
+            self.assertEqual(codec.decode(payload), value)
+
+    def test_compression_above_threshold(self):
+        """Only payloads at or above the threshold are compressed."""
+        codec = CacheCodec(serializer='json', compression='zlib', compress_min_bytes=200)
+        small = codec.encode({'a': 1})
+        large = codec.encode({'rows': [self.payload['policies'][0]] * 50})
+
+        self.assertEqual(small[2:3], b'-')
+        self.assertEqual(large[2:3], b'z')
+        self.assertEqual(codec.decode(large)['rows'][49]['tags'], ['a', 'b'])
+
+    def test_unencoded_values_pass_through(self):
+        """Entries written before the codec are returned unchanged."""
+        codec = CacheCodec()
+        self.assertEqual(codec.decode({'legacy': True}), {'legacy': True})
+        self.assertEqual(codec.decode(b'raw'), b'raw')
+
+    def test_stats_by_prefix(self):
+        """Payload sizes are reported per key prefix."""
+        encoded = EncodedCache(CacheCodec(serializer='json', compression='zlib', compress_min_bytes=100))
+        encoded.set('comparison_result:health:abc', {'rows': ['x' * 10] * 100}, 60)
+        encoded.set_many({'question_analytics_1': {'a': 1}, 'question_analytics_2': {'a': 2}}, 60,
+                         prefix='question_analytics')
+
+        self.assertEqual(encoded.get('comparison_result:health:abc')['rows'][0], 'x' * 10)
+        self.assertIsNone(encoded.get('comparison_result:health:missing'))
+
+        stats = encoded.get_stats()
+        self.assertEqual(stats['question_analytics']['writes'], 2)
+        self.assertEqual(stats['comparison_result']['reads'], 2)
+        self.assertEqual(stats['comparison_result']['misses'], 1)
+        self.assertGreater(stats['comparison_result']['compression_ratio'], 5)
+
+    def test_cache_manager_stores_encoded_payloads(self):
+        """Survey cache entries are stored as encoded bytes and decoded on read."""
+        manager = SurveyCacheManager()
+        manager.set_criteria_cache('abc123', {'max_premium': Decimal('800.00')})
+
+        self.assertEqual(manager.get_criteria_cache('abc123'), {'max_premium': Decimal('800.00')})
+        self.assertIn('survey_criteria', manager.get_cache_stats()['payloads'])
+
+
+class StableHashTest(TestCase):
+    """Test the streaming structure hash."""
+
+    def test_key_order_does_not_matter(self):
+        """Equal dicts hash equally regardless of insertion order."""
+        self.assertEqual(stable_hash({'a': 1, 'b': [1, 2]}), stable_hash({'b': [1, 2], 'a': 1}))
+
+    def test_types_and_boundaries_are_distinguished(self):
+        """Values that would serialize alike do not collide."""
+        self.assertNotEqual(stable_hash(['ab', 'c']), stable_hash(['a', 'bc']))
+        self.assertNotEqual(stable_hash({'a': 1}), stable_hash({'a': '1'}))
+        self.assertNotEqual(stable_hash([True]), stable_hash([1]))
+        self.assertEqual(len(stable_hash({'a': 1})), 8)
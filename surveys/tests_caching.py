@@ -0,0 +1,163 @@
+"""
+Unit tests for survey caching: namespace invalidation and the bounded local cache.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from policies.signals import (
+    get_cached_validation_errors, validation_cache_key, clear_all_validation_caches
+)
+from .caching import CacheNamespaces, SurveyCacheManager, ResponseProcessingCache, LocalLRUCache
+
+
+class CacheNamespacesTest(TestCase):
+    """Test generation counters for cache namespaces."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidate_moves_generation_forward(self):
+        """Each invalidation gives the namespace a new, higher generation."""
+        first = CacheNamespaces.generation('things')
+        self.assertEqual(CacheNamespaces.generation('things'), first)
+
+        second = CacheNamespaces.invalidate('things')
+        self.assertGreater(second, first)
+        self.assertEqual(CacheNamespaces.generation('things'), second)
+
+    def test_invalidate_without_counter(self):
+        """Invalidating a namespace that was never read starts a counter."""
+        generation = CacheNamespaces.invalidate('unused')
+        self.assertEqual(CacheNamespaces.generation('unused'), generation)
+
+    def test_namespaces_are_independent(self):
+        """Invalidating one namespace leaves others alone."""
+        before = CacheNamespaces.generations(['a', 'b'])
+        CacheNamespaces.invalidate('a')
+        after = CacheNamespaces.generations(['a', 'b'])
+
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], before[1])
+
+
+class SurveyCacheManagerInvalidationTest(TestCase):
+    """Test that invalidation retires exactly the affected entries."""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = SurveyCacheManager()
+
+    def test_caching_off_with_process_local_backend(self):
+        """Namespace invalidations can't reach other workers through a local-memory cache."""
+        with self.settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }):
+            self.assertFalse(SurveyCacheManager().cache_enabled)
+
+        self.assertTrue(self.manager.cache_enabled)
+
+    def test_template_invalidation_retires_category_entries(self):
+        """Invalidating a category's template drops its questions and sections too."""
+        self.manager.set_template_cache('health', {'name': 'Health'})
+        self.manager.set_questions_cache('health', [{'id': 1}], section='Basics')
+        self.manager.set_sections_cache('health', [{'name': 'Basics'}])
+        self.manager.set_template_cache('funeral', {'name': 'Funeral'})
+
+        self.manager.invalidate_template_cache('health')
+
+        self.assertIsNone(self.manager.get_template_cache('health'))
+        self.assertIsNone(self.manager.get_questions_cache('health', section='Basics'))
+        self.assertIsNone(self.manager.get_sections_cache('health'))
+        self.assertEqual(self.manager.get_template_cache('funeral'), {'name': 'Funeral'})
+
+    def test_session_invalidation(self):
+        """Invalidating a session drops only that session's processing results."""
+        self.manager.set_response_processing_cache(1, 'abc', {'score': 1})
+        self.manager.set_response_processing_cache(2, 'abc', {'score': 2})
+
+        self.manager.invalidate_session_cache(1)
+
+        self.assertIsNone(self.manager.get_response_processing_cache(1, 'abc'))
+        self.assertEqual(self.manager.get_response_processing_cache(2, 'abc'), {'score': 2})
+
+    def test_response_cache_invalidation(self):
+        """ResponseProcessingCache invalidation reaches the distributed cache."""
+        response_cache = ResponseProcessingCache(self.manager)
+        response_cache.set_criteria_mapping_cache('health', 'abc', {'weights': {}})
+        response_cache.set_criteria_mapping_cache('health', 'def', {'weights': {}})
+
+        response_cache.invalidate_response_cache('abc')
+        response_cache.clear_local_cache()
+
+        self.assertIsNone(response_cache.get_criteria_mapping_cache('health', 'abc'))
+        self.assertIsNotNone(response_cache.get_criteria_mapping_cache('health', 'def'))
+
+    def test_invalidate_all_keeps_unrelated_entries(self):
+        """Invalidating everything leaves non-survey cache entries in place."""
+        cache.set('unrelated', 'kept')
+        self.manager.set_template_cache('health', {'name': 'Health'})
+
+        self.manager.invalidate_all()
+
+        self.assertIsNone(self.manager.get_template_cache('health'))
+        self.assertEqual(cache.get('unrelated'), 'kept')
+
+    def test_clear_all_validation_caches_keeps_unrelated_entries(self):
+        """Clearing validation caches no longer flushes the whole cache."""
+        cache.set('unrelated', 'kept')
+        cache.set(validation_cache_key('policy', 7), ['Missing features'])
+        self.assertEqual(get_cached_validation_errors('policy', 7), ['Missing features'])
+
+        clear_all_validation_caches()
+
+        self.assertEqual(get_cached_validation_errors('policy', 7), [])
+        self.assertEqual(cache.get('unrelated'), 'kept')
+
+
+class LocalLRUCacheTest(TestCase):
+    """Test the bounded in-process cache."""
+
+    def test_evicts_least_recently_used(self):
+        """The least recently read entry is evicted first when full."""
+        local = LocalLRUCache(max_entries=2, ttl=60)
+        local.set('weights:a', 1)
+        local.set('weights:b', 2)
+        local.get('weights:a')
+        local.set('weights:c', 3)
+
+        self.assertEqual(len(local), 2)
+        self.assertIsNone(local.get('weights:b'))
+        self.assertEqual(local.get('weights:a'), 1)
+        self.assertEqual(local.get_stats()['prefixes']['weights']['evictions'], 1)
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than the TTL are dropped when read."""
+        local = LocalLRUCache(max_entries=10, ttl=0)
+        local.set('profile:a', {'age': 30})
+
+        self.assertIsNone(local.get('profile:a'))
+        self.assertEqual(len(local), 0)
+        self.assertEqual(
+            local.get_stats()['prefixes']['profile'],
+            {'hits': 0, 'misses': 1, 'evictions': 0, 'expirations': 1}
+        )
+
+    def test_response_cache_bounded_by_settings(self):
+        """ResponseProcessingCache keeps at most the configured number of entries."""
+        with self.settings(SURVEY_LOCAL_CACHE_MAX_ENTRIES=5):
+            response_cache = ResponseProcessingCache(SurveyCacheManager())
+
+        for i in range(20):
+            response_cache.set_weight_calculation_cache(f"hash{i}", {'base_premium': 1.0})
+
+        stats = response_cache.get_cache_stats()
+        self.assertEqual(stats['local_cache_size'], 5)
+        self.assertEqual(stats['local_cache']['prefixes']['weights']['evictions'], 15)
+        self.assertIsNotNone(response_cache.get_weight_calculation_cache('hash19'))
+        self.assertIsNone(response_cache.get_weight_calculation_cache('hash0'))
+        self.assertEqual(stats['local_cache']['max_entries'], 5)
+        self.assertEqual(
+            response_cache.get_cache_stats()['distributed_cache']['weights'],
+            {'hits': 0, 'misses': 1}
+        )
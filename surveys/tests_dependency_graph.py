@@ -0,0 +1,201 @@
+"""
+Unit tests for the conditional-question dependency graph.
+"""
+
+import pickle
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from .caching import SurveyPerformanceOptimizer
+from .flow_controller import SurveyFlowController
+from .models import (
+    SurveyTemplate, SurveyQuestion, TemplateQuestion, SurveyResponse, QuestionDependency
+)
+from .survey_structure import DependencyGraph, clear_compiled_surveys
+from .testing import AppQueriesMixin
+
+
+class DependencyGraphTest(TestCase):
+    """Test ordering and evaluation of a compiled dependency graph."""
+
+    def setUp(self):
+        # 1 -> 2 -> 4, 1 -> 3, 3 -> 4
+        children = {
+            1: ((2, 'EQUALS', True), (3, 'GREATER_THAN', 5)),
+            2: ((4, 'EQUALS', 'yes'),),
+            3: ((4, 'NOT_EQUALS', 0),)
+        }
+        parents = {}
+        for parent_id, edges in children.items():
+            for child_id, operator, value in edges:
+                parents.setdefault(child_id, []).append((parent_id, operator, value))
+        self.graph = DependencyGraph(frozenset([1, 2, 3, 4, 5]), children, parents)
+
+    def test_topological_order(self):
+        """Parents come before children."""
+        position = {question_id: i for i, question_id in enumerate(self.graph.order)}
+        self.assertLess(position[1], position[2])
+        self.assertLess(position[2], position[4])
+        self.assertLess(position[3], position[4])
+        self.assertEqual(self.graph.descendants(1), tuple(q for q in self.graph.order if q in (2, 3, 4)))
+
+    def test_evaluate_follows_conditions(self):
+        """Visibility matches each edge's evaluate_condition."""
+        self.assertEqual(self.graph.evaluate({}), {2: False, 3: False, 4: False})
+        self.assertEqual(
+            self.graph.evaluate({1: True, 2: 'yes', 3: 1}),
+            {2: True, 3: False, 4: True}
+        )
+        self.assertEqual(self.graph.evaluate({1: 10, 2: 'yes', 3: 1}), {2: False, 3: True, 4: True})
+        self.assertTrue(self.graph.is_visible(5, {}))
+
+    def test_refresh_updates_descendants_only(self):
+        """Changing an answer re-evaluates its subtree and can prune hidden answers."""
+        answers = {1: True, 2: 'yes', 3: 1}
+        visibility = self.graph.evaluate(answers)
+
+        answers[1] = False
+        hidden = self.graph.refresh(1, answers, visibility, prune_hidden=True)
+
+        self.assertEqual(sorted(hidden), [2, 3, 4])
+        self.assertEqual(visibility, {2: False, 3: False, 4: False})
+        self.assertEqual(answers, {1: False})
+
+    def test_cycle_is_tolerated(self):
+        """Questions in a cycle are still ordered and evaluated."""
+        graph = DependencyGraph(
+            frozenset([1, 2]),
+            {1: ((2, 'EQUALS', True),), 2: ((1, 'EQUALS', True),)},
+            {2: ((1, 'EQUALS', True),), 1: ((2, 'EQUALS', True),)}
+        )
+        self.assertEqual(sorted(graph.order), [1, 2])
+        self.assertEqual(graph.evaluate({1: True, 2: True}), {1: True, 2: True})
+
+
+class FlowControllerVisibilityTest(AppQueriesMixin, TestCase):
+    """Test that the flow controller evaluates conditions from the compiled graph."""
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_surveys()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        self.template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.smoker = self._question("smoker", SurveyQuestion.QuestionType.BOOLEAN, order=1)
+        self.cigarettes = self._question("cigarettes", SurveyQuestion.QuestionType.NUMBER, order=2)
+        self.heavy = self._question("heavy_smoker_cover", SurveyQuestion.QuestionType.BOOLEAN, order=3)
+        self.budget = self._question("monthly_budget", SurveyQuestion.QuestionType.NUMBER, order=4)
+
+        QuestionDependency.objects.create(
+            parent_question=self.smoker, child_question=self.cigarettes, condition_value=True
+        )
+        QuestionDependency.objects.create(
+            parent_question=self.cigarettes, child_question=self.heavy,
+            condition_operator=QuestionDependency.ConditionOperator.GREATER_THAN, condition_value=10
+        )
+        self.session = ComparisonSession.objects.create(session_key="graph-session", category=self.category)
+
+    def _question(self, field_name, question_type, order):
+        question = SurveyQuestion.objects.create(
+            category=self.category,
+            section="Lifestyle",
+            question_text=f"{field_name}?",
+            question_type=question_type,
+            field_name=field_name,
+            is_required=True
+        )
+        TemplateQuestion.objects.create(template=self.template, question=question, display_order=order)
+        return question
+
+    def _controller(self):
+        return SurveyFlowController('health', self.session.session_key)
+
+    def _answer(self, question, value):
+        SurveyResponse.objects.create(session=self.session, question=question, response_value=value)
+
+    def test_visibility_from_one_response_load(self):
+        """Checking every question costs one query for the session's responses."""
+        self._answer(self.smoker, True)
+        self._answer(self.cigarettes, 20)
+        controller = self._controller()
+        controller.engine.get_survey_sections()
+
+        with self.assertNumAppQueries(1):
+            visible = [
+                question_id for question_id in (self.smoker.id, self.cigarettes.id, self.heavy.id, self.budget.id)
+                if controller._should_show_question(question_id)
+            ]
+            section, question = controller.get_current_section_and_question()
+
+        self.assertEqual(visible, [self.smoker.id, self.cigarettes.id, self.heavy.id, self.budget.id])
+        self.assertEqual(question['id'], self.heavy.id)
+
+    def test_hidden_questions_are_skipped(self):
+        """Questions whose parent is unanswered or fails its condition are skipped."""
+        self._answer(self.smoker, False)
+        controller = self._controller()
+
+        section, question = controller.get_current_section_and_question()
+
+        self.assertEqual(question['id'], self.budget.id)
+        self.assertEqual(controller.get_section_progress()['Lifestyle']['visible_questions'], 2)
+
+    def test_submit_response_reveals_dependants(self):
+        """A submitted answer re-evaluates the questions below it."""
+        controller = self._controller()
+        self.assertFalse(controller._should_show_question(self.cigarettes.id))
+
+        result = controller.submit_response(self.smoker.id, True)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['next_question']['id'], self.cigarettes.id)
+        self.assertTrue(controller._should_show_question(self.cigarettes.id))
+        self.assertFalse(controller._should_show_question(self.heavy.id))
+
+    def test_modify_response_prunes_subtree(self):
+        """Hiding a question removes its response and those of questions below it."""
+        self._answer(self.smoker, True)
+        self._answer(self.cigarettes, 20)
+        self._answer(self.heavy, True)
+        controller = self._controller()
+
+        result = controller.modify_response(self.smoker.id, False)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(sorted(result['affected_questions']), sorted([self.cigarettes.id, self.heavy.id]))
+        self.assertEqual(
+            list(SurveyResponse.objects.filter(session=self.session).values_list('question_id', flat=True)),
+            [self.smoker.id]
+        )
+        self.assertEqual(controller.get_current_section_and_question()[1]['id'], self.budget.id)
+
+    def test_graph_not_stored_in_shared_cache(self):
+        """The compiled structure pickles without its graph and rebuilds it on use."""
+        structure = self._controller().engine.get_structure()
+        self.assertIn(self.heavy.id, structure.graph.descendants(self.smoker.id))
+
+        restored = pickle.loads(pickle.dumps(structure))
+
+        self.assertIsNone(restored._graph)
+        self.assertEqual(restored.graph.order, structure.graph.order)
+
+    def test_prefetch_dependencies_from_structure(self):
+        """Prefetched dependency rules come from the compiled survey."""
+        data = SurveyPerformanceOptimizer().prefetch_survey_data('health')
+
+        self.assertEqual(
+            data['dependencies'][self.cigarettes.id],
+            [{
+                'child_question_id': self.heavy.id,
+                'condition_value': 10,
+                'condition_operator': QuestionDependency.ConditionOperator.GREATER_THAN,
+                'child_field_name': 'heavy_smoker_cover'
+            }]
+        )
+        self.assertNotIn(self.budget.id, data['dependencies'])
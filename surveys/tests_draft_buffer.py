@@ -0,0 +1,142 @@
+"""
+Unit tests for the write-behind draft response buffer.
+"""
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from .draft_buffer import DraftResponseBuffer, draft_buffer
+from .engine import SurveyEngine
+from .models import SurveyTemplate, SurveyQuestion, TemplateQuestion, SurveyResponse
+from .session_manager import SurveySessionManager, SurveyAutoSaveManager
+from .survey_structure import clear_compiled_surveys
+
+
+class DraftResponseBufferTest(TestCase):
+    """Test coalescing, flushing and consistency of buffered drafts."""
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_surveys()
+        self.addCleanup(draft_buffer._buffered.clear)
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.questions = []
+        for order, field_name in enumerate(['age', 'dependants', 'monthly_budget', 'hospital_cover'], start=1):
+            question = SurveyQuestion.objects.create(
+                category=self.category,
+                section="Basics",
+                question_text=f"{field_name}?",
+                question_type=SurveyQuestion.QuestionType.NUMBER,
+                field_name=field_name,
+                validation_rules={'min_value': 0}
+            )
+            TemplateQuestion.objects.create(template=template, question=question, display_order=order)
+            self.questions.append(question)
+        self.session = ComparisonSession.objects.create(session_key="draft-session", category=self.category)
+
+    def _drafts(self, *values):
+        return [
+            {'question_id': question.id, 'response_value': value}
+            for question, value in zip(self.questions, values)
+        ]
+
+    def test_drafts_coalesce_in_cache(self):
+        """Repeated drafts keep only the latest value and write nothing."""
+        buffer = DraftResponseBuffer(flush_size=10, flush_interval=60)
+        buffer.add(self.session, self._drafts(30, 1))
+        buffer.add(self.session, self._drafts(31))
+
+        pending = buffer.pending(self.session)
+        self.assertEqual(pending[self.questions[0].id]['response_value'], 31)
+        self.assertEqual(len(pending), 2)
+        self.assertFalse(SurveyResponse.objects.filter(session=self.session).exists())
+
+    def test_flush_on_size_threshold(self):
+        """Reaching the size threshold writes the buffer in one batch."""
+        buffer = DraftResponseBuffer(flush_size=3, flush_interval=60)
+        self.assertEqual(buffer.add(self.session, self._drafts(30, 1)), 0)
+        self.assertEqual(buffer.add(self.session, self._drafts(31, 1, 500)), 3)
+
+        self.assertEqual(buffer.pending(self.session), {})
+        self.assertEqual(
+            dict(SurveyResponse.objects.filter(session=self.session).values_list('question_id', 'response_value')),
+            {self.questions[0].id: 31, self.questions[1].id: 1, self.questions[2].id: 500}
+        )
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 3)
+
+    def test_flush_on_time_threshold(self):
+        """Drafts older than the interval are written with the next draft."""
+        buffer = DraftResponseBuffer(flush_size=10, flush_interval=0)
+        self.assertEqual(buffer.add(self.session, self._drafts(30)), 1)
+        self.assertTrue(SurveyResponse.objects.filter(session=self.session).exists())
+
+    def test_due_drafts_flushed_at_request_end(self):
+        """Drafts of a session that stops sending are written once they are due."""
+        draft_buffer.add(self.session, self._drafts(30, 1))
+        request_finished.send(sender=self.__class__)
+        self.assertFalse(SurveyResponse.objects.filter(session=self.session).exists())
+
+        draft_buffer._buffered[self.session.pk] -= draft_buffer.flush_interval
+        request_finished.send(sender=self.__class__)
+
+        self.assertEqual(SurveyResponse.objects.filter(session=self.session).count(), 2)
+        self.assertEqual(draft_buffer.pending(self.session), {})
+        self.assertNotIn(self.session.pk, draft_buffer._buffered)
+
+    def test_drafts_written_directly_without_shared_cache(self):
+        """A process-local cache can't be flushed by other workers, so drafts are not buffered."""
+        buffer = DraftResponseBuffer(flush_size=10, flush_interval=60)
+        with self.settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        }):
+            self.assertEqual(buffer.add(self.session, self._drafts(30, 1)), 2)
+            self.assertEqual(buffer.pending(self.session), {})
+
+        self.assertEqual(SurveyResponse.objects.filter(session=self.session).count(), 2)
+
+    def test_completion_check_flushes(self):
+        """Completion checks and processing see buffered drafts."""
+        draft_buffer.add(self.session, self._drafts(30, 1))
+
+        completion = SurveyEngine('health').calculate_completion_percentage(self.session)
+
+        self.assertEqual(completion, 50.0)
+        self.assertEqual(draft_buffer.pending(self.session), {})
+
+    def test_explicit_answer_not_overwritten_by_draft(self):
+        """An explicit answer flushes older drafts before it is written."""
+        draft_buffer.add(self.session, self._drafts(30))
+
+        SurveyEngine('health').save_response(self.session, self.questions[0].id, 45)
+        draft_buffer.flush(self.session)
+
+        self.assertEqual(
+            SurveyResponse.objects.get(session=self.session, question=self.questions[0]).response_value, 45.0
+        )
+
+    def test_session_manager_buffers_valid_drafts(self):
+        """Auto-saved drafts are validated, buffered and reported."""
+        manager = SurveySessionManager()
+        result = SurveyAutoSaveManager(manager).save_draft_responses(self.session, {
+            'age': {'question_id': self.questions[0].id, 'response_value': 30},
+            'dependants': {'question_id': self.questions[1].id, 'response_value': -1},
+        })
+
+        self.assertEqual((result['saved_count'], result['failed_count']), (1, 1))
+        self.assertEqual(result['errors'][0]['field_name'], 'dependants')
+        self.assertEqual(list(draft_buffer.pending(self.session)), [self.questions[0].id])
+        self.assertEqual(
+            manager.session_store[SurveySessionManager.SURVEY_DATA_KEY]['age']['response_value'], 30
+        )
+
+        progress = manager.get_session_progress(self.session)
+        self.assertEqual(progress['answered_questions'], 1)
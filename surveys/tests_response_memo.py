@@ -0,0 +1,87 @@
+"""
+Unit tests for memoized response processing.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from .caching import response_processing_cache
+from .models import SurveyQuestion, SurveyResponse
+from .response_processor import ResponseProcessor
+from .testing import AppQueriesMixin
+
+
+class ResponseProcessorMemoTest(AppQueriesMixin, TestCase):
+    """Test that processing results are reused for unchanged responses."""
+
+    def setUp(self):
+        cache.clear()
+        response_processing_cache.clear_local_cache()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        self.session = ComparisonSession.objects.create(session_key="memo-session", category=self.category)
+        self.responses = {}
+        for order, (field_name, value, confidence) in enumerate([
+            ('age', 35, 5),
+            ('monthly_budget', 1000, 5),
+            ('dental_cover_needed', True, 3),
+        ], start=1):
+            question = SurveyQuestion.objects.create(
+                category=self.category,
+                section="Basics",
+                question_text=f"{field_name}?",
+                question_type=(
+                    SurveyQuestion.QuestionType.BOOLEAN if isinstance(value, bool)
+                    else SurveyQuestion.QuestionType.NUMBER
+                ),
+                field_name=field_name,
+                display_order=order
+            )
+            self.responses[field_name] = SurveyResponse.objects.create(
+                session=self.session, question=question, response_value=value, confidence_level=confidence
+            )
+
+    def _stage_counters(self):
+        return response_processing_cache.get_cache_stats()['stages']
+
+    def test_repeat_call_served_from_cache(self):
+        """A second call for unchanged responses costs one query and returns the same result."""
+        processor = ResponseProcessor('health')
+        first = processor.process_responses(self.session)
+
+        with self.assertNumAppQueries(1):
+            second = ResponseProcessor('health').process_responses(self.session)
+
+        self.assertTrue(second['success'])
+        self.assertEqual(second, first)
+        self.assertEqual(second['filters']['base_premium__lte'], 1100.0)
+
+    def test_changed_answer_recomputes_affected_stages(self):
+        """Changing a low-confidence answer leaves the filters stage cached."""
+        processor = ResponseProcessor('health')
+        processor.process_responses(self.session)
+        before = self._stage_counters()
+
+        response = self.responses['dental_cover_needed']
+        response.response_value = False
+        response.save()
+        result = processor.process_responses(self.session)
+
+        after = self._stage_counters()
+        self.assertEqual(after['result']['misses'] - before['result']['misses'], 1)
+        self.assertEqual(after['filters']['hits'] - before['filters'].get('hits', 0), 1)
+        self.assertEqual(after['criteria']['misses'] - before['criteria']['misses'], 1)
+        self.assertFalse(result['criteria']['includes_dental_cover'])
+
+    def test_result_matches_uncached_processing(self):
+        """Memoized stages produce what processing SurveyResponse objects produces."""
+        result = ResponseProcessor('health').process_responses(self.session)
+
+        processor = ResponseProcessor('health')
+        responses = list(SurveyResponse.objects.filter(session=self.session).select_related('question'))
+        self.assertEqual(result['weights'], processor.calculate_weights(responses))
+        self.assertEqual(result['filters'], processor.generate_filters(responses))
+        self.assertEqual(result['user_profile'], processor.create_user_profile(responses))
@@ -0,0 +1,127 @@
+"""
+Unit tests for incrementally maintained survey progress.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from simple_surveys.engine import SimpleSurveyEngine
+from simple_surveys.models import SimpleSurveyQuestion
+from .engine import SurveyEngine
+from .models import SurveyTemplate, SurveyQuestion, TemplateQuestion
+from .survey_structure import clear_compiled_surveys
+from .testing import AppQueriesMixin
+
+
+class SessionProgressCounterTest(AppQueriesMixin, TestCase):
+    """Test that answer saves bump session progress instead of recounting."""
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_surveys()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.questions = []
+        for order, field_name in enumerate(['age', 'dependants', 'monthly_budget', 'hospital_cover'], start=1):
+            question = SurveyQuestion.objects.create(
+                category=self.category,
+                section="Basics",
+                question_text=f"{field_name}?",
+                question_type=SurveyQuestion.QuestionType.NUMBER,
+                field_name=field_name
+            )
+            TemplateQuestion.objects.create(template=template, question=question, display_order=order)
+            self.questions.append(question)
+        self.session = ComparisonSession.objects.create(session_key="progress-session", category=self.category)
+
+    def test_new_answers_bump_counter(self):
+        """Each new answer adds one to the counter and moves completion on."""
+        engine = SurveyEngine('health')
+        engine.save_response(self.session, self.questions[0].id, 30)
+        engine.save_response(self.session, self.questions[1].id, 2)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 2)
+        self.assertEqual(self.session.survey_completion_percentage, Decimal('50.00'))
+        self.assertFalse(self.session.survey_completed)
+
+    def test_changed_answer_leaves_progress(self):
+        """Changing an existing answer does not write progress at all."""
+        engine = SurveyEngine('health')
+        engine.save_response(self.session, self.questions[0].id, 30)
+        engine.get_structure()
+
+        # Savepoint, lookup and update of the existing response only
+        with self.assertNumAppQueries(4):
+            result = engine.save_response(self.session, self.questions[0].id, 31)
+
+        self.assertFalse(result['created'])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 1)
+
+    def test_last_answer_completes_survey(self):
+        """Answering every question marks the survey completed."""
+        engine = SurveyEngine('health')
+        for question in self.questions:
+            engine.save_response(self.session, question.id, 1)
+
+        self.assertTrue(self.session.survey_completed)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 4)
+        self.assertEqual(self.session.survey_completion_percentage, Decimal('100.00'))
+        self.assertTrue(self.session.survey_completed)
+
+    def test_counter_is_not_overwritten_by_stale_instance(self):
+        """Answers saved through different session instances all count."""
+        other = ComparisonSession.objects.get(pk=self.session.pk)
+        engine = SurveyEngine('health')
+        engine.save_response(self.session, self.questions[0].id, 30)
+        engine.save_response(other, self.questions[1].id, 2)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.survey_responses_count, 2)
+
+
+class SimpleSurveyCompletionStatusTest(AppQueriesMixin, TestCase):
+    """Test that completion status polls count answers once per engine."""
+
+    def setUp(self):
+        # Start from an empty question set rather than the seeded one
+        SimpleSurveyQuestion.objects.all().delete()
+        for order, (field_name, required) in enumerate([('age', True), ('gender', False)], start=1):
+            SimpleSurveyQuestion.objects.create(
+                category='health',
+                question_text=f"{field_name}?",
+                field_name=field_name,
+                input_type='text',
+                display_order=order,
+                is_required=required
+            )
+        self.engine = SimpleSurveyEngine('health')
+        self.age, self.gender = self.engine.questions
+
+    def test_status_counted_once_and_kept_current(self):
+        """Status and completion checks share one count, updated by new answers."""
+        self.engine.save_response('simple-progress', self.gender.id, 'Female')
+
+        with self.assertNumAppQueries(1):
+            self.assertFalse(self.engine.is_survey_complete('simple-progress'))
+            status = self.engine.get_completion_status('simple-progress')
+
+        self.assertEqual((status['answered_total'], status['answered_required']), (1, 0))
+
+        self.engine.save_response('simple-progress', self.age.id, '35')
+
+        with self.assertNumAppQueries(0):
+            status = self.engine.get_completion_status('simple-progress')
+        self.assertTrue(status['is_complete'])
+        self.assertEqual((status['answered_total'], status['answered_required']), (2, 1))
+        self.assertEqual(status['completion_percentage'], 100)
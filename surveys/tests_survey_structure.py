@@ -0,0 +1,125 @@
+"""
+Unit tests for compiled survey structures.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from comparison.models import ComparisonSession
+from policies.models import PolicyCategory
+from .engine import SurveyEngine
+from .models import (
+    SurveyTemplate, SurveyQuestion, TemplateQuestion, SurveyResponse, QuestionDependency
+)
+from .survey_structure import clear_compiled_surveys
+from .testing import AppQueriesMixin
+
+
+class CompiledSurveyTest(AppQueriesMixin, TestCase):
+    """Test loading, serving and invalidating compiled survey structures."""
+
+    def setUp(self):
+        cache.clear()
+        clear_compiled_surveys()
+        self.category = PolicyCategory.objects.create(
+            name="Health Insurance", slug="health", description="Health insurance policies"
+        )
+        self.template = SurveyTemplate.objects.create(
+            category=self.category, name="Health Survey", description="Health needs", version="1.0"
+        )
+        self.age = self._question("Personal Info", "age", SurveyQuestion.QuestionType.NUMBER, order=2)
+        self.smoker = self._question("Personal Info", "smoker", SurveyQuestion.QuestionType.BOOLEAN, order=1)
+        self.budget = self._question("Budget", "monthly_budget", SurveyQuestion.QuestionType.NUMBER, order=3)
+        self.cigarettes = self._question("Personal Info", "cigarettes", SurveyQuestion.QuestionType.NUMBER, order=4)
+        self.retired = self._question("Budget", "retired", SurveyQuestion.QuestionType.BOOLEAN, order=5)
+        self.retired.is_active = False
+        self.retired.save()
+        # Active category question outside the template
+        self.extra = SurveyQuestion.objects.create(
+            category=self.category, section="Extra", question_text="Extra?",
+            question_type=SurveyQuestion.QuestionType.TEXT, field_name="extra"
+        )
+
+        TemplateQuestion.objects.filter(question=self.age).update(is_required_override=False)
+        QuestionDependency.objects.create(
+            parent_question=self.smoker, child_question=self.cigarettes, condition_value=True
+        )
+        self.session = ComparisonSession.objects.create(session_key="structure-session", category=self.category)
+
+    def _question(self, section, field_name, question_type, order):
+        question = SurveyQuestion.objects.create(
+            category=self.category,
+            section=section,
+            question_text=f"{field_name}?",
+            question_type=question_type,
+            field_name=field_name,
+            is_required=True
+        )
+        TemplateQuestion.objects.create(template=self.template, question=question, display_order=order)
+        return question
+
+    def test_sections_follow_template_order(self):
+        """Sections and questions are ordered by template display order, with overrides applied."""
+        sections = SurveyEngine('health').get_survey_sections()
+
+        self.assertEqual([section['name'] for section in sections], ['Personal Info', 'Budget'])
+        self.assertEqual(
+            [q['field_name'] for q in sections[0]['questions']], ['smoker', 'age', 'cigarettes']
+        )
+        self.assertEqual([q['field_name'] for q in sections[1]['questions']], ['monthly_budget'])
+        age = sections[0]['questions'][1]
+        self.assertFalse(age['is_required'])
+        self.assertEqual(age['display_order'], 2)
+
+    def test_question_lookup_covers_category_questions(self):
+        """Lookup finds any active category question, using its own required flag."""
+        engine = SurveyEngine('health')
+
+        self.assertTrue(engine.get_question_by_id(self.age.id)['is_required'])
+        self.assertEqual(engine.get_question_by_id(self.extra.id)['field_name'], 'extra')
+        self.assertIsNone(engine.get_question_by_id(self.retired.id))
+
+    def test_warm_structure_served_without_queries(self):
+        """Validation, navigation data and conditional checks do not touch the database."""
+        SurveyEngine('health').get_survey_sections()
+        engine = SurveyEngine('health')
+
+        with self.assertNumAppQueries(0):
+            engine.get_survey_sections()
+            self.assertTrue(engine.validate_response(self.budget.id, 500)['is_valid'])
+            self.assertEqual(
+                engine.check_conditional_questions(self.session, self.smoker.id, True),
+                [self.cigarettes.id]
+            )
+            self.assertEqual(engine.check_conditional_questions(self.session, self.smoker.id, False), [])
+
+    def test_question_edit_rebuilds_structure(self):
+        """Editing a question is visible to engines created afterwards."""
+        SurveyEngine('health').get_survey_sections()
+
+        self.budget.question_text = "What is your monthly budget?"
+        self.budget.save()
+
+        engine = SurveyEngine('health')
+        self.assertEqual(
+            engine.get_question_by_id(self.budget.id)['question_text'], "What is your monthly budget?"
+        )
+
+    def test_template_change_rebuilds_structure(self):
+        """Removing a question from the template removes it from the sections."""
+        SurveyEngine('health').get_survey_sections()
+
+        TemplateQuestion.objects.get(question=self.budget).delete()
+
+        sections = SurveyEngine('health').get_survey_sections()
+        self.assertEqual([section['name'] for section in sections], ['Personal Info'])
+
+    def test_save_response_and_completion(self):
+        """Responses save against the compiled question and count towards completion."""
+        engine = SurveyEngine('health')
+        result = engine.save_response(self.session, self.budget.id, 500, confidence_level=4)
+
+        self.assertTrue(result['success'])
+        self.assertTrue(SurveyResponse.objects.filter(session=self.session, question=self.budget).exists())
+        self.assertEqual(engine.calculate_completion_percentage(self.session), 25.0)
+        self.assertFalse(engine.save_response(self.session, self.retired.id, True)['success'])